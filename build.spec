@@ -56,6 +56,7 @@ hiddenimports = [
 
     # 核心依赖 - 只保留必需的
     'playwright.async_api',
+    'greenlet',
     'openpyxl',
     'requests',
     'PIL.Image',
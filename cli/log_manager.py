@@ -8,10 +8,11 @@ import json
 import csv
 import re
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from enum import Enum
 from datetime import datetime
 
+from cli.log_reader import LogIndex, read_lines_reverse
 from cli.models import LogEntry
 from common.logging_config import xuanping_logger
 
@@ -25,11 +26,25 @@ class LogExportFormat(Enum):
 class LogManager:
     """日志管理器"""
     
-    def __init__(self):
+    def __init__(self, use_index: bool = True):
         self.log_dir = xuanping_logger.get_log_directory()
+        self.use_index = use_index  # 级别/时间过滤时使用旁路索引
+        self._indexes: Dict[str, LogIndex] = {}
 
-    def get_recent_logs(self, limit: int = 100, level_filter: Optional[str] = None) -> List[LogEntry]:
-        """从日志文件中读取最近的日志条目"""
+    def get_recent_logs(self, limit: int = 100, level_filter: Optional[str] = None,
+                        since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[LogEntry]:
+        """
+        从日志文件中读取最近的日志条目
+
+        从文件末尾按块倒序读取，读够 limit 条即停止；指定级别或时间范围时
+        通过旁路索引跳过不包含匹配日志的块，读取量与输出量成正比。
+
+        Args:
+            limit: 最多返回的条数
+            level_filter: 日志级别过滤
+            since: 起始时间（含）
+            until: 结束时间（含）
+        """
         logs = []
 
         # 获取所有日志文件，按修改时间排序
@@ -37,21 +52,19 @@ class LogManager:
 
         for log_file_info in log_files:
             try:
-                with open(log_file_info['path'], 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-
-                # 从文件末尾开始读取
-                for line in reversed(lines):
-                    line = line.strip()
+                for line in self._iter_lines_reverse(log_file_info['path'], level_filter, since, until):
+                    line = line.decode('utf-8', errors='replace').strip()
                     if not line:
                         continue
 
                     # 解析日志行
                     log_entry = self._parse_log_line(line)
                     if log_entry:
-                        # 应用级别过滤
+                        # 应用级别和时间过滤
                         if level_filter and log_entry.level.value.lower() != level_filter.lower():
                             continue
+                        if (since and log_entry.timestamp < since) or (until and log_entry.timestamp > until):
+                            continue
 
                         logs.append(log_entry)
 
@@ -71,6 +84,19 @@ class LogManager:
         logs.sort(key=lambda x: x.timestamp, reverse=True)
         return logs[:limit]
 
+    def _iter_lines_reverse(self, path: str, level_filter: Optional[str] = None,
+                            since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[bytes]:
+        """倒序读取日志行：没有过滤条件时直接从文件尾部读取，否则只读取索引命中的块"""
+        if not (self.use_index and (level_filter or since or until)):
+            yield from read_lines_reverse(path)
+            return
+
+        index = self._indexes.get(path)
+        if index is None:
+            index = self._indexes[path] = LogIndex(path)
+        for block in reversed(index.select_blocks(level_filter, since, until)):
+            yield from read_lines_reverse(path, block.offset, block.end)
+
     def _parse_log_line(self, line: str) -> Optional[LogEntry]:
         """解析日志行"""
         try:
@@ -116,24 +142,32 @@ class LogManager:
 
         return None
 
-    def export_logs_txt(self, filename: str, level_filter: Optional[str] = None) -> bool:
+    def export_logs_txt(self, filename: str, level_filter: Optional[str] = None,
+                        since: Optional[datetime] = None, until: Optional[datetime] = None,
+                        limit: int = 10000) -> bool:
         """导出日志为TXT格式"""
-        logs = self.get_recent_logs(limit=10000, level_filter=level_filter)
+        logs = self.get_recent_logs(limit=limit, level_filter=level_filter, since=since, until=until)
         return self.export_logs(logs, filename, LogExportFormat.TXT)
 
-    def export_logs_csv(self, filename: str, level_filter: Optional[str] = None) -> bool:
+    def export_logs_csv(self, filename: str, level_filter: Optional[str] = None,
+                        since: Optional[datetime] = None, until: Optional[datetime] = None,
+                        limit: int = 10000) -> bool:
         """导出日志为CSV格式"""
-        logs = self.get_recent_logs(limit=10000, level_filter=level_filter)
+        logs = self.get_recent_logs(limit=limit, level_filter=level_filter, since=since, until=until)
         return self.export_logs(logs, filename, LogExportFormat.CSV)
 
-    def export_logs_json(self, filename: str, level_filter: Optional[str] = None) -> bool:
+    def export_logs_json(self, filename: str, level_filter: Optional[str] = None,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         limit: int = 10000) -> bool:
         """导出日志为JSON格式"""
-        logs = self.get_recent_logs(limit=10000, level_filter=level_filter)
+        logs = self.get_recent_logs(limit=limit, level_filter=level_filter, since=since, until=until)
         return self.export_logs(logs, filename, LogExportFormat.JSON)
 
-    def export_logs_html(self, filename: str, level_filter: Optional[str] = None) -> bool:
+    def export_logs_html(self, filename: str, level_filter: Optional[str] = None,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         limit: int = 10000) -> bool:
         """导出日志为HTML格式"""
-        logs = self.get_recent_logs(limit=10000, level_filter=level_filter)
+        logs = self.get_recent_logs(limit=limit, level_filter=level_filter, since=since, until=until)
         return self.export_logs(logs, filename, LogExportFormat.HTML)
 
     def export_logs(self, logs: List[LogEntry], filename: str, format_type: LogExportFormat) -> bool:
@@ -0,0 +1,280 @@
+"""
+日志文件读取器
+
+为日志查看和导出提供与输出量成正比（而不是与文件大小成正比）的读取方式：
+- read_lines_reverse: 从文件末尾按块向前读取行，最近 N 条只读取文件尾部
+- LogIndex: 旁路索引（<日志文件>.idx），按约 64KB 的块记录字节偏移、时间范围和包含的日志级别，
+  级别过滤和时间范围查询只读取命中的块；日志追加后增量更新，文件被轮转/截断后重建
+"""
+
+import os
+import re
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+READ_BLOCK_SIZE = 64 * 1024
+INDEX_BLOCK_SIZE = 64 * 1024
+INDEX_SUFFIX = ".idx"
+
+# 日志级别位掩码（与 LogManager 支持的级别一致）
+LEVEL_BITS = {'DEBUG': 1, 'INFO': 2, 'WARNING': 4, 'ERROR': 8}
+ALL_LEVELS = 0xFF
+
+SCAN_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 日志行头部：时间戳和级别（与 LogManager._parse_log_line 的格式一致）
+_LINE_HEADER = re.compile(rb'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - [^\n]*? - (DEBUG|INFO|WARNING|ERROR) - ', re.M)
+
+
+def read_lines_reverse(path: Union[str, Path], start: int = 0, end: Optional[int] = None,
+                       block_size: int = READ_BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    倒序读取 [start, end) 范围内的行（不含换行符）
+
+    Args:
+        path: 文件路径
+        start: 起始字节偏移（需位于行首）
+        end: 结束字节偏移，默认为文件末尾
+        block_size: 每次向前读取的字节数
+
+    Yields:
+        bytes: 从后向前的每一行
+    """
+    with open(path, 'rb') as f:
+        if end is None:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+        position = end
+        remainder = b''
+        while position > start:
+            read_size = min(block_size, position - start)
+            position -= read_size
+            f.seek(position)
+            pieces = (f.read(read_size) + remainder).split(b'\n')
+            remainder = pieces[0]
+            for line in reversed(pieces[1:]):
+                yield line
+        yield remainder
+
+
+def _to_timestamp(header_time: bytes) -> float:
+    """把日志头部的时间（YYYY-MM-DD HH:MM:SS）转换为 Unix 时间戳"""
+    return datetime.strptime(header_time.decode('ascii'), '%Y-%m-%d %H:%M:%S').timestamp()
+
+
+class _BlockStats:
+    """扫描中的块统计：最早/最晚时间和出现过的级别"""
+
+    __slots__ = ('first', 'last', 'levels')
+
+    def __init__(self):
+        self.first: Optional[bytes] = None
+        self.last: Optional[bytes] = None
+        self.levels = set()
+
+    def add(self, data: bytes, start: int, end: int):
+        headers = _LINE_HEADER.findall(data, start, end)
+        if not headers:
+            return
+        times = [header_time for header_time, _ in headers]
+        first, last = min(times), max(times)
+        self.first = first if self.first is None else min(self.first, first)
+        self.last = last if self.last is None else max(self.last, last)
+        self.levels.update(level for _, level in headers)
+
+    def to_block(self, offset: int, end: int) -> 'LogBlock':
+        mask = 0
+        for level in self.levels:
+            mask |= LEVEL_BITS[level.decode('ascii')]
+        if self.first is None:
+            return LogBlock(offset, end, 0.0, 0.0, mask)
+        try:
+            return LogBlock(offset, end, _to_timestamp(self.first), _to_timestamp(self.last), mask)
+        except ValueError:
+            # 时间无法解析时不按时间范围跳过该块
+            return LogBlock(offset, end, 0.0, float('inf'), mask)
+
+
+@dataclass
+class LogBlock:
+    """索引中的一个块（起止偏移均位于行首）"""
+    offset: int
+    end: int
+    first_ts: float  # 块内最早的日志时间
+    last_ts: float  # 块内最晚的日志时间
+    level_mask: int  # 块内出现过的日志级别
+
+    def matches(self, level_mask: int = ALL_LEVELS, since: Optional[float] = None,
+                until: Optional[float] = None) -> bool:
+        """块内是否可能包含满足条件的日志"""
+        if not self.level_mask & level_mask:
+            return False
+        if since is not None and self.last_ts < since:
+            return False
+        if until is not None and self.first_ts > until:
+            return False
+        return True
+
+
+class LogIndex:
+    """
+    日志文件旁路索引
+
+    索引文件格式：头部（魔数、已索引字节数、文件开头指纹）后跟定长的块记录。
+    只索引以换行结尾的完整行；未索引的尾部在查询时作为一个不做过滤的块返回。
+    """
+
+    MAGIC = b'XPLOGIX1'
+    HEADER = struct.Struct('<8sQI')
+    ENTRY = struct.Struct('<QQddB')
+    FINGERPRINT_BYTES = 4096
+
+    def __init__(self, log_path: Union[str, Path], index_path: Optional[Union[str, Path]] = None,
+                 block_size: int = INDEX_BLOCK_SIZE):
+        """
+        初始化日志索引
+
+        Args:
+            log_path: 日志文件路径
+            index_path: 索引文件路径，默认为 <日志文件>.idx
+            block_size: 每个索引块的目标字节数
+        """
+        self.log_path = Path(log_path)
+        self.index_path = Path(index_path) if index_path else self.log_path.with_name(self.log_path.name + INDEX_SUFFIX)
+        self.block_size = block_size
+        self.blocks: List[LogBlock] = []
+        self.indexed_size = 0
+        self.fingerprint = 0
+        self._loaded = False
+
+    def _compute_fingerprint(self, size: int) -> int:
+        """文件开头的 CRC32，用于识别日志文件被轮转或重写"""
+        with open(self.log_path, 'rb') as f:
+            return zlib.crc32(f.read(min(size, self.FINGERPRINT_BYTES)))
+
+    def _load(self):
+        """读取索引文件（不存在或损坏时视为空索引）"""
+        self._loaded = True
+        try:
+            data = self.index_path.read_bytes()
+            magic, indexed_size, fingerprint = self.HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return
+        if magic != self.MAGIC or (len(data) - self.HEADER.size) % self.ENTRY.size:
+            return
+        self.indexed_size = indexed_size
+        self.fingerprint = fingerprint
+        self.blocks = [LogBlock(*entry) for entry in self.ENTRY.iter_unpack(data[self.HEADER.size:])]
+
+    def _save(self):
+        """写入索引文件（目录不可写时只保留内存中的索引）"""
+        payload = [self.HEADER.pack(self.MAGIC, self.indexed_size, self.fingerprint)]
+        payload.extend(self.ENTRY.pack(block.offset, block.end, block.first_ts, block.last_ts, block.level_mask)
+                       for block in self.blocks)
+        temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            temp_path.write_bytes(b''.join(payload))
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            pass
+
+    def update(self) -> bool:
+        """
+        使索引覆盖日志文件的全部完整行
+
+        Returns:
+            bool: 索引是否有变化
+        """
+        if not self._loaded:
+            self._load()
+        size = self.log_path.stat().st_size
+
+        if self.blocks and (size < self.indexed_size
+                            or self._compute_fingerprint(self.indexed_size) != self.fingerprint):
+            self.blocks, self.indexed_size = [], 0
+        if size == self.indexed_size:
+            return False
+
+        # 最后一个块可能未满，从它的起点重新索引
+        start = 0
+        if self.blocks:
+            start = self.blocks.pop().offset
+        new_blocks, indexed_end = self._scan(start, size)
+        if indexed_end == self.indexed_size and not new_blocks:
+            return False
+        self.blocks.extend(new_blocks)
+        self.indexed_size = indexed_end
+        self.fingerprint = self._compute_fingerprint(indexed_end)
+        self._save()
+        return True
+
+    def _scan(self, start: int, end: int):
+        """
+        扫描 [start, end) 中的完整行并切分为块
+
+        按大块读取，用多行正则一次找出块内所有行头部；时间戳按字节比较（格式固定，字典序即时间序），
+        每个块只转换最早和最晚两个时间。
+        """
+        blocks = []
+        block_start = start
+        block_stats = _BlockStats()
+        read_position = start
+        carry = b''
+
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            while read_position < end:
+                data = f.read(min(SCAN_CHUNK_SIZE, end - read_position))
+                if not data:
+                    break
+                read_position += len(data)
+                chunk = carry + data
+                last_newline = chunk.rfind(b'\n')
+                if last_newline < 0:
+                    carry = chunk
+                    continue
+                carry = chunk[last_newline + 1:]
+                chunk_start = read_position - len(chunk)
+
+                # 在块大小达到目标后的第一个换行处切分
+                segment_start = 0
+                while segment_start <= last_newline:
+                    target = block_start + self.block_size - chunk_start - 1
+                    cut = chunk.find(b'\n', max(target, segment_start), last_newline + 1)
+                    segment_end = (cut if cut >= 0 else last_newline) + 1
+                    block_stats.add(chunk, segment_start, segment_end)
+                    segment_start = segment_end
+                    if cut >= 0:
+                        blocks.append(block_stats.to_block(block_start, chunk_start + segment_end))
+                        block_start = chunk_start + segment_end
+                        block_stats = _BlockStats()
+
+        indexed_end = read_position - len(carry)
+        if indexed_end > block_start:
+            blocks.append(block_stats.to_block(block_start, indexed_end))
+        return blocks, indexed_end
+
+    def select_blocks(self, level: Optional[str] = None, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None) -> List[LogBlock]:
+        """
+        选出可能包含满足条件日志的块（按文件顺序，含未索引的尾部）
+
+        Args:
+            level: 日志级别（不区分大小写），None 表示不过滤
+            since: 起始时间（含）
+            until: 结束时间（含）
+        """
+        self.update()
+        level_mask = LEVEL_BITS.get(level.upper(), 0) if level else ALL_LEVELS
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        selected = [block for block in self.blocks if block.matches(level_mask, since_ts, until_ts)]
+
+        size = self.log_path.stat().st_size
+        if size > self.indexed_size:
+            selected.append(LogBlock(self.indexed_size, size, 0.0, float('inf'), ALL_LEVELS))
+        return selected
@@ -11,6 +11,7 @@ import argparse
 import logging
 import time
 import threading
+from datetime import datetime
 from pathlib import Path
 
 from cli.models import UIStateManager, AppState, LogLevel, UIConfig
@@ -88,6 +89,16 @@ def setup_cli_logging(log_level: LogLevel = LogLevel.INFO):
     return logger
 
 
+def _parse_log_time(value: str) -> datetime:
+    """解析logs命令的时间参数"""
+    for time_format in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, time_format)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"无法解析的时间: {value}")
+
+
 def create_parser():
     """创建命令行参数解析器"""
     parser = argparse.ArgumentParser(
@@ -98,9 +109,13 @@ def create_parser():
   %(prog)s start --data user_data.json --config system_config.json  # 使用用户数据和系统配置启动
   %(prog)s start --data user_data.json                              # 使用用户数据和默认系统配置启动
   %(prog)s start --dryrun --data user_data.json                     # 试运行模式
+  %(prog)s start --force-refresh --data user_data.json              # 忽略页面缓存重新抓取
+  %(prog)s start --full-coverage --data user_data.json              # 审计运行：抓取店铺全部商品
+  %(prog)s start --resume --data user_data.json                     # 从上次中断处续跑
   %(prog)s status                                                    # 查看当前任务状态
   %(prog)s stop                                                      # 停止当前任务
   %(prog)s logs --export csv                                         # 导出日志为CSV格式
+  %(prog)s logs --level error --since 2025-11-06                     # 查看指定日期之后的错误日志
 
 参数文件格式:
   --data (用户输入数据):
@@ -158,6 +173,21 @@ def create_parser():
         action='store_true',
         help='试运行模式：只显示将要执行的操作，不实际修改文件'
     )
+    start_parser.add_argument(
+        '--force-refresh',
+        action='store_true',
+        help='忽略页面缓存，强制重新抓取所有页面（新结果仍会写入缓存）'
+    )
+    start_parser.add_argument(
+        '--full-coverage',
+        action='store_true',
+        help='审计运行：抓取店铺全部商品，不因好店判定已确定而提前结束'
+    )
+    start_parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='续跑模式：跳过上次中断前已完成的店铺，并将其结果一并写回Excel'
+    )
 
     # 选择模式标志（互斥）
     mode_group = start_parser.add_mutually_exclusive_group()
@@ -200,6 +230,16 @@ def create_parser():
         choices=['debug', 'info', 'warning', 'error'],
         help='过滤日志级别'
     )
+    logs_parser.add_argument(
+        '--since',
+        type=_parse_log_time,
+        help='起始时间（YYYY-MM-DD 或 "YYYY-MM-DD HH:MM:SS"）'
+    )
+    logs_parser.add_argument(
+        '--until',
+        type=_parse_log_time,
+        help='结束时间（YYYY-MM-DD 或 "YYYY-MM-DD HH:MM:SS"）'
+    )
 
     # create-template命令
     template_parser = subparsers.add_parser('create-template', help='创建用户数据配置模板')
@@ -358,6 +398,24 @@ def handle_start_command(args):
         system_config.dryrun = True
         print("🧪 试运行模式已启用")
 
+    # 应用强制刷新
+    if args.force_refresh:
+        ui_config.force_refresh = True
+        system_config.performance.force_refresh = True
+        print("🔄 强制刷新已启用：忽略页面缓存")
+
+    # 应用完整覆盖（审计运行）
+    if args.full_coverage:
+        ui_config.full_coverage = True
+        system_config.performance.early_store_verdict = False
+        print("🔍 完整覆盖已启用：抓取店铺全部商品")
+
+    # 应用续跑模式
+    if args.resume:
+        ui_config.resume = True
+        system_config.resume = True
+        print("📒 续跑模式已启用：跳过已完成的店铺")
+
     # 应用选择模式
     system_config.selection_mode = select_mode
 
@@ -519,6 +577,8 @@ def handle_resume_command(args):
 def handle_logs_command(args):
     """处理logs命令"""
     log_manager = LogManager()
+    since = getattr(args, 'since', None)
+    until = getattr(args, 'until', None)
 
     if args.export:
         # 如果没有指定输出路径，使用用户数据目录
@@ -531,13 +591,13 @@ def handle_logs_command(args):
 
         try:
             if args.export == 'txt':
-                success = log_manager.export_logs_txt(output_file, args.level)
+                success = log_manager.export_logs_txt(output_file, args.level, since, until)
             elif args.export == 'csv':
-                success = log_manager.export_logs_csv(output_file, args.level)
+                success = log_manager.export_logs_csv(output_file, args.level, since, until)
             elif args.export == 'json':
-                success = log_manager.export_logs_json(output_file, args.level)
+                success = log_manager.export_logs_json(output_file, args.level, since, until)
             elif args.export == 'html':
-                success = log_manager.export_logs_html(output_file, args.level)
+                success = log_manager.export_logs_html(output_file, args.level, since, until)
             else:
                 print(f"✗ 不支持的导出格式: {args.export}")
                 return 1
@@ -555,7 +615,7 @@ def handle_logs_command(args):
     else:
         # 显示最近的日志
         try:
-            logs = log_manager.get_recent_logs(limit=20, level_filter=args.level)
+            logs = log_manager.get_recent_logs(limit=20, level_filter=args.level, since=since, until=until)
             if logs:
                 print("📋 最近的日志:")
                 if args.level:
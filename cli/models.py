@@ -107,6 +107,9 @@ class UIConfig:
 
     # 运行模式
     dryrun: bool = False
+    force_refresh: bool = False  # 忽略页面缓存，强制重新抓取
+    full_coverage: bool = False  # 抓取店铺全部商品（不因好店判定已确定而提前结束）
+    resume: bool = False  # 跳过断点日志中已完成的店铺
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
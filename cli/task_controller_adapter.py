@@ -43,6 +43,9 @@ class TaskControllerAdapter(ITaskEventListener):
                 # 创建选择器实例
                 selector_config = GoodStoreSelectorConfig()
                 selector_config.dryrun = config.dryrun
+                selector_config.performance.force_refresh = config.force_refresh
+                selector_config.performance.early_store_verdict = not config.full_coverage
+                selector_config.resume = config.resume
                 selector = GoodStoreSelector(
                     excel_file_path=config.good_shop_file,
                     profit_calculator_path=config.margin_calculator,
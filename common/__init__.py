@@ -6,11 +6,12 @@
 """
 
 # 导入常用的工具类和函数
-from .excel_processor import ExcelStoreProcessor, ExcelProfitProcessor
+from .excel_processor import ExcelStoreProcessor, ExcelProfitProcessor, IncrementalExcelWriter
 from .logging_config import setup_logging
 
 __all__ = [
     'ExcelStoreProcessor',
     'ExcelProfitProcessor',
+    'IncrementalExcelWriter',
     'setup_logging'
 ]
@@ -6,11 +6,32 @@
 
 from .pricing_calculator import PricingCalculator
 from .profit_evaluator import ProfitEvaluator
-from .store_evaluator import StoreEvaluator
+from .store_evaluator import StoreEvaluator, IncrementalStoreEvaluator
+from .batch_profit_engine import (
+    BatchProfitResult,
+    BatchPricingResult,
+    evaluate_profit_batch,
+    calculate_pricing_batch,
+)
+from .formula_model import (
+    FormulaModel,
+    FormulaModelError,
+    load_formula_model,
+    clear_formula_model_cache,
+)
 
 
 __all__ = [
     'PricingCalculator',
     'ProfitEvaluator', 
     'StoreEvaluator',
+    'IncrementalStoreEvaluator',
+    'BatchProfitResult',
+    'BatchPricingResult',
+    'evaluate_profit_batch',
+    'calculate_pricing_batch',
+    'FormulaModel',
+    'FormulaModelError',
+    'load_formula_model',
+    'clear_formula_model_cache',
 ]
\ No newline at end of file
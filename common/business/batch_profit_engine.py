@@ -0,0 +1,199 @@
+"""
+批量利润计算引擎
+
+用 NumPy 对整批商品一次性完成利润计算，供价格/佣金调整后重新评估大量缓存商品使用：
+- evaluate_profit_batch: 与 ExcelProfitCalculator.calculate_profit 相同的校验与利润公式
+- calculate_pricing_batch: 与 PricingCalculator.calculate_complete_pricing 相同的定价规则
+
+逐元素运算的顺序与标量实现完全一致，结果与逐个计算逐位相同；
+不合法的行不抛出异常，通过校验掩码返回。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[Optional[float]], np.ndarray]
+
+# 输入校验规则（顺序与 ExcelProfitCalculator._validate_input 一致，错误信息相同）
+VALIDATION_RULES = (
+    ('black_price', "黑标价格必须为正数"),
+    ('green_price', "绿标价格必须为正数"),
+    ('list_price', "定价必须为正数"),
+    ('purchase_price', "采购价必须为正数"),
+    ('commission_rate', "佣金率必须在0-100之间"),
+    ('weight', "重量必须为正数"),
+    ('length', "长度必须为正数"),
+    ('width', "宽度必须为正数"),
+    ('height', "高度必须为正数"),
+)
+
+
+def _as_float_array(values: ArrayLike) -> np.ndarray:
+    """转换为 float64 数组，None 视为 0"""
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False)
+    if np.isscalar(values) or values is None:
+        return np.asarray(0.0 if values is None else values, dtype=np.float64)
+    return np.asarray([0.0 if value is None else value for value in values], dtype=np.float64)
+
+
+@dataclass
+class BatchProfitResult:
+    """批量利润计算结果（每个数组按输入行对齐）"""
+    profit_amount: np.ndarray  # 利润金额，不合法行为 NaN
+    profit_rate: np.ndarray  # 利润率（百分比），不合法行为 NaN
+    is_loss: np.ndarray  # 是否亏损
+    valid: np.ndarray  # 输入是否通过校验
+    invalid_masks: Dict[str, np.ndarray] = field(default_factory=dict)  # 各字段的不合法掩码
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)  # 广播后的输入列
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def error_message(self, index: int) -> Optional[str]:
+        """第 index 行的校验错误（与标量计算抛出的第一个错误相同），合法时返回 None"""
+        for name, message in VALIDATION_RULES:
+            if self.invalid_masks[name][index]:
+                return message
+        return None
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """第 index 行的结果"""
+        valid = bool(self.valid[index])
+        return {
+            'profit_amount': float(self.profit_amount[index]) if valid else None,
+            'profit_rate': float(self.profit_rate[index]) if valid else None,
+            'is_loss': bool(self.is_loss[index]) if valid else None,
+            'valid': valid,
+            'error': self.error_message(index),
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """逐行结果列表"""
+        return [self.row(i) for i in range(len(self))]
+
+    @property
+    def valid_count(self) -> int:
+        """合法行数"""
+        return int(np.count_nonzero(self.valid))
+
+
+def evaluate_profit_batch(black_price: ArrayLike,
+                          green_price: ArrayLike,
+                          list_price: ArrayLike,
+                          purchase_price: ArrayLike,
+                          commission_rate: ArrayLike,
+                          weight: ArrayLike,
+                          length: ArrayLike,
+                          width: ArrayLike,
+                          height: ArrayLike) -> BatchProfitResult:
+    """
+    批量计算利润（参数与 ExcelProfitCalculator.calculate_profit 相同，每个参数为一列）
+
+    标量参数会广播到所有行（例如统一调整佣金率后重新评估）。
+
+    Returns:
+        BatchProfitResult: 利润金额、利润率（百分比）、亏损标记和校验掩码
+    """
+    columns = dict(zip(
+        [name for name, _ in VALIDATION_RULES],
+        np.broadcast_arrays(*[_as_float_array(values) for values in (
+            black_price, green_price, list_price, purchase_price, commission_rate,
+            weight, length, width, height
+        )])
+    ))
+    columns = {name: np.atleast_1d(values) for name, values in columns.items()}
+
+    invalid_masks = {
+        name: (~((values >= 0) & (values <= 100)) if name == 'commission_rate' else values <= 0)
+        for name, values in columns.items()
+    }
+    valid = ~np.logical_or.reduce(list(invalid_masks.values()))
+
+    black = columns['black_price']
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        commission_decimal = columns['commission_rate'] / 100.0
+        commission_amount = black * commission_decimal
+        profit_amount = columns['green_price'] - black - commission_amount
+        profit_rate = np.where(black != 0, profit_amount / np.where(black != 0, black, 1.0), 0.0)
+        profit_rate = profit_rate * 100
+
+    profit_amount = np.where(valid, profit_amount, np.nan)
+    profit_rate = np.where(valid, profit_rate, np.nan)
+    return BatchProfitResult(
+        profit_amount=profit_amount,
+        profit_rate=profit_rate,
+        is_loss=valid & (profit_amount < 0),
+        valid=valid,
+        invalid_masks=invalid_masks,
+        columns=columns
+    )
+
+
+@dataclass
+class BatchPricingResult:
+    """批量定价计算结果（人民币）"""
+    green_price_cny: np.ndarray  # 绿标价格，无价格时为 0
+    black_price_cny: np.ndarray  # 黑标价格，无价格时为 0
+    real_selling_price: np.ndarray  # 真实售价
+    product_pricing: np.ndarray  # 商品定价
+    profit_amount: np.ndarray  # 利润金额
+    profit_rate: np.ndarray  # 利润率（百分比）
+
+    def __len__(self) -> int:
+        return len(self.real_selling_price)
+
+
+def calculate_pricing_batch(green_price_rub: ArrayLike, black_price_rub: ArrayLike,
+                            price_config) -> BatchPricingResult:
+    """
+    批量定价计算（规则与 PricingCalculator.calculate_complete_pricing 相同）
+
+    Args:
+        green_price_rub: 绿标价格（卢布），None/0 表示无价格
+        black_price_rub: 黑标价格（卢布），None/0 表示无价格
+        price_config: PriceCalculationConfig 实例
+
+    Returns:
+        BatchPricingResult: 各步骤的计算结果
+    """
+    green_rub, black_rub = np.broadcast_arrays(_as_float_array(green_price_rub), _as_float_array(black_price_rub))
+    green_rub, black_rub = np.atleast_1d(green_rub), np.atleast_1d(black_rub)
+
+    # 1. 汇率转换（无价格保持为 0）
+    has_green = green_rub != 0
+    has_black = black_rub != 0
+    green = np.where(has_green, green_rub * price_config.rub_to_cny_rate, 0.0)
+    black = np.where(has_black, black_rub * price_config.rub_to_cny_rate, 0.0)
+    has_green = green != 0
+    has_black = black != 0
+
+    # 2. 真实售价：有绿标价格时以绿标价格为基准分段计算，只有黑标价格时直接使用黑标价格
+    black_or_green = np.where(has_black, black, green)
+    with np.errstate(invalid='ignore', over='ignore'):
+        high_price = np.where(has_black, (black - green) * price_config.price_multiplier + black, green)
+        real_price = np.select(
+            [green <= price_config.price_adjustment_threshold_1,
+             green <= price_config.price_adjustment_threshold_2],
+            [black_or_green, black_or_green + price_config.price_adjustment_amount],
+            default=high_price
+        )
+    # 与标量实现一致：只有绿标参与的分段结果截断为非负，只有黑标价格时原样使用
+    real_price = np.where(has_green, np.maximum(real_price, 0.0), np.where(has_black, black, 0.0))
+
+    # 3. 商品定价与利润
+    product_pricing = real_price * price_config.pricing_discount_rate
+    profit_amount = real_price - product_pricing
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_rate = np.where(real_price > 0, profit_amount / np.where(real_price > 0, real_price, 1.0) * 100, 0.0)
+
+    return BatchPricingResult(
+        green_price_cny=green,
+        black_price_cny=black,
+        real_selling_price=real_price,
+        product_pricing=product_pricing,
+        profit_amount=profit_amount,
+        profit_rate=profit_rate
+    )
@@ -14,10 +14,15 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 from dataclasses import dataclass, asdict
+
+import numpy as np
 from openpyxl import load_workbook
 from openpyxl.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
+from .batch_profit_engine import ArrayLike, BatchProfitResult, evaluate_profit_batch
+from .formula_model import FormulaModel, FormulaModelError, load_formula_model
+
 
 @dataclass
 class ProfitCalculatorInput:
@@ -83,10 +88,27 @@ class ExcelProfitCalculator:
         'profit_rate': 'H10'      # 利润率
     }
     
+    # 利润表（V4版本）公式模型的输入/输出单元格（利润计算表工作表）
+    WORKBOOK_INPUT_CELLS = {
+        'black_price': 'A3',      # 黑标价格
+        'green_price': 'B3',      # 绿标价格
+        'commission_rate': 'C3',  # 佣金率（小数，0.12表示12%）
+        'weight': 'A4',           # 重量（克）
+        'length': 'A5',           # 长度（厘米）
+        'width': 'A6',            # 宽度（厘米）
+        'height': 'A7',           # 高度（厘米）
+        'list_price': 'A11',      # 定价
+        'purchase_price': 'B11',  # 采购价
+    }
+    WORKBOOK_OUTPUT_CELLS = {
+        'profit_amount': 'G11',   # 利润
+        'profit_rate': 'H11',     # 利润率（小数）
+    }
+
     WORKSHEET_NAME = '利润计算表'
     SUPPORTED_EXTENSIONS = {'.xlsx', '.xls'}
     
-    def __init__(self, excel_file_path: Union[str, Path]):
+    def __init__(self, excel_file_path: Union[str, Path], use_workbook_formulas: bool = False):
         """
         初始化Excel利润计算器
         
@@ -95,6 +117,8 @@ class ExcelProfitCalculator:
                 - 绝对路径：/path/to/file.xlsx, C:\\path\\to\\file.xlsx
                 - 相对路径：./uploads/file.xlsx, ../data/file.xlsx
                 - Web upload目录路径：uploads/profit_calc.xlsx
+            use_workbook_formulas: 是否按工作簿中的公式计算（编译为内存公式模型，
+                文件修改后自动重新编译）；否则使用内置公式
         
         Raises:
             ExcelCalculatorError: 文件路径无效、文件不存在或格式错误
@@ -103,8 +127,12 @@ class ExcelProfitCalculator:
         self.excel_file_path = self._validate_and_normalize_path(excel_file_path)
         self.workbook: Optional[Workbook] = None
         self.worksheet: Optional[Worksheet] = None
+        self.use_workbook_formulas = use_workbook_formulas
         self._last_access_time = 0
-        self._initialize_excel()
+        if use_workbook_formulas:
+            self._get_formula_model()
+        else:
+            self._initialize_excel()
     
     def _validate_and_normalize_path(self, file_path: Union[str, Path]) -> Path:
         """
@@ -182,6 +210,45 @@ class ExcelProfitCalculator:
                 raise ExcelCalculatorError("Excel文件版本过旧，请使用较新版本的Excel文件")
             raise ExcelCalculatorError(f"Excel文件初始化失败: {e}")
     
+    def _get_formula_model(self) -> FormulaModel:
+        """
+        获取工作簿公式模型（按文件修改时间缓存，工作簿被编辑后自动重新编译）
+
+        Raises:
+            ExcelCalculatorError: 工作簿无法编译或缺少利润计算所需的单元格
+        """
+        try:
+            model = load_formula_model(self.excel_file_path)
+        except FormulaModelError as e:
+            raise ExcelCalculatorError(f"Excel公式模型加载失败: {e}")
+
+        if self.WORKSHEET_NAME not in model.sheet_names:
+            raise ExcelCalculatorError(
+                f"工作表 '{self.WORKSHEET_NAME}' 不存在。可用工作表: {', '.join(model.sheet_names)}"
+            )
+        missing = [cell for cell in self.WORKBOOK_OUTPUT_CELLS.values()
+                   if not model.is_formula(cell, self.WORKSHEET_NAME)]
+        if missing:
+            raise ExcelCalculatorError(f"工作表 '{self.WORKSHEET_NAME}' 缺少利润公式单元格: {', '.join(missing)}")
+        return model
+
+    def _evaluate_workbook_formulas(self, columns: Dict[str, Any]) -> tuple:
+        """
+        用工作簿公式模型计算利润（输入为列或单值）
+
+        Returns:
+            tuple: (利润金额数组, 利润率数组（小数）)，公式错误时为 NaN
+        """
+        inputs = {cell: columns[name] for name, cell in self.WORKBOOK_INPUT_CELLS.items()}
+        inputs[self.WORKBOOK_INPUT_CELLS['commission_rate']] = (
+            np.asarray(columns['commission_rate'], dtype=np.float64) / 100.0
+        )
+        outputs = self._get_formula_model().evaluate_batch(
+            inputs, self.WORKBOOK_OUTPUT_CELLS.values(), default_sheet=self.WORKSHEET_NAME
+        )
+        return (np.asarray(outputs[self.WORKBOOK_OUTPUT_CELLS['profit_amount']], dtype=np.float64),
+                np.asarray(outputs[self.WORKBOOK_OUTPUT_CELLS['profit_rate']], dtype=np.float64))
+
     def _validate_input(self, input_data: ProfitCalculatorInput):
         """
         验证输入参数
@@ -363,8 +430,15 @@ class ExcelProfitCalculator:
             # 验证输入参数
             self._validate_input(input_data)
             
-            # 直接计算（不修改Excel文件）
-            profit_amount, profit_rate = self._calculate_profit_directly(input_data)
+            if self.use_workbook_formulas:
+                # 按工作簿公式计算（内存中的公式模型）
+                amounts, rates = self._evaluate_workbook_formulas(asdict(input_data))
+                profit_amount, profit_rate = float(amounts[0]), float(rates[0])
+                if np.isnan(profit_amount) or np.isnan(profit_rate):
+                    raise ExcelCalculatorError("工作簿公式计算结果为错误值")
+            else:
+                # 直接计算（不修改Excel文件）
+                profit_amount, profit_rate = self._calculate_profit_directly(input_data)
             
             # 判断是否亏损
             is_loss = profit_amount < 0
@@ -383,6 +457,7 @@ class ExcelProfitCalculator:
                     'timestamp': time.time(),
                     'file_path': str(self.excel_file_path),
                     'worksheet': self.WORKSHEET_NAME,
+                    'calculation_source': 'workbook_formulas' if self.use_workbook_formulas else 'builtin',
                     'status': 'loss' if is_loss else 'profit'
                 }
             )
@@ -407,6 +482,45 @@ class ExcelProfitCalculator:
                 raise
             raise ExcelCalculatorError(f"利润计算失败: {e}")
 
+    def calculate_profit_batch(self,
+                               black_price: ArrayLike,
+                               green_price: ArrayLike,
+                               list_price: ArrayLike,
+                               purchase_price: ArrayLike,
+                               commission_rate: ArrayLike,
+                               weight: ArrayLike,
+                               length: ArrayLike,
+                               width: ArrayLike,
+                               height: ArrayLike) -> BatchProfitResult:
+        """
+        批量计算利润（向量化计算，每个参数为一列，标量参数广播到所有行）
+
+        校验规则和利润公式与 calculate_profit 相同，结果逐位一致；
+        不合法的行不抛出异常，通过结果中的校验掩码返回。
+
+        Returns:
+            BatchProfitResult: 利润金额、利润率（百分比）、亏损标记和校验掩码
+        """
+        start_time = time.time()
+        result = evaluate_profit_batch(
+            black_price, green_price, list_price, purchase_price, commission_rate,
+            weight, length, width, height
+        )
+        if self.use_workbook_formulas and result.valid_count:
+            # 合法行按工作簿公式整批求值
+            amounts, rates = self._evaluate_workbook_formulas(
+                {name: values[result.valid] for name, values in result.columns.items()}
+            )
+            result.profit_amount[result.valid] = amounts
+            result.profit_rate[result.valid] = rates * 100
+            result.is_loss = result.valid & (result.profit_amount < 0)
+        self.logger.info(
+            f"批量利润计算完成: {len(result)} 行, 合法 {result.valid_count} 行, "
+            f"亏损 {int(result.is_loss.sum())} 行, 耗时={time.time() - start_time:.3f}秒"
+        )
+        self._last_access_time = time.time()
+        return result
+
     def format_result_summary(self, result: ProfitCalculatorResult) -> str:
         """
         格式化计算结果摘要（简洁版本）
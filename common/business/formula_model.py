@@ -0,0 +1,630 @@
+"""
+Excel公式模型
+
+一次性读取工作簿中的常量和公式，把公式编译为基于 NumPy 的求值函数，之后在内存中求值：
+- 支持跨工作表引用、区域引用、算术/比较/连接运算和常用函数（IF、AND、OR、SUM、MAX 等）
+- 所有单元格值以数组表示，同一次求值可以计算一行或整批输入
+- 编译结果按文件路径缓存，文件修改时间变化时自动重新编译（工作表可以持续编辑）
+
+错误值（#DIV/0!、#VALUE! 等）统一表示为 NaN，空单元格表示为 None。
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from openpyxl import load_workbook
+
+CellKey = Tuple[str, str]  # (工作表名, 单元格坐标)
+
+
+class FormulaModelError(Exception):
+    """公式模型异常"""
+    pass
+
+
+# ==================== 词法分析 ====================
+
+_TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<string>"(?:[^"]|"")*")
+  | (?P<func>[A-Za-z_][\w.]*(?=\())
+  | (?P<ref>(?:(?:'(?:[^']|'')+'|[^\W\d][\w.]*)!)?\$?[A-Za-z]{1,3}\$?\d+(?::\$?[A-Za-z]{1,3}\$?\d+)?)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<bool>TRUE|FALSE)
+  | (?P<op><>|<=|>=|[-+*/^&%=<>(),])
+""", re.VERBOSE)
+
+_CELL_PATTERN = re.compile(r"\$?([A-Za-z]{1,3})\$?(\d+)")
+
+
+def _tokenize(formula: str) -> List[Tuple[str, str]]:
+    """把公式拆分为 (类型, 文本) 列表"""
+    tokens = []
+    position = 0
+    while position < len(formula):
+        match = _TOKEN_PATTERN.match(formula, position)
+        if not match:
+            raise FormulaModelError(f"无法解析公式片段: {formula[position:position + 20]}")
+        kind = match.lastgroup
+        if kind != 'space':
+            tokens.append((kind, match.group()))
+        position = match.end()
+    return tokens
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index
+
+
+def _column_letters(index: int) -> str:
+    letters = ''
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def parse_address(address: str, default_sheet: Optional[str] = None) -> CellKey:
+    """
+    解析单元格地址（"利润计算表!A3"、"'Sheet 1'!$B$2" 或 "A3"）
+
+    Raises:
+        FormulaModelError: 地址无效或缺少工作表名
+    """
+    sheet, _, cell = address.rpartition('!')
+    sheet = sheet.strip("'").replace("''", "'") if sheet else default_sheet
+    match = _CELL_PATTERN.fullmatch(cell)
+    if not match or not sheet:
+        raise FormulaModelError(f"无效的单元格地址: {address}")
+    return sheet, f"{match.group(1).upper()}{match.group(2)}"
+
+
+def _expand_range(start: CellKey, end: CellKey) -> List[CellKey]:
+    """展开区域引用为单元格列表（按行优先）"""
+    sheet = start[0]
+    start_match, end_match = _CELL_PATTERN.fullmatch(start[1]), _CELL_PATTERN.fullmatch(end[1])
+    col1, col2 = sorted((_column_index(start_match.group(1)), _column_index(end_match.group(1))))
+    row1, row2 = sorted((int(start_match.group(2)), int(end_match.group(2))))
+    return [(sheet, f"{_column_letters(col)}{row}") for row in range(row1, row2 + 1) for col in range(col1, col2 + 1)]
+
+
+# ==================== 语法分析 ====================
+
+class _Parser:
+    """递归下降解析器，生成元组形式的语法树"""
+
+    COMPARISON_OPS = ('=', '<>', '<', '>', '<=', '>=')
+
+    def __init__(self, formula: str, sheet: str):
+        self.tokens = _tokenize(formula)
+        self.position = 0
+        self.sheet = sheet
+
+    def parse(self):
+        node = self._comparison()
+        if self.position != len(self.tokens):
+            raise FormulaModelError(f"公式存在多余内容: {self.tokens[self.position][1]}")
+        return node
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _take_op(self, *ops) -> Optional[str]:
+        kind, text = self._peek()
+        if kind == 'op' and text in ops:
+            self.position += 1
+            return text
+        return None
+
+    def _expect(self, op: str) -> None:
+        if not self._take_op(op):
+            raise FormulaModelError(f"公式缺少 '{op}'")
+
+    def _binary(self, operand, ops):
+        node = operand()
+        while True:
+            op = self._take_op(*ops)
+            if not op:
+                return node
+            node = ('binop', op, node, operand())
+
+    def _comparison(self):
+        return self._binary(self._concat, self.COMPARISON_OPS)
+
+    def _concat(self):
+        return self._binary(self._additive, ('&',))
+
+    def _additive(self):
+        return self._binary(self._term, ('+', '-'))
+
+    def _term(self):
+        return self._binary(self._power, ('*', '/'))
+
+    def _power(self):
+        return self._binary(self._percent, ('^',))
+
+    def _percent(self):
+        node = self._unary()
+        while self._take_op('%'):
+            node = ('percent', node)
+        return node
+
+    def _unary(self):
+        op = self._take_op('+', '-')
+        if op == '-':
+            return ('negate', self._unary())
+        if op == '+':
+            return self._unary()
+        return self._primary()
+
+    def _primary(self):
+        kind, text = self._peek()
+        if kind is None:
+            raise FormulaModelError("公式意外结束")
+        self.position += 1
+        if kind == 'number':
+            return ('const', float(text))
+        if kind == 'string':
+            return ('const', text[1:-1].replace('""', '"'))
+        if kind == 'bool':
+            return ('const', text == 'TRUE')
+        if kind == 'ref':
+            start, _, end = text.partition(':')
+            start_key = parse_address(start, self.sheet)
+            if not end:
+                return ('ref', start_key)
+            return ('range', _expand_range(start_key, parse_address(end, start_key[0])))
+        if kind == 'func':
+            name = text.upper()
+            if name.startswith('_XLFN.'):
+                name = name[len('_XLFN.'):]
+            self._expect('(')
+            args = []
+            if not self._take_op(')'):
+                args.append(self._comparison())
+                while self._take_op(','):
+                    args.append(self._comparison())
+                self._expect(')')
+            return ('func', name, args)
+        if kind == 'op' and text == '(':
+            node = self._comparison()
+            self._expect(')')
+            return node
+        raise FormulaModelError(f"无法解析的公式内容: {text}")
+
+
+# ==================== 值与运算 ====================
+
+def _is_numeric(values: np.ndarray) -> bool:
+    return values.dtype.kind in 'biuf'
+
+
+def _full(size: int, value: Any) -> np.ndarray:
+    """把常量扩展为数组"""
+    if isinstance(value, bool):
+        return np.full(size, value, dtype=bool)
+    if isinstance(value, (int, float)):
+        return np.full(size, float(value), dtype=np.float64)
+    array = np.empty(size, dtype=object)
+    array.fill(value)
+    return array
+
+
+def _elementwise(func: Callable, *arrays: np.ndarray, numeric_result: bool = False) -> np.ndarray:
+    """对对象数组逐元素求值"""
+    result = np.frompyfunc(func, len(arrays), 1)(*arrays)
+    result = np.asarray(result, dtype=object).reshape(np.shape(arrays[0]))
+    return result.astype(np.float64) if numeric_result else result
+
+
+def _scalar_number(value: Any) -> float:
+    """单个值转为数字：空值为 0，非数字文本为错误（NaN）"""
+    if value is None:
+        return 0.0
+    if isinstance(value, (bool, int, float, np.number)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _as_number(values: np.ndarray) -> np.ndarray:
+    if _is_numeric(values):
+        return values.astype(np.float64, copy=False)
+    return _elementwise(_scalar_number, values, numeric_result=True)
+
+
+def _scalar_bool(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.upper() == 'TRUE'
+    number = _scalar_number(value)
+    return not math.isnan(number) and number != 0
+
+
+def _as_bool(values: np.ndarray) -> np.ndarray:
+    if _is_numeric(values):
+        numbers = values.astype(np.float64, copy=False)
+        return (numbers != 0) & ~np.isnan(numbers)
+    return _elementwise(_scalar_bool, values).astype(bool)
+
+
+def _scalar_text(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, (bool, np.bool_)):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float, np.number)):
+        return f"{float(value):.15g}"
+    return str(value)
+
+
+def _is_error(value: Any) -> bool:
+    return isinstance(value, (float, np.floating)) and math.isnan(value)
+
+
+def _type_rank(value: Any) -> int:
+    """Excel 比较顺序：数字 < 文本 < 逻辑值"""
+    if isinstance(value, (bool, np.bool_)):
+        return 2
+    if isinstance(value, str):
+        return 1
+    return 0
+
+
+def _scalar_compare(op: str, left: Any, right: Any) -> bool:
+    if _is_error(left) or _is_error(right):
+        return False
+    if left is None:
+        left = '' if isinstance(right, str) else 0.0
+    if right is None:
+        right = '' if isinstance(left, str) else 0.0
+    left_key, right_key = (_type_rank(left), left), (_type_rank(right), right)
+    if left_key[0] == right_key[0] == 1:
+        left_key, right_key = (1, left.lower()), (1, right.lower())
+    elif left_key[0] != right_key[0]:
+        left_key, right_key = (left_key[0], 0), (right_key[0], 0)
+    return _COMPARATORS[op](left_key, right_key)
+
+
+_COMPARATORS = {
+    '=': lambda a, b: a == b,
+    '<>': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+}
+
+_ARITHMETIC = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide,
+    '^': np.power,
+}
+
+
+def _binary_op(op: str, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    if op in _ARITHMETIC:
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            result = _ARITHMETIC[op](_as_number(left), _as_number(right))
+        if op == '/':
+            result = np.where(_as_number(right) == 0, np.nan, result)
+        return result
+    if op == '&':
+        return _elementwise(lambda a, b: _scalar_text(a) + _scalar_text(b), left, right)
+    if _is_numeric(left) and _is_numeric(right) and left.dtype.kind != 'b' and right.dtype.kind != 'b':
+        with np.errstate(invalid='ignore'):
+            return _COMPARATORS[op](left, right) & ~np.isnan(left) & ~np.isnan(right)
+    return _elementwise(lambda a, b: _scalar_compare(op, a, b), left, right).astype(bool)
+
+
+# ==================== 函数 ====================
+
+def _flatten(args: List[Any]) -> List[np.ndarray]:
+    values = []
+    for arg in args:
+        values.extend(arg if isinstance(arg, list) else [arg])
+    return values
+
+
+def _numbers_only(values: np.ndarray) -> np.ndarray:
+    """区域/参数中的数字，文本和空值视为 NaN（由调用方忽略）"""
+    if _is_numeric(values):
+        return values.astype(np.float64, copy=False)
+    return _elementwise(
+        lambda v: float(v) if isinstance(v, (int, float, np.number)) and not isinstance(v, bool) else math.nan,
+        values, numeric_result=True
+    )
+
+
+def _func_if(size, condition, when_true=None, when_false=None):
+    mask = _as_bool(condition)
+    when_true = _full(size, True) if when_true is None else when_true
+    when_false = _full(size, False) if when_false is None else when_false
+    if _is_numeric(when_true) and _is_numeric(when_false):
+        return np.where(mask, when_true, when_false)
+    return np.where(mask, when_true.astype(object), when_false.astype(object))
+
+
+def _func_sum(size, *args):
+    total = np.zeros(size)
+    for values in _flatten(list(args)):
+        if _is_numeric(values):
+            total = total + values
+        else:
+            total = total + _elementwise(
+                lambda v: float(v) if isinstance(v, (int, float, np.number)) and not isinstance(v, bool) else 0.0,
+                values, numeric_result=True
+            )
+    return total
+
+
+def _extreme(reducer, size, *args):
+    stacked = np.vstack([_numbers_only(values) for values in _flatten(list(args))] or [np.full(size, np.nan)])
+    empty = np.all(np.isnan(stacked), axis=0)
+    with np.errstate(invalid='ignore'):
+        filled = np.where(np.isnan(stacked), -np.inf if reducer is np.max else np.inf, stacked)
+        result = reducer(filled, axis=0)
+    return np.where(empty, 0.0, result)
+
+
+def _func_and(size, *args):
+    return np.logical_and.reduce([_as_bool(values) for values in _flatten(list(args))])
+
+
+def _func_or(size, *args):
+    return np.logical_or.reduce([_as_bool(values) for values in _flatten(list(args))])
+
+
+def _func_round(size, values, digits=None):
+    factor = 10.0 ** (_as_number(digits) if digits is not None else 0.0)
+    numbers = _as_number(values)
+    return np.sign(numbers) * np.floor(np.abs(numbers) * factor + 0.5) / factor
+
+
+def _func_isblank(size, values):
+    if _is_numeric(values):
+        return np.zeros(size, dtype=bool)
+    return _elementwise(lambda v: v is None, values).astype(bool)
+
+
+def _func_iserror(size, values):
+    if _is_numeric(values):
+        return np.isnan(values.astype(np.float64, copy=False))
+    return _elementwise(_is_error, values).astype(bool)
+
+
+_FUNCTIONS: Dict[str, Callable] = {
+    'IF': _func_if,
+    'SUM': _func_sum,
+    'MAX': lambda size, *args: _extreme(np.max, size, *args),
+    'MIN': lambda size, *args: _extreme(np.min, size, *args),
+    'AND': _func_and,
+    'OR': _func_or,
+    'NOT': lambda size, values: ~_as_bool(values),
+    'ABS': lambda size, values: np.abs(_as_number(values)),
+    'ROUND': _func_round,
+    'ISBLANK': _func_isblank,
+    'ISERROR': _func_iserror,
+}
+
+
+# ==================== 编译与求值 ====================
+
+def _compile(node) -> Callable[['_Evaluation'], Any]:
+    """把语法树编译为求值函数"""
+    kind = node[0]
+    if kind == 'const':
+        value = node[1]
+        return lambda ev: _full(ev.size, value)
+    if kind == 'ref':
+        key = node[1]
+        return lambda ev: ev.get(key)
+    if kind == 'range':
+        keys = node[1]
+        return lambda ev: [ev.get(key) for key in keys]
+    if kind == 'negate':
+        operand = _compile(node[1])
+        return lambda ev: -_as_number(operand(ev))
+    if kind == 'percent':
+        operand = _compile(node[1])
+        return lambda ev: _as_number(operand(ev)) / 100
+    if kind == 'binop':
+        op, left, right = node[1], _compile(node[2]), _compile(node[3])
+        return lambda ev: _binary_op(op, left(ev), right(ev))
+    if kind == 'func':
+        name, args = node[1], [_compile(arg) for arg in node[2]]
+        if name not in _FUNCTIONS:
+            raise FormulaModelError(f"不支持的函数: {name}")
+        func = _FUNCTIONS[name]
+        return lambda ev: func(ev.size, *[arg(ev) for arg in args])
+    raise FormulaModelError(f"未知的语法节点: {kind}")
+
+
+class _Evaluation:
+    """一次求值（记忆化已计算的单元格）"""
+
+    def __init__(self, model: 'FormulaModel', size: int, overrides: Dict[CellKey, np.ndarray]):
+        self.model = model
+        self.size = size
+        self.values: Dict[CellKey, np.ndarray] = dict(overrides)
+        self.pending = set()
+
+    def get(self, key: CellKey) -> np.ndarray:
+        if key in self.values:
+            return self.values[key]
+        compiled = self.model.compiled.get(key)
+        if compiled is None:
+            value = _full(self.size, self.model.constants.get(key))
+        else:
+            if key in self.pending:
+                raise FormulaModelError(f"公式存在循环引用: {key[0]}!{key[1]}")
+            self.pending.add(key)
+            try:
+                value = compiled(self)
+            finally:
+                self.pending.discard(key)
+            if isinstance(value, list):
+                raise FormulaModelError(f"单元格公式不能直接返回区域: {key[0]}!{key[1]}")
+        self.values[key] = value
+        return value
+
+
+def _to_python(value: Any) -> Any:
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+class FormulaModel:
+    """
+    编译后的工作簿公式模型
+
+    示例：
+        model = load_formula_model("uploads/利润表V4版本.xlsx")
+        outputs = model.evaluate({'利润计算表!A11': 180}, ['利润计算表!G11'])
+        batch = model.evaluate_batch({'利润计算表!A11': prices}, ['利润计算表!G11'])
+    """
+
+    def __init__(self, file_path: Union[str, Path], constants: Dict[CellKey, Any],
+                 formulas: Dict[CellKey, str], mtime_ns: int = 0):
+        self.file_path = Path(file_path)
+        self.constants = constants
+        self.formulas = formulas
+        self.mtime_ns = mtime_ns
+        self.sheet_names = sorted({key[0] for key in list(constants) + list(formulas)})
+        self.compiled: Dict[CellKey, Callable] = {}
+        self.unsupported: Dict[CellKey, str] = {}
+        for key, formula in formulas.items():
+            try:
+                self.compiled[key] = _compile(_Parser(formula, key[0]).parse())
+            except FormulaModelError as e:
+                self.unsupported[key] = str(e)
+                self.compiled[key] = self._unsupported_cell(key, str(e))
+
+    @staticmethod
+    def _unsupported_cell(key: CellKey, reason: str) -> Callable:
+        def evaluate(ev):
+            raise FormulaModelError(f"单元格 {key[0]}!{key[1]} 的公式无法编译: {reason}")
+        return evaluate
+
+    @classmethod
+    def from_workbook(cls, file_path: Union[str, Path]) -> 'FormulaModel':
+        """读取工作簿中的常量和公式并编译"""
+        path = Path(file_path)
+        workbook = load_workbook(path, data_only=False)
+        constants, formulas = {}, {}
+        try:
+            for worksheet in workbook.worksheets:
+                for row in worksheet.iter_rows():
+                    for cell in row:
+                        value = cell.value
+                        if value is None:
+                            continue
+                        key = (worksheet.title, cell.coordinate)
+                        if isinstance(value, str) and value.startswith('=') and len(value) > 1:
+                            formulas[key] = value[1:]
+                        elif isinstance(value, (bool, int, float, str)):
+                            constants[key] = value
+        finally:
+            workbook.close()
+        return cls(path, constants, formulas, path.stat().st_mtime_ns)
+
+    def has_cell(self, address: str, default_sheet: Optional[str] = None) -> bool:
+        """单元格是否有值或公式"""
+        key = parse_address(address, default_sheet)
+        return key in self.constants or key in self.formulas
+
+    def is_formula(self, address: str, default_sheet: Optional[str] = None) -> bool:
+        """单元格是否为公式"""
+        return parse_address(address, default_sheet) in self.formulas
+
+    def evaluate_batch(self, inputs: Dict[str, Any], outputs: Iterable[str],
+                       default_sheet: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        批量求值：输入单元格为数组（或标量，广播到所有行），返回各输出单元格的数组
+
+        Args:
+            inputs: {单元格地址: 值列表}，覆盖工作簿中的值
+            outputs: 输出单元格地址
+            default_sheet: 地址中未指定工作表时使用的工作表
+
+        Returns:
+            Dict[str, np.ndarray]: {输出地址: 结果数组}，错误值为 NaN
+        """
+        columns = {parse_address(address, default_sheet): np.atleast_1d(np.asarray(values, dtype=object))
+                   for address, values in inputs.items()}
+        size = max((len(values) for values in columns.values()), default=1)
+        overrides = {}
+        for key, values in columns.items():
+            values = np.broadcast_to(values, (size,))
+            numeric = all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in values)
+            overrides[key] = values.astype(np.float64) if numeric else values.astype(object)
+
+        evaluation = _Evaluation(self, size, overrides)
+        return {address: evaluation.get(parse_address(address, default_sheet)) for address in outputs}
+
+    def evaluate(self, inputs: Dict[str, Any], outputs: Iterable[str],
+                 default_sheet: Optional[str] = None) -> Dict[str, Any]:
+        """单行求值，返回 Python 标量"""
+        results = self.evaluate_batch({address: [value] for address, value in inputs.items()}, outputs, default_sheet)
+        return {address: _to_python(values[0]) for address, values in results.items()}
+
+
+# ==================== 模型缓存 ====================
+
+_model_cache: Dict[str, FormulaModel] = {}
+_model_cache_lock = threading.Lock()
+_logger = logging.getLogger(__name__)
+
+
+def load_formula_model(file_path: Union[str, Path]) -> FormulaModel:
+    """
+    获取工作簿的公式模型（按文件修改时间缓存，文件被编辑后重新编译）
+
+    Raises:
+        FormulaModelError: 文件不存在或无法读取
+    """
+    path = Path(file_path).resolve()
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError as e:
+        raise FormulaModelError(f"无法读取工作簿: {e}")
+
+    cache_key = str(path)
+    with _model_cache_lock:
+        model = _model_cache.get(cache_key)
+        if model is not None and model.mtime_ns == mtime_ns:
+            return model
+        try:
+            model = FormulaModel.from_workbook(path)
+        except FormulaModelError:
+            raise
+        except Exception as e:
+            raise FormulaModelError(f"编译工作簿公式失败: {e}")
+        _model_cache[cache_key] = model
+
+    _logger.info(f"📐 已编译工作簿公式: {path.name}（{len(model.formulas)} 个公式，"
+                 f"{len(model.unsupported)} 个不支持）")
+    return model
+
+
+def clear_formula_model_cache() -> None:
+    """清空公式模型缓存"""
+    with _model_cache_lock:
+        _model_cache.clear()
@@ -5,9 +5,10 @@
 """
 
 import logging
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 
 from ..models import PriceCalculationResult
+from .batch_profit_engine import calculate_pricing_batch
 from ..config import GoodStoreSelectorConfig, get_config
 
 
@@ -187,6 +188,53 @@ class PricingCalculator:
                 calculation_details={'error': str(e)}
             )
     
+    def calculate_complete_pricing_batch(self, green_prices_rub: List[Optional[float]],
+                                         black_prices_rub: List[Optional[float]]) -> List[PriceCalculationResult]:
+        """
+        批量定价计算（向量化计算，结果与逐个调用 calculate_complete_pricing 相同）
+
+        Args:
+            green_prices_rub: 绿标价格列表（卢布）
+            black_prices_rub: 黑标价格列表（卢布）
+
+        Returns:
+            List[PriceCalculationResult]: 与输入顺序对应的价格计算结果
+        """
+        try:
+            batch = calculate_pricing_batch(green_prices_rub, black_prices_rub, self.config.price_calculation)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"批量定价计算失败，改为逐个计算: {e}")
+            return [self.calculate_complete_pricing(green, black)
+                    for green, black in zip(green_prices_rub, black_prices_rub)]
+
+        price_config = self.config.price_calculation
+        results = []
+        for i, (green_rub, black_rub) in enumerate(zip(green_prices_rub, black_prices_rub)):
+            real_selling_price = float(batch.real_selling_price[i])
+            profit_rate = float(batch.profit_rate[i])
+            results.append(PriceCalculationResult(
+                real_selling_price=real_selling_price,
+                product_pricing=float(batch.product_pricing[i]),
+                profit_amount=float(batch.profit_amount[i]),
+                profit_rate=profit_rate,
+                is_profitable=profit_rate >= self.config.selector_filter.profit_rate_threshold,
+                calculation_details={
+                    'input_green_price_rub': green_rub,
+                    'input_black_price_rub': black_rub,
+                    'exchange_rate': price_config.rub_to_cny_rate,
+                    'discount_rate': price_config.pricing_discount_rate,
+                    'green_price_cny': float(batch.green_price_cny[i]) if green_rub else None,
+                    'black_price_cny': float(batch.black_price_cny[i]) if black_rub else None,
+                    'real_selling_price': real_selling_price,
+                    'product_pricing': float(batch.product_pricing[i]),
+                    'profit_amount': float(batch.profit_amount[i]),
+                    'profit_rate': profit_rate
+                }
+            ))
+
+        self.logger.info(f"批量定价计算完成: {len(results)} 个商品")
+        return results
+
     def validate_prices(self, green_price: Optional[float], 
                        black_price: Optional[float]) -> bool:
         """
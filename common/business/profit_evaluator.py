@@ -282,18 +282,31 @@ class ProfitEvaluator:
         Returns:
             list[Dict[str, Any]]: 评估结果列表
         """
-        results: list[Dict[str, Any]] = []
+        results: list[Optional[Dict[str, Any]]] = [None] * len(products)
         source_prices_dict: Dict[str, float] = source_prices or {}
 
-        for product in products:
+        # 上架时间不符合要求的商品直接拒绝，其余商品一次性向量化定价
+        eligible = []
+        for index, product in enumerate(products):
+            if self._validate_shelf_time(product):
+                eligible.append(index)
+            else:
+                results[index] = self._create_shelf_time_rejected_result(product)
+
+        pricing_results = self.pricing_calculator.calculate_complete_pricing_batch(
+            [products[index].green_price for index in eligible],
+            [products[index].black_price for index in eligible]
+        )
+
+        for index, pricing_result in zip(eligible, pricing_results):
+            product = products[index]
             try:
                 source_price = source_prices_dict.get(product.product_id)
-                result = self.evaluate_product_profit(product, source_price)
-                results.append(result)
+                results[index] = self._create_evaluation_result(product, pricing_result, None, source_price)
 
             except Exception as e:
                 self.logger.error(f"批量评估商品{product.product_id}失败: {e}")
-                results.append(self._create_error_result(str(e)))
+                results[index] = self._create_error_result(str(e))
 
         self.logger.info(f"批量评估完成，共{len(products)}个商品")
         return results
@@ -106,13 +106,20 @@ class StoreEvaluator:
         """
         from ..models import ProductInfo
         
+        # 定价计算结果可能是 PriceCalculationResult 对象、字典或 None（上架时间不符合要求）
+        pricing_calculation = evaluation.get('pricing_calculation')
+        if isinstance(pricing_calculation, dict):
+            calculation_details = pricing_calculation.get('calculation_details') or {}
+        else:
+            calculation_details = getattr(pricing_calculation, 'calculation_details', None) or {}
+
         # 这里需要从evaluation中重建ProductInfo
         # 实际实现中可能需要传递原始的ProductInfo对象
         return ProductInfo(
             product_id=evaluation.get('product_id', 'unknown'),
             product_url=evaluation.get('product_url'),  # 修复：添加product_url字段
-            green_price=evaluation.get('pricing_calculation', {}).get('calculation_details', {}).get('green_price_cny'),
-            black_price=evaluation.get('pricing_calculation', {}).get('calculation_details', {}).get('black_price_cny'),
+            green_price=calculation_details.get('green_price_cny'),
+            black_price=calculation_details.get('black_price_cny'),
             commission_rate=evaluation.get('commission_rate'),
             weight=evaluation.get('weight'),
             source_price=evaluation.get('source_price'),
@@ -274,3 +281,81 @@ class StoreEvaluator:
             self.logger.error(f"判断是否采集跟卖店铺信息失败: {e}")
             return False
 
+
+class IncrementalStoreEvaluator:
+    """
+    增量店铺评估器
+
+    每处理完一个商品更新店铺判定。好店判定基于有利润商品占已评估商品的比例，
+    剩余商品无论结果如何都无法改变判定时（比例已达标且剩余商品全部无利润也不会跌破阈值，
+    或剩余商品全部有利润也无法达标），判定即已确定，商品循环可以提前结束。
+
+    判定规则与 StoreEvaluator.evaluate_store 一致：商品通过同一转换逻辑计入，
+    抓取失败或无法转换的商品不计入分母。
+    """
+
+    def __init__(self, total_products: int, config: Optional[GoodStoreSelectorConfig] = None,
+                 store_evaluator: Optional[StoreEvaluator] = None):
+        """
+        初始化增量评估器
+
+        Args:
+            total_products: 店铺待处理的商品总数
+            config: 配置对象
+            store_evaluator: 用于转换商品评估结果的店铺评估器
+        """
+        self.config = config or get_config()
+        self.store_evaluator = store_evaluator or StoreEvaluator(self.config)
+        self.good_store_threshold = self.config.selector_filter.good_store_ratio_threshold
+        self.total_products = total_products
+        self.processed = 0
+        self.evaluated = 0
+        self.profitable = 0
+
+    @property
+    def remaining(self) -> int:
+        """尚未处理的商品数"""
+        return max(self.total_products - self.processed, 0)
+
+    def add(self, evaluation: Optional[Dict[str, Any]]) -> Optional[GoodStoreFlag]:
+        """
+        记录一个商品的处理结果
+
+        Args:
+            evaluation: 商品评估结果，抓取或评估失败时为 None
+
+        Returns:
+            Optional[GoodStoreFlag]: 已确定的判定，尚未确定时返回 None
+        """
+        self.processed += 1
+        if evaluation is not None:
+            for product_result in self.store_evaluator._convert_product_evaluations([evaluation]):
+                self.evaluated += 1
+                price_calculation = product_result.price_calculation
+                if price_calculation and price_calculation.is_profitable:
+                    self.profitable += 1
+        return self.decided
+
+    @property
+    def decided(self) -> Optional[GoodStoreFlag]:
+        """已确定的判定（剩余商品无法改变结果时），尚未确定时返回 None"""
+        remaining = self.remaining
+        # 剩余商品全部评估成功且无利润时比例最低，仍达标则必为好店
+        if self.evaluated > 0 and self.profitable * 100 >= self.good_store_threshold * (self.evaluated + remaining):
+            return GoodStoreFlag.YES
+        if remaining == 0:
+            return GoodStoreFlag.NO
+        # 剩余商品全部评估成功且有利润时比例最高，仍不达标则必不是好店
+        if (self.profitable + remaining) * 100 < self.good_store_threshold * (self.evaluated + remaining):
+            return GoodStoreFlag.NO
+        return None
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取评估进度"""
+        return {
+            'total_products': self.total_products,
+            'processed': self.processed,
+            'evaluated': self.evaluated,
+            'profitable': self.profitable,
+            'skipped': self.remaining,
+        }
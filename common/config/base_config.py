@@ -36,6 +36,7 @@ class GoodStoreSelectorConfig:
     # 全局配置
     debug_mode: bool = False
     dryrun: bool = False  # 试运行模式，执行抓取但不写入文件，不调用1688接口
+    resume: bool = False  # 续跑模式，跳过断点日志中已完成的店铺
     selection_mode: str = 'select-shops'  # 选择模式：'select-goods' 或 'select-shops'（默认）
 
     @classmethod
@@ -111,7 +112,7 @@ class GoodStoreSelectorConfig:
                     setattr(config.performance, key, value)
         
         # 更新全局配置
-        for key in ['debug_mode', 'dryrun', 'selection_mode']:
+        for key in ['debug_mode', 'dryrun', 'resume', 'selection_mode']:
             if key in config_dict:
                 setattr(config, key, config_dict[key])
         
@@ -163,12 +164,72 @@ class GoodStoreSelectorConfig:
             config.browser.max_retries = int(os.getenv('MAX_RETRIES'))
         if os.getenv('RETRY_DELAY_MS'):
             config.browser.retry_delay_ms = int(os.getenv('RETRY_DELAY_MS'))
+
+        # 性能配置
+        if os.getenv('PAGE_CACHE_DIR'):
+            config.performance.page_cache_dir = os.getenv('PAGE_CACHE_DIR')
+        if os.getenv('FORCE_REFRESH'):
+            config.performance.force_refresh = os.getenv('FORCE_REFRESH').lower() == 'true'
+        if os.getenv('PAGE_CACHE_ALWAYS'):
+            config.performance.page_cache_always = os.getenv('PAGE_CACHE_ALWAYS').lower() == 'true'
+        if os.getenv('HTML_PARSER'):
+            config.performance.html_parser = os.getenv('HTML_PARSER')
+        if os.getenv('OZON_JS_EXTRACTION'):
+            config.performance.ozon_js_extraction = os.getenv('OZON_JS_EXTRACTION').lower() == 'true'
+        if os.getenv('READINESS_PROBE'):
+            config.performance.readiness_probe = os.getenv('READINESS_PROBE').lower() == 'true'
+        if os.getenv('READINESS_QUIET_MS'):
+            config.performance.readiness_quiet_ms = int(os.getenv('READINESS_QUIET_MS'))
+        if os.getenv('ASYNC_SCRAPING'):
+            config.performance.async_scraping = os.getenv('ASYNC_SCRAPING').lower() == 'true'
+        if os.getenv('QUEUED_LOGGING'):
+            config.performance.queued_logging = os.getenv('QUEUED_LOGGING').lower() == 'true'
+        if os.getenv('LOG_RATE_LIMIT_BURST'):
+            config.performance.log_rate_limit_burst = int(os.getenv('LOG_RATE_LIMIT_BURST'))
+        if os.getenv('IMAGE_HASH_INDEX_PATH'):
+            config.performance.image_hash_index_path = os.getenv('IMAGE_HASH_INDEX_PATH')
+        if os.getenv('SEERFAR_MAX_PAGES'):
+            config.performance.seerfar_max_pages = int(os.getenv('SEERFAR_MAX_PAGES'))
+        if os.getenv('PRODUCT_MEMO'):
+            config.performance.product_memo = os.getenv('PRODUCT_MEMO').lower() == 'true'
+        if os.getenv('PRODUCT_MEMO_PATH'):
+            config.performance.product_memo_path = os.getenv('PRODUCT_MEMO_PATH')
+        if os.getenv('RATE_LIMIT'):
+            config.performance.rate_limit = os.getenv('RATE_LIMIT').lower() == 'true'
+        if os.getenv('RATE_LIMIT_RPS'):
+            config.performance.rate_limit_rps = float(os.getenv('RATE_LIMIT_RPS'))
+        if os.getenv('RATE_LIMIT_MAX_CONCURRENCY'):
+            config.performance.rate_limit_max_concurrency = int(os.getenv('RATE_LIMIT_MAX_CONCURRENCY'))
+        if os.getenv('PAGE_RECYCLE'):
+            config.performance.page_recycle = os.getenv('PAGE_RECYCLE').lower() == 'true'
+        if os.getenv('PAGE_RECYCLE_NAVIGATIONS'):
+            config.performance.page_recycle_navigations = int(os.getenv('PAGE_RECYCLE_NAVIGATIONS'))
+        if os.getenv('PAGE_RECYCLE_JS_HEAP_MB'):
+            config.performance.page_recycle_js_heap_mb = float(os.getenv('PAGE_RECYCLE_JS_HEAP_MB'))
+        if os.getenv('PAGE_RECYCLE_RSS_MB'):
+            config.performance.page_recycle_rss_mb = float(os.getenv('PAGE_RECYCLE_RSS_MB'))
+        if os.getenv('EARLY_STORE_VERDICT'):
+            config.performance.early_store_verdict = os.getenv('EARLY_STORE_VERDICT').lower() == 'true'
+        if os.getenv('TIMEOUT_EXECUTOR_WORKERS'):
+            config.performance.timeout_executor_workers = int(os.getenv('TIMEOUT_EXECUTOR_WORKERS'))
+        if os.getenv('EXCEL_FLUSH_EVERY'):
+            config.performance.excel_flush_every = int(os.getenv('EXCEL_FLUSH_EVERY'))
+        if os.getenv('EXCEL_FLUSH_INTERVAL'):
+            config.performance.excel_flush_interval = float(os.getenv('EXCEL_FLUSH_INTERVAL'))
+        if os.getenv('EXCEL_STREAMING_REWRITE'):
+            config.performance.excel_streaming_rewrite = os.getenv('EXCEL_STREAMING_REWRITE').lower() == 'true'
+        if os.getenv('MAX_CONCURRENT_STORES'):
+            config.performance.max_concurrent_stores = int(os.getenv('MAX_CONCURRENT_STORES'))
+        if os.getenv('MAX_CONCURRENT_PRODUCTS'):
+            config.performance.max_concurrent_products = int(os.getenv('MAX_CONCURRENT_PRODUCTS'))
         
         # Excel配置
         if os.getenv('DEFAULT_EXCEL_PATH'):
             config.excel.default_excel_path = os.getenv('DEFAULT_EXCEL_PATH')
         if os.getenv('PROFIT_CALCULATOR_PATH'):
             config.excel.profit_calculator_path = os.getenv('PROFIT_CALCULATOR_PATH')
+        if os.getenv('USE_WORKBOOK_FORMULAS'):
+            config.excel.use_workbook_formulas = os.getenv('USE_WORKBOOK_FORMULAS').lower() == 'true'
         
         # 日志配置
         if os.getenv('LOG_LEVEL'):
@@ -181,6 +242,8 @@ class GoodStoreSelectorConfig:
             config.debug_mode = os.getenv('DEBUG_MODE').lower() == 'true'
         if os.getenv('DRYRUN'):
             config.dryrun = os.getenv('DRYRUN').lower() == 'true'
+        if os.getenv('RESUME'):
+            config.resume = os.getenv('RESUME').lower() == 'true'
         if os.getenv('SELECTION_MODE'):
             config.selection_mode = os.getenv('SELECTION_MODE')
 
@@ -229,6 +292,7 @@ class GoodStoreSelectorConfig:
             'excel': {
                 'default_excel_path': self.excel.default_excel_path,
                 'profit_calculator_path': self.excel.profit_calculator_path,
+                'use_workbook_formulas': self.excel.use_workbook_formulas,
                 'store_id_column': self.excel.store_id_column,
                 'good_store_column': self.excel.good_store_column,
                 'status_column': self.excel.status_column,
@@ -247,10 +311,45 @@ class GoodStoreSelectorConfig:
                 'max_concurrent_products': self.performance.max_concurrent_products,
                 'enable_cache': self.performance.enable_cache,
                 'cache_ttl': self.performance.cache_ttl,
+                'page_cache_dir': self.performance.page_cache_dir,
+                'page_cache_max_size_mb': self.performance.page_cache_max_size_mb,
+                'page_cache_ttl_by_source': dict(self.performance.page_cache_ttl_by_source),
+                'force_refresh': self.performance.force_refresh,
+                'page_cache_always': self.performance.page_cache_always,
+                'html_parser': self.performance.html_parser,
+                'ozon_js_extraction': self.performance.ozon_js_extraction,
+                'timeout_executor_workers': self.performance.timeout_executor_workers,
+                'readiness_probe': self.performance.readiness_probe,
+                'readiness_quiet_ms': self.performance.readiness_quiet_ms,
+                'async_scraping': self.performance.async_scraping,
+                'queued_logging': self.performance.queued_logging,
+                'log_rate_limit_burst': self.performance.log_rate_limit_burst,
+                'log_rate_limit_interval': self.performance.log_rate_limit_interval,
+                'log_ring_buffer_size': self.performance.log_ring_buffer_size,
+                'log_flush_interval': self.performance.log_flush_interval,
+                'image_hash_index_path': self.performance.image_hash_index_path,
+                'seerfar_max_pages': self.performance.seerfar_max_pages,
+                'product_memo': self.performance.product_memo,
+                'product_memo_path': self.performance.product_memo_path,
+                'product_memo_ttl': self.performance.product_memo_ttl,
+                'rate_limit': self.performance.rate_limit,
+                'rate_limit_rps': self.performance.rate_limit_rps,
+                'rate_limit_burst': self.performance.rate_limit_burst,
+                'rate_limit_max_concurrency': self.performance.rate_limit_max_concurrency,
+                'rate_limit_latency_target': self.performance.rate_limit_latency_target,
+                'page_recycle': self.performance.page_recycle,
+                'page_recycle_navigations': self.performance.page_recycle_navigations,
+                'page_recycle_js_heap_mb': self.performance.page_recycle_js_heap_mb,
+                'page_recycle_rss_mb': self.performance.page_recycle_rss_mb,
+                'early_store_verdict': self.performance.early_store_verdict,
                 'batch_size': self.performance.batch_size,
+                'excel_flush_every': self.performance.excel_flush_every,
+                'excel_flush_interval': self.performance.excel_flush_interval,
+                'excel_streaming_rewrite': self.performance.excel_streaming_rewrite,
             },
             'debug_mode': self.debug_mode,
             'dryrun': self.dryrun,
+            'resume': self.resume,
             'selection_mode': self.selection_mode,
         }
     
@@ -303,7 +402,29 @@ class GoodStoreSelectorConfig:
             
 
             assert self.performance.cache_ttl > 0
+            assert self.performance.page_cache_max_size_mb > 0
+            assert all(ttl > 0 for ttl in self.performance.page_cache_ttl_by_source.values())
             assert self.performance.batch_size > 0
+            assert self.performance.html_parser in ('auto', 'lxml', 'html.parser')
+            assert self.performance.timeout_executor_workers > 0
+            assert self.performance.readiness_quiet_ms > 0
+            assert self.performance.log_rate_limit_burst >= 0
+            assert self.performance.log_rate_limit_interval > 0
+            assert self.performance.log_ring_buffer_size > 0
+            assert self.performance.log_flush_interval > 0
+            assert self.performance.seerfar_max_pages >= 1
+            assert self.performance.product_memo_ttl > 0
+            assert self.performance.rate_limit_rps > 0
+            assert self.performance.rate_limit_burst >= 1
+            assert self.performance.rate_limit_max_concurrency >= 1
+            assert self.performance.rate_limit_latency_target > 0
+            assert self.performance.page_recycle_navigations >= 0
+            assert self.performance.page_recycle_js_heap_mb >= 0
+            assert self.performance.page_recycle_rss_mb >= 0
+            assert self.performance.excel_flush_every > 0
+            assert self.performance.excel_flush_interval > 0
+            assert 0 < self.performance.max_concurrent_stores <= 16
+            assert 0 < self.performance.max_concurrent_products <= 16
             
             return True
         except AssertionError:
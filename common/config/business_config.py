@@ -57,6 +57,7 @@ class ExcelConfig:
     # 默认Excel文件路径
     default_excel_path: str = "uploads/store_list.xlsx"
     profit_calculator_path: str = "uploads/profit_calculator.xlsx"
+    use_workbook_formulas: bool = False  # 按利润表中的公式计算利润（编译为内存公式模型）
     
     # Excel列配置
     store_id_column: str = "A"  # 店铺ID列
@@ -3,6 +3,7 @@ OZON平台选择器配置
 统一管理OzonScraper和CompetitorScraper中的所有选择器配置
 """
 
+import json
 from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Optional
 from .language_config import get_language_config
@@ -419,6 +420,110 @@ class OzonSelectorsConfig(BaseScrapingConfig):
 
         return selectors
 
+    def build_product_bundle_script(self, erp_container_selectors: List[str],
+                                    max_price_elements: int = 50, max_images: int = 40) -> str:
+        """
+        生成商品页一次性提取脚本（选择器以JSON内联到脚本中）
+
+        Args:
+            erp_container_selectors: ERP插件容器选择器
+            max_price_elements: 每种价格最多返回的候选文本数量（与 extract_price_from_soup 一致）
+            max_images: 最多返回的图片地址数量
+
+        Returns:
+            str: 可直接传给 evaluate 的脚本
+        """
+        bundle_config = {
+            'price_selectors': {
+                price_type: self.get_price_selectors_for_type(price_type) for price_type in ('green', 'black')
+            },
+            'max_price_elements': max_price_elements,
+            'image_selectors': list(self.image_selectors),
+            'max_images': max_images,
+            'erp_container_selectors': list(erp_container_selectors),
+            'competitor_area_selectors': list(self.competitor_area_selectors),
+        }
+        return f"({OZON_PRODUCT_BUNDLE_JS})({json.dumps(bundle_config, ensure_ascii=False)})"
+
+
+# ========== 商品页一次性提取脚本 ==========
+# 返回紧凑的JSON对象，由 Python 端沿用现有解析规则处理：
+# - price_texts: 各价格类型的候选文本（按选择器优先级，与 BeautifulSoup get_text(strip=True) 规则一致）
+# - image_srcs: 图片候选地址（按选择器顺序）
+# - erp_html / competitor_html: ERP插件区域和跟卖区域的 outerHTML 片段
+OZON_PRODUCT_BUNDLE_JS = """function (cfg) {
+    function queryAll(selector) {
+        try {
+            return document.querySelectorAll(selector);
+        } catch (e) {
+            // 浏览器不支持的选择器（如 :contains）直接跳过
+            return [];
+        }
+    }
+
+    function strippedText(element) {
+        var walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT, null);
+        var parts = [];
+        var node;
+        while ((node = walker.nextNode())) {
+            var parentName = node.parentNode ? node.parentNode.nodeName : '';
+            if (parentName === 'SCRIPT' || parentName === 'STYLE' || parentName === 'TEMPLATE') {
+                continue;
+            }
+            var text = node.nodeValue.trim();
+            if (text) {
+                parts.push(text);
+            }
+        }
+        return parts.join('');
+    }
+
+    function priceTexts(selectors) {
+        var texts = [];
+        for (var i = 0; i < selectors.length && texts.length < cfg.max_price_elements; i++) {
+            var elements = queryAll(selectors[i]);
+            var limit = Math.min(elements.length, 10, cfg.max_price_elements - texts.length);
+            for (var j = 0; j < limit; j++) {
+                texts.push(strippedText(elements[j]));
+            }
+        }
+        return texts;
+    }
+
+    function firstOuterHtml(selectors) {
+        for (var i = 0; i < selectors.length; i++) {
+            var elements = queryAll(selectors[i]);
+            if (elements.length > 0) {
+                return elements[0].outerHTML;
+            }
+        }
+        return '';
+    }
+
+    var imageSrcs = [];
+    for (var i = 0; i < cfg.image_selectors.length && imageSrcs.length < cfg.max_images; i++) {
+        var images = queryAll(cfg.image_selectors[i]);
+        for (var j = 0; j < images.length && imageSrcs.length < cfg.max_images; j++) {
+            var src = images[j].getAttribute('src');
+            if (src) {
+                imageSrcs.push(src);
+            }
+        }
+    }
+
+    var result = {
+        url: window.location.href,
+        price_texts: {},
+        image_srcs: imageSrcs,
+        erp_html: firstOuterHtml(cfg.erp_container_selectors),
+        competitor_html: firstOuterHtml(cfg.competitor_area_selectors)
+    };
+    for (var priceType in cfg.price_selectors) {
+        result.price_texts[priceType] = priceTexts(cfg.price_selectors[priceType]);
+    }
+    return result;
+}"""
+
 
 # 全局默认配置实例
 DEFAULT_OZON_SELECTORS = OzonSelectorsConfig()
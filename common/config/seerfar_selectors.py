@@ -456,7 +456,9 @@ SEERFAR_SELECTORS = SeerfarSelectors(
         # 备用可点击元素选择器
         'clickable_element_alt': "img, a, span.avatar, .cursor-pointer",
         # 类目信息选择器
-        'category_info': "td:nth-child(3) div:nth-child(3)"
+        'category_info': "td:nth-child(3) div:nth-child(3)",
+        # 商品表格分页容器选择器（bootstrap-table）
+        'pagination': ".fixed-table-pagination"
     },
     
     product_detail={
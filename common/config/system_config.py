@@ -4,8 +4,8 @@
 定义与系统运行相关的技术配置类，包括日志、性能等配置
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 
 
 @dataclass
@@ -24,6 +24,75 @@ class PerformanceConfig:
     # 缓存配置
     enable_cache: bool = True
     cache_ttl: int = 3600  # 缓存过期时间（秒）
+
+    # 页面缓存配置（压缩HTML与提取结果的磁盘缓存）
+    page_cache_dir: str = ""  # 缓存目录，为空时使用 ~/.xuanping/cache
+    page_cache_max_size_mb: int = 512  # 缓存总大小上限（MB），超出后按最近最少使用淘汰
+    page_cache_ttl_by_source: Dict[str, int] = field(default_factory=lambda: {
+        'ozon': 6 * 3600,  # 商品价格与ERP数据变化较快
+        'seerfar': 24 * 3600,  # 店铺30天销售数据按天更新
+    })
+    force_refresh: bool = False  # 忽略已有缓存强制重新抓取（仍会写入新结果）
+    page_cache_always: bool = False  # 正式运行也使用页面缓存（默认只在试运行中启用，避免用过期价格判定店铺）
+
+    # HTML解析后端：auto（有lxml时使用lxml）、lxml、html.parser
+    html_parser: str = "auto"
+
+    # OZON商品页使用页面内JS脚本一次性提取价格、图片和ERP区域（失败时回退到整页HTML解析）
+    ozon_js_extraction: bool = True
+
+    # 带超时浏览器操作的共享线程池大小（超时的操作会被取消，不会继续占用页面）
+    timeout_executor_workers: int = 16
+
+    # 页面就绪探测：MutationObserver + 网络安静判断替代固定等待（固定等待时间仅作为上限）
+    readiness_probe: bool = True
+    readiness_quiet_ms: int = 300  # 目标内容、DOM和网络保持不变多久视为就绪（毫秒）
+
+    # 异步执行模式：抓取在浏览器驱动事件循环上以协程方式运行，浏览器调用不再逐次跨线程
+    async_scraping: bool = False
+
+    # 非阻塞日志管线：格式化和文件写入移到后台线程按批完成，重复日志按调用位置限流
+    queued_logging: bool = False
+    log_rate_limit_burst: int = 20  # 同一调用位置每个窗口最多输出的条数（0表示不限流）
+    log_rate_limit_interval: float = 10.0  # 限流窗口（秒）
+    log_ring_buffer_size: int = 2000  # 内存中保留的最近日志条数
+    log_flush_interval: float = 0.5  # 后台写入的最长刷新间隔（秒）
+
+    # 商品图片感知哈希索引（SQLite文件路径，为空时不建立索引）：相似商品查找先按哈希距离筛选候选
+    image_hash_index_path: str = ""
+
+    # Seerfar商品列表分页：最多读取的页数（1表示只读取首页），后续页在后台标签页中提前翻页提取
+    seerfar_max_pages: int = 5
+
+    # 跨店铺商品结果备忘：同一商品（按商品ID）在一次运行中只抓取和评估一次
+    product_memo: bool = True
+    product_memo_path: str = ""  # SQLite文件路径，设置后抓取结果跨运行保存（为空时只在内存中保存）
+    product_memo_ttl: int = 6 * 3600  # 持久化结果的有效期（秒）
+
+    # 按域名的自适应导航限流：令牌桶限制导航速率，并发上限按AIMD调整（超时或拦截页时减半，健康时逐步增加）
+    rate_limit: bool = True
+    rate_limit_rps: float = 2.0  # 每个域名的初始导航速率（次/秒）
+    rate_limit_burst: int = 4  # 令牌桶容量
+    rate_limit_max_concurrency: int = 8  # 每个域名的最大并发导航数
+    rate_limit_latency_target: float = 8.0  # 健康导航的最大耗时（秒），超过时不再增加并发
+
+    # 页面回收：导航前检查页面健康，导航次数或内存超过阈值时换新页面（阈值为0表示不按该条件回收）
+    page_recycle: bool = True
+    page_recycle_navigations: int = 200  # 单个页面最多导航次数
+    page_recycle_js_heap_mb: float = 512.0  # 单个页面 JS 堆上限（MB）
+    page_recycle_rss_mb: float = 4096.0  # 浏览器渲染进程 RSS 总和上限（MB，仅 Linux 可用）
+
+    # 店铺判定提前结束：剩余商品无法改变好店判定时不再抓取（审计运行需要完整商品数据时关闭）
+    early_store_verdict: bool = True
     
     # 批处理配置
     batch_size: int = 100  # 批处理大小
+
+    # Excel结果增量写回（满足任一条件即写回）
+    excel_flush_every: int = 20  # 每完成N个店铺写回一次
+    excel_flush_interval: float = 60.0  # 距上次写回超过T秒时写回
+    excel_streaming_rewrite: bool = False  # 流式重写（不常驻工作簿，内存不随表格大小增长，但丢失样式、列宽等格式）
+
+    # 并发配置
+    max_concurrent_stores: int = 1  # 同时处理的店铺数量（每个店铺使用独立的浏览器上下文，1表示顺序处理）
+    max_concurrent_products: int = 1  # 同时抓取商品的标签页数量（1表示顺序抓取）
@@ -6,9 +6,13 @@ Excel数据处理模块
 """
 
 import logging
+import os
+import threading
+import time
 from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from openpyxl import Workbook, load_workbook
+from openpyxl.utils import column_index_from_string
 from openpyxl.worksheet.worksheet import Worksheet
 
 from .models import (
@@ -186,7 +190,7 @@ class ExcelStoreProcessor:
             raise ExcelProcessingError("工作簿未加载")
         
         try:
-            if not self.config.dry_run:
+            if not self.config.dryrun:
                 self.workbook.save(self.excel_file_path)
                 self.logger.info(f"Excel文件已保存: {self.excel_file_path}")
             else:
@@ -275,6 +279,206 @@ class ExcelStoreProcessor:
             return {'error': str(e)}
 
 
+class IncrementalExcelWriter:
+    """
+    增量Excel结果写入器
+
+    店铺结果先缓存在内存中，每完成 flush_every 个店铺或距上次写入超过 flush_interval 秒时写回Excel：
+    - 第一次写回时加载工作簿并常驻内存，之后每次写回只修改结果行的"是否好店"和"状态"两个单元格再保存，
+      样式、列宽、合并单元格等与 save_changes() 一样保留
+    - 先写入临时文件再原子替换原文件，进程被杀也不会损坏表格
+    - 写入失败（如文件被Excel占用）时保留待写结果，下次重试
+
+    内存与耗时：默认模式常驻一份完整工作簿（与 ExcelStoreProcessor 加载的大小相同），不随写回次数增长；
+    每次写回需要保存整个工作簿，耗时与表格大小成正比，大表可调大 excel_flush_every 减少写回次数。
+
+    启用 performance.excel_streaming_rewrite 时改为流式重写：每次以只读方式逐行读取原文件、写入只写模式的
+    临时文件，内存占用不随表格行数增长，但只保留单元格值，不保留单元格样式、列宽等格式。
+    """
+
+    def __init__(self, excel_file_path: str, config: Optional[GoodStoreSelectorConfig] = None,
+                 flush_every: Optional[int] = None, flush_interval: Optional[float] = None):
+        """
+        初始化增量写入器
+
+        Args:
+            excel_file_path: Excel文件路径
+            config: 配置对象
+            flush_every: 每完成多少个店铺写回一次（默认取 performance.excel_flush_every）
+            flush_interval: 最长写回间隔（秒，默认取 performance.excel_flush_interval）
+        """
+        self.config = config or get_config()
+        self.excel_file_path = Path(excel_file_path)
+        self.logger = logging.getLogger(f"{__name__}.IncrementalExcelWriter")
+        self.flush_every = max(1, flush_every or self.config.performance.excel_flush_every)
+        self.flush_interval = flush_interval or self.config.performance.excel_flush_interval
+        self.streaming = self.config.performance.excel_streaming_rewrite
+
+        self._good_store_col = column_index_from_string(self.config.excel.good_store_column)
+        self._status_col = column_index_from_string(self.config.excel.status_column)
+
+        self._pending: Dict[int, Tuple[str, str]] = {}  # row_index -> (好店标记, 状态)
+        self._workbook: Optional[Workbook] = None  # 默认模式下常驻的工作簿（第一次写回时加载）
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._last_flush = time.time()
+        self._stop_event = threading.Event()
+        self._timer_thread: Optional[threading.Thread] = None
+
+        self.flush_count = 0
+        self.rows_written = 0
+
+    def start(self) -> 'IncrementalExcelWriter':
+        """启动定时写回线程"""
+        if self._timer_thread is None:
+            self._stop_event.clear()
+            self._timer_thread = threading.Thread(
+                target=self._flush_periodically, name="ExcelFlushTimer", daemon=True
+            )
+            self._timer_thread.start()
+        return self
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_event.wait(min(self.flush_interval, 5.0)):
+            if self.pending_count and time.time() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    @property
+    def pending_count(self) -> int:
+        """尚未写回的店铺数"""
+        with self._lock:
+            return len(self._pending)
+
+    def add(self, store_data: ExcelStoreData, is_good_store: GoodStoreFlag, status: StoreStatus) -> None:
+        """
+        记录一个店铺结果，达到写回条件时立即写回
+
+        Args:
+            store_data: 店铺数据
+            is_good_store: 是否为好店
+            status: 处理状态
+        """
+        with self._lock:
+            self._pending[store_data.row_index] = (is_good_store.value, status.value)
+            due = (len(self._pending) >= self.flush_every
+                   or time.time() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def add_many(self, updates: List[Tuple[ExcelStoreData, GoodStoreFlag, StoreStatus]]) -> None:
+        """批量记录店铺结果（不触发写回，由 flush()/close() 统一写回）"""
+        with self._lock:
+            for store_data, is_good_store, status in updates:
+                self._pending[store_data.row_index] = (is_good_store.value, status.value)
+
+    def flush(self) -> bool:
+        """
+        将待写结果写回Excel
+
+        Returns:
+            bool: 是否写入成功（没有待写结果时返回 True）
+        """
+        with self._write_lock:
+            with self._lock:
+                updates, self._pending = self._pending, {}
+            if not updates:
+                self._last_flush = time.time()
+                return True
+
+            try:
+                start_time = time.time()
+                self._rewrite(updates)
+            except Exception as e:
+                self.logger.warning(f"⚠️ 写回Excel失败，{len(updates)}个店铺结果将在下次重试: {e}")
+                with self._lock:
+                    # 失败期间新加入的结果更新，保留新值
+                    self._pending = {**updates, **self._pending}
+                return False
+
+            self._last_flush = time.time()
+            self.flush_count += 1
+            self.rows_written += len(updates)
+            self.logger.info(f"💾 已写回{len(updates)}个店铺结果，耗时{time.time() - start_time:.2f}s")
+            return True
+
+    def _rewrite(self, updates: Dict[int, Tuple[str, str]]) -> None:
+        """生成更新后的工作簿，写入临时文件后原子替换原文件"""
+        if not self.excel_file_path.exists():
+            raise ExcelProcessingError(f"Excel文件不存在: {self.excel_file_path}")
+
+        target = self._stream_updates(updates) if self.streaming else self._patch_updates(updates)
+        tmp_path = self.excel_file_path.with_name(f".{self.excel_file_path.name}.{os.getpid()}.tmp")
+        try:
+            target.save(tmp_path)
+            with open(tmp_path, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.excel_file_path)
+        finally:
+            if target is not self._workbook:
+                target.close()
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def _patch_updates(self, updates: Dict[int, Tuple[str, str]]) -> Workbook:
+        """在常驻工作簿中只修改结果单元格（保留格式）"""
+        if self._workbook is None:
+            self._workbook = load_workbook(self.excel_file_path)
+        sheet = self._workbook.active
+        for row_index, (is_good_store, status) in updates.items():
+            sheet.cell(row=row_index, column=self._good_store_col, value=is_good_store)
+            sheet.cell(row=row_index, column=self._status_col, value=status)
+        return self._workbook
+
+    def _stream_updates(self, updates: Dict[int, Tuple[str, str]]) -> Workbook:
+        """流式复制原文件并替换目标行（只保留单元格值）"""
+        source = load_workbook(self.excel_file_path, read_only=True)
+        try:
+            target = Workbook(write_only=True)
+            active_title = source.active.title
+            for sheet in source.worksheets:
+                out_sheet = target.create_sheet(sheet.title)
+                if sheet.title != active_title:
+                    for row in sheet.iter_rows(values_only=True):
+                        out_sheet.append(row)
+                    continue
+
+                row_index = 0
+                for row_index, row in enumerate(sheet.iter_rows(values_only=True), 1):
+                    update = updates.get(row_index)
+                    out_sheet.append(self._apply_update(row, update) if update else row)
+                # 更新行超出原表范围时补齐
+                for extra_index in sorted(i for i in updates if i > row_index):
+                    while row_index < extra_index - 1:
+                        out_sheet.append([])
+                        row_index += 1
+                    out_sheet.append(self._apply_update((), updates[extra_index]))
+                    row_index += 1
+        finally:
+            source.close()
+        return target
+
+    def _apply_update(self, row: tuple, update: Tuple[str, str]) -> list:
+        values = list(row)
+        width = max(self._good_store_col, self._status_col)
+        if len(values) < width:
+            values.extend([None] * (width - len(values)))
+        values[self._good_store_col - 1], values[self._status_col - 1] = update
+        return values
+
+    def close(self) -> bool:
+        """停止定时线程、写回剩余结果并释放常驻工作簿"""
+        self._stop_event.set()
+        if self._timer_thread:
+            self._timer_thread.join(timeout=5)
+            self._timer_thread = None
+        success = self.flush()
+        with self._write_lock:
+            if self._workbook is not None:
+                self._workbook.close()
+                self._workbook = None
+        return success
+
+
 class ExcelProfitProcessor:
     """Excel利润计算处理器，集成现有的ExcelProfitCalculator"""
     
@@ -291,7 +495,10 @@ class ExcelProfitProcessor:
         self.logger = logging.getLogger(f"{__name__}.ExcelProfitProcessor")
         
         # 初始化利润计算器
-        self.calculator = ExcelProfitCalculator(self.profit_calculator_path)
+        self.calculator = ExcelProfitCalculator(
+            self.profit_calculator_path,
+            use_workbook_formulas=getattr(self.config.excel, 'use_workbook_formulas', False)
+        )
     
     def calculate_product_profit(self, black_price: float, green_price: float, 
                                commission_rate: float, weight: float) -> ProfitCalculatorResult:
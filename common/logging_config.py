@@ -9,6 +9,10 @@ import sys
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+from rpa.browser.implementations.logger_system import (
+    QueuedLogPipeline, get_global_log_pipeline, reset_global_log_pipeline
+)
+
 
 class CompatibleXuanpingLogger:
     """兼容的xuanping日志器，提供与原版本相同的接口"""
@@ -57,13 +61,14 @@ class CompatibleXuanpingLogger:
 xuanping_logger = CompatibleXuanpingLogger()
 
 
-def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> None:
+def setup_logging(level: str = "INFO", log_file: Optional[str] = None, queued: bool = False) -> None:
     """
     设置日志配置 - 兼容接口
     
     Args:
         level: 日志级别
         log_file: 可选的日志文件路径
+        queued: 是否经由后台日志管线异步写出（见 configure_queued_logging）
     """
     # 配置基本日志格式
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -86,6 +91,36 @@ def setup_logging(level: str = "INFO", log_file: Optional[str] = None) -> None:
         except Exception as e:
             logging.warning(f"无法创建日志文件处理器: {e}")
 
+    if queued:
+        get_global_log_pipeline().attach(logging.getLogger())
+
+
+def configure_queued_logging(performance_config) -> Optional[QueuedLogPipeline]:
+    """
+    根据性能配置设置非阻塞日志管线
+
+    启用后根日志器和浏览器日志系统的处理器移到后台写入线程，抓取线程只负责入队；
+    同一调用位置的重复日志按窗口限流，最近的日志保留在内存环形缓冲区中。
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        Optional[QueuedLogPipeline]: 启用时返回日志管线，否则返回 None
+    """
+    if not getattr(performance_config, 'queued_logging', False):
+        reset_global_log_pipeline()
+        return None
+
+    pipeline = get_global_log_pipeline(
+        ring_buffer_size=int(getattr(performance_config, 'log_ring_buffer_size', 2000)),
+        rate_limit_burst=int(getattr(performance_config, 'log_rate_limit_burst', 20)),
+        rate_limit_interval=float(getattr(performance_config, 'log_rate_limit_interval', 10.0)),
+        flush_interval=float(getattr(performance_config, 'log_flush_interval', 0.5)),
+    )
+    pipeline.attach(logging.getLogger())
+    return pipeline
+
 
 def get_logger(name: str = "xuanping") -> logging.Logger:
     """
@@ -23,7 +23,8 @@ from .business_models import (
 
 # 抓取模型
 from .scraping_models import (
-    ScrapingResult
+    ScrapingResult,
+    PageSnapshot
 )
 
 # Excel模型
@@ -72,6 +73,7 @@ __all__ = [
     'BatchProcessingResult',
     # 抓取模型
     'ScrapingResult',
+    'PageSnapshot',
     # Excel模型
     'ExcelStoreData',
     # 异常类
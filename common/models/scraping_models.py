@@ -4,7 +4,8 @@
 定义与网页抓取、数据提取相关的数据结构
 """
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 
 
@@ -15,8 +16,43 @@ class ScrapingResult:
     data: Dict[str, Any]
     error_message: Optional[str] = None
     execution_time: Optional[float] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
     def __post_init__(self):
         """数据验证"""
         if self.data is None:
             self.data = {}
+
+
+@dataclass
+class PageSnapshot:
+    """
+    页面快照
+
+    一次导航后抓取的页面HTML，供原商品提取、跟卖提取和ERP提取共同使用，
+    避免对同一页面重复导航和重复解析。
+    """
+    url: str
+    html: str
+    captured_at: float = field(default_factory=time.time)
+    extractions: Dict[str, Any] = field(default_factory=dict)  # 已完成的提取结果缓存
+    _soup: Optional[Any] = field(default=None, repr=False, compare=False)
+
+    @property
+    def soup(self):
+        """延迟解析的 BeautifulSoup 对象（只解析一次）"""
+        if self._soup is None:
+            from common.utils.html_parser import parse_html
+            self._soup = parse_html(self.html)
+        return self._soup
+
+    def matches(self, url: Optional[str]) -> bool:
+        """判断快照是否对应指定URL（忽略查询参数和末尾斜杠）"""
+        if not url or not self.url:
+            return False
+        return normalize_page_url(self.url) == normalize_page_url(url)
+
+
+def normalize_page_url(url: str) -> str:
+    """标准化页面URL，用于判断是否为同一页面"""
+    return url.rstrip('/').split('?')[0].rstrip('/')
@@ -20,9 +20,13 @@ Scraper 基类
 
 import time
 import logging
-import threading
 from typing import Any, Callable, Optional, Dict, List
 from ..models import ScrapingResult
+from ..models.scraping_models import normalize_page_url
+from ..utils.page_cache import get_page_cache
+from ..utils.timeout_executor import get_global_timeout_executor
+from rpa.browser.implementations.loop_bridge import run_sync_on_loop
+from rpa.browser.implementations.rate_limiter import OUTCOME_ERROR, get_global_rate_limiter
 from ..services.scraping_orchestrator import ScrapingMode
 from abc import ABC
 
@@ -71,7 +75,8 @@ class BaseScraper(ABC):
         """
         带真正超时控制的同步操作执行器
 
-        使用线程和事件机制实现真正的超时控制，能够在操作运行中中断它。
+        操作在所有抓取器共享的有界线程池中执行；超时后取消该操作在浏览器驱动中未完成的协程，
+        该操作后续的浏览器调用直接失败，不会与下一个操作竞争共享页面。
 
         Args:
             operation_func: 要执行的操作函数
@@ -88,47 +93,23 @@ class BaseScraper(ABC):
         start_time = time.time()
         self._update_progress(operation_name, start_time)
 
-        # 操作结果容器
-        result_container = {'result': None, 'exception': None, 'completed': False}
-
-        def _run_operation():
-            """在独立线程中运行操作"""
-            try:
-                result_container['result'] = operation_func()
-                result_container['completed'] = True
-            except Exception as e:
-                result_container['exception'] = e
-                result_container['completed'] = True
-
-        # 启动操作线程
         self.logger.debug(f"🚀 开始执行{operation_name}，超时设置: {timeout}秒")
-        operation_thread = threading.Thread(target=_run_operation)
-        operation_thread.daemon = True
-        operation_thread.start()
+        try:
+            result = get_global_timeout_executor().run(operation_func, timeout, operation_name)
+        except TimeoutError:
+            elapsed = time.time() - start_time
+            self.logger.error(f"⏰ {operation_name}超时（{elapsed:.2f}秒 > {timeout}秒）")
+            raise
+        except Exception as e:
+            elapsed = time.time() - start_time
+            self.logger.error(f"❌ {operation_name}执行失败（耗时{elapsed:.2f}秒）: {e}")
+            raise
 
-        # 等待操作完成或超时
-        operation_thread.join(timeout)
         elapsed = time.time() - start_time
-
-        if operation_thread.is_alive():
-            # 操作超时
-            self.logger.error(f"⏰ {operation_name}超时（{elapsed:.2f}秒 > {timeout}秒），尝试强制停止...")
-            # 注意：Python无法强制终止线程，但我们可以记录超时并抛出异常
-            raise TimeoutError(f"{operation_name}超时（{timeout:.1f}秒）")
-
-        # 检查操作结果
-        if result_container['exception']:
-            self.logger.error(f"❌ {operation_name}执行失败（耗时{elapsed:.2f}秒）: {result_container['exception']}")
-            raise result_container['exception']
-
-        if not result_container['completed']:
-            self.logger.error(f"❌ {operation_name}未完成（耗时{elapsed:.2f}秒）")
-            raise RuntimeError(f"{operation_name}执行异常：未返回结果")
-
         self.logger.debug(f"✅ {operation_name}执行成功，耗时: {elapsed:.2f}秒")
         self._complete_progress_step()
 
-        return result_container['result']
+        return result
 
     def retry_operation(self, operation_func: Callable, max_retries: int = 3, 
                        retry_delay: float = 1.0, operation_name: str = "operation",
@@ -298,10 +279,21 @@ class BaseScraper(ABC):
             self.logger.info(f"🔍 navigate_to_sync返回值: {result}")
             return result
 
+        def _limited_navigate():
+            # 浏览器服务自身不限流时（旧版服务的 open_page_sync）在此按域名限流
+            rate_limiter = get_global_rate_limiter()
+            if rate_limiter is None or getattr(self.browser_service, 'applies_rate_limit', False):
+                return _navigate()
+            with rate_limiter.limit(url) as permit:
+                result = _navigate()
+                if not result:
+                    permit.release(OUTCOME_ERROR)
+                return result
+
         try:
             return self.retry_operation(
                 lambda: self.execute_with_smart_timeout(
-                    _navigate,
+                    _limited_navigate,
                     "navigation",
                     f"导航到{url}"
                 ),
@@ -313,6 +305,24 @@ class BaseScraper(ABC):
             self.logger.error(f"❌ 导航失败: {e}")
             return False
 
+    def is_current_page(self, target_url: str) -> bool:
+        """
+        检查浏览器当前页面是否为目标页面（忽略查询参数和末尾斜杠）
+
+        Args:
+            target_url: 目标页面URL
+
+        Returns:
+            bool: 当前页面是否为目标页面，获取失败时返回 False
+        """
+        if not target_url or not self.browser_service:
+            return False
+        try:
+            current_url = self.browser_service.get_page_url_sync()
+            return bool(current_url) and normalize_page_url(current_url) == normalize_page_url(target_url)
+        except Exception:
+            return False  # 如果获取失败，按需要导航处理
+
     def check_and_navi(self, target_url: str) -> bool:
         """
         智能检查并导航 - 简化版本
@@ -333,15 +343,8 @@ class BaseScraper(ABC):
             return self.navigate_to(target_url)
 
         # 检查当前URL是否与目标URL相同
-        try:
-            current_url = self.browser_service.get_page_url_sync()
-            if current_url:
-                current_clean = current_url.rstrip('/').split('?')[0]
-                target_clean = target_url.rstrip('/').split('?')[0]
-                if current_clean == target_clean:
-                    return False  # 无需导航
-        except Exception:
-            pass  # 如果获取失败，继续导航
+        if self.is_current_page(target_url):
+            return False  # 无需导航
 
         # 执行导航
         return self.navigate_to(target_url)
@@ -415,6 +418,19 @@ class BaseScraper(ABC):
             self.logger.debug(f"等待 {seconds} 秒")
             self.wait_utils.smart_wait(seconds)
 
+    def wait_for_page_ready(self, selectors: Optional[List[str]] = None, max_wait: float = 1.0) -> bool:
+        """
+        等待页面就绪：目标内容稳定后立即返回，max_wait 仅作为等待上限
+
+        Args:
+            selectors: 目标内容选择器，为空时只等待DOM和网络安静
+            max_wait: 最长等待秒数
+
+        Returns:
+            bool: 是否在上限前探测到页面就绪
+        """
+        return self.wait_utils.wait_for_page_ready(selectors, max_wait)
+
     def get_page_content(self) -> Optional[str]:
         """
         获取页面内容 - 使用同步方法
@@ -440,9 +456,18 @@ class BaseScraper(ABC):
 
     # ========== 高级方法：完整的抓取流程 ==========
 
+    @property
+    def page_cache(self):
+        """全局页面缓存（未启用时为 None）"""
+        return get_page_cache()
+
     def scrape_page_data(self, url: str, extractor_func: Callable, 
                         navigation_timeout: Optional[float] = None,
-                        extraction_timeout: Optional[float] = None) -> ScrapingResult:
+                        extraction_timeout: Optional[float] = None,
+                        cache_source: Optional[str] = None,
+                        cache_kind: str = "page_data",
+                        cache_validator: Optional[Callable[[Any], bool]] = None,
+                        ready_selectors: Optional[List[str]] = None) -> ScrapingResult:
         """
         同步抓取页面数据 - 完全重构版本
         
@@ -457,6 +482,10 @@ class BaseScraper(ABC):
             extractor_func: 数据提取函数（同步），接收 browser_service 参数
             navigation_timeout: 导航超时时间
             extraction_timeout: 数据提取超时时间
+            cache_source: 缓存来源（如 'seerfar'），提供时先查询页面缓存，命中则不再打开页面
+            cache_kind: 缓存内容类型，用于区分同一页面上的不同提取结果
+            cache_validator: 判断提取结果是否可以写入缓存（避免缓存提取失败时的默认值）
+            ready_selectors: 页面就绪的目标内容选择器，内容稳定后即开始提取（最多等待1秒）
             
         Returns:
             ScrapingResult: 抓取结果对象
@@ -474,6 +503,17 @@ class BaseScraper(ABC):
         nav_timeout = navigation_timeout or self.timeouts['page_navigation']
         ext_timeout = extraction_timeout or self.timeouts['data_extraction']
         
+        page_cache = self.page_cache if cache_source else None
+        if page_cache:
+            cached_data = page_cache.get_data(url, cache_source, cache_kind)
+            if cached_data is not None:
+                self.logger.info(f"♻️ 命中页面缓存: {url}")
+                return ScrapingResult(
+                    success=True,
+                    data=cached_data,
+                    execution_time=time.time() - start_time
+                )
+
         try:
             # 1. 导航到页面
             self.logger.info(f"开始同步抓取页面数据: {url}")
@@ -497,7 +537,7 @@ class BaseScraper(ABC):
 
             # 2. 等待页面稳定
             self.logger.info("📋 步骤 2: 等待页面稳定")
-            self.wait(1.0)  # 给页面1秒稳定时间
+            self.wait_for_page_ready(ready_selectors, max_wait=1.0)  # 内容稳定即继续，最多1秒
             self.logger.info("✅ 页面稳定等待完成")
 
             # 3. 同步提取数据
@@ -514,6 +554,9 @@ class BaseScraper(ABC):
             self.logger.info(f"✅ 数据提取execute_with_timeout完成")
             self.logger.debug(f"📊 数据提取结果: {data}")
 
+            if page_cache and data and (cache_validator is None or cache_validator(data)):
+                page_cache.put(url, cache_source, cache_kind, data=data)
+
             # 4. 返回成功结果
             execution_time = time.time() - start_time
             self.logger.info(f"✅ 页面数据抓取成功，耗时: {execution_time:.2f}秒")
@@ -659,6 +702,25 @@ class BaseScraper(ABC):
             error_message="未实现 scrape 方法"
         )
 
+    async def scrape_async(self, *args, **kwargs) -> ScrapingResult:
+        """
+        异步执行模式：在浏览器驱动事件循环上以协程方式执行 scrape
+
+        必须在驱动事件循环中 await（例如通过 browser_service.run_in_loop_sync 或驱动的 run_in_loop）；
+        抓取过程中的浏览器调用直接 await，不再逐次跨线程提交。参数与 scrape 相同。
+        """
+        return await run_sync_on_loop(self.scrape, *args, **kwargs)
+
+    def run_on_browser_loop(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        同步入口的异步执行模式：把 func 放到浏览器驱动事件循环上运行，只进行一次跨线程往返
+
+        浏览器服务不支持时在当前线程直接执行。
+        """
+        if self.browser_service is not None and hasattr(self.browser_service, 'run_in_loop_sync'):
+            return self.browser_service.run_in_loop_sync(func, *args, timeout=timeout, **kwargs)
+        return func(*args, **kwargs)
+
     def validate_data(self, data: Dict[str, Any],
                      filters: Optional[List[Callable]] = None) -> bool:
         """
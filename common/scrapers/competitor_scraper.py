@@ -18,7 +18,10 @@ from bs4 import BeautifulSoup
 # 🔧 重构后的导入：使用新的数据模型和统一工具类
 from common.utils.scraping_utils import clean_price_string
 from common.models.scraping_result import ScrapingResult
-from common.utils.wait_utils import WaitUtils, wait_for_content_smart
+from common.utils.wait_utils import WaitUtils, build_page_ready_script, wait_for_content_smart
+from rpa.browser.core.models.action_script import ActionScript, ActionScriptResult
+from rpa.browser.implementations.loop_bridge import cooperative_sleep
+from common.utils.html_parser import parse_html
 from common.utils.scraping_utils import ScrapingUtils
 from .base_scraper import BaseScraper
 from common.config.ozon_selectors_config import *
@@ -69,6 +72,8 @@ class CompetitorScraper(BaseScraper):
         2. 等待弹窗加载完成
         3. 如果需要，展开更多竞品信息
         4. 返回弹窗容器和相关信息
+
+        优先以一个动作脚本在驱动中一次执行完成；浏览器服务不支持动作脚本时逐步执行。
         
         Args:
             expand: 是否需要展开更多竞品
@@ -76,6 +81,97 @@ class CompetitorScraper(BaseScraper):
         Returns:
             Dict包含: success, popup_container, expanded等信息
         """
+        result = self._present_competitor_popup_scripted(expand)
+        if result is not None:
+            return result
+        return self._present_competitor_popup_stepwise(expand)
+
+    def _build_competitor_popup_script(self, expand: bool) -> ActionScript:
+        """构建弹出（并展开）竞品弹窗、返回弹窗片段HTML的动作脚本"""
+        popup_selectors = self.selectors_config.competitor_popup_selectors
+        click_timeout = self.timing_config.timeout.get_timeout_ms('element_wait') * 3
+
+        script = (ActionScript()
+                  .click(self.selectors_config.competitor_area_click_selectors, timeout_ms=click_timeout, name='open')
+                  .wait_for(popup_selectors, timeout_ms=10000, optional=True, name='popup_loaded'))
+        if expand:
+            script.click(self.selectors_config.expand_selectors, timeout_ms=click_timeout, optional=True, name='expand')
+            ready_script = build_page_ready_script(popup_selectors, max_wait_seconds=5.0)
+            if ready_script:
+                script.evaluate(ready_script, timeout_ms=6000, optional=True, name='expanded_ready')
+        return script.get_html(popup_selectors, optional=True, name='popup')
+
+    def _present_competitor_popup_scripted(self, expand: bool) -> Optional[Dict[str, Any]]:
+        """
+        以一个动作脚本完成弹窗流程（一次驱动调用）
+
+        Returns:
+            Dict: 与 _present_competitor_popup 相同的结果；浏览器服务不支持动作脚本时返回 None
+        """
+        if not hasattr(self.browser_service, 'run_action_script_sync'):
+            return None
+
+        self.logger.info("🔍 开始处理竞品容器点击和弹窗加载（动作脚本）...")
+        try:
+            script_result = self.browser_service.run_action_script_sync(self._build_competitor_popup_script(expand))
+        except Exception as e:
+            self.logger.warning(f"⚠️ 动作脚本执行失败，改为逐步执行: {e}")
+            return None
+        if not isinstance(script_result, ActionScriptResult):
+            return None
+
+        self.logger.debug(f"🎯 动作脚本命中选择器: {script_result.matched_selectors}，"
+                          f"耗时 {script_result.elapsed_ms:.0f}ms")
+
+        if script_result.failed_step == 'page':
+            self.logger.error("❌ 无法获取浏览器页面实例")
+            return {"success": False, "error": "浏览器页面不可用"}
+
+        if script_result.failed_step == 'open':
+            open_step = script_result.get('open')
+            self.logger.warning(f"⚠️ 未找到可点击的竞品容器，该商品可能没有跟卖信息 ({open_step.error})")
+            return {
+                "success": False,
+                "error": "no_competitors",
+                "popup_container": None,
+                "expanded": False
+            }
+
+        if not script_result.success:
+            self.logger.error(f"❌ 竞品弹窗处理失败: {script_result.failed_step}")
+            return {
+                "success": False,
+                "error": f"动作脚本执行失败: {script_result.failed_step}",
+                "popup_container": None,
+                "expanded": False
+            }
+
+        self.logger.info(f"✅ 成功点击竞品区域，使用选择器: {script_result.matched_selector('open')}")
+        if expand:
+            expand_selector = script_result.matched_selector('expand')
+            if expand_selector:
+                self.logger.info(f"✅ 成功展开更多竞品: {expand_selector}")
+            else:
+                self.logger.info("ℹ️  未找到展开按钮，可能已全部显示或无需展开")
+
+        popup_container = None
+        popup_selector = script_result.matched_selector('popup')
+        if popup_selector:
+            popup_container = parse_html(script_result.value('popup')).select_one(popup_selector)
+        if popup_container:
+            self.logger.info(f"✅ 找到弹窗容器: {popup_selector}")
+        else:
+            self.logger.warning("⚠️ 未找到弹窗容器")
+
+        self.logger.info("🎉 竞品容器点击和弹窗加载完成")
+        return {
+            "success": True,
+            "popup_container": popup_container,
+            "expanded": expand
+        }
+
+    def _present_competitor_popup_stepwise(self, expand: bool) -> Dict[str, Any]:
+        """逐步执行弹窗流程（每个查找/点击/等待都是一次驱动调用）"""
         try:
             self.logger.info("🔍 开始处理竞品容器点击和弹窗加载...")
 
@@ -156,7 +252,7 @@ class CompetitorScraper(BaseScraper):
                     self.logger.info("✅ 成功展开更多竞品")
                     # 展开后需要更长时间等待新内容加载
                     self.logger.info("⏳ 等待展开后的内容加载...")
-                    self.wait_utils.smart_wait(5.0)
+                    self.wait_utils.wait_for_page_ready(self.selectors_config.competitor_popup_selectors, max_wait=5.0)
                 else:
                     self.logger.warning("⚠️ 展开操作失败或无需展开")
 
@@ -169,7 +265,7 @@ class CompetitorScraper(BaseScraper):
                     self.logger.error("❌ 获取页面内容失败")
                     return {"success": False, "error": "获取页面内容失败"}
                 
-                popup_soup = BeautifulSoup(page_content, 'html.parser')
+                popup_soup = parse_html(page_content)
 
                 # 查找弹窗容器
                 popup_container = None
@@ -276,8 +372,8 @@ class CompetitorScraper(BaseScraper):
                     
                     # 等待展开内容加载
                     wait_time = self.timing_config.timeout.short_wait_s
-                    self.logger.info(f"⏳ 等待 {wait_time}s 加载展开内容...")
-                    self.wait_utils.smart_wait(wait_time)
+                    self.logger.info(f"⏳ 等待展开内容加载（最多 {wait_time}s）...")
+                    self.wait_utils.wait_for_page_ready(self.selectors_config.competitor_popup_selectors, max_wait=wait_time)
                     
                     return True
                     
@@ -703,7 +799,7 @@ class CompetitorScraper(BaseScraper):
                         self.logger.warning(f"⚠️ 页面已跳转但无法提取商品ID: {current_url}")
                         return None
                 
-                time.sleep(wait_interval)
+                cooperative_sleep(wait_interval)
                 elapsed_time += wait_interval
             
             # 超时
@@ -742,14 +838,27 @@ class CompetitorScraper(BaseScraper):
             :param context:
         """
 
+        # 如果 context 里的 competitor_cnt = 0 或为空则直接返回（无需打开页面）
+        if context and ('competitor_cnt' in context and context['competitor_cnt'] == 0):
+            return ScrapingResult(
+                success=True,
+                data={'competitors': [], 'total_count': 0, 'scraped_at': time.time(), 'target_url': url},
+                execution_time=0
+            )
+
         # 🔧 关键修复：在任何抓取操作前确保浏览器已正确启动
         try:
             self.logger.info("🌐 准备开始抓取，首先确保浏览器已启动...")
             # self._ensure_browser_initialized()
 
-            # 🔧 关键修复：导航到目标页面
-            self.logger.info(f"🎯 导航到目标页面: {url}")
-            nav_success = self.browser_service.navigate_to_sync(url, wait_until="domcontentloaded")
+            # 🚀 当前页面已是目标页面（同一次导航的快照已被提取）时，直接在该页面上操作跟卖浮层
+            if self.is_current_page(url):
+                self.logger.info(f"♻️ 当前已在目标页面，跳过导航: {url}")
+                nav_success = True
+            else:
+                # 🔧 关键修复：导航到目标页面
+                self.logger.info(f"🎯 导航到目标页面: {url}")
+                nav_success = self.browser_service.navigate_to_sync(url, wait_until="domcontentloaded")
             if not nav_success:
                 return ScrapingResult(
                     success=False,
@@ -776,14 +885,6 @@ class CompetitorScraper(BaseScraper):
                 execution_time=0
             )
 
-        # 如果 context 里的 competitor_cnt = 0 或为空则直接返回
-        if context and ('competitor_cnt' in context and context['competitor_cnt'] == 0):
-            return ScrapingResult(
-                success=True,
-                data={'competitors': [], 'total_count': 0, 'scraped_at': time.time(), 'target_url': url},
-                execution_time=0
-            )
-
         # 如果 context 里的 competitor_cnt > 5 则进行expand
         # 默认情况下（context为None或没有competitor_cnt字段），不进行expand
         expand_pop_layer = False
@@ -9,12 +9,13 @@ OZON平台抓取器
 import logging
 import time
 from typing import Dict, Any, List, Optional, Tuple
-from bs4 import BeautifulSoup
 
 from .base_scraper import BaseScraper
 from rpa.browser.browser_service import SimplifiedBrowserService
 
 from ..models import ScrapingResult
+from ..models.scraping_models import PageSnapshot, normalize_page_url
+from ..utils.html_parser import parse_html
 from ..config import GoodStoreSelectorConfig
 from ..config.ozon_selectors_config import get_ozon_selectors_config, OzonSelectorsConfig
 from ..config.currency_config import get_currency_config
@@ -51,6 +52,28 @@ class OzonScraper(BaseScraper):
     实现IProductScraper接口，提供标准化的商品信息抓取功能
     """
 
+    # OZON平台特定的商品图片配置
+    PRODUCT_IMAGE_CONFIG: Dict[str, Any] = {
+        'placeholder_patterns': [
+            'doodle_ozon_rus.png',
+            'doodle_ozone_rus.png',
+            'placeholder.png',
+            'no-image.png',
+            'default.png',
+            'loading.png'
+        ],
+        'valid_patterns': [
+            'multimedia',        # OZON的商品图片通常包含multimedia
+            's3/multimedia',     # 完整的S3路径
+            'wc1000',           # 高清图片标识
+            'wc750',            # 中等分辨率图片
+            'wc500',            # 标准分辨率图片
+        ],
+        'valid_extensions': ['.jpg', '.jpeg', '.png', '.webp'],
+        'valid_domains': ['ozon.ru', 'ozone.ru', 'ir.ozone.ru'],
+        'conversion_config': {r'/wc\d+/': '/wc1000/'}
+    }
+
     def __init__(self, config: Optional[GoodStoreSelectorConfig] = None,
                  selectors_config: Optional[OzonSelectorsConfig] = None,
                  browser_service=None):
@@ -66,7 +89,7 @@ class OzonScraper(BaseScraper):
         self.wait_utils = WaitUtils(self.browser_service, self.logger)
         self.scraping_utils = ScrapingUtils(self.logger)
         ErpPluginScraper = get_erp_plugin_scraper()
-        self.erp_scraper = ErpPluginScraper(self.config, self.browser_service)
+        self.erp_scraper = ErpPluginScraper(browser_service=self.browser_service)
         
         # 🎯 集成过滤管理器和利润评估器
         self.filter_manager = FilterManager(self.config)
@@ -74,6 +97,11 @@ class OzonScraper(BaseScraper):
         # 注意：ProfitEvaluator需要profit_calculator_path，这里先设为None，实际使用时需要传入
         self.profit_evaluator = None
 
+        # 最近一次使用的页面快照（供协调器在同一页面的后续步骤中复用）
+        self._last_snapshot: Optional[PageSnapshot] = None
+        # 页面内一次性提取脚本（首次使用时按选择器配置生成）
+        self._product_bundle_script: Optional[str] = None
+
     # 标准scrape接口实现
     def scrape(self, target: str,
                context: Optional[Dict[str, Any]] = None, 
@@ -86,31 +114,51 @@ class OzonScraper(BaseScraper):
             context: 上下文信息
             include_competitor: 是否包含跟卖商品分析
             **kwargs: 其他参数
+                snapshot: 同一页面的 PageSnapshot，提供时复用快照，不再导航
+
+        Returns:
+            ScrapingResult: 抓取结果，metadata['page_snapshot'] 为本次使用的页面快照
         """
         start_time = time.time()
+        snapshot = kwargs.pop('snapshot', None)
+        cached_extractions = None
 
         try:
-            # 直接导航到目标页面
-            if not self.navigate_to(target):
-                return ScrapingResult(
-                    success=False,
-                    data={},
-                    error_message=f"无法导航到商品页面: {target}",
-                    execution_time=time.time() - start_time
+            if snapshot is not None and snapshot.matches(target):
+                self.logger.debug(f"♻️ 复用页面快照，跳过导航: {target}")
+            else:
+                snapshot = None
+                self._last_snapshot = None
+                servable, cached_extractions = self._load_cached_extractions(
+                    target, include_competitor, kwargs.get('skip_competitors', False)
                 )
+                if servable:
+                    self.logger.info(f"♻️ 命中页面缓存，跳过导航: {target}")
+                # 直接导航到目标页面
+                elif not self.navigate_to(target):
+                    return ScrapingResult(
+                        success=False,
+                        data={},
+                        error_message=f"无法导航到商品页面: {target}",
+                        execution_time=time.time() - start_time
+                    )
 
             # 根据include_competitor参数选择处理方式
             if include_competitor:
-                data = self._scrape_with_competitor_analysis(target, context, **kwargs)
+                data = self._scrape_with_competitor_analysis(target, context, snapshot=snapshot,
+                                                             cached_extractions=cached_extractions, **kwargs)
             else:
                 # 检查是否跳过跟卖信息抓取
                 skip_competitors = kwargs.get('skip_competitors', False)
-                data = self._extract_basic_product_info(target, context, skip_competitors=skip_competitors)
+                data = self._extract_basic_product_info(target, context, skip_competitors=skip_competitors,
+                                                        snapshot=snapshot,
+                                                        cached_extractions=cached_extractions)
 
             return ScrapingResult(
                 success=True,
                 data=data,
-                execution_time=time.time() - start_time
+                execution_time=time.time() - start_time,
+                metadata={'page_snapshot': snapshot or self._last_snapshot}
             )
 
         except ValueError as e:
@@ -118,11 +166,16 @@ class OzonScraper(BaseScraper):
         except Exception as e:
             raise RuntimeError(f"抓取失败: {str(e)}")
     
-    def _scrape_with_competitor_analysis(self, target: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
-        """完整的跟卖商品分析流程"""
+    def _scrape_with_competitor_analysis(self, target: str, context: Optional[Dict[str, Any]] = None,
+                                         snapshot: Optional[PageSnapshot] = None,
+                                         cached_extractions: Optional[Dict[str, Dict[str, Any]]] = None,
+                                         **kwargs) -> Dict[str, Any]:
+        """完整的跟卖商品分析流程（cached_extractions 为 scrape() 中已读取的缓存提取结果）"""
         try:
             # 1. 抓取基础商品信息
-            basic_data = self._extract_basic_product_info(target, context, skip_competitors=False)
+            basic_data = self._extract_basic_product_info(target, context, skip_competitors=False,
+                                                          snapshot=snapshot,
+                                                          cached_extractions=cached_extractions)
             
             # 2. 商品过滤检查
             if not self._should_analyze_competitor(basic_data):
@@ -137,13 +190,19 @@ class OzonScraper(BaseScraper):
             # 3. 获取跟卖信息 - 使用CompetitorScraper
             try:
                 from .competitor_scraper import CompetitorScraper
-                competitor_scraper = CompetitorScraper(browser_service=self.browser_service)
-                competitor_result = competitor_scraper.scrape(
-                    target, 
-                    context=context, 
-                    extract_first_product=True,
-                    **kwargs
-                )
+                cached_competitors = self._lookup_cached_extraction(target, 'competitors', cached_extractions)
+                if cached_competitors is not None:
+                    competitor_result = ScrapingResult(success=True, data=cached_competitors)
+                else:
+                    competitor_scraper = CompetitorScraper(browser_service=self.browser_service)
+                    competitor_result = competitor_scraper.scrape(
+                        target, 
+                        context=context, 
+                        extract_first_product=True,
+                        **kwargs
+                    )
+                    if competitor_result.success:
+                        self._put_cached_extraction(target, 'competitors', competitor_result.data)
                 
                 if not competitor_result.success:
                     return {
@@ -187,7 +246,7 @@ class OzonScraper(BaseScraper):
         except Exception as e:
             self.logger.error(f"跟卖商品分析失败: {e}")
             # 降级返回基础数据
-            basic_data = self._extract_basic_product_info(target, context, skip_competitors=True)
+            basic_data = self._extract_basic_product_info(target, context, skip_competitors=True, snapshot=snapshot)
             return {
                 "primary_product": basic_data,
                 "selected_product": basic_data,
@@ -226,13 +285,125 @@ class OzonScraper(BaseScraper):
             self.logger.error(f"判断跟卖分析必要性失败: {e}")
             return False
 
-    def _extract_basic_product_info(self, url: str, context: Optional[Dict[str, Any]] = None, skip_competitors: bool = False) -> Dict[str, Any]:
-        """直接提取基础价格数据（扁平化实现）"""
+    # ========== 页面缓存 ==========
+
+    @staticmethod
+    def _basic_info_cache_kind(skip_competitors: bool) -> str:
+        return 'basic_info_no_competitors' if skip_competitors else 'basic_info'
+
+    def _get_cached_extraction(self, url: str, kind: str) -> Optional[Dict[str, Any]]:
+        """读取商品页的缓存提取结果（OZON商品页由路径决定，忽略查询参数）"""
+        page_cache = self.page_cache
+        if not page_cache:
+            return None
+        return page_cache.get_data(normalize_page_url(url), 'ozon', kind)
+
+    def _put_cached_extraction(self, url: str, kind: str, data: Dict[str, Any],
+                               html: Optional[str] = None) -> None:
+        """写入商品页的提取结果"""
+        page_cache = self.page_cache
+        if page_cache and data:
+            page_cache.put(normalize_page_url(url), 'ozon', kind, html=html, data=data)
+
+    def _lookup_cached_extraction(self, url: str, kind: str,
+                                  cached_extractions: Optional[Dict[str, Dict[str, Any]]] = None
+                                  ) -> Optional[Dict[str, Any]]:
+        """优先使用 scrape() 中已读取的缓存结果，未读取时再查询缓存（每个结果只计一次命中）"""
+        if cached_extractions is not None:
+            return cached_extractions.get(kind)
+        return self._get_cached_extraction(url, kind)
+
+    def _load_cached_extractions(self, url: str, include_competitor: bool, skip_competitors: bool
+                                 ) -> Tuple[bool, Optional[Dict[str, Dict[str, Any]]]]:
+        """
+        读取本次抓取所需的缓存提取结果
+
+        Returns:
+            Tuple[bool, Optional[Dict]]: (所需结果是否都已缓存、可以不打开页面, 已读取的结果（按缓存类型）)；
+            未启用缓存时结果为 None
+        """
+        if not self.page_cache:
+            return False, None
+
+        cached_extractions: Dict[str, Dict[str, Any]] = {}
+        kind = self._basic_info_cache_kind(skip_competitors and not include_competitor)
+        basic_data = self._get_cached_extraction(url, kind)
+        if basic_data is None:
+            return False, cached_extractions
+        cached_extractions[kind] = basic_data
+        if not include_competitor:
+            return True, cached_extractions
+
+        # 需要跟卖分析时，被过滤的商品不需要跟卖数据；否则跟卖数据也必须已缓存
+        if not self._should_analyze_competitor(basic_data):
+            return True, cached_extractions
+        competitors = self._get_cached_extraction(url, 'competitors')
+        if competitors is None:
+            return False, cached_extractions
+        cached_extractions['competitors'] = competitors
+        return True, cached_extractions
+
+    def capture_snapshot(self, url: str) -> PageSnapshot:
+        """
+        抓取当前页面的HTML快照（不导航）
+
+        Args:
+            url: 当前页面对应的URL
+
+        Returns:
+            PageSnapshot: 页面快照
+        """
+        page_content = self.scraping_utils.extract_data_with_js(self.browser_service, script="() => document.documentElement.outerHTML")
+        snapshot = PageSnapshot(url=url, html=page_content or '')
+        self._last_snapshot = snapshot
+        return snapshot
+
+    def _extract_basic_product_info(self, url: str, context: Optional[Dict[str, Any]] = None, skip_competitors: bool = False,
+                                    snapshot: Optional[PageSnapshot] = None,
+                                    cached_extractions: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """直接提取基础价格数据（扁平化实现）
+
+        提供 snapshot 时复用快照中的HTML和已完成的提取结果，不再重复抓取和解析页面。
+        提供 cached_extractions（scrape() 中已读取的缓存结果）时不再重复查询页面缓存。
+        启用 ozon_js_extraction 时优先在页面内一次性提取，失败时回退到整页HTML解析。
+        """
         try:
-            page_content = self.scraping_utils.extract_data_with_js(self.browser_service,script="() => document.documentElement.outerHTML")
-            soup = BeautifulSoup(page_content, 'html.parser')
-            # 获取插件数据
-            erp_data = self.erp_scraper.scrape(target=url, options={'soup': soup}).data
+            if snapshot is None or not snapshot.matches(url):
+                # 优先使用磁盘缓存中的提取结果
+                cached_data = self._lookup_cached_extraction(
+                    url, self._basic_info_cache_kind(skip_competitors), cached_extractions
+                )
+                if cached_data is not None:
+                    self.logger.debug("♻️ 使用页面缓存中的基础商品数据")
+                    _upd_competitor_cnt(cached_data, context)
+                    return cached_data
+                snapshot = None
+            else:
+                self._last_snapshot = snapshot
+
+            cache_key = f"basic_info:{skip_competitors}"
+            cached = snapshot.extractions.get(cache_key) if snapshot is not None else None
+            if cached is not None:
+                self.logger.debug("♻️ 复用页面快照中的基础商品数据")
+                data = dict(cached)
+                _upd_competitor_cnt(data, context)
+                return data
+
+            # 没有快照，或快照由页面内提取生成（不含整页HTML）时，先尝试页面内提取
+            if (snapshot is None or not snapshot.html) and self.config.performance.ozon_js_extraction:
+                data = self._extract_basic_info_with_bundle(url, context, skip_competitors, snapshot=snapshot)
+                if data is not None:
+                    return data
+            if snapshot is None or not snapshot.html:
+                snapshot = self.capture_snapshot(url)
+
+            soup = snapshot.soup
+            # 获取插件数据（快照中已有ERP区域时无需再等待页面）
+            erp_data = snapshot.extractions.get('erp_data')
+            if erp_data is None:
+                erp_data = self.erp_scraper.scrape(target=url, soup=soup).data
+                if erp_data:
+                    snapshot.extractions['erp_data'] = erp_data
             # 如果获取失败，则直接返回
             if not erp_data:
                 return {}
@@ -254,11 +425,74 @@ class OzonScraper(BaseScraper):
             _upd_competitor_cnt(data,context)
 
             # 清理空值
-            return {k: v for k, v in data.items() if v is not None}
+            data = {k: v for k, v in data.items() if v is not None}
+            snapshot.extractions[cache_key] = data
+            self._put_cached_extraction(url, self._basic_info_cache_kind(skip_competitors), data, html=snapshot.html)
+            return dict(data)
         except Exception as e:
             self.logger.error(f"提取基础价格数据失败: {e}")
             return {}
 
+    def _get_product_bundle_script(self) -> str:
+        if self._product_bundle_script is None:
+            self._product_bundle_script = self.selectors_config.build_product_bundle_script(
+                self.erp_scraper.selectors_config.erp_container_selectors
+            )
+        return self._product_bundle_script
+
+    def _extract_basic_info_with_bundle(self, url: str, context: Optional[Dict[str, Any]] = None,
+                                        skip_competitors: bool = False,
+                                        snapshot: Optional[PageSnapshot] = None) -> Optional[Dict[str, Any]]:
+        """页面内一次性提取基础价格数据
+
+        只传回价格候选文本、图片地址和ERP/跟卖区域的HTML片段，不传输整页HTML；
+        Python 端沿用与整页解析相同的规则处理这些字段。提取结果记录在不含HTML的快照中，
+        供同一页面的后续步骤复用。
+
+        Returns:
+            Optional[Dict[str, Any]]: 提取结果；脚本执行失败时返回 None，由调用方回退到整页HTML解析
+        """
+        bundle = self.scraping_utils.extract_data_with_js(
+            self.browser_service, self._get_product_bundle_script(), "商品页关键数据"
+        )
+        if not isinstance(bundle, dict) or not isinstance(bundle.get('price_texts'), dict):
+            self.logger.debug("页面内提取脚本未返回有效结果，回退到整页HTML解析")
+            return None
+
+        if snapshot is None:
+            snapshot = PageSnapshot(url=url, html='')
+        self._last_snapshot = snapshot
+
+        # ERP区域片段未完整加载时，ERP抓取器会继续在页面上等待
+        erp_data = snapshot.extractions.get('erp_data')
+        if erp_data is None:
+            erp_data = self.erp_scraper.scrape(target=url, soup=parse_html(bundle.get('erp_html'))).data
+            if erp_data:
+                snapshot.extractions['erp_data'] = erp_data
+        if not erp_data:
+            return {}
+
+        price_texts = bundle['price_texts']
+        data = {
+            'green_price': self.scraping_utils.extract_price_from_texts(price_texts.get('green'), "green"),
+            'black_price': self.scraping_utils.extract_price_from_texts(price_texts.get('black'), "black"),
+            'product_image': self.scraping_utils.pick_product_image(bundle.get('image_srcs') or [],
+                                                                    self.PRODUCT_IMAGE_CONFIG),
+            'erp_data': erp_data,
+        }
+
+        if not skip_competitors:
+            data['competitor_data'] = self._extract_competitor_price(parse_html(bundle.get('competitor_html')))
+        else:
+            self.logger.info("跳过跟卖信息抓取（skip_competitors=True）")
+
+        _upd_competitor_cnt(data, context)
+
+        data = {k: v for k, v in data.items() if v is not None}
+        snapshot.extractions[f"basic_info:{skip_competitors}"] = data
+        self._put_cached_extraction(url, self._basic_info_cache_kind(skip_competitors), data)
+        return dict(data)
+
     # 根据data里的信息设置  competitor_cnt， 可以从erp_data里获取 也可以 从competitor_data获取， 谁存在就用谁
 
     def _extract_competitor_price(self, soup) -> Optional[Dict[str, Any]]:
@@ -339,33 +573,11 @@ class OzonScraper(BaseScraper):
             str: 商品图片URL，如果提取失败返回None
         """
         try:
-            # 构建OZON平台特定的图片配置
-            image_config = {
-                'placeholder_patterns': [
-                    'doodle_ozon_rus.png',
-                    'doodle_ozone_rus.png',
-                    'placeholder.png',
-                    'no-image.png',
-                    'default.png',
-                    'loading.png'
-                ],
-                'valid_patterns': [
-                    'multimedia',        # OZON的商品图片通常包含multimedia
-                    's3/multimedia',     # 完整的S3路径
-                    'wc1000',           # 高清图片标识
-                    'wc750',            # 中等分辨率图片
-                    'wc500',            # 标准分辨率图片
-                ],
-                'valid_extensions': ['.jpg', '.jpeg', '.png', '.webp'],
-                'valid_domains': ['ozon.ru', 'ozone.ru', 'ir.ozone.ru'],
-                'conversion_config': {r'/wc\d+/': '/wc1000/'}
-            }
-
             # 使用通用方法提取图片
             return self.scraping_utils.extract_product_image(
                 soup,
                 self.selectors_config.image_selectors,
-                image_config
+                self.PRODUCT_IMAGE_CONFIG
             )
 
         except Exception as e:
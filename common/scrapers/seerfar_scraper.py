@@ -6,13 +6,15 @@ Seerfar平台抓取器
 """
 
 import time
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, Iterator, List, Optional, Callable
 
 from .base_scraper import BaseScraper
 from rpa.browser.browser_service import SimplifiedBrowserService
 from common.models.scraping_result import ScrapingResult
+from common.services.page_prefetcher import PagePrefetcher
 from common.utils.wait_utils import WaitUtils
 from common.utils.scraping_utils import ScrapingUtils
+from common.utils.html_parser import parse_html
 from common.utils.sales_data_utils import extract_sales_data_generic
 from common.config.seerfar_selectors import SeerfarSelectors, get_seerfar_selector, SEERFAR_SELECTORS
 # 接口导入已移除，直接继承BaseScraper
@@ -25,8 +27,14 @@ class SeerfarScraper(BaseScraper):
     实现IStoreScraper接口，提供标准化的店铺数据抓取功能
     """
 
-    def __init__(self, selectors_config: Optional[SeerfarSelectors] = None):
-        """初始化Seerfar抓取器"""
+    def __init__(self, selectors_config: Optional[SeerfarSelectors] = None, browser_service=None):
+        """
+        初始化Seerfar抓取器
+
+        Args:
+            selectors_config: 选择器配置
+            browser_service: 浏览器服务实例（可选，默认使用全局单例）
+        """
         super().__init__()
         import logging
         from common.config.base_config import get_config
@@ -41,8 +49,8 @@ class SeerfarScraper(BaseScraper):
         self.base_url = self.config.browser.seerfar_base_url
         self.store_detail_path = self.config.browser.seerfar_store_detail_path
 
-        # 使用全局浏览器服务
-        self.browser_service = SimplifiedBrowserService.get_global_instance()
+        # 使用传入的浏览器服务，默认使用全局浏览器服务
+        self.browser_service = browser_service or SimplifiedBrowserService.get_global_instance()
         
         # 🔧 重构：初始化统一工具类
         self.wait_utils = WaitUtils(self.browser_service, self.logger)
@@ -75,8 +83,18 @@ class SeerfarScraper(BaseScraper):
             self.logger.info(f"🧪 试运行模式 - Seerfar店铺销售数据抓取入参: 店铺ID={store_id}, URL={url}")
             self.logger.info("🧪 试运行模式 - 执行真实的销售数据抓取流程（结果不会保存到文件）")
 
-        # 使用继承的抓取方法
-        result = self.scrape_page_data(url, self._extract_sales_data)
+        # 使用继承的抓取方法（销售数据按天更新，提取成功的结果写入页面缓存）
+        result = self.scrape_page_data(
+            url,
+            self._extract_sales_data,
+            cache_source='seerfar',
+            cache_kind='sales_data',
+            cache_validator=lambda data: bool(data.get('sold_30days') or data.get('sold_count_30days')),
+            ready_selectors=[
+                self.selectors_config.get_selector('store_sales_data', 'sales_amount'),
+                self.selectors_config.get_selector('store_sales_data', 'sales_volume')
+            ]
+        )
 
         # 从选项中获取过滤函数并应用过滤
         # 注意：需要将字段名转换为统一格式
@@ -169,12 +187,17 @@ class SeerfarScraper(BaseScraper):
                 def extract_products(browser_service):
                     products = self._extract_products_list(
                         max_products,
-                        product_filter_func
+                        product_filter_func,
+                        url=url
                     )
                     return {'products': products, 'total_count': len(products)}
 
                 # 使用继承的抓取方法
-                products_result = self.scrape_page_data(url, extract_products)
+                products_result = self.scrape_page_data(
+                    url,
+                    extract_products,
+                    ready_selectors=[self.selectors_config.get_selector('product_list', 'product_rows')]
+                )
 
                 if products_result.success:
                     result_data['products'] = products_result.data['products']
@@ -222,38 +245,43 @@ class SeerfarScraper(BaseScraper):
 
 
 
-    def _extract_all_products_data_js(self, product_rows_selector: str) -> List[Dict[str, Any]]:
+    def _extract_all_products_data_js(self, product_rows_selector: str,
+                                      browser_service=None) -> List[Dict[str, Any]]:
         """
         使用 JavaScript evaluate 一次性提取所有商品行数据 - 使用专门的seerfar提取脚本
+
+        Args:
+            product_rows_selector: 商品行选择器
+            browser_service: 执行脚本的浏览器服务（默认为主标签页，分页预取时为后台标签页）
         """
+        browser_service = browser_service or self.browser_service
         try:
-            # 🔧 调试：增加详细的调试日志
-            self.logger.info(f"🔧 DEBUG: 开始JavaScript提取，选择器: {product_rows_selector}")
+            self.logger.debug("🔧 开始JavaScript提取，选择器: %s", product_rows_selector)
 
             # 🔧 修复：使用专门的seerfar提取脚本，包含完整的OZON URL提取逻辑
             js_script = SEERFAR_SELECTORS.js_scripts['extract_products']
-            self.logger.info(f"🔧 DEBUG: JavaScript脚本长度: {len(js_script)}")
+            self.logger.debug("🔧 JavaScript脚本长度: %d", len(js_script))
 
             # 🔧 验证浏览器服务状态
-            if not self.browser_service:
+            if not browser_service:
                 self.logger.error("❌ CRITICAL: browser_service 为 None")
                 return []
 
-            self.logger.info(f"🔧 DEBUG: 浏览器服务类型: {type(self.browser_service)}")
+            self.logger.debug("🔧 浏览器服务类型: %s", type(browser_service))
 
             # 🔧 架构重构：通过scraping_utils统一执行JavaScript
             # 🔧 修复：支持参数传递，将选择器作为参数传递给JavaScript脚本
-            self.logger.info("🔧 DEBUG: 调用 extract_data_with_js...")
+            self.logger.debug("🔧 调用 extract_data_with_js...")
 
             products_data = self.scraping_utils.extract_data_with_js(
-                self.browser_service,
+                browser_service,
                 js_script,
                 "商品列表数据",
                 product_rows_selector  # 传递选择器参数
             )
 
-            self.logger.info(f"🔧 DEBUG: extract_data_with_js 返回结果类型: {type(products_data)}")
-            self.logger.info(f"🔧 DEBUG: extract_data_with_js 返回结果: {products_data}")
+            # 只记录类型，不格式化整个提取结果（每页数十个商品，会明显拖慢抓取）
+            self.logger.debug("🔧 extract_data_with_js 返回结果类型: %s", type(products_data))
 
             if products_data:
                 self.logger.info(f"📋 JavaScript 提取到 {len(products_data)} 个商品行")
@@ -269,110 +297,197 @@ class SeerfarScraper(BaseScraper):
             return []
 
     def _extract_products_list(self, max_products: int,
-                              product_filter_func: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+                              product_filter_func: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                              url: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         提取商品列表 - 同步实现
 
-        重构的同步版本，支持前置过滤，消除异步复杂性。
-        使用JavaScript一次性提取所有商品数据，避免逐个元素查询的性能问题。
+        按页流式处理（见 iter_product_batches）：每页商品行提取并前置过滤后立即抓取 OZON 详情，
+        同时后台标签页翻到下一页；max_products 按通过前置过滤的商品计数，达到后停止翻页。
 
         Args:
-            max_products: 最大商品数量
+            max_products: 最大商品数量（通过前置过滤的商品）
             product_filter_func: 商品过滤函数，用于前置过滤
+            url: 店铺详情页URL，提供时读取后续分页
 
         Returns:
             List[Dict[str, Any]]: 商品列表
         """
         products = []
-        filtered_count = 0
+        stream_stats: Dict[str, int] = {}
 
         try:
             self.logger.info(f"开始提取商品列表（同步实现，最多 {max_products} 个）")
 
-            # 从配置文件获取商品列表选择器
-            product_rows_selector = get_seerfar_selector('product_list', 'product_rows')
-            product_rows_alt_selector = get_seerfar_selector('product_list', 'product_rows_alt')
-
-            if not product_rows_selector or not product_rows_alt_selector:
-                self.logger.error("❌ 未能找到商品列表选择器配置")
-                return []
-
-            # 使用JavaScript一次性提取所有商品数据
-            products_data = self._extract_all_products_data_js(product_rows_selector)
-
-            if not products_data:
-                self.logger.warning("⚠️ 未找到任何商品行")
-                return []
-
-            total_rows = len(products_data)
-            self.logger.info(f"📋 找到 {total_rows} 个商品行，开始处理（最多 {max_products} 个）")
+            for batch in self.iter_product_batches(max_products, product_filter_func, url=url, stats=stream_stats):
+                for product_data in batch:
+                    index = len(products) + 1
+                    try:
+                        # 获取 OZON URL
+                        ozon_url = product_data.pop('ozon_url', None)
+                        ozon_data_success = False
+                        if ozon_url:
+                            self.logger.info(f"📎 提取到 OZON URL: {ozon_url}")
+
+                            # 抓取 OZON 详情页数据 - 同步实现
+                            ozon_data = self._fetch_ozon_details(ozon_url)
+                            if ozon_data:
+                                product_data.update(ozon_data)
+                                ozon_data_success = True
+                            else:
+                                self.logger.warning(f"⚠️ 商品 #{index} OZON 数据获取失败")
 
-            # 遍历提取的商品数据
-            for i in range(min(total_rows, max_products)):
-                try:
-                    product_data_js = products_data[i]
-
-                    # 构建基础商品数据用于前置过滤
-                    basic_product_data = {
-                        'product_category_cn': product_data_js.get('categoryCn'),
-                        'product_category_ru': product_data_js.get('categoryRu'),
-                        'product_listing_date': product_data_js.get('listingDate'),
-                        'product_shelf_duration': product_data_js.get('shelfDuration'),
-                        'product_sales_volume': product_data_js.get('salesVolume'),
-                        'product_weight': product_data_js.get('weight')
-                    }
-
-                    # 应用前置过滤
-                    if product_filter_func:
-                        if not product_filter_func(basic_product_data):
-                            filtered_count += 1
-                            self.logger.debug(f"⏭️  商品 #{i+1} 未通过前置过滤，跳过 OZON 详情页处理")
-                            continue
-
-                    # 构建完整商品数据
-                    product_data = {
-                        'category_cn': product_data_js.get('categoryCn'),
-                        'category_ru': product_data_js.get('categoryRu'),
-                        'listing_date': product_data_js.get('listingDate'),
-                        'shelf_duration': product_data_js.get('shelfDuration'),
-                        'sales_volume': product_data_js.get('salesVolume'),
-                        'weight': product_data_js.get('weight')
-                    }
-
-                    # 获取 OZON URL
-                    ozon_url = product_data_js.get('ozonUrl')
-                    ozon_data_success = False
-                    if ozon_url:
-                        self.logger.info(f"📎 提取到 OZON URL: {ozon_url}")
-
-                        # 抓取 OZON 详情页数据 - 同步实现
-                        ozon_data = self._fetch_ozon_details(ozon_url)
-                        if ozon_data:
-                            product_data.update(ozon_data)
-                            ozon_data_success = True
-                        else:
-                            self.logger.warning(f"⚠️ 商品 #{i+1} OZON 数据获取失败")
-
-                    if product_data:
                         products.append(product_data)
                         if ozon_data_success:
-                            self.logger.info(f"✅ 商品 #{i+1} 提取成功（含 OZON 数据）")
+                            self.logger.info(f"✅ 商品 #{index} 提取成功（含 OZON 数据）")
                         else:
-                            self.logger.warning(f"⚠️ 商品 #{i+1} 提取部分成功（仅基础数据，OZON 数据缺失）")
+                            self.logger.warning(f"⚠️ 商品 #{index} 提取部分成功（仅基础数据，OZON 数据缺失）")
 
-                except Exception as e:
-                    self.logger.warning(f"⚠️  提取第 {i + 1} 个商品信息失败: {e}")
-                    continue
+                    except Exception as e:
+                        self.logger.warning(f"⚠️  提取第 {index} 个商品信息失败: {e}")
+                        continue
 
             if products:
-                self.logger.info(f"🎉 成功提取 {len(products)} 个有效商品信息（前置过滤跳过 {filtered_count} 个）")
+                self.logger.info(
+                    f"🎉 成功提取 {len(products)} 个有效商品信息（读取 {stream_stats.get('pages', 0)} 页，"
+                    f"前置过滤跳过 {stream_stats.get('filtered', 0)} 个）"
+                )
             else:
                 self.logger.warning("⚠️  未提取到有效的商品信息")
             return products
 
         except Exception as e:
             self.logger.error(f"❌ 提取商品列表失败: {e}")
-            return []
+            return products
+
+    def iter_product_batches(self, max_products: int,
+                             product_filter_func: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                             url: Optional[str] = None,
+                             max_pages: Optional[int] = None,
+                             stats: Optional[Dict[str, int]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        流式提取商品行：按页产出通过前置过滤的商品
+
+        第一页从主标签页（已打开的店铺详情页）提取。还需要更多商品且提供了 url 时，后台标签页打开同一页面，
+        基于 UniversalPaginator 翻页并始终领先调用方一页（PagePrefetcher）：调用方抓取当前批次的
+        OZON 详情时，下一页已在提取。通过前置过滤的商品达到 max_products 后不再翻页。
+
+        Args:
+            max_products: 最大商品数量（通过前置过滤的商品）
+            product_filter_func: 商品过滤函数
+            url: 店铺详情页URL，为空时只读取当前页
+            max_pages: 最大页数，默认使用性能配置 seerfar_max_pages
+            stats: 可选的统计字典，写入读取的页数(pages)、商品行数(rows)和前置过滤跳过数(filtered)
+
+        Yields:
+            List[Dict[str, Any]]: 一页中通过前置过滤的商品（含 ozon_url），总数不超过 max_products
+        """
+        stats = stats if stats is not None else {}
+        stats.update(pages=0, rows=0, filtered=0)
+
+        product_rows_selector = get_seerfar_selector('product_list', 'product_rows')
+        if not product_rows_selector:
+            self.logger.error("❌ 未能找到商品列表选择器配置")
+            return
+        if max_pages is None:
+            max_pages = self.config.performance.seerfar_max_pages
+
+        remaining = max_products
+        seen_urls = set()
+
+        def take(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            nonlocal remaining
+            stats['pages'] += 1
+            stats['rows'] += len(rows)
+            batch = []
+            for row in rows:
+                if remaining <= 0:
+                    break
+                # 翻页未生效时同一商品会重复出现
+                ozon_url = row.get('ozonUrl')
+                if ozon_url:
+                    if ozon_url in seen_urls:
+                        continue
+                    seen_urls.add(ozon_url)
+                try:
+                    product_data = self._build_product_row(row, product_filter_func)
+                except Exception as e:
+                    self.logger.warning(f"⚠️  处理商品行失败: {e}")
+                    continue
+                if product_data is None:
+                    stats['filtered'] += 1
+                    continue
+                batch.append(product_data)
+                remaining -= 1
+            return batch
+
+        first_rows = self._extract_all_products_data_js(product_rows_selector)
+        if not first_rows:
+            self.logger.warning("⚠️ 未找到任何商品行")
+            return
+        self.logger.info(f"📋 找到 {len(first_rows)} 个商品行，开始处理（最多 {max_products} 个）")
+        batch = take(first_rows)
+
+        prefetcher = None
+        if remaining > 0 and url and max_pages > 1:
+            # 在处理第一页之前启动，第二页与第一页的 OZON 详情抓取并行加载
+            prefetcher = PagePrefetcher(
+                self.browser_service, url,
+                get_seerfar_selector('product_list', 'pagination'),
+                lambda tab_service: self._extract_all_products_data_js(product_rows_selector, tab_service),
+                max_pages=max_pages,
+                ready_selector=product_rows_selector
+            ).start()
+
+        try:
+            if batch:
+                yield batch
+            while prefetcher and remaining > 0:
+                page = prefetcher.next_page()
+                if page is None:
+                    break
+                page_number, rows = page
+                batch = take(rows or [])
+                self.logger.info(f"📄 第 {page_number} 页: {len(rows or [])} 个商品行，通过前置过滤 {len(batch)} 个")
+                if batch:
+                    yield batch
+        finally:
+            if prefetcher:
+                prefetcher.close()
+
+    def _build_product_row(self, product_data_js: Dict[str, Any],
+                           product_filter_func: Optional[Callable[[Dict[str, Any]], bool]] = None
+                           ) -> Optional[Dict[str, Any]]:
+        """
+        把 JavaScript 提取的商品行转换为商品数据并应用前置过滤
+
+        Returns:
+            Optional[Dict[str, Any]]: 商品数据（含 ozon_url），未通过前置过滤时返回 None
+        """
+        # 构建基础商品数据用于前置过滤
+        basic_product_data = {
+            'product_category_cn': product_data_js.get('categoryCn'),
+            'product_category_ru': product_data_js.get('categoryRu'),
+            'product_listing_date': product_data_js.get('listingDate'),
+            'product_shelf_duration': product_data_js.get('shelfDuration'),
+            'product_sales_volume': product_data_js.get('salesVolume'),
+            'product_weight': product_data_js.get('weight')
+        }
+
+        # 应用前置过滤
+        if product_filter_func and not product_filter_func(basic_product_data):
+            self.logger.debug("⏭️  商品未通过前置过滤，跳过 OZON 详情页处理")
+            return None
+
+        return {
+            'category_cn': product_data_js.get('categoryCn'),
+            'category_ru': product_data_js.get('categoryRu'),
+            'listing_date': product_data_js.get('listingDate'),
+            'shelf_duration': product_data_js.get('shelfDuration'),
+            'sales_volume': product_data_js.get('salesVolume'),
+            'weight': product_data_js.get('weight'),
+            'ozon_url': product_data_js.get('ozonUrl')
+        }
 
     def close(self):
         """
@@ -761,8 +876,7 @@ class SeerfarScraper(BaseScraper):
                 return {}
 
             # 使用默认的销售数据提取逻辑
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(page_content, 'html.parser')
+            soup = parse_html(page_content)
 
             extracted_data = {}
 
@@ -11,7 +11,8 @@ from .scraping_orchestrator import (
     get_global_scraping_orchestrator,
     reset_global_scraping_orchestrator
 )
-
+from .tab_worker_pool import TabWorkerPool, ContextWorkerPool, TabStats
+from .page_prefetcher import PagePrefetcher
 
 
 __all__ = [
@@ -19,5 +20,9 @@ __all__ = [
     'ScrapingMode',
     'OrchestrationConfig',
     'get_global_scraping_orchestrator',
-    'reset_global_scraping_orchestrator'
+    'reset_global_scraping_orchestrator',
+    'TabWorkerPool',
+    'ContextWorkerPool',
+    'TabStats',
+    'PagePrefetcher'
 ]
@@ -0,0 +1,148 @@
+"""
+后台标签页分页预取
+
+列表页的数据需要逐行打开详情页处理时，主标签页忙于详情页，列表页的翻页只能等当前页全部处理完。
+PagePrefetcher 在后台标签页中打开同一个列表页，始终比调用方多翻一页：
+调用方取走第 N 页的数据后，后台标签页立即翻到第 N+1 页并提取数据，与调用方处理第 N 页并行。
+
+调用方不再需要更多数据时调用 close()，后台标签页停止翻页并关闭。
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from rpa.browser.implementations.loop_bridge import cooperative_sleep, in_loop_bridge
+
+# 队列中的结束标记
+_DONE = object()
+
+
+class PagePrefetcher:
+    """
+    后台标签页分页预取器
+
+    翻页基于浏览器服务的 iterate_pages_sync（UniversalPaginator），每页的数据由 extract_func 在后台标签页上提取。
+    """
+
+    def __init__(self, browser_service, url: str, root_selector: str,
+                 extract_func: Callable[[Any], Any],
+                 max_pages: Optional[int] = None,
+                 skip_pages: int = 1,
+                 ready_selector: Optional[str] = None,
+                 paginator_config: Optional[Dict[str, Any]] = None):
+        """
+        初始化预取器
+
+        Args:
+            browser_service: 主浏览器服务（用于创建后台标签页）
+            url: 列表页URL
+            root_selector: 分页容器选择器
+            extract_func: 提取当前页数据的函数，接收后台标签页的浏览器服务
+            max_pages: 最大页数（含跳过的页）
+            skip_pages: 跳过的前几页（调用方已在主标签页提取过的页）
+            ready_selector: 列表内容选择器，打开列表页后等待其出现
+            paginator_config: 分页器配置
+        """
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.browser_service = browser_service
+        self.url = url
+        self.root_selector = root_selector
+        self.extract_func = extract_func
+        self.max_pages = max_pages
+        self.skip_pages = skip_pages
+        self.ready_selector = ready_selector
+        self.paginator_config = paginator_config or {}
+
+        self._pages: "queue.Queue[Any]" = queue.Queue()
+        self._demand = threading.Semaphore(0)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._tab_service = None
+        self.stats = {'pages_fetched': 0, 'consumer_wait_time': 0.0}
+
+    def start(self) -> 'PagePrefetcher':
+        """启动后台标签页并预取第一页"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="PagePrefetcher", daemon=True)
+            self._demand.release()
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self._tab_service = self.browser_service.create_tab_service()
+            if not self._tab_service.navigate_to_sync(self.url):
+                self.logger.warning(f"⚠️ 后台标签页打开列表页失败: {self.url}")
+                return
+            if self.ready_selector:
+                self._tab_service.wait_for_selector_sync(self.ready_selector, timeout=15000)
+
+            pages = self._tab_service.iterate_pages_sync(self.root_selector, self.paginator_config, self.max_pages)
+            try:
+                for _ in range(self.skip_pages):
+                    if next(pages, None) is None:
+                        return
+                while True:
+                    # 调用方取走上一页后才翻页，保持只领先一页
+                    self._demand.acquire()
+                    if self._stop_event.is_set():
+                        return
+                    page_number = next(pages, None)
+                    if page_number is None:
+                        return
+                    self._pages.put((page_number, self.extract_func(self._tab_service)))
+                    self.stats['pages_fetched'] += 1
+            finally:
+                pages.close()
+        except Exception as e:
+            self.logger.warning(f"⚠️ 后台分页预取失败: {e}")
+        finally:
+            self._pages.put(_DONE)
+
+    def next_page(self) -> Optional[Tuple[int, Any]]:
+        """
+        获取下一页数据（预取未完成时等待）
+
+        Returns:
+            Optional[Tuple[int, Any]]: (页码, 提取结果)，没有更多页时返回 None
+        """
+        if self._thread is None:
+            self.start()
+        start_time = time.time()
+        if in_loop_bridge():
+            # 运行在驱动事件循环上时不能阻塞等待（后台标签页的翻页也需要事件循环）
+            while self._pages.empty():
+                cooperative_sleep(0.05)
+        item = self._pages.get()
+        self.stats['consumer_wait_time'] += time.time() - start_time
+        if item is _DONE:
+            self._pages.put(_DONE)
+            return None
+        self._demand.release()
+        return item
+
+    def close(self):
+        """停止翻页并关闭后台标签页"""
+        self._stop_event.set()
+        self._demand.release()
+        if self._thread is not None:
+            if in_loop_bridge():
+                while self._thread.is_alive():
+                    cooperative_sleep(0.05)
+            self._thread.join()
+        if self._tab_service is not None:
+            try:
+                self._tab_service.close_sync()
+            except Exception as e:
+                self.logger.warning(f"关闭预取标签页失败: {e}")
+            self._tab_service = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取预取统计"""
+        return {
+            'pages_fetched': self.stats['pages_fetched'],
+            'consumer_wait_time': round(self.stats['consumer_wait_time'], 3),
+        }
@@ -8,10 +8,12 @@
 4. 性能监控和日志
 """
 
+import copy
 import time
 import logging
+from functools import partial
 from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
 
 # 从旧模型导入业务相关类
@@ -48,6 +50,13 @@ from ..models.scraping_result import ScrapingResult
 # CompetitorDetectionService由CompetitorScraper管理，协调器不直接依赖
 from ..utils.wait_utils import WaitUtils
 from ..utils.scraping_utils import ScrapingUtils
+from ..utils.product_memo import get_product_memo, normalize_product_id
+from rpa.browser.implementations.rate_limiter import (
+    AdaptiveRateLimiter, configure_global_rate_limiter, get_global_rate_limiter, reset_global_rate_limiter
+)
+from rpa.browser.implementations.page_pool import (
+    PageRecyclePolicy, configure_page_recycle_policy, get_page_pool_stats, reset_page_recycle_policy
+)
 
 
 class ScrapingMode(Enum):
@@ -66,6 +75,77 @@ class OrchestrationConfig:
     timeout_seconds: int = 300
     enable_monitoring: bool = True
     enable_detailed_logging: bool = True
+    # 异步执行模式：整次协调抓取在浏览器驱动事件循环上以协程方式运行；None 时使用全局设置
+    async_scraping: Optional[bool] = None
+
+
+# 异步执行模式全局设置（由 configure_async_scraping 根据性能配置设置）
+_async_scraping_enabled = False
+
+
+def configure_async_scraping(performance_config) -> bool:
+    """
+    根据性能配置设置异步执行模式
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        bool: 是否启用异步执行模式
+    """
+    global _async_scraping_enabled
+    _async_scraping_enabled = bool(getattr(performance_config, 'async_scraping', False))
+    return _async_scraping_enabled
+
+
+def configure_rate_limiting(performance_config) -> Optional[AdaptiveRateLimiter]:
+    """
+    根据性能配置启用按域名的自适应导航限流
+
+    初始并发上限与配置的标签页/上下文并发数一致，之后按导航耗时和超时/拦截情况自动调整。
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        Optional[AdaptiveRateLimiter]: 启用时返回限流器，否则返回 None
+    """
+    if not getattr(performance_config, 'rate_limit', False):
+        reset_global_rate_limiter()
+        return None
+
+    workers = max(performance_config.max_concurrent_products, performance_config.max_concurrent_stores, 1)
+    return configure_global_rate_limiter(
+        rate=performance_config.rate_limit_rps,
+        burst=performance_config.rate_limit_burst,
+        initial_concurrency=workers,
+        max_concurrency=max(performance_config.rate_limit_max_concurrency, workers),
+        latency_target=performance_config.rate_limit_latency_target,
+    )
+
+
+def configure_page_recycling(performance_config) -> Optional[PageRecyclePolicy]:
+    """
+    根据性能配置启用页面回收
+
+    浏览器驱动（包括并发抓取的标签页）每次导航前检查页面健康，
+    导航次数、JS堆或渲染进程内存超过阈值时换新页面。
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        Optional[PageRecyclePolicy]: 启用时返回回收策略，否则返回 None
+    """
+    if not getattr(performance_config, 'page_recycle', False):
+        reset_page_recycle_policy()
+        return None
+
+    return configure_page_recycle_policy(
+        max_navigations=performance_config.page_recycle_navigations,
+        max_js_heap_mb=performance_config.page_recycle_js_heap_mb,
+        max_renderer_rss_mb=performance_config.page_recycle_rss_mb,
+    )
 
 
 class ScrapingOrchestrator:
@@ -131,10 +211,10 @@ class ScrapingOrchestrator:
             from ..scrapers.erp_plugin_scraper import ErpPluginScraper
 
             # 专注纯商品信息抓取
-            self.ozon_scraper = OzonScraper()
+            self.ozon_scraper = OzonScraper(browser_service=self.browser_service)
             
             # 店铺销售数据和商品列表抓取  
-            self.seerfar_scraper = SeerfarScraper()
+            self.seerfar_scraper = SeerfarScraper(browser_service=self.browser_service)
             
             # 专业化跟卖店铺信息抓取
             self.competitor_scraper = CompetitorScraper(
@@ -195,15 +275,14 @@ class ScrapingOrchestrator:
             self.logger.info(f"🚀 开始协调抓取 [{operation_id}]: {mode.value} -> {url}")
             self._update_metrics('total_operations', 1)
             
-            # 根据模式选择对应的抓取策略
-            if mode == ScrapingMode.PRODUCT_INFO:
-                result = self._orchestrate_product_info_scraping(url, **kwargs)
-            elif mode == ScrapingMode.STORE_ANALYSIS:
-                result = self._orchestrate_store_analysis(url, **kwargs)
-            elif mode == ScrapingMode.FULL_CHAIN:
-                result = self._orchestrate_product_full_analysis(url, **kwargs)
+            if self._use_async_scraping():
+                # 异步执行模式：整次抓取只进行一次跨线程往返
+                result = self.ozon_scraper.run_on_browser_loop(
+                    partial(self._dispatch, mode, url, **kwargs),
+                    timeout=self.config.timeout_seconds
+                )
             else:
-                raise ValueError(f"不支持的抓取模式: {mode}")
+                result = self._dispatch(mode, url, **kwargs)
             
             # 📊 更新成功指标
             execution_time = time.time() - start_time
@@ -224,6 +303,23 @@ class ScrapingOrchestrator:
                 execution_time=execution_time
             )
     
+    def _use_async_scraping(self) -> bool:
+        """是否使用异步执行模式"""
+        if self.config.async_scraping is not None:
+            return self.config.async_scraping
+        return _async_scraping_enabled
+
+    def _dispatch(self, mode: ScrapingMode, url: str, **kwargs) -> ScrapingResult:
+        """根据模式选择对应的抓取策略"""
+        if mode == ScrapingMode.PRODUCT_INFO:
+            return self._orchestrate_product_info_scraping(url, **kwargs)
+        elif mode == ScrapingMode.STORE_ANALYSIS:
+            return self._orchestrate_store_analysis(url, **kwargs)
+        elif mode == ScrapingMode.FULL_CHAIN:
+            return self._orchestrate_product_full_analysis(url, **kwargs)
+        else:
+            raise ValueError(f"不支持的抓取模式: {mode}")
+
     def _orchestrate_product_info_scraping(self, url: str, **kwargs) -> ScrapingResult:
         """协调纯商品信息抓取"""
         try:
@@ -304,7 +400,36 @@ class ScrapingOrchestrator:
         1. 获取原商品数据
         2. 获取跟卖商品数据（如果存在）
         3. 组装数据，不进行选择决策
+
+        🚀 原商品页面只导航一次：第1步生成的页面快照（PageSnapshot）在第2步复用，
+        原商品、跟卖区域和ERP数据均从同一快照中提取；仅在需要点击跟卖浮层时操作实时页面。
+
+        🚀 跨店铺备忘（见 product_memo）：同一商品在本次运行中只分析一次，出现在其他店铺时直接复用结果，
+        并发抓取同一商品时后到的任务等待先到的任务完成。
         """
+        memo = get_product_memo()
+        product_id = normalize_product_id(url=url)
+        if memo is None or product_id is None:
+            return self._analyze_product_full_chain(url, **kwargs)
+
+        start_time = time.time()
+        with memo.key_lock('full_chain', product_id):
+            cached = memo.get('full_chain', product_id)
+            if cached is not None:
+                self.logger.info(f"♻️ 商品{product_id}本次运行已分析，复用结果")
+                return ScrapingResult.create_success(
+                    data=self._decode_full_chain(cached),
+                    execution_time=time.time() - start_time,
+                    metadata={'memo_hit': True}
+                )
+
+            result = self._analyze_product_full_chain(url, **kwargs)
+            if result.success:
+                memo.put('full_chain', product_id, self._encode_full_chain(result.data))
+            return result
+
+    def _analyze_product_full_chain(self, url: str, **kwargs) -> ScrapingResult:
+        """执行商品完整分析（原商品、跟卖区域、第一个跟卖商品）"""
         start_time = time.time()
         
         try:
@@ -320,21 +445,21 @@ class ScrapingOrchestrator:
                 )
             
             primary_product = self._convert_to_product_info(primary_result.data, is_primary=True)
+            self._remember_product(primary_product)
             
             # Step 2: 获取跟卖商品数据（如果存在）
             competitor_product = None
             competitors_list = []
             
-            competitor_result = self.ozon_scraper.scrape(url, include_competitor=True, **kwargs)
+            # 复用第1步的页面快照，避免重复导航和解析
+            snapshot = (getattr(primary_result, 'metadata', None) or {}).get('page_snapshot')
+            competitor_result = self.ozon_scraper.scrape(url, include_competitor=True, snapshot=snapshot, **kwargs)
             if competitor_result.success:
                 first_competitor_id = competitor_result.data.get('first_competitor_product_id')
                 competitors_list = competitor_result.data.get('competitors', [])
                 
                 if first_competitor_id:
-                    competitor_url = self._build_competitor_url(first_competitor_id)
-                    comp_result = self.ozon_scraper.scrape(competitor_url, skip_competitors=True, **kwargs)
-                    if comp_result.success:
-                        competitor_product = self._convert_to_product_info(comp_result.data, is_primary=False)
+                    competitor_product = self._scrape_competitor_product(first_competitor_id, **kwargs)
             
             # Step 3: 组装数据，使用标准化格式
             return ScrapingResult.create_success(
@@ -352,6 +477,55 @@ class ScrapingOrchestrator:
                 error_message=f"数据组装异常: {str(e)}",
                 execution_time=time.time() - start_time
             )
+
+    def _scrape_competitor_product(self, competitor_product_id: str, **kwargs) -> Optional[ProductInfo]:
+        """抓取跟卖商品页（同一商品在本次运行中只打开一次）"""
+        memo = get_product_memo()
+        product_id = normalize_product_id(competitor_product_id)
+        if memo is None or product_id is None:
+            return self._fetch_competitor_product(competitor_product_id, **kwargs)
+
+        with memo.key_lock('product', product_id):
+            cached = memo.get('product', product_id)
+            if cached is not None:
+                self.logger.info(f"♻️ 跟卖商品{product_id}本次运行已抓取，复用结果")
+                return ProductInfo(**cached)
+            competitor_product = self._fetch_competitor_product(competitor_product_id, **kwargs)
+            self._remember_product(competitor_product)
+            return competitor_product
+
+    def _fetch_competitor_product(self, competitor_product_id: str, **kwargs) -> Optional[ProductInfo]:
+        competitor_url = self._build_competitor_url(competitor_product_id)
+        comp_result = self.ozon_scraper.scrape(competitor_url, skip_competitors=True, **kwargs)
+        if comp_result.success:
+            return self._convert_to_product_info(comp_result.data, is_primary=False)
+        return None
+
+    @staticmethod
+    def _remember_product(product: Optional[ProductInfo]):
+        """记录单个商品页的抓取结果（之后作为跟卖商品出现时直接复用）"""
+        memo = get_product_memo()
+        product_id = normalize_product_id(product.product_id, product.product_url) if product else None
+        if memo is not None and product_id is not None:
+            memo.put('product', product_id, asdict(product))
+
+    @staticmethod
+    def _encode_full_chain(data: Dict[str, Any]) -> Dict[str, Any]:
+        """完整分析结果转换为可持久化的字典"""
+        return {
+            'primary_product': asdict(data['primary_product']) if data.get('primary_product') else None,
+            'competitor_product': asdict(data['competitor_product']) if data.get('competitor_product') else None,
+            'competitors_list': data.get('competitors_list', []),
+        }
+
+    @staticmethod
+    def _decode_full_chain(cached: Dict[str, Any]) -> Dict[str, Any]:
+        """由备忘结果重建完整分析结果（每次返回新对象，调用方可以修改）"""
+        return {
+            'primary_product': ProductInfo(**cached['primary_product']) if cached.get('primary_product') else None,
+            'competitor_product': ProductInfo(**cached['competitor_product']) if cached.get('competitor_product') else None,
+            'competitors_list': copy.deepcopy(cached.get('competitors_list', [])),
+        }
     
     def _convert_to_product_info(self, raw_data: Dict[str, Any], is_primary: bool):
         """
@@ -445,8 +619,15 @@ class ScrapingOrchestrator:
             )
     
     def get_metrics(self) -> Dict[str, Any]:
-        """获取监控指标"""
-        return self.metrics.copy()
+        """获取监控指标（启用限流时包含各域名的限流状态，启用页面回收时包含各页面的使用情况）"""
+        metrics = self.metrics.copy()
+        rate_limiter = get_global_rate_limiter()
+        if rate_limiter is not None:
+            metrics['rate_limiter'] = rate_limiter.get_stats()
+        page_pools = get_page_pool_stats()
+        if page_pools:
+            metrics['page_pools'] = page_pools
+        return metrics
     
     def reset_metrics(self):
         """重置监控指标"""
@@ -0,0 +1,208 @@
+"""
+多标签页并发抓取池
+
+在同一浏览器上下文中打开多个标签页，每个标签页绑定独立的 ScrapingOrchestrator，
+由线程池并发执行商品抓取任务。标签页共享 Cookie 与 ERP 插件状态。
+
+ContextWorkerPool 以同样方式为每个工作单元创建隔离的浏览器上下文，用于店铺级并发。
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class TabStats:
+    """单个标签页的运行统计"""
+    tab_index: int
+    tasks: int = 0
+    failures: int = 0
+    busy_time: float = 0.0
+    max_task_time: float = 0.0
+
+    @property
+    def avg_task_time(self) -> float:
+        """平均单任务耗时（秒）"""
+        return self.busy_time / self.tasks if self.tasks else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            'tab_index': self.tab_index,
+            'tasks': self.tasks,
+            'failures': self.failures,
+            'busy_time': round(self.busy_time, 3),
+            'avg_task_time': round(self.avg_task_time, 3),
+            'max_task_time': round(self.max_task_time, 3)
+        }
+
+
+class TabWorkerPool:
+    """
+    多标签页工作池
+
+    每个标签页同一时刻只执行一个任务；空闲标签页通过队列分配给等待中的任务，
+    结果按输入顺序返回。
+    """
+
+    def __init__(self, size: int,
+                 browser_service=None,
+                 orchestrator_factory: Optional[Callable[[Any], Any]] = None):
+        """
+        初始化标签页工作池
+
+        Args:
+            size: 标签页数量
+            browser_service: 主浏览器服务（默认使用全局单例）
+            orchestrator_factory: 根据标签页浏览器服务创建协调器的工厂函数
+        """
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.size = max(1, int(size))
+        self.browser_service = browser_service
+        self.orchestrator_factory = orchestrator_factory or self._default_orchestrator_factory
+
+        self._tab_services: List[Any] = []
+        self._workers: List[Any] = []
+        self._idle_workers: "queue.Queue[int]" = queue.Queue()
+        self._stats: List[TabStats] = []
+        self._stats_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._started = False
+
+    @staticmethod
+    def _default_orchestrator_factory(tab_service):
+        # 🔧 延迟导入避免循环依赖
+        from .scraping_orchestrator import ScrapingOrchestrator
+        return ScrapingOrchestrator(browser_service=tab_service)
+
+    def start(self) -> 'TabWorkerPool':
+        """打开标签页并创建对应的协调器"""
+        if self._started:
+            return self
+
+        if self.browser_service is None:
+            from rpa.browser.browser_service import SimplifiedBrowserService
+            self.browser_service = SimplifiedBrowserService.get_global_instance()
+
+        try:
+            for index in range(self.size):
+                tab_service = self._create_worker_service()
+                self._tab_services.append(tab_service)
+                self._workers.append(self.orchestrator_factory(tab_service))
+                self._stats.append(TabStats(tab_index=index))
+                self._idle_workers.put(index)
+        except Exception:
+            self.close()
+            raise
+
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="TabWorker")
+        self._started = True
+        self.logger.info(f"✅ 标签页工作池已启动，标签页数量: {self.size}")
+        return self
+
+    def _create_worker_service(self):
+        """为单个工作单元创建浏览器服务"""
+        return self.browser_service.create_tab_service()
+
+    def map(self, func: Callable[[Any, Any], Any], items: Sequence[Any],
+            should_continue: Optional[Callable[[int, Any], bool]] = None) -> List[Optional[Any]]:
+        """
+        并发执行任务
+
+        Args:
+            func: 任务函数，签名为 func(worker, item)，worker 为标签页绑定的协调器
+            items: 任务参数列表
+            should_continue: 任务开始前的检查函数，签名为 should_continue(index, item)，
+                返回 False 时停止派发后续任务
+
+        Returns:
+            List[Optional[Any]]: 与 items 顺序一致的结果，失败或被跳过的任务为 None
+        """
+        if not self._started:
+            self.start()
+
+        results: List[Optional[Any]] = [None] * len(items)
+        stop_event = threading.Event()
+
+        def run(index: int, item: Any) -> None:
+            if stop_event.is_set():
+                return
+            worker_index = self._idle_workers.get()
+            try:
+                if stop_event.is_set():
+                    return
+                if should_continue and not should_continue(index, item):
+                    stop_event.set()
+                    return
+
+                start_time = time.time()
+                failed = False
+                try:
+                    results[index] = func(self._workers[worker_index], item)
+                except Exception as e:
+                    failed = True
+                    self.logger.error(f"标签页{worker_index}执行任务{index}失败: {e}")
+                finally:
+                    self._record(worker_index, time.time() - start_time, failed)
+            finally:
+                self._idle_workers.put(worker_index)
+
+        futures = [self._executor.submit(run, index, item) for index, item in enumerate(items)]
+        for future in futures:
+            future.result()
+
+        return results
+
+    def _record(self, worker_index: int, elapsed: float, failed: bool) -> None:
+        with self._stats_lock:
+            stats = self._stats[worker_index]
+            stats.tasks += 1
+            stats.busy_time += elapsed
+            stats.max_task_time = max(stats.max_task_time, elapsed)
+            if failed:
+                stats.failures += 1
+
+    def get_tab_stats(self) -> List[Dict[str, Any]]:
+        """获取各标签页的运行统计"""
+        with self._stats_lock:
+            return [stats.to_dict() for stats in self._stats]
+
+    def close(self) -> None:
+        """关闭线程池和所有标签页"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        for worker in self._workers:
+            try:
+                worker.close()
+            except Exception as e:
+                self.logger.warning(f"关闭标签页协调器失败: {e}")
+
+        for tab_service in self._tab_services:
+            try:
+                tab_service.close_sync()
+            except Exception as e:
+                self.logger.warning(f"关闭标签页失败: {e}")
+
+        self._workers.clear()
+        self._tab_services.clear()
+        self._idle_workers = queue.Queue()
+        self._started = False
+
+
+class ContextWorkerPool(TabWorkerPool):
+    """
+    多浏览器上下文工作池
+
+    每个工作单元持有独立的浏览器上下文（共享同一浏览器进程），适用于店铺级并发。
+    """
+
+    def _create_worker_service(self):
+        """为单个工作单元创建隔离上下文的浏览器服务"""
+        return self.browser_service.create_context_service()
@@ -0,0 +1,92 @@
+"""
+HTML解析后端
+
+所有抓取器统一通过 parse_html() 构建 BeautifulSoup 对象，按配置选择解析后端：
+- lxml：C 实现的解析器，解析整页OZON商品页比 html.parser 快数倍
+- html.parser：Python 内置解析器，无额外依赖，作为兜底
+
+默认 'auto'：安装了 lxml 时使用 lxml，否则使用 html.parser。
+两种后端都返回 BeautifulSoup 对象，select()/get_text() 等调用方式完全一致，
+各提取逻辑无需修改；两者结果的一致性由 tests/utils/test_html_parser.py 基于 tests/resources 中的页面验证。
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+
+PARSER_AUTO = 'auto'
+PARSER_LXML = 'lxml'
+PARSER_HTML = 'html.parser'
+SUPPORTED_PARSERS = (PARSER_AUTO, PARSER_LXML, PARSER_HTML)
+
+# 通过 set_html_parser() 配置的后端（未配置时读取环境变量 HTML_PARSER）
+_configured_parser: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_parser(parser: Optional[str] = None) -> str:
+    """
+    解析实际使用的后端名称
+
+    Args:
+        parser: 指定后端（auto/lxml/html.parser），为空时使用全局配置
+
+    Returns:
+        str: BeautifulSoup 可用的解析器名称
+    """
+    parser = parser or _configured_parser or os.getenv('HTML_PARSER') or PARSER_AUTO
+    if parser == PARSER_HTML:
+        return PARSER_HTML
+    if parser in (PARSER_AUTO, PARSER_LXML) and _lxml_available():
+        return PARSER_LXML
+    if parser == PARSER_LXML:
+        logging.getLogger(__name__).warning("⚠️ 未安装 lxml，HTML解析回退到 html.parser")
+    return PARSER_HTML
+
+
+def parse_html(html: Optional[str], parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    解析HTML为 BeautifulSoup 对象
+
+    Args:
+        html: 页面HTML
+        parser: 指定后端，为空时使用全局配置
+
+    Returns:
+        BeautifulSoup: 解析结果
+    """
+    backend = resolve_parser(parser)
+    try:
+        return BeautifulSoup(html or '', backend)
+    except FeatureNotFound:
+        return BeautifulSoup(html or '', PARSER_HTML)
+
+
+def set_html_parser(parser: Optional[str]) -> str:
+    """
+    设置全局HTML解析后端
+
+    Args:
+        parser: auto/lxml/html.parser，为空时恢复默认
+
+    Returns:
+        str: 实际使用的解析器名称
+    """
+    global _configured_parser
+
+    if parser and parser not in SUPPORTED_PARSERS:
+        raise ValueError(f"不支持的HTML解析后端: {parser}，可选: {', '.join(SUPPORTED_PARSERS)}")
+    _configured_parser = parser or None
+    return resolve_parser()
@@ -0,0 +1,344 @@
+"""
+页面抓取磁盘缓存
+
+以标准化URL（忽略大小写的域名、末尾斜杠和查询参数顺序）为键，持久化保存压缩后的页面HTML和提取结果字典：
+- 按数据来源（ozon、seerfar等）设置不同的过期时间（TTL）
+- 限制缓存总大小，超出后按最近最少使用（LRU）淘汰
+- 支持强制刷新：忽略已有缓存，但仍写入新的抓取结果
+
+缓存只在抓取流程中通过 configure_page_cache() 启用，未启用时 get_page_cache() 返回 None，
+各抓取器按无缓存方式运行。默认只在试运行（dryrun）中启用：正式运行的店铺判定需要最新的价格和跟卖数据，
+需要时可通过 performance.page_cache_always 开启。
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".xuanping" / "cache"
+
+
+def normalize_cache_url(url: str) -> str:
+    """
+    标准化缓存URL
+
+    保留查询参数（Seerfar店铺页依赖 storeId 等参数），但按参数名排序；
+    只由路径决定的页面（如OZON商品页）应由调用方先去掉查询参数。
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+    return f"{normalized}?{query}" if query else normalized
+
+
+@dataclass
+class CacheEntry:
+    """缓存条目"""
+    url: str
+    source: str
+    kind: str
+    html: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    created_at: float = 0.0
+
+    @property
+    def age(self) -> float:
+        """条目存在时间（秒）"""
+        return time.time() - self.created_at
+
+
+@dataclass
+class CacheStats:
+    """缓存统计"""
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    writes: int = 0
+    evictions: int = 0
+    bypassed: int = 0  # 强制刷新时跳过的读取次数
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PageCache:
+    """
+    基于 SQLite 的页面缓存
+
+    线程安全，可在多标签页/多上下文并发抓取时共享同一实例。
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None,
+                 max_size_bytes: int = 512 * 1024 * 1024,
+                 default_ttl: int = 3600,
+                 ttl_by_source: Optional[Dict[str, int]] = None,
+                 force_refresh: bool = False):
+        """
+        初始化页面缓存
+
+        Args:
+            cache_dir: 缓存目录，默认 ~/.xuanping/cache
+            max_size_bytes: 缓存总大小上限（字节）
+            default_ttl: 未单独配置来源的默认过期时间（秒）
+            ttl_by_source: 按来源配置的过期时间（秒）
+            force_refresh: 是否忽略已有缓存强制重新抓取
+        """
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_size_bytes = max_size_bytes
+        self.default_ttl = default_ttl
+        self.ttl_by_source = dict(ttl_by_source or {})
+        self.force_refresh = force_refresh
+        self.stats = CacheStats()
+
+        self._lock = threading.RLock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.cache_dir / "page_cache.db"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, url TEXT, source TEXT, kind TEXT,"
+            " html BLOB, data TEXT, size INTEGER, created_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, performance_config, force_refresh: Optional[bool] = None) -> 'PageCache':
+        """根据 PerformanceConfig 创建缓存"""
+        return cls(
+            cache_dir=performance_config.page_cache_dir or None,
+            max_size_bytes=performance_config.page_cache_max_size_mb * 1024 * 1024,
+            default_ttl=performance_config.cache_ttl,
+            ttl_by_source=performance_config.page_cache_ttl_by_source,
+            force_refresh=performance_config.force_refresh if force_refresh is None else force_refresh
+        )
+
+    @staticmethod
+    def make_key(url: str, kind: str) -> str:
+        """生成缓存键"""
+        return f"{kind}:{normalize_cache_url(url)}"
+
+    def get_ttl(self, source: str) -> int:
+        """获取来源对应的过期时间"""
+        return self.ttl_by_source.get(source, self.default_ttl)
+
+    def get(self, url: str, source: str, kind: str = "page") -> Optional[CacheEntry]:
+        """
+        读取缓存条目
+
+        Args:
+            url: 页面URL
+            source: 数据来源（决定TTL）
+            kind: 缓存内容类型（同一URL可缓存多种提取结果）
+
+        Returns:
+            CacheEntry: 未过期的缓存条目，未命中、过期或强制刷新时返回 None
+        """
+        if not url:
+            return None
+
+        with self._lock:
+            if self.force_refresh:
+                self.stats.bypassed += 1
+                return None
+
+            key = self.make_key(url, kind)
+            row = self._conn.execute(
+                "SELECT html, data, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            html_blob, data_text, created_at = row
+            if time.time() - created_at > self.get_ttl(source):
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.stats.hits += 1
+
+        return CacheEntry(
+            url=url,
+            source=source,
+            kind=kind,
+            html=zlib.decompress(html_blob).decode('utf-8') if html_blob else None,
+            data=json.loads(data_text) if data_text else None,
+            created_at=created_at
+        )
+
+    def get_data(self, url: str, source: str, kind: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的提取结果"""
+        entry = self.get(url, source, kind)
+        return entry.data if entry else None
+
+    def put(self, url: str, source: str, kind: str = "page",
+            html: Optional[str] = None, data: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        写入缓存条目
+
+        Args:
+            url: 页面URL
+            source: 数据来源
+            kind: 缓存内容类型
+            html: 页面HTML（压缩保存）
+            data: 提取结果（JSON序列化保存）
+
+        Returns:
+            bool: 是否写入成功
+        """
+        if not url or (html is None and data is None):
+            return False
+
+        try:
+            html_blob = zlib.compress(html.encode('utf-8'), 6) if html else None
+            data_text = json.dumps(data, ensure_ascii=False, default=str) if data is not None else None
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"缓存数据序列化失败，跳过写入: {e}")
+            return False
+
+        size = len(html_blob or b'') + len((data_text or '').encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, source, kind, html, data, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(url, kind), normalize_cache_url(url), source, kind,
+                 html_blob, data_text, size, now, now)
+            )
+            self.stats.writes += 1
+            self._evict_if_needed()
+            self._conn.commit()
+        return True
+
+    def _evict_if_needed(self) -> None:
+        """超出大小上限时按最近最少使用淘汰"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.stats.evictions += 1
+
+    def invalidate(self, url: str, kind: Optional[str] = None) -> int:
+        """
+        删除指定URL的缓存
+
+        Args:
+            url: 页面URL
+            kind: 缓存内容类型，为空时删除该URL的所有类型
+
+        Returns:
+            int: 删除的条目数
+        """
+        with self._lock:
+            if kind:
+                cursor = self._conn.execute("DELETE FROM entries WHERE key = ?", (self.make_key(url, kind),))
+            else:
+                cursor = self._conn.execute("DELETE FROM entries WHERE url = ?", (normalize_cache_url(url),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            return {
+                'hits': self.stats.hits,
+                'misses': self.stats.misses,
+                'expired': self.stats.expired,
+                'writes': self.stats.writes,
+                'evictions': self.stats.evictions,
+                'bypassed': self.stats.bypassed,
+                'hit_rate': round(self.stats.hit_rate, 3),
+                'entries': entries,
+                'size_bytes': size
+            }
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception as e:
+                self.logger.warning(f"关闭页面缓存失败: {e}")
+
+
+# 全局缓存实例（由抓取流程启用）
+_global_page_cache: Optional[PageCache] = None
+_global_page_cache_lock = threading.Lock()
+
+
+def configure_page_cache(performance_config, dryrun: bool = False) -> Optional[PageCache]:
+    """
+    根据性能配置启用全局页面缓存
+
+    Args:
+        performance_config: PerformanceConfig 实例
+        dryrun: 是否为试运行（正式运行只在 page_cache_always 开启时启用缓存）
+
+    Returns:
+        PageCache: 启用的缓存实例，配置禁用缓存或初始化失败时返回 None
+    """
+    global _global_page_cache
+
+    with _global_page_cache_lock:
+        if _global_page_cache:
+            _global_page_cache.close()
+            _global_page_cache = None
+
+        if not performance_config.enable_cache:
+            return None
+        if not (dryrun or performance_config.page_cache_always):
+            return None
+
+        try:
+            _global_page_cache = PageCache.from_config(performance_config)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️ 页面缓存初始化失败，按无缓存模式运行: {e}")
+            _global_page_cache = None
+
+        return _global_page_cache
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """获取全局页面缓存，未启用时返回 None"""
+    return _global_page_cache
+
+
+def reset_page_cache() -> None:
+    """关闭并移除全局页面缓存"""
+    global _global_page_cache
+
+    with _global_page_cache_lock:
+        if _global_page_cache:
+            _global_page_cache.close()
+        _global_page_cache = None
@@ -0,0 +1,234 @@
+"""
+跨店铺商品结果备忘
+
+同一批店铺中同一个 OZON 商品（SKU）经常出现在多个店铺下，跟卖商品也会通过 first_competitor_product_id
+被多次访问。备忘以标准化商品ID为键保存本次运行中已完成的结果：
+- full_chain: 商品完整抓取结果（原商品、跟卖商品、跟卖列表）
+- product: 单个商品页的抓取结果（原商品和跟卖商品共用）
+- evaluation: 利润评估结果（只保存在内存中）
+
+key_lock() 保证并发抓取同一商品时只有一个线程（或桥接任务）打开页面，其余等待后直接使用结果；
+桥接任务在事件循环上轮询等待，不阻塞其他标签页。
+配置了 product_memo_path 时，可序列化为 JSON 的结果同时写入 SQLite，下次运行在有效期内直接使用。
+
+备忘只在抓取流程中通过 configure_product_memo() 启用，未启用时 get_product_memo() 返回 None。
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from rpa.browser.implementations.loop_bridge import cooperative_sleep, in_loop_bridge
+
+# 与 ScrapingUtils.extract_product_id_from_url 支持的URL格式一致
+_PRODUCT_ID_PATTERNS = (
+    re.compile(r'/product/[^/?#]+-(\d+)'),  # /product/haval-kolesnyy-disk-2964205200/
+    re.compile(r'/product/(\d+)'),  # /product/123456789/
+)
+
+# 桥接任务中轮询等待商品锁的间隔（秒）
+_BRIDGE_POLL_INTERVAL = 0.05
+
+
+def normalize_product_id(product_id: Optional[Any] = None, url: Optional[str] = None) -> Optional[str]:
+    """
+    标准化商品ID
+
+    Args:
+        product_id: 商品ID（纯数字时直接使用）
+        url: 商品URL（商品ID缺失或不是纯数字时从URL中提取）
+
+    Returns:
+        Optional[str]: 去掉前导零的数字ID，无法确定时返回 None
+    """
+    if product_id is not None:
+        text = str(product_id).strip()
+        if text.isdigit():
+            return str(int(text))
+    if url:
+        for pattern in _PRODUCT_ID_PATTERNS:
+            match = pattern.search(url)
+            if match:
+                return str(int(match.group(1)))
+    return None
+
+
+class ProductMemo:
+    """
+    商品结果备忘
+
+    线程安全，店铺并发和多标签页并发时共享同一实例。
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, ttl: int = 6 * 3600):
+        """
+        初始化备忘
+
+        Args:
+            db_path: SQLite 文件路径，None 表示只在本次运行的内存中保存
+            ttl: 持久化结果的有效期（秒）
+        """
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.db_path = Path(db_path) if db_path else None
+        self.ttl = ttl
+        self._memory: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.RLock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'hits': 0, 'misses': 0, 'writes': 0})
+
+        self._conn = None
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS product_memo ("
+                " kind TEXT, product_id TEXT, value TEXT, created_at REAL,"
+                " PRIMARY KEY (kind, product_id))"
+            )
+            self._conn.commit()
+
+    @contextmanager
+    def key_lock(self, kind: str, product_id: str) -> Iterator[None]:
+        """同一商品的计算串行执行（不同商品互不阻塞）"""
+        with self._lock:
+            lock = self._key_locks.setdefault((kind, product_id), threading.Lock())
+        if in_loop_bridge():
+            # 事件循环上不能阻塞（持有锁的可能是同一事件循环上的另一个桥接任务）
+            while not lock.acquire(blocking=False):
+                cooperative_sleep(_BRIDGE_POLL_INTERVAL)
+        else:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def get(self, kind: str, product_id: str) -> Optional[Any]:
+        """
+        获取结果（先查内存，再查未过期的持久化结果）
+
+        Returns:
+            Optional[Any]: 保存的结果，不存在时返回 None
+        """
+        key = (kind, product_id)
+        with self._lock:
+            value = self._memory.get(key)
+            if value is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM product_memo WHERE kind = ? AND product_id = ?", key
+                ).fetchone()
+                if row and time.time() - row[1] <= self.ttl:
+                    value = self._memory[key] = json.loads(row[0])
+            self._stats[kind]['hits' if value is not None else 'misses'] += 1
+            return value
+
+    def put(self, kind: str, product_id: str, value: Any, persist: bool = True):
+        """
+        保存结果
+
+        Args:
+            kind: 结果类型
+            product_id: 标准化商品ID
+            value: 结果（None 不保存）
+            persist: 是否写入持久化存储（值需可序列化为JSON，否则只保存在内存中）
+        """
+        if value is None:
+            return
+        key = (kind, product_id)
+        with self._lock:
+            self._memory[key] = value
+            self._stats[kind]['writes'] += 1
+            if persist and self._conn is not None:
+                try:
+                    payload = json.dumps(value, ensure_ascii=False)
+                except (TypeError, ValueError) as e:
+                    self.logger.debug(f"商品结果无法序列化，只保存在内存中: {e}")
+                    return
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO product_memo (kind, product_id, value, created_at) VALUES (?, ?, ?, ?)",
+                    (kind, product_id, payload, time.time())
+                )
+                self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中统计（总计和按结果类型）"""
+        with self._lock:
+            by_kind = {kind: dict(counts) for kind, counts in self._stats.items()}
+            return {
+                'hits': sum(counts['hits'] for counts in by_kind.values()),
+                'misses': sum(counts['misses'] for counts in by_kind.values()),
+                'entries': len(self._memory),
+                'by_kind': by_kind,
+            }
+
+    def close(self):
+        """关闭持久化存储"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception as e:
+                    self.logger.warning(f"关闭商品结果备忘失败: {e}")
+                self._conn = None
+
+
+# 全局备忘实例（由抓取流程启用）
+_global_product_memo: Optional[ProductMemo] = None
+_global_product_memo_lock = threading.Lock()
+
+
+def configure_product_memo(performance_config) -> Optional[ProductMemo]:
+    """
+    根据性能配置启用全局商品结果备忘
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        ProductMemo: 启用的备忘实例，配置禁用时返回 None
+    """
+    global _global_product_memo
+
+    with _global_product_memo_lock:
+        if _global_product_memo is not None:
+            _global_product_memo.close()
+            _global_product_memo = None
+
+        if not performance_config.product_memo:
+            return None
+
+        try:
+            _global_product_memo = ProductMemo(
+                Path(performance_config.product_memo_path).expanduser() if performance_config.product_memo_path else None,
+                ttl=performance_config.product_memo_ttl
+            )
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"⚠️ 商品结果备忘持久化初始化失败，只在内存中保存: {e}")
+            _global_product_memo = ProductMemo(ttl=performance_config.product_memo_ttl)
+
+        return _global_product_memo
+
+
+def get_product_memo() -> Optional[ProductMemo]:
+    """获取全局商品结果备忘，未启用时返回 None"""
+    return _global_product_memo
+
+
+def reset_product_memo() -> None:
+    """关闭并移除全局商品结果备忘"""
+    global _global_product_memo
+
+    with _global_product_memo_lock:
+        if _global_product_memo is not None:
+            _global_product_memo.close()
+        _global_product_memo = None
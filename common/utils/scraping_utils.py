@@ -6,10 +6,12 @@
 
 import logging
 import re
-from typing import Optional, Dict, Any, List, Callable
+from typing import Optional, Dict, Any, List, Callable, Iterable
 
 from bs4 import BeautifulSoup
 
+from .html_parser import parse_html
+
 
 def is_valid_product_image(image_url: str, image_config: Dict[str, Any]) -> bool:
     """
@@ -343,7 +345,7 @@ class ScrapingUtils:
 
             try:
                 page_content = browser_service.evaluate_sync("() => document.documentElement.outerHTML")
-                return BeautifulSoup(page_content, 'html.parser')
+                return parse_html(page_content)
             except Exception as e:
                 raise Exception(f"页面内容解析失败: {e}")
 
@@ -519,41 +521,83 @@ class ScrapingUtils:
             str: 商品图片URL，如果提取失败返回None
         """
         try:
-            # 获取配置
-            placeholder_patterns = image_config.get('placeholder_patterns', [])
-            conversion_config = image_config.get('conversion_config', {})
-
-            for selector in image_selectors:
-                img_elements = soup.select(selector)
-                self.logger.debug(f"🔍 选择器 '{selector}' 找到 {len(img_elements)} 个图片元素")
-
-                for img_element in img_elements:
-                    src = img_element.get('src')
-                    if not src:
-                        continue
-
-                    # 转换为高清版本
-                    high_res_url = self.convert_to_high_res_image(src, conversion_config)
-
-                    # 验证图片URL是否为占位符
-                    if is_placeholder_image(high_res_url, placeholder_patterns):
-                        self.logger.warning(f"⚠️ 跳过占位符图片: {high_res_url}")
-                        continue
-
-                    # 验证图片URL是否为有效的商品图片
-                    if is_valid_product_image(high_res_url, image_config):
-                        self.logger.info(f"✅ 成功提取商品图片: {high_res_url}")
-                        return high_res_url
-                    else:
-                        self.logger.debug(f"🔍 跳过无效图片: {high_res_url}")
-
-            self.logger.warning("⚠️ 未找到有效的商品图片")
-            return None
+            def iter_image_srcs():
+                for selector in image_selectors:
+                    img_elements = soup.select(selector)
+                    self.logger.debug(f"🔍 选择器 '{selector}' 找到 {len(img_elements)} 个图片元素")
+                    for img_element in img_elements:
+                        yield img_element.get('src')
+
+            return self.pick_product_image(iter_image_srcs(), image_config)
 
         except Exception as e:
             self.logger.error(f"提取商品图片失败: {e}")
             return None
 
+    def pick_product_image(self, image_srcs: Iterable[Optional[str]], image_config: Dict[str, Any]) -> Optional[str]:
+        """
+        从候选图片地址中选出第一个有效的商品图片
+
+        Args:
+            image_srcs: 按选择器优先级排列的图片地址
+            image_config: 图片配置，字段同 extract_product_image
+
+        Returns:
+            str: 商品图片URL，如果没有有效图片返回None
+        """
+        placeholder_patterns = image_config.get('placeholder_patterns', [])
+        conversion_config = image_config.get('conversion_config', {})
+
+        for src in image_srcs:
+            if not src:
+                continue
+
+            # 转换为高清版本
+            high_res_url = self.convert_to_high_res_image(src, conversion_config)
+
+            # 验证图片URL是否为占位符
+            if is_placeholder_image(high_res_url, placeholder_patterns):
+                self.logger.warning(f"⚠️ 跳过占位符图片: {high_res_url}")
+                continue
+
+            # 验证图片URL是否为有效的商品图片
+            if is_valid_product_image(high_res_url, image_config):
+                self.logger.info(f"✅ 成功提取商品图片: {high_res_url}")
+                return high_res_url
+            else:
+                self.logger.debug(f"🔍 跳过无效图片: {high_res_url}")
+
+        self.logger.warning("⚠️ 未找到有效的商品图片")
+        return None
+
+    def extract_price_from_texts(self, price_texts: Iterable[str], price_type: str = "default") -> Optional[float]:
+        """
+        从候选价格文本中提取第一个有效价格
+
+        与 extract_price_from_soup 的解析规则一致，用于页面内脚本已按选择器优先级取出文本的场景。
+
+        Args:
+            price_texts: 按选择器优先级排列的元素文本
+            price_type: 价格类型（仅用于日志）
+
+        Returns:
+            Optional[float]: 提取的价格，未找到返回None
+        """
+        for price_text in price_texts or []:
+            if not price_text:
+                continue
+            try:
+                price = self.extract_price(price_text)
+                if price and validate_price(price):
+                    self.logger.debug(f"✅ 提取到{price_type}价格: {price}")
+                    return price
+            except (ValueError, TypeError, AttributeError) as e:
+                self.logger.debug(f"价格解析失败: {price_text[:30]} - {e}")
+                continue
+
+        self.logger.debug(f"⚠️ 未能提取到{price_type}价格")
+        return None
+
     def extract_price_from_soup(self, soup, price_type: str = "default", max_elements: int = 50) -> Optional[float]:
 
         if not soup:
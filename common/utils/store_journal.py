@@ -0,0 +1,201 @@
+"""
+店铺处理断点日志
+
+每个店铺处理完成后立即向 JSONL 文件追加一条记录（写入后 fsync），进程崩溃时已完成的店铺结果不会丢失。
+续跑（--resume）时读取日志，跳过已成功处理的店铺，并把记录的结果回放到Excel更新中。
+
+日志默认保存在Excel文件旁：<Excel文件名>.journal.jsonl。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from common.models.business_models import StoreAnalysisResult, StoreInfo
+from common.models.enums import GoodStoreFlag, StoreStatus
+
+
+def default_journal_path(excel_file_path: Union[str, Path]) -> Path:
+    """获取Excel文件对应的默认日志路径"""
+    excel_path = Path(excel_file_path)
+    return excel_path.with_name(f"{excel_path.name}.journal.jsonl")
+
+
+@dataclass
+class StoreJournalRecord:
+    """单个店铺的日志记录"""
+    store_id: str
+    row_index: int
+    is_good_store: str
+    status: str
+    total_products: int = 0
+    profitable_products: int = 0
+    sold_30days: Optional[float] = None
+    sold_count_30days: Optional[int] = None
+    daily_avg_sold: Optional[float] = None
+    recorded_at: float = 0.0
+
+    @classmethod
+    def from_result(cls, row_index: int, result: StoreAnalysisResult) -> 'StoreJournalRecord':
+        """根据店铺分析结果创建记录"""
+        store_info = result.store_info
+        return cls(
+            store_id=store_info.store_id,
+            row_index=row_index,
+            is_good_store=GoodStoreFlag(store_info.is_good_store).value,
+            status=StoreStatus(store_info.status).value,
+            total_products=result.total_products,
+            profitable_products=result.profitable_products,
+            sold_30days=store_info.sold_30days,
+            sold_count_30days=store_info.sold_count_30days,
+            daily_avg_sold=store_info.daily_avg_sold,
+            recorded_at=time.time()
+        )
+
+    @property
+    def is_completed(self) -> bool:
+        """是否已成功处理（失败的店铺续跑时重新处理）"""
+        return self.status == StoreStatus.PROCESSED.value
+
+    def to_result(self) -> StoreAnalysisResult:
+        """还原为店铺分析结果（不含商品明细）"""
+        store_info = StoreInfo(
+            store_id=self.store_id,
+            sold_30days=self.sold_30days,
+            sold_count_30days=self.sold_count_30days,
+            daily_avg_sold=self.daily_avg_sold
+        )
+        result = StoreAnalysisResult(store_info=store_info, products=[])
+
+        # StoreAnalysisResult 会按空商品列表重算汇总，这里恢复日志中记录的值
+        result.total_products = self.total_products
+        result.profitable_products = self.profitable_products
+        store_info.total_products_checked = self.total_products
+        store_info.profitable_products_count = self.profitable_products
+        store_info.is_good_store = GoodStoreFlag(self.is_good_store)
+        store_info.status = StoreStatus(self.status)
+        store_info.needs_split = store_info.is_good_store == GoodStoreFlag.YES
+        return result
+
+
+class StoreJournal:
+    """
+    追加写入的店铺处理日志
+
+    线程安全，可在店铺并发处理时共享同一实例。
+    """
+
+    def __init__(self, journal_path: Union[str, Path]):
+        """
+        初始化日志
+
+        Args:
+            journal_path: 日志文件路径
+        """
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.journal_path = Path(journal_path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    @staticmethod
+    def make_key(store_id: str, row_index: int) -> str:
+        """生成记录键（同一店铺ID可能出现在多行）"""
+        return f"{row_index}:{store_id}"
+
+    def load(self) -> Dict[str, StoreJournalRecord]:
+        """
+        读取已有日志
+
+        同一店铺有多条记录时以最后一条为准；崩溃时写了一半的末行会被忽略。
+
+        Returns:
+            Dict[str, StoreJournalRecord]: 以 make_key() 为键的记录
+        """
+        records: Dict[str, StoreJournalRecord] = {}
+        if not self.journal_path.exists():
+            return records
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = StoreJournalRecord(**json.loads(line))
+                except (TypeError, ValueError) as e:
+                    self.logger.warning(f"⚠️ 跳过无法解析的日志行 {line_no}: {e}")
+                    continue
+                records[self.make_key(record.store_id, record.row_index)] = record
+
+        return records
+
+    def open(self, resume: bool = False) -> 'StoreJournal':
+        """
+        打开日志准备写入
+
+        Args:
+            resume: 续跑时在原日志后追加；否则将旧日志备份为 .bak 后重新开始
+        """
+        with self._lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            if not resume and self.journal_path.exists():
+                backup_path = self.journal_path.with_name(f"{self.journal_path.name}.bak")
+                os.replace(self.journal_path, backup_path)
+                self.logger.info(f"📒 旧的处理日志已备份: {backup_path}")
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        return self
+
+    def append(self, row_index: int, result: StoreAnalysisResult) -> None:
+        """追加一条店铺结果并落盘"""
+        record = StoreJournalRecord.from_result(row_index, result)
+        line = json.dumps(asdict(record), ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("处理日志未打开")
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def split_pending(self, stores: List, records: Dict[str, StoreJournalRecord]):
+        """
+        按日志拆分店铺列表
+
+        Args:
+            stores: 待处理店铺（ExcelStoreData）
+            records: load() 返回的记录
+
+        Returns:
+            tuple: (需要处理的店铺, 已完成的店铺, 已完成店铺对应的记录)
+        """
+        remaining, done, done_records = [], [], []
+        for store_data in stores:
+            record = records.get(self.make_key(store_data.store_id, store_data.row_index))
+            if record and record.is_completed:
+                done.append(store_data)
+                done_records.append(record)
+            else:
+                remaining.append(store_data)
+        return remaining, done, done_records
+
+    def close(self) -> None:
+        """关闭日志文件"""
+        with self._lock:
+            if self._file:
+                try:
+                    self._file.close()
+                except Exception as e:
+                    self.logger.warning(f"关闭处理日志失败: {e}")
+                self._file = None
+
+    def remove(self) -> None:
+        """删除日志文件（整批结果已写入Excel后调用）"""
+        self.close()
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,276 @@
+"""
+带超时的操作执行器
+
+所有抓取器共享一个有界线程池执行带超时的浏览器操作，替代每次调用新建线程的方式：
+- 超时后取消该操作在驱动事件循环中未完成的协程，之后该操作的浏览器调用直接失败，
+  不会继续操作共享页面、与下一个商品的导航竞争
+- 线程池中的操作再次调用带超时操作时（嵌套）在当前线程内执行，由共享的截止时间监控线程
+  到期取消，避免嵌套调用占满线程池
+- 在浏览器事件循环的桥接任务中（异步执行模式）同样在当前任务内执行，不切换到线程池
+- 统计执行中、超时、取消的操作数量
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+from rpa.browser.implementations.cancellation import CancellationScope, cancellation_scope, current_scope
+from rpa.browser.implementations.loop_bridge import in_loop_bridge
+
+DEFAULT_MAX_WORKERS = 16
+
+_worker_local = threading.local()
+
+
+def _mark_worker_thread() -> None:
+    _worker_local.is_worker = True
+
+
+def _in_worker_thread() -> bool:
+    return getattr(_worker_local, 'is_worker', False)
+
+
+class _DeadlineWatchdog:
+    """共享的截止时间监控线程：到期执行回调（用于取消嵌套操作）"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._heap = []
+        self._counter = itertools.count()
+        self._cancelled = set()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def schedule(self, delay: float, callback: Callable[[], Any]) -> int:
+        """安排回调，返回可用于 cancel 的句柄"""
+        with self._condition:
+            handle = next(self._counter)
+            heapq.heappush(self._heap, (time.monotonic() + delay, handle, callback))
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="scraper-deadline-watchdog", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+            return handle
+
+    def cancel(self, handle: int) -> None:
+        with self._condition:
+            self._cancelled.add(handle)
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._heap and self._heap[0][1] in self._cancelled:
+                        _, handle, _ = heapq.heappop(self._heap)
+                        self._cancelled.discard(handle)
+                        continue
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    remaining = self._heap[0][0] - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._stopped:
+                    return
+                _, handle, callback = heapq.heappop(self._heap)
+            try:
+                callback()
+            except Exception as e:
+                logging.getLogger(__name__).debug(f"截止时间回调执行失败: {e}")
+
+
+class TimeoutExecutor:
+    """
+    共享的有界超时执行器
+
+    超时时抛出 TimeoutError；操作本身的异常原样抛出。
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        初始化执行器
+
+        Args:
+            max_workers: 线程池大小（同时执行的带超时操作上限）
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="scraper-op",
+            initializer=_mark_worker_thread
+        )
+        self._watchdog = _DeadlineWatchdog()
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'in_flight': 0,
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'cancelled_before_start': 0,
+            'cancelled_coroutines': 0,
+            'running_after_timeout': 0,
+        }
+
+    def _count(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += delta
+
+    def run(self, operation_func: Callable[[], Any], timeout: float, operation_name: str = "operation") -> Any:
+        """
+        执行带超时的操作
+
+        Args:
+            operation_func: 要执行的操作函数
+            timeout: 超时时间（秒）
+            operation_name: 操作名称（用于日志和取消异常信息）
+
+        Returns:
+            Any: 操作结果
+
+        Raises:
+            TimeoutError: 操作超时
+            Exception: 操作执行异常
+        """
+        scope = CancellationScope(operation_name, parent=current_scope())
+        self._count('submitted')
+        if _in_worker_thread() or in_loop_bridge():
+            return self._run_inline(operation_func, timeout, scope)
+        return self._run_in_pool(operation_func, timeout, scope)
+
+    def _run_in_pool(self, operation_func: Callable[[], Any], timeout: float, scope: CancellationScope) -> Any:
+        def invoke():
+            with cancellation_scope(scope):
+                return operation_func()
+
+        self._count('in_flight')
+        future = self._executor.submit(invoke)
+        future.add_done_callback(lambda _: self._count('in_flight', -1))
+
+        done, _ = wait([future], timeout=timeout)
+        if not done:
+            self._handle_pool_timeout(future, scope, timeout)
+            raise TimeoutError(f"{scope.name}超时（{timeout:.1f}秒）")
+
+        try:
+            result = future.result()
+        except Exception:
+            self._count('failed')
+            raise
+        self._count('completed')
+        return result
+
+    def _handle_pool_timeout(self, future: Future, scope: CancellationScope, timeout: float) -> None:
+        self._count('timed_out')
+        if future.cancel():
+            # 线程池已满，操作尚未开始
+            self._count('cancelled_before_start')
+            self.logger.error(f"⏰ {scope.name}超时（{timeout}秒），操作排队未执行，已取消")
+            return
+
+        cancelled = scope.cancel()
+        self._count('cancelled_coroutines', cancelled)
+        self._count('running_after_timeout')
+        future.add_done_callback(lambda _: self._count('running_after_timeout', -1))
+        self.logger.error(
+            f"⏰ {scope.name}超时（{timeout}秒），已取消{cancelled}个浏览器协程，该操作后续的浏览器调用将不再执行"
+        )
+
+    def _run_inline(self, operation_func: Callable[[], Any], timeout: float, scope: CancellationScope) -> Any:
+        expired = threading.Event()
+
+        def on_deadline():
+            expired.set()
+            self._count('cancelled_coroutines', scope.cancel())
+
+        handle = self._watchdog.schedule(timeout, on_deadline)
+        self._count('in_flight')
+        try:
+            with cancellation_scope(scope):
+                result = operation_func()
+        except Exception:
+            if expired.is_set():
+                self._count('timed_out')
+                raise TimeoutError(f"{scope.name}超时（{timeout:.1f}秒）")
+            self._count('failed')
+            raise
+        finally:
+            self._watchdog.cancel(handle)
+            self._count('in_flight', -1)
+
+        if expired.is_set():
+            self._count('timed_out')
+            raise TimeoutError(f"{scope.name}超时（{timeout:.1f}秒）")
+        self._count('completed')
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取执行统计"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['max_workers'] = self.max_workers
+        return stats
+
+    def shutdown(self) -> None:
+        """关闭线程池（不等待超时后仍在运行的操作）"""
+        self._watchdog.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 全局执行器实例（所有抓取器共享）
+_global_timeout_executor: Optional[TimeoutExecutor] = None
+_global_timeout_executor_lock = threading.Lock()
+
+
+def get_global_timeout_executor() -> TimeoutExecutor:
+    """获取全局超时执行器实例"""
+    global _global_timeout_executor
+
+    with _global_timeout_executor_lock:
+        if _global_timeout_executor is None:
+            _global_timeout_executor = TimeoutExecutor()
+        return _global_timeout_executor
+
+
+def configure_timeout_executor(performance_config) -> TimeoutExecutor:
+    """
+    根据性能配置设置全局超时执行器（线程池大小变化时重建）
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        TimeoutExecutor: 全局执行器实例
+    """
+    global _global_timeout_executor
+
+    max_workers = getattr(performance_config, 'timeout_executor_workers', DEFAULT_MAX_WORKERS)
+    with _global_timeout_executor_lock:
+        if _global_timeout_executor is not None:
+            if _global_timeout_executor.max_workers == max_workers:
+                return _global_timeout_executor
+            _global_timeout_executor.shutdown()
+        _global_timeout_executor = TimeoutExecutor(max_workers)
+        return _global_timeout_executor
+
+
+def reset_global_timeout_executor() -> None:
+    """关闭并重置全局超时执行器"""
+    global _global_timeout_executor
+
+    with _global_timeout_executor_lock:
+        if _global_timeout_executor is not None:
+            _global_timeout_executor.shutdown()
+        _global_timeout_executor = None
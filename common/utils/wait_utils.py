@@ -5,11 +5,196 @@
 包含高性能的内容等待和验证机制。
 """
 
+import json
 import time
 import logging
 from typing import Optional, Callable, Any, List
 from bs4 import BeautifulSoup
 
+from .html_parser import parse_html
+from rpa.browser.implementations.loop_bridge import cooperative_sleep
+
+
+# =============================================================================
+# 🚀 页面就绪探测 - 替代固定等待
+# =============================================================================
+
+# 页面内就绪探测脚本（ES5 + Promise）：
+# - MutationObserver 记录最近一次DOM变化时间
+# - Resource Timing 条目数变化视为网络仍在活动
+# - 目标选择器存在且文本长度/子元素数稳定，并且DOM和网络安静 quietMs 后返回就绪
+# - 超过 timeoutMs 返回未就绪（固定等待仅作为上限）
+PAGE_READY_PROBE_JS = """
+function (cfg) {
+    return new Promise(function (resolve) {
+        var start = Date.now();
+        var lastChange = start;
+        var lastSignature;
+        var observer = null;
+        var timer = null;
+
+        function resourceCount() {
+            try {
+                return performance.getEntriesByType('resource').length;
+            } catch (e) {
+                return 0;
+            }
+        }
+
+        function targetSignature() {
+            if (!cfg.selectors.length) {
+                return '';
+            }
+            for (var i = 0; i < cfg.selectors.length; i++) {
+                var el = null;
+                try {
+                    el = document.querySelector(cfg.selectors[i]);
+                } catch (e) {
+                    el = null;
+                }
+                if (el) {
+                    var text = (el.textContent || '').replace(/\\s+/g, '');
+                    if (text.length >= cfg.minTextLength) {
+                        return i + ':' + text.length + ':' + el.getElementsByTagName('*').length;
+                    }
+                }
+            }
+            return null;
+        }
+
+        function finish(ready, reason) {
+            if (observer) {
+                observer.disconnect();
+            }
+            clearInterval(timer);
+            resolve({ready: ready, reason: reason, elapsed_ms: Date.now() - start});
+        }
+
+        var resources = resourceCount();
+
+        function check() {
+            var now = Date.now();
+            var count = resourceCount();
+            if (count !== resources) {
+                resources = count;
+                lastChange = now;
+            }
+            var signature = targetSignature();
+            if (signature !== lastSignature) {
+                lastSignature = signature;
+                lastChange = now;
+            }
+            if (signature !== null && document.readyState !== 'loading' && now - lastChange >= cfg.quietMs) {
+                finish(true, 'stable');
+            } else if (now - start >= cfg.timeoutMs) {
+                finish(false, signature === null ? 'selector_missing' : 'not_quiet');
+            }
+        }
+
+        if (window.MutationObserver && document.documentElement) {
+            observer = new MutationObserver(function () {
+                lastChange = Date.now();
+            });
+            observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+        }
+        timer = setInterval(check, cfg.pollMs);
+        check();
+    });
+}
+"""
+
+# 就绪探测配置（由 configure_readiness_probe 根据性能配置设置）
+_readiness_settings = {
+    'enabled': True,
+    'quiet_ms': 300,
+    'poll_ms': 50,
+}
+
+
+def configure_readiness_probe(performance_config) -> bool:
+    """
+    根据性能配置设置页面就绪探测
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        bool: 是否启用就绪探测
+    """
+    _readiness_settings['enabled'] = bool(getattr(performance_config, 'readiness_probe', True))
+    _readiness_settings['quiet_ms'] = int(getattr(performance_config, 'readiness_quiet_ms', 300))
+    return _readiness_settings['enabled']
+
+
+def build_page_ready_script(selectors: Optional[List[str]] = None, max_wait_seconds: float = 1.0,
+                            min_text_length: int = 1) -> Optional[str]:
+    """
+    生成页面就绪探测的脚本表达式（可作为动作脚本中的 evaluate 步骤）
+
+    Returns:
+        Optional[str]: 脚本表达式，未启用就绪探测时返回 None
+    """
+    if not _readiness_settings['enabled']:
+        return None
+    if isinstance(selectors, str):
+        selectors = [selectors]
+    probe_config = {
+        'selectors': list(selectors or []),
+        'minTextLength': min_text_length,
+        'quietMs': _readiness_settings['quiet_ms'],
+        'pollMs': _readiness_settings['poll_ms'],
+        'timeoutMs': int(max_wait_seconds * 1000),
+    }
+    return f"({PAGE_READY_PROBE_JS})({json.dumps(probe_config)})"
+
+
+def wait_for_page_ready(browser_service, selectors: Optional[List[str]] = None,
+                        max_wait_seconds: float = 1.0, min_text_length: int = 1,
+                        logger: Optional[logging.Logger] = None) -> bool:
+    """
+    等待页面就绪：目标内容稳定且DOM/网络安静后立即返回，max_wait_seconds 仅作为上限
+
+    探测不可用（未启用、浏览器服务不支持脚本执行、执行上下文被导航销毁等）时，
+    等待剩余的固定时间，与原有固定等待行为一致。
+
+    Args:
+        browser_service: 浏览器服务实例
+        selectors: 目标内容选择器（任一存在即可），为空时只等待DOM和网络安静
+        max_wait_seconds: 最长等待时间（秒）
+        min_text_length: 目标元素的最小文本长度（忽略空白）
+        logger: 日志记录器
+
+    Returns:
+        bool: 是否在上限前探测到页面就绪
+    """
+    if max_wait_seconds <= 0:
+        return False
+
+    logger = logger or logging.getLogger(__name__)
+    if isinstance(selectors, str):
+        selectors = [selectors]
+
+    start_time = time.monotonic()
+    result = None
+    probe_script = build_page_ready_script(selectors, max_wait_seconds, min_text_length)
+    if probe_script and browser_service is not None and hasattr(browser_service, 'evaluate_sync'):
+        try:
+            result = browser_service.evaluate_sync(probe_script, timeout=int(max_wait_seconds * 1000))
+        except Exception as e:
+            logger.debug(f"页面就绪探测失败: {e}")
+
+    if isinstance(result, dict):
+        if result.get('ready'):
+            logger.debug(f"⚡ 页面就绪，等待 {result.get('elapsed_ms', 0)}ms（上限 {max_wait_seconds} 秒）")
+            return True
+        logger.debug(f"⏳ 页面未在 {max_wait_seconds} 秒内就绪: {result.get('reason')}")
+        return False
+
+    remaining = max_wait_seconds - (time.monotonic() - start_time)
+    if remaining > 0:
+        cooperative_sleep(remaining)
+    return False
+
 
 class WaitUtils:
     """
@@ -46,7 +231,22 @@ class WaitUtils:
         """
         if seconds > 0:
             self.logger.debug(f"⏳ 智能等待 {seconds} 秒")
-            time.sleep(seconds)
+            cooperative_sleep(seconds)
+
+    def wait_for_page_ready(self, selectors: Optional[List[str]] = None, max_wait: float = 1.0,
+                            min_text_length: int = 1) -> bool:
+        """
+        等待页面就绪（事件驱动，max_wait 仅作为上限）
+
+        Args:
+            selectors: 目标内容选择器，为空时只等待DOM和网络安静
+            max_wait: 最长等待秒数
+            min_text_length: 目标元素的最小文本长度
+
+        Returns:
+            bool: 是否在上限前探测到页面就绪
+        """
+        return wait_for_page_ready(self.browser_service, selectors, max_wait, min_text_length, self.logger)
     
     def wait_for_element_visible(self, selector: str, timeout: Optional[float] = None) -> bool:
         """
@@ -135,7 +335,7 @@ class WaitUtils:
                 if current_url != initial_url:
                     if expected_url is None or expected_url in current_url:
                         return True
-                time.sleep(0.5)
+                cooperative_sleep(0.5)
 
             return False
         except Exception as e:
@@ -406,7 +606,6 @@ def _wait_with_browser_native_retry(selectors, content_validator, max_wait_secon
         dict | None: 成功时返回包含 soup 和 content 的字典，失败返回 None
     """
     import time
-    from bs4 import BeautifulSoup
 
     timeout_ms = int(max_wait_seconds * 1000)
 
@@ -423,7 +622,7 @@ def _wait_with_browser_native_retry(selectors, content_validator, max_wait_secon
                         try:
                             current_html = browser_service.evaluate_sync("() => document.documentElement.outerHTML")
                             if current_html:
-                                current_soup = BeautifulSoup(current_html, 'html.parser')
+                                current_soup = parse_html(current_html)
 
                                 # 检查内容是否符合要求
                                 elements = select_with_soup(current_soup, selectors, select_type='select')
@@ -456,16 +655,16 @@ def _wait_with_browser_native_retry(selectors, content_validator, max_wait_secon
                     logger.debug(f"Selector '{selector}' wait failed in attempt {attempt + 1}: {e}")
                     continue
 
-            # 如果不是最后一次尝试，等待后重试
+            # 如果不是最后一次尝试，等待目标内容稳定后重试（最多0.5秒）
             if attempt < max_retries - 1:
-                time.sleep(0.5)  # 重试间隔0.5秒
+                wait_for_page_ready(browser_service, selectors, 0.5)
 
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
             logger.debug(f"Browser operation failed in attempt {attempt + 1}: {e}")
             if attempt < max_retries - 1:
-                time.sleep(1)
+                wait_for_page_ready(browser_service, None, 1.0)
 
     # 所有重试都失败了
     return None
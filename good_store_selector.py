@@ -5,6 +5,7 @@
 """
 
 import logging
+import threading
 import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Union
@@ -15,14 +16,33 @@ from common.models.business_models import StoreInfo, ProductInfo, BatchProcessin
 from common.models.enums import GoodStoreFlag, StoreStatus
 from common.models.scraping_result import ScrapingResult
 from common.config.base_config import GoodStoreSelectorConfig, get_config
-from common.excel_processor import ExcelStoreProcessor
-from common.services.scraping_orchestrator import ScrapingMode, get_global_scraping_orchestrator
+from common.excel_processor import ExcelStoreProcessor, IncrementalExcelWriter
+from common.services.scraping_orchestrator import (
+    ScrapingMode, configure_async_scraping, configure_page_recycling, configure_rate_limiting,
+    get_global_scraping_orchestrator
+)
+from common.services.tab_worker_pool import TabWorkerPool, ContextWorkerPool
+from common.utils.page_cache import configure_page_cache, get_page_cache, reset_page_cache
+from common.utils.product_memo import (
+    configure_product_memo, get_product_memo, normalize_product_id, reset_product_memo
+)
+from common.utils.store_journal import StoreJournal, default_journal_path
+from common.utils.html_parser import set_html_parser
+from common.utils.wait_utils import configure_readiness_probe
+from common.logging_config import configure_queued_logging
+from rpa.browser.implementations.logger_system import get_global_log_pipeline, reset_global_log_pipeline
+from rpa.browser.implementations.rate_limiter import get_global_rate_limiter, reset_global_rate_limiter
+from rpa.browser.implementations.page_pool import get_page_pool_stats, reset_page_recycle_policy
+from common.utils.timeout_executor import (
+    configure_timeout_executor, get_global_timeout_executor, reset_global_timeout_executor
+)
 from common.business.filter_manager import FilterManager
-from common.business import ProfitEvaluator, StoreEvaluator
+from common.business import ProfitEvaluator, StoreEvaluator, IncrementalStoreEvaluator
 from task_manager.mixins import TaskControlMixin
 # 🔧 用户反馈：移除不必要的图片URL转换功能
 # from utils.url_converter import convert_image_url_to_product_url
 from utils.result_factory import ErrorResultFactory
+from utils.image_hash_index import ImageHashIndexer, configure_image_hash_index, reset_image_hash_index
 
 
 def _evaluate_profit_calculation_completeness(product: ProductInfo) -> float:
@@ -102,7 +122,26 @@ class GoodStoreSelector(TaskControlMixin):
         self.store_evaluator = StoreEvaluator(config)
 
         # 🎯 使用ScrapingOrchestrator统一管理所有抓取器
+        # 店铺并发时各工作线程使用各自浏览器上下文绑定的协调器（见 scraping_orchestrator 属性）
+        self._worker_local = threading.local()
         self.scraping_orchestrator = None
+
+        # 多标签页工作池（max_concurrent_products > 1 时延迟创建）
+        self.tab_pool = None
+        # 多浏览器上下文工作池（max_concurrent_stores > 1 时创建）
+        self.context_pool = None
+        # 商品图片哈希索引器（配置了 image_hash_index_path 时创建）
+        self.image_indexer = None
+
+        # 店铺并发时保护共享状态
+        self._stats_lock = threading.RLock()
+        self._evaluation_lock = threading.RLock()
+        self._stop_requested = threading.Event()
+
+        # 店铺处理断点日志（process_stores 中打开）
+        self.journal: Optional[StoreJournal] = None
+        # Excel结果增量写入器（非dryrun模式下在 process_stores 中创建）
+        self.result_writer: Optional[IncrementalExcelWriter] = None
         
         # 工具类
         self.error_factory = ErrorResultFactory(config)
@@ -116,9 +155,19 @@ class GoodStoreSelector(TaskControlMixin):
             'good_stores': 0,
             'failed_stores': 0,
             'total_products': 0,
-            'profitable_products': 0
+            'profitable_products': 0,
+            'skipped_products': 0  # 店铺判定提前确定后未抓取的商品数
         }
     
+    @property
+    def scraping_orchestrator(self):
+        """当前线程使用的抓取协调器（店铺并发时为工作上下文绑定的协调器）"""
+        return getattr(self._worker_local, 'orchestrator', None) or self._scraping_orchestrator
+
+    @scraping_orchestrator.setter
+    def scraping_orchestrator(self, orchestrator):
+        self._scraping_orchestrator = orchestrator
+
     def process_stores(self) -> BatchProcessingResult:
         """
         处理店铺列表，执行完整的好店筛选流程
@@ -134,6 +183,38 @@ class GoodStoreSelector(TaskControlMixin):
             
             # 1. 初始化组件
             self._initialize_components()
+            self.logger.info(f"🧩 HTML解析后端: {set_html_parser(self.config.performance.html_parser)}")
+            page_cache = configure_page_cache(self.config.performance, dryrun=self.config.dryrun)
+            if page_cache:
+                refresh_note = "（强制刷新，不读取已有缓存）" if page_cache.force_refresh else ""
+                self.logger.info(f"📦 页面缓存已启用: {page_cache.cache_dir}{refresh_note}")
+            configure_timeout_executor(self.config.performance)
+            if not configure_readiness_probe(self.config.performance):
+                self.logger.info("⏳ 页面就绪探测已关闭，使用固定等待")
+            if configure_async_scraping(self.config.performance):
+                self.logger.info("⚡ 异步执行模式已启用：抓取在浏览器事件循环上以协程方式运行")
+            if configure_queued_logging(self.config.performance):
+                self.logger.info("📝 非阻塞日志管线已启用：日志在后台线程批量写出，重复日志按调用位置限流")
+            image_index = configure_image_hash_index(self.config.performance)
+            if image_index is not None:
+                self.image_indexer = ImageHashIndexer(image_index)
+                self.logger.info(f"🖼️ 商品图片哈希索引已启用: {image_index.db_path}（已有{len(image_index)}条）")
+            rate_limiter = configure_rate_limiting(self.config.performance)
+            if rate_limiter is not None:
+                self.logger.info(
+                    f"🚦 按域名自适应限流已启用：初始{rate_limiter.initial_rate}次/秒，"
+                    f"并发上限{rate_limiter.initial_concurrency}（最多{rate_limiter.max_concurrency}）"
+                )
+            recycle_policy = configure_page_recycling(self.config.performance)
+            if recycle_policy is not None:
+                self.logger.info(
+                    f"♻️ 页面回收已启用：每{recycle_policy.max_navigations}次导航或JS堆超过"
+                    f"{recycle_policy.max_js_heap_mb:.0f}MB时换新页面"
+                )
+            product_memo = configure_product_memo(self.config.performance)
+            if product_memo is not None:
+                persist_note = f"，持久化到{product_memo.db_path}" if product_memo.db_path else ""
+                self.logger.info(f"♻️ 跨店铺商品备忘已启用：同一商品本次运行只抓取一次{persist_note}")
             
             # 2. 读取待处理店铺
             pending_stores = self._load_pending_stores()
@@ -143,63 +224,34 @@ class GoodStoreSelector(TaskControlMixin):
             
             self.processing_stats['total_stores'] = len(pending_stores)
             self.logger.info(f"找到{len(pending_stores)}个待处理店铺")
+
+            # 续跑时跳过日志中已完成的店铺
+            all_stores = pending_stores
+            pending_stores, resumed = self._open_journal(pending_stores)
+            if not self.config.dryrun:
+                self.result_writer = IncrementalExcelWriter(self.excel_file_path, self.config).start()
             
             # 3. 批量处理店铺
-            store_results = []
-            for i, store_data in enumerate(pending_stores):
-                try:
-                    # 检查任务控制点 - 每个店铺处理前
-                    if not self._check_task_control(f"处理店铺_{i+1}_{store_data.store_id}"):
-                        self.logger.info("任务被用户停止")
-                        break
-
-                    # 报告进度
-                    self._report_task_progress(
-                        f"处理店铺 {i+1}/{len(pending_stores)}",
-                        total=len(pending_stores),
-                        current=i+1,
-                        processed_stores=i,
-                        good_stores=self.processing_stats['good_stores'],
-                        current_store=store_data.store_id,
-                        percentage=((i+1) / len(pending_stores)) * 100
-                    )
-
-                    self.logger.info(f"处理店铺 {i+1}/{len(pending_stores)}: {store_data.store_id}")
-                    self._log_task_message("INFO", f"开始处理店铺: {store_data.store_id}", store_data.store_id)
-
-                    result = self._process_single_store(store_data)
-                    store_results.append(result)
-
-                    if result.store_info.status == StoreStatus.PROCESSED:
-                        self.processing_stats['processed_stores'] += 1
-                        if result.store_info.is_good_store == GoodStoreFlag.YES:
-                            self.processing_stats['good_stores'] += 1
-                            self._log_task_message("SUCCESS", f"发现好店: {store_data.store_id}", store_data.store_id)
-                    else:
-                        self.processing_stats['failed_stores'] += 1
-                        self._log_task_message("WARNING", f"店铺处理失败: {store_data.store_id}", store_data.store_id)
-
-                    # 更新统计
-                    self.processing_stats['total_products'] += result.total_products
-                    self.processing_stats['profitable_products'] += result.profitable_products
+            if self.config.performance.max_concurrent_stores > 1 and len(pending_stores) > 1:
+                handled_stores, store_results = self._process_stores_concurrently(pending_stores)
+            else:
+                handled_stores, store_results = self._process_stores_sequentially(pending_stores)
 
-                except InterruptedError:
-                    self.logger.info("任务被用户中断")
-                    break
-                except Exception as e:
-                    self.logger.error(f"处理店铺{store_data.store_id}失败: {e}")
-                    self._log_task_message("ERROR", f"处理店铺失败: {str(e)}", store_data.store_id)
-                    self.processing_stats['failed_stores'] += 1
-                    continue
+            if resumed:
+                handled_stores, store_results = self._merge_resumed_results(
+                    all_stores, resumed, handled_stores, store_results
+                )
             
             # 4. 更新Excel文件（dryrun模式下跳过实际写入）
             if not self.config.dryrun:
-                self._update_excel_results(pending_stores, store_results)
+                if self._update_excel_results(handled_stores, store_results, resumed) and self.journal:
+                    # 结果已全部写入Excel，不再需要断点日志
+                    self.journal.remove()
                 self.logger.info("✅ Excel文件更新完成")
             else:
                 self.logger.info("🧪 试运行模式：模拟Excel文件更新（不实际写入文件）")
                 # 在dryrun模式下，仍然执行更新逻辑以验证数据，但不实际保存
-                self._simulate_excel_update(pending_stores, store_results)
+                self._simulate_excel_update(handled_stores, store_results)
             
             # 5. 创建处理结果
             processing_time = time.time() - start_time
@@ -235,6 +287,208 @@ class GoodStoreSelector(TaskControlMixin):
         finally:
             self._cleanup_components()
     
+    def _process_stores_sequentially(self, pending_stores: List[ExcelStoreData]
+                                     ) -> tuple[List[ExcelStoreData], List[StoreAnalysisResult]]:
+        """顺序处理店铺，返回已处理店铺及对应结果"""
+        handled_stores = []
+        store_results = []
+        for i, store_data in enumerate(pending_stores):
+            try:
+                # 检查任务控制点 - 每个店铺处理前
+                if not self._check_task_control(f"处理店铺_{i+1}_{store_data.store_id}"):
+                    self.logger.info("任务被用户停止")
+                    break
+
+                result = self._run_store(i, store_data, len(pending_stores))
+                handled_stores.append(store_data)
+                store_results.append(result)
+
+            except InterruptedError:
+                self.logger.info("任务被用户中断")
+                break
+            except Exception as e:
+                self._record_store_exception(store_data, e)
+                continue
+
+        return handled_stores, store_results
+
+    def _process_stores_concurrently(self, pending_stores: List[ExcelStoreData]
+                                     ) -> tuple[List[ExcelStoreData], List[StoreAnalysisResult]]:
+        """
+        多浏览器上下文并发处理店铺
+
+        每个工作上下文共享同一浏览器进程，绑定独立的抓取协调器；
+        结果按Excel原顺序返回，便于回写。
+        """
+        max_concurrent_stores = self.config.performance.max_concurrent_stores
+        try:
+            self.context_pool = ContextWorkerPool(max_concurrent_stores).start()
+        except Exception as e:
+            self.logger.warning(f"⚠️ 浏览器上下文工作池创建失败，回退到顺序处理: {e}")
+            self.context_pool = None
+            return self._process_stores_sequentially(pending_stores)
+
+        self.logger.info(f"🚀 并发处理店铺，并发数: {max_concurrent_stores}")
+        self._stop_requested.clear()
+        total = len(pending_stores)
+
+        def should_continue(i: int, item) -> bool:
+            store_data = item[1]
+            if self._stop_requested.is_set():
+                return False
+            # 检查任务控制点 - 每个店铺处理前
+            if not self._check_task_control(f"处理店铺_{i+1}_{store_data.store_id}"):
+                self.logger.info("任务被用户停止")
+                self._stop_requested.set()
+                return False
+            return True
+
+        def run_store(orchestrator, item) -> Optional[StoreAnalysisResult]:
+            i, store_data = item
+            self._worker_local.orchestrator = orchestrator
+            try:
+                return self._run_store(i, store_data, total)
+            except InterruptedError:
+                self.logger.info("任务被用户中断")
+                self._stop_requested.set()
+                return None
+            except Exception as e:
+                self._record_store_exception(store_data, e)
+                return None
+            finally:
+                self._worker_local.orchestrator = None
+
+        results = self.context_pool.map(run_store, list(enumerate(pending_stores)), should_continue=should_continue)
+
+        handled_stores = []
+        store_results = []
+        for store_data, result in zip(pending_stores, results):
+            if result is not None:
+                handled_stores.append(store_data)
+                store_results.append(result)
+
+        context_stats = self.context_pool.get_tab_stats()
+        self.processing_stats['context_stats'] = context_stats
+        for stats in context_stats:
+            self.logger.info(
+                f"📊 浏览器上下文{stats['tab_index']}: 店铺{stats['tasks']}个，"
+                f"平均耗时{stats['avg_task_time']:.2f}s，最长耗时{stats['max_task_time']:.2f}s"
+            )
+
+        return handled_stores, store_results
+
+    def _run_store(self, i: int, store_data: ExcelStoreData, total: int) -> StoreAnalysisResult:
+        """处理单个店铺并更新统计"""
+        with self._stats_lock:
+            # 报告进度
+            self._report_task_progress(
+                f"处理店铺 {i+1}/{total}",
+                total=total,
+                current=i+1,
+                processed_stores=i,
+                good_stores=self.processing_stats['good_stores'],
+                current_store=store_data.store_id,
+                percentage=((i+1) / total) * 100
+            )
+
+        self.logger.info(f"处理店铺 {i+1}/{total}: {store_data.store_id}")
+        self._log_task_message("INFO", f"开始处理店铺: {store_data.store_id}", store_data.store_id)
+
+        result = self._process_single_store(store_data)
+        self._journal_result(store_data, result)
+        if self.result_writer:
+            self.result_writer.add(store_data, result.store_info.is_good_store, result.store_info.status)
+
+        with self._stats_lock:
+            if result.store_info.status == StoreStatus.PROCESSED:
+                self.processing_stats['processed_stores'] += 1
+                if result.store_info.is_good_store == GoodStoreFlag.YES:
+                    self.processing_stats['good_stores'] += 1
+                    self._log_task_message("SUCCESS", f"发现好店: {store_data.store_id}", store_data.store_id)
+            else:
+                self.processing_stats['failed_stores'] += 1
+                self._log_task_message("WARNING", f"店铺处理失败: {store_data.store_id}", store_data.store_id)
+
+            # 更新统计
+            self.processing_stats['total_products'] += result.total_products
+            self.processing_stats['profitable_products'] += result.profitable_products
+
+        return result
+
+    def _open_journal(self, pending_stores: List[ExcelStoreData]
+                      ) -> tuple[List[ExcelStoreData], Dict[str, Any]]:
+        """
+        打开店铺处理断点日志
+
+        续跑模式下读取已有日志，返回仍需处理的店铺以及已完成店铺的记录（以 store_id/row_index 为键）；
+        日志不可用时按无日志方式继续处理。试运行模式不读写日志（避免覆盖正式运行的断点）。
+        """
+        if self.config.dryrun:
+            self.journal = None
+            return pending_stores, {}
+
+        journal = StoreJournal(default_journal_path(self.excel_file_path))
+        resumed = {}
+        try:
+            if self.config.resume:
+                records = journal.load()
+                pending_stores, done_stores, done_records = journal.split_pending(pending_stores, records)
+                resumed = {
+                    journal.make_key(store_data.store_id, store_data.row_index): record
+                    for store_data, record in zip(done_stores, done_records)
+                }
+                self.logger.info(
+                    f"📒 续跑模式：日志中已完成{len(resumed)}个店铺，剩余{len(pending_stores)}个待处理"
+                )
+            self.journal = journal.open(resume=self.config.resume)
+        except Exception as e:
+            self.logger.warning(f"⚠️ 店铺处理日志不可用，本次运行不记录断点: {e}")
+            self.journal = None
+        return pending_stores, resumed
+
+    def _journal_result(self, store_data: ExcelStoreData, result: StoreAnalysisResult) -> None:
+        """将店铺结果追加到断点日志"""
+        if not self.journal:
+            return
+        try:
+            self.journal.append(store_data.row_index, result)
+        except Exception as e:
+            self.logger.warning(f"⚠️ 写入店铺处理日志失败 {store_data.store_id}: {e}")
+
+    def _merge_resumed_results(self, all_stores: List[ExcelStoreData], resumed: Dict[str, Any],
+                               handled_stores: List[ExcelStoreData],
+                               store_results: List[StoreAnalysisResult]
+                               ) -> tuple[List[ExcelStoreData], List[StoreAnalysisResult]]:
+        """按Excel原顺序合并日志回放结果与本次处理结果，并计入统计"""
+        fresh = {id(store_data): result for store_data, result in zip(handled_stores, store_results)}
+        merged_stores = []
+        merged_results = []
+        for store_data in all_stores:
+            record = resumed.get(StoreJournal.make_key(store_data.store_id, store_data.row_index))
+            if record is not None:
+                result = record.to_result()
+                with self._stats_lock:
+                    self.processing_stats['resumed_stores'] = self.processing_stats.get('resumed_stores', 0) + 1
+                    self.processing_stats['processed_stores'] += 1
+                    if result.store_info.is_good_store == GoodStoreFlag.YES:
+                        self.processing_stats['good_stores'] += 1
+                    self.processing_stats['total_products'] += result.total_products
+                    self.processing_stats['profitable_products'] += result.profitable_products
+            elif id(store_data) in fresh:
+                result = fresh[id(store_data)]
+            else:
+                continue
+            merged_stores.append(store_data)
+            merged_results.append(result)
+        return merged_stores, merged_results
+
+    def _record_store_exception(self, store_data: ExcelStoreData, error: Exception) -> None:
+        """记录店铺处理异常"""
+        self.logger.error(f"处理店铺{store_data.store_id}失败: {error}")
+        self._log_task_message("ERROR", f"处理店铺失败: {str(error)}", store_data.store_id)
+        with self._stats_lock:
+            self.processing_stats['failed_stores'] += 1
+
     def _initialize_components(self):
         """初始化所有组件"""
         try:
@@ -439,7 +693,14 @@ class GoodStoreSelector(TaskControlMixin):
                 products.append(product)
 
             # 处理商品（抓取价格、ERP数据、货源匹配、利润计算）
-            product_evaluations = self._process_products(products)
+            # select-shops 模式下好店判定确定后不再抓取剩余商品（select-goods 模式需要全部商品）
+            store_evaluation = None
+            if self.config.performance.early_store_verdict and self.config.selection_mode != 'select-goods':
+                store_evaluation = IncrementalStoreEvaluator(len(products), self.config, self.store_evaluator)
+            product_evaluations = self._process_products(products, store_evaluation)
+            if store_evaluation is not None and store_evaluation.remaining:
+                with self._stats_lock:
+                    self.processing_stats['skipped_products'] += store_evaluation.remaining
 
             # TODO: 1688orAI
 
@@ -463,8 +724,18 @@ class GoodStoreSelector(TaskControlMixin):
     
 
     
-    def _process_products(self, products: List[ProductInfo]) -> List[Dict[str, Any]]:
-        """处理商品列表"""
+    def _process_products(self, products: List[ProductInfo],
+                          store_evaluation: Optional[IncrementalStoreEvaluator] = None) -> List[Dict[str, Any]]:
+        """
+        处理商品列表
+
+        Args:
+            products: 商品列表
+            store_evaluation: 增量店铺评估器，提供时好店判定确定后停止处理剩余商品
+
+        Returns:
+            List[Dict[str, Any]]: 商品评估结果列表
+        """
         product_evaluations = []
         
         # 🔧 修复：如果没有有效商品，直接返回空列表
@@ -474,67 +745,198 @@ class GoodStoreSelector(TaskControlMixin):
 
         self.logger.info(f"开始处理{len(products)}个商品")
 
+        # 🚀 多标签页并发抓取
+        # 店铺并发时各店铺已在独立上下文中运行，商品在本上下文内顺序抓取
+        in_store_worker = getattr(self._worker_local, 'orchestrator', None) is not None
+        if self.config.performance.max_concurrent_products > 1 and len(products) > 1 and not in_store_worker:
+            tab_pool = self._get_tab_pool()
+            if tab_pool:
+                return self._process_products_concurrently(products, tab_pool, store_evaluation)
+
         for j, product in enumerate(products):
+            evaluation_result = None
             try:
                 # 检查任务控制点 - 每个商品处理前
                 if not self._check_task_control(f"处理商品_{j+1}_{product.product_id}"):
                     self.logger.info("任务被用户停止")
                     break
 
-                # 使用协调器进行完整商品分析
-                scraping_result = self.scraping_orchestrator.scrape_with_orchestration(
-                    ScrapingMode.FULL_CHAIN, 
-                    url=product.product_url
-                )
-                
-                if not scraping_result.success:
-                    self.logger.error(f"商品{product.product_id}抓取失败: {scraping_result.error_message}")
-                    continue
+                # 其他店铺已评估过的商品直接复用结果，不再打开页面
+                evaluation_result = self._get_memoized_evaluation(product)
+                if evaluation_result is None:
+                    # 使用协调器进行完整商品分析
+                    scraping_result = self.scraping_orchestrator.scrape_with_orchestration(
+                        ScrapingMode.FULL_CHAIN, 
+                        url=product.product_url
+                    )
+
+                    evaluation_result = self._evaluate_scraped_product(product, scraping_result)
+                if evaluation_result:
+                    product_evaluations.append(evaluation_result)
                 
-                # 使用新的合并逻辑处理数据
+            except Exception as e:
+                self.logger.error(f"处理商品{product.product_id}失败: {e}")
+
+            if store_evaluation is not None and self._is_store_verdict_decided(store_evaluation, [evaluation_result]):
+                break
+        
+        return product_evaluations
+
+    def _is_store_verdict_decided(self, store_evaluation: IncrementalStoreEvaluator,
+                                  evaluation_results: List[Optional[Dict[str, Any]]]) -> bool:
+        """记录已处理商品的评估结果，返回好店判定是否已确定（剩余商品无法改变结果）"""
+        for evaluation_result in evaluation_results:
+            store_evaluation.add(evaluation_result)
+        verdict = store_evaluation.decided
+        if verdict is None or not store_evaluation.remaining:
+            return False
+        stats = store_evaluation.get_stats()
+        self.logger.info(
+            f"🎯 店铺判定已确定（{verdict.value}）: 已评估{stats['evaluated']}个商品，"
+            f"有利润{stats['profitable']}个，跳过剩余{stats['skipped']}个商品"
+        )
+        return True
+
+    def _process_products_concurrently(self, products: List[ProductInfo], tab_pool,
+                                       store_evaluation: Optional[IncrementalStoreEvaluator] = None
+                                       ) -> List[Dict[str, Any]]:
+        """
+        多标签页并发抓取商品，按原顺序在主线程完成合并与利润评估
+
+        提供增量店铺评估器时按标签页数量分批抓取，每批完成后检查好店判定是否已确定。
+        """
+        product_evaluations = []
+        batch_size = tab_pool.size if store_evaluation is not None else len(products)
+        evaluated_ids = set()
+        for start in range(0, len(products), batch_size):
+            batch = products[start:start + batch_size]
+            batch_evaluations = self._process_product_batch(batch, tab_pool, evaluated_ids, start)
+            product_evaluations.extend(evaluation for evaluation in batch_evaluations if evaluation)
+            if store_evaluation is not None and self._is_store_verdict_decided(store_evaluation, batch_evaluations):
+                break
+
+        tab_stats = tab_pool.get_tab_stats()
+        self.processing_stats['tab_stats'] = tab_stats
+        for stats in tab_stats:
+            self.logger.info(
+                f"📊 标签页{stats['tab_index']}: 任务{stats['tasks']}个，失败{stats['failures']}个，"
+                f"平均耗时{stats['avg_task_time']:.2f}s，最长耗时{stats['max_task_time']:.2f}s"
+            )
+
+        return product_evaluations
+
+    def _process_product_batch(self, products: List[ProductInfo], tab_pool, evaluated_ids: set,
+                               offset: int = 0) -> List[Optional[Dict[str, Any]]]:
+        """并发抓取一批商品，返回与商品顺序一致的评估结果（失败或被跳过的商品为 None）"""
+        product_evaluations = []
+
+        def scrape_product(orchestrator, product: ProductInfo) -> ScrapingResult:
+            return orchestrator.scrape_with_orchestration(
+                ScrapingMode.FULL_CHAIN,
+                url=product.product_url
+            )
+
+        def should_continue(j: int, product: ProductInfo) -> bool:
+            # 检查任务控制点 - 每个商品处理前
+            return self._check_task_control(f"处理商品_{offset+j+1}_{product.product_id}")
+
+        # 其他店铺已评估过的商品不再分配标签页
+        cached_evaluations = {id(product): self._get_memoized_evaluation(product) for product in products}
+        pending_products = [product for product in products if cached_evaluations[id(product)] is None]
+        scraping_results = tab_pool.map(scrape_product, pending_products, should_continue=should_continue)
+        results_by_product = {id(product): result for product, result in zip(pending_products, scraping_results)}
+
+        for product in products:
+            cached_evaluation = cached_evaluations[id(product)]
+            product_key = normalize_product_id(product.product_id, product.product_url)
+            if cached_evaluation is None and product_key in evaluated_ids:
+                # 同一批次中重复出现的商品只评估一次
+                cached_evaluation = self._get_memoized_evaluation(product)
+            if product_key is not None:
+                evaluated_ids.add(product_key)
+            evaluation_result = cached_evaluation
+            scraping_result = results_by_product.get(id(product))
+            if evaluation_result is None and scraping_result is not None:
                 try:
-                    candidate_product = self.merge_and_compute(scraping_result)
-                    
-                    # 利润评估
-                    evaluation_result = self.profit_evaluator.evaluate_product_profit(candidate_product, candidate_product.source_price)
-                    
-                    # 添加额外信息
-                    evaluation_result.update({
-                        'is_competitor': getattr(candidate_product, 'is_competitor_selected', False),
-                        'competitor_count': len(scraping_result.data.get('competitors_list', [])),
-                    })
-                    
-                    product_evaluations.append(evaluation_result)
-                    
-                    self.logger.info(f"✅ 商品{product.product_id}处理完成，利润率: {evaluation_result.get('profit_rate', 0):.2f}%")
-                    
+                    evaluation_result = self._evaluate_scraped_product(product, scraping_result)
                 except Exception as e:
-                    self.logger.error(f"商品{product.product_id}合并处理失败: {e}")
-                    continue
+                    self.logger.error(f"处理商品{product.product_id}失败: {e}")
+            product_evaluations.append(evaluation_result)
 
+        return product_evaluations
 
+    @staticmethod
+    def _get_memoized_evaluation(product: ProductInfo) -> Optional[Dict[str, Any]]:
+        """获取本次运行中该商品已有的评估结果（返回副本），没有时返回 None"""
+        memo = get_product_memo()
+        product_id = normalize_product_id(product.product_id, product.product_url)
+        if memo is None or product_id is None:
+            return None
+        cached = memo.get('evaluation', product_id)
+        return dict(cached) if cached is not None else None
+
+    @staticmethod
+    def _memoize_evaluation(product: ProductInfo, evaluation_result: Dict[str, Any]):
+        """记录商品评估结果（含定价计算对象，只保存在内存中）"""
+        memo = get_product_memo()
+        product_id = normalize_product_id(product.product_id, product.product_url)
+        if memo is not None and product_id is not None:
+            memo.put('evaluation', product_id, dict(evaluation_result), persist=False)
+
+    def _evaluate_scraped_product(self, product: ProductInfo,
+                                  scraping_result: ScrapingResult) -> Optional[Dict[str, Any]]:
+        """合并抓取结果并进行利润评估，失败时返回 None"""
+        if not scraping_result.success:
+            self.logger.error(f"商品{product.product_id}抓取失败: {scraping_result.error_message}")
+            return None
+
+        # 使用新的合并逻辑处理数据
+        try:
+            # 利润计算器基于Excel工作簿，店铺并发时需要串行访问
+            with self._evaluation_lock:
+                candidate_product = self.merge_and_compute(scraping_result)
+
+                # 利润评估
+                evaluation_result = self.profit_evaluator.evaluate_product_profit(candidate_product, candidate_product.source_price)
+
+            # 添加额外信息
+            evaluation_result.update({
+                'is_competitor': getattr(candidate_product, 'is_competitor_selected', False),
+                'competitor_count': len(scraping_result.data.get('competitors_list', [])),
+            })
+
+            if self.image_indexer:
+                # 图片下载和哈希计算在后台完成
+                self.image_indexer.submit(candidate_product.product_id, candidate_product.image_url, {
+                    'product_url': candidate_product.product_url,
+                    'green_price': candidate_product.green_price,
+                    'black_price': candidate_product.black_price,
+                })
+
+            self._memoize_evaluation(product, evaluation_result)
+            self.logger.info(f"✅ 商品{product.product_id}处理完成，利润率: {evaluation_result.get('profit_rate', 0):.2f}%")
+            return evaluation_result
 
+        except Exception as e:
+            self.logger.error(f"商品{product.product_id}合并处理失败: {e}")
+            return None
 
-                # # 检查任务控制点 - 价格抓取后
-                # if not self._check_task_control(f"商品价格抓取完成_{product.product_id}"):
-                #     self.logger.info("任务被用户停止")
-                #     break
-                #
-                # # 检查任务控制点 - ERP数据抓取后
-                # if not self._check_task_control(f"商品ERP数据抓取完成_{product.product_id}"):
-                #     self.logger.info("任务被用户停止")
-                #     break
-                
+    def _get_tab_pool(self) -> Optional[TabWorkerPool]:
+        """获取多标签页工作池，创建失败时返回 None（回退到顺序抓取）"""
+        if self.tab_pool is None:
+            try:
+                self.tab_pool = TabWorkerPool(self.config.performance.max_concurrent_products).start()
             except Exception as e:
-                self.logger.error(f"处理商品{product.product_id}失败: {e}")
-                continue
-        
-        return product_evaluations
+                self.logger.warning(f"⚠️ 多标签页工作池创建失败，回退到顺序抓取: {e}")
+                self.config.performance.max_concurrent_products = 1
+                return None
+        return self.tab_pool
 
     
     def _update_excel_results(self, pending_stores: List[ExcelStoreData], 
-                            store_results: List[StoreAnalysisResult]):
-        """更新Excel结果"""
+                            store_results: List[StoreAnalysisResult],
+                            resumed: Optional[Dict[str, Any]] = None) -> bool:
+        """更新Excel结果，返回是否保存成功（resumed 为续跑时从日志回放的店铺记录）"""
         try:
             updates = []
             for store_data, result in zip(pending_stores, store_results):
@@ -543,14 +945,28 @@ class GoodStoreSelector(TaskControlMixin):
                     result.store_info.is_good_store,
                     result.store_info.status
                 ))
+
+            if self.result_writer:
+                # 本次处理的店铺已在 _run_store 中增量写回，这里只补齐续跑回放的结果并写回剩余部分
+                resumed = resumed or {}
+                self.result_writer.add_many([
+                    update for update in updates
+                    if StoreJournal.make_key(update[0].store_id, update[0].row_index) in resumed
+                ])
+                if not self.result_writer.close():
+                    return False
+                self.logger.info(f"更新Excel文件完成，共{len(updates)}个店铺")
+                return True
             
             self.excel_processor.batch_update_stores(updates)
             self.excel_processor.save_changes()
             
             self.logger.info(f"更新Excel文件完成，共{len(updates)}个店铺")
+            return True
             
         except Exception as e:
             self.logger.error(f"更新Excel结果失败: {e}")
+            return False
     
     def _simulate_excel_update(self, pending_stores: List[ExcelStoreData],
                              store_results: List[StoreAnalysisResult]):
@@ -575,6 +991,11 @@ class GoodStoreSelector(TaskControlMixin):
     def _cleanup_components(self):
         """清理组件"""
         try:
+            if self.result_writer:
+                # 异常退出时也写回已完成的店铺
+                self.result_writer.close()
+                self.processing_stats['excel_flushes'] = self.result_writer.flush_count
+                self.result_writer = None
             if self.excel_processor:
                 self.excel_processor.close()
             if self.profit_evaluator:
@@ -582,6 +1003,84 @@ class GoodStoreSelector(TaskControlMixin):
             # 🎯 ScrapingOrchestrator会自动管理所有scraper的生命周期
             if self.scraping_orchestrator:
                 self.scraping_orchestrator.close()
+            if self.tab_pool:
+                self.tab_pool.close()
+                self.tab_pool = None
+            if self.context_pool:
+                self.context_pool.close()
+                self.context_pool = None
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+            page_cache = get_page_cache()
+            if page_cache:
+                cache_stats = page_cache.get_stats()
+                self.processing_stats['page_cache_stats'] = cache_stats
+                self.logger.info(
+                    f"📦 页面缓存: 命中{cache_stats['hits']}次，未命中{cache_stats['misses']}次，"
+                    f"写入{cache_stats['writes']}次，淘汰{cache_stats['evictions']}条"
+                )
+                reset_page_cache()
+
+            timeout_stats = get_global_timeout_executor().get_stats()
+            self.processing_stats['timeout_stats'] = timeout_stats
+            self.logger.info(
+                f"⏱️ 超时操作: 执行{timeout_stats['submitted']}次，超时{timeout_stats['timed_out']}次，"
+                f"取消浏览器协程{timeout_stats['cancelled_coroutines']}个，"
+                f"超时后仍在运行{timeout_stats['running_after_timeout']}个"
+            )
+            reset_global_timeout_executor()
+
+            if self.config.performance.queued_logging:
+                log_stats = get_global_log_pipeline().get_stats()
+                self.processing_stats['log_pipeline_stats'] = log_stats
+                self.logger.info(
+                    f"📝 日志管线: 写出{log_stats['written']}条，限流抑制{log_stats['suppressed']}条，"
+                    f"队列满丢弃{log_stats['dropped']}条"
+                )
+                reset_global_log_pipeline()
+
+            if self.image_indexer:
+                self.image_indexer.close()
+                index_stats = self.image_indexer.get_stats()
+                self.processing_stats['image_index_stats'] = index_stats
+                self.logger.info(
+                    f"🖼️ 图片哈希索引: 新增{index_stats['indexed']}条，已有跳过{index_stats['skipped']}条，"
+                    f"失败{index_stats['failed']}条"
+                )
+                self.image_indexer = None
+            reset_image_hash_index()
+
+            product_memo = get_product_memo()
+            if product_memo is not None:
+                memo_stats = product_memo.get_stats()
+                self.processing_stats['product_memo_stats'] = memo_stats
+                self.logger.info(
+                    f"♻️ 商品备忘: 命中{memo_stats['hits']}次，未命中{memo_stats['misses']}次，"
+                    f"保存{memo_stats['entries']}条"
+                )
+            reset_product_memo()
+
+            rate_limiter = get_global_rate_limiter()
+            if rate_limiter is not None:
+                rate_limit_stats = rate_limiter.get_stats()
+                self.processing_stats['rate_limit_stats'] = rate_limit_stats
+                for domain, stats in rate_limit_stats.items():
+                    self.logger.info(
+                        f"🚦 {domain}: 导航{stats['requests']}次，超时{stats['timeouts']}次，拦截{stats['blocked']}次，"
+                        f"退避{stats['decreases']}次，当前并发上限{stats['concurrency_limit']}、速率{stats['rate']}次/秒，"
+                        f"累计等待{stats['wait_time']:.1f}s"
+                    )
+            reset_global_rate_limiter()
+
+            page_pool_stats = get_page_pool_stats()
+            if page_pool_stats:
+                self.processing_stats['page_pool_stats'] = page_pool_stats
+                self.logger.info(
+                    f"♻️ 页面回收: {len(page_pool_stats)}个页面池共回收"
+                    f"{sum(stats['recycled'] for stats in page_pool_stats)}次"
+                )
+            reset_page_recycle_policy()
                 
             self.logger.info("组件清理完成")
             
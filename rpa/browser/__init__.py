@@ -27,11 +27,18 @@ from .core.models.browser_config import (
     BrowserConfig,
     ViewportConfig,
     ProxyConfig,
+    ResourceBlockingConfig,
     SecurityConfig,
     PerformanceConfig,
     create_default_config
 )
 
+from .core.models.action_script import (
+    ActionScript,
+    ActionScriptResult,
+    ActionStepResult
+)
+
 from .core.exceptions.browser_exceptions import (
     BrowserError,
     BrowserInitializationError,
@@ -46,6 +53,7 @@ from .core.exceptions.browser_exceptions import (
     ValidationError,
     ScenarioExecutionError,
     PaginationError,
+    OperationCancelledError,
     create_browser_error,
     handle_browser_error
 )
@@ -72,9 +80,13 @@ __all__ = [
     'BrowserConfig',
     'ViewportConfig',
     'ProxyConfig',
+    'ResourceBlockingConfig',
     'SecurityConfig',
     'PerformanceConfig',
     'create_default_config',
+    'ActionScript',
+    'ActionScriptResult',
+    'ActionStepResult',
     
     # 异常类型
     'BrowserError',
@@ -90,6 +102,7 @@ __all__ = [
     'ValidationError',
     'ScenarioExecutionError',
     'PaginationError',
+    'OperationCancelledError',
     'create_browser_error',
     'handle_browser_error'
 ]
\ No newline at end of file
@@ -13,7 +13,7 @@ import asyncio
 import logging
 import sys
 import threading
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, Optional
 
 from .core.config.config import (
     BrowserServiceConfig, 
@@ -21,6 +21,9 @@ from .core.config.config import (
     create_default_browser_service_config
 )
 from .core.exceptions.browser_exceptions import BrowserError, ConfigurationError
+from .core.models.action_script import ActionScript, ActionScriptResult
+from .implementations.cancellation import submit_coroutine, wait_for_future
+from .implementations.rate_limiter import OUTCOME_ERROR, classify_navigation, get_global_rate_limiter
 
 # 导入组件接口
 from .core.interfaces.browser_driver import IBrowserDriver
@@ -53,6 +56,9 @@ class SimplifiedBrowserService:
     _global_instance_initialized: bool = False
     _global_lock: threading.Lock = threading.Lock()
 
+    # navigate_to_sync 自身经由全局限流器导航（调用方不需要再限流）
+    applies_rate_limit: bool = True
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         初始化浏览器服务
@@ -260,21 +266,20 @@ class SimplifiedBrowserService:
 
             self.logger.info(f"🔗 导航到: {url}")
 
-            # 使用同步方式打开页面
-            if hasattr(self.browser_driver, 'open_page_sync'):
-                success = self.browser_driver.open_page_sync(url, wait_until)
-            else:
-                # 如果没有同步方法，使用事件循环处理
-                try:
-                    loop = asyncio.get_running_loop()
-                    # 在当前事件循环中创建任务
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.browser_driver.open_page(url, wait_until), loop
-                    )
-                    success = future.result()
-                except RuntimeError:
-                    # 不在事件循环中，直接运行
-                    success = asyncio.run(self.browser_driver.open_page(url, wait_until))
+            # 按目标域名限流（启用时）
+            rate_limiter = get_global_rate_limiter()
+            permit = rate_limiter.acquire(url) if rate_limiter else None
+            try:
+                success = self._open_page_sync(url, wait_until)
+            except Exception:
+                if permit:
+                    permit.release(OUTCOME_ERROR)
+                raise
+            if permit:
+                navigation = getattr(self.browser_driver, 'last_navigation', None) or {}
+                permit.release(classify_navigation(
+                    success, navigation.get('status'), navigation.get('final_url'), navigation.get('timed_out', False)
+                ))
 
             if success:
                 self.logger.info("✅ 页面导航成功")
@@ -287,6 +292,22 @@ class SimplifiedBrowserService:
             self.logger.error(f"❌ 页面导航失败: {e}")
             return False
 
+    def _open_page_sync(self, url: str, wait_until: str) -> bool:
+        """使用驱动打开页面（优先使用驱动的同步方法）"""
+        if hasattr(self.browser_driver, 'open_page_sync'):
+            return self.browser_driver.open_page_sync(url, wait_until)
+        # 如果没有同步方法，使用事件循环处理
+        try:
+            loop = asyncio.get_running_loop()
+            # 在当前事件循环中创建任务
+            future = asyncio.run_coroutine_threadsafe(
+                self.browser_driver.open_page(url, wait_until), loop
+            )
+            return future.result()
+        except RuntimeError:
+            # 不在事件循环中，直接运行
+            return asyncio.run(self.browser_driver.open_page(url, wait_until))
+
     async def close(self) -> bool:
         """关闭浏览器服务"""
         try:
@@ -472,7 +493,7 @@ class SimplifiedBrowserService:
             Dict[str, Any]: 浏览器服务配置字典
         """
         import os
-        from .core.models.browser_config import BrowserConfig, BrowserType
+        from .core.models.browser_config import BrowserConfig, BrowserType, ResourceBlockingConfig
         from .core.config.config import BrowserServiceConfig
 
         logger = logging.getLogger(__name__)
@@ -482,6 +503,7 @@ class SimplifiedBrowserService:
             browser_type = os.environ.get('PREFERRED_BROWSER', 'edge').lower()
             debug_port = os.environ.get('BROWSER_DEBUG_PORT', '9222')
             headless = os.environ.get('BROWSER_HEADLESS', 'false').lower() == 'true'
+            block_resources = os.environ.get('BROWSER_BLOCK_RESOURCES', 'false').lower() == 'true'
 
             # 创建浏览器检测器
             detector = BrowserDetector()
@@ -536,7 +558,8 @@ class SimplifiedBrowserService:
                 browser_type=BrowserType.EDGE if browser_type == 'edge' else BrowserType.CHROME,
                 headless=headless,
                 debug_port=int(debug_port),
-                user_data_dir=user_data_dir
+                user_data_dir=user_data_dir,
+                resource_blocking=ResourceBlockingConfig(enabled=block_resources)
             )
 
             service_config = BrowserServiceConfig(
@@ -803,6 +826,73 @@ class SimplifiedBrowserService:
             return None
         return self.browser_driver.evaluate_sync(script, timeout)
 
+    def run_action_script_sync(self, script: ActionScript, timeout: Optional[float] = None) -> ActionScriptResult:
+        """
+        执行声明式动作脚本（代理方法）
+
+        查找/点击/等待/取片段 HTML 等步骤在驱动事件循环上一次执行完成，只进行一次跨线程往返，
+        结果中记录每一步命中的选择器。
+        """
+        if not self.browser_driver or not hasattr(self.browser_driver, 'run_action_script_sync'):
+            self.logger.error("Browser driver not initialized")
+            return ActionScriptResult(success=False, failed_step="driver")
+        return self.browser_driver.run_action_script_sync(script, timeout=timeout)
+
+    def run_in_loop_sync(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        在浏览器驱动事件循环上运行同步函数（代理方法）
+
+        函数内的浏览器同步调用直接在事件循环上 await，整段函数只进行一次跨线程往返；
+        驱动不支持时在当前线程直接执行。
+        """
+        if self.browser_driver and hasattr(self.browser_driver, 'run_in_loop_sync'):
+            return self.browser_driver.run_in_loop_sync(func, *args, timeout=timeout, **kwargs)
+        return func(*args, **kwargs)
+
+    def iterate_pages_sync(self, root_selector: str, config: Optional[Dict[str, Any]] = None,
+                           max_pages: Optional[int] = None, timeout: float = 60.0) -> Iterator[int]:
+        """
+        同步迭代当前页面的分页（基于 UniversalPaginator.iterate_pages）
+
+        每次取下一个页码时才翻页，调用方处理完当前页后再继续迭代；提前结束迭代即停止翻页。
+
+        Args:
+            root_selector: 分页容器选择器
+            config: 分页器配置
+            max_pages: 最大页数（含当前页）
+            timeout: 单次翻页的等待上限（秒）
+
+        Yields:
+            int: 当前页码（第一次为翻页前的当前页）
+        """
+        loop = self.get_event_loop()
+        page = self.browser_driver.get_page() if self.browser_driver else None
+        if loop is None or page is None:
+            self.logger.error("❌ 浏览器未就绪，无法分页")
+            return
+
+        paginator = UniversalPaginator(page, debug_mode=self.config.debug_mode)
+        if not wait_for_future(submit_coroutine(paginator.initialize(root_selector, config or {}), loop), timeout):
+            self.logger.warning(f"⚠️ 分页器初始化失败: {root_selector}")
+            return
+
+        pages = paginator.iterate_pages(max_pages=max_pages)
+
+        async def next_page():
+            try:
+                return True, await pages.__anext__()
+            except StopAsyncIteration:
+                return False, None
+
+        try:
+            while True:
+                has_page, page_number = wait_for_future(submit_coroutine(next_page(), loop), timeout)
+                if not has_page:
+                    return
+                yield page_number
+        finally:
+            asyncio.run_coroutine_threadsafe(pages.aclose(), loop)
+
     def get_page_url_sync(self):
         """同步获取当前页面 URL（代理方法）"""
         if not self.browser_driver:
@@ -810,7 +900,76 @@ class SimplifiedBrowserService:
             return None
         return self.browser_driver.get_page_url()
 
+    def get_resource_blocking_stats(self) -> Optional[Dict[str, Any]]:
+        """获取网络资源拦截统计（未启用拦截时返回 None）"""
+        if not self.browser_driver or not hasattr(self.browser_driver, 'get_resource_blocking_stats'):
+            return None
+        return self.browser_driver.get_resource_blocking_stats()
+
+    def get_page_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """获取页面回收池统计（未启用页面回收时返回 None）"""
+        if not self.browser_driver or not hasattr(self.browser_driver, 'get_page_pool_stats'):
+            return None
+        return self.browser_driver.get_page_pool_stats()
+
+    def create_tab_service(self) -> 'SimplifiedBrowserService':
+        """
+        创建绑定新标签页的浏览器服务
+
+        🔧 设计说明：
+        - 新标签页与当前服务共享同一浏览器进程和上下文（Cookie、ERP插件状态）
+        - 返回的服务实例可以像全局服务一样注入到各个 Scraper 中
+        - 对返回的服务调用 close_sync() 只会关闭对应标签页
+
+        Returns:
+            SimplifiedBrowserService: 绑定新标签页的浏览器服务
+
+        Raises:
+            BrowserError: 浏览器驱动不支持多标签页或创建失败
+        """
+        return self._create_child_service('create_tab_driver', "标签页")
+
+    def create_context_service(self) -> 'SimplifiedBrowserService':
+        """
+        创建绑定隔离浏览器上下文的浏览器服务
 
+        🔧 设计说明：
+        - 新上下文与当前服务共享同一浏览器进程，不会启动额外的浏览器
+        - 创建时复制当前上下文的 Cookie 和 localStorage
+        - 持久化上下文（加载ERP插件）下回退为共享上下文的新标签页
+        - 对返回的服务调用 close_sync() 只会关闭对应上下文
+
+        Returns:
+            SimplifiedBrowserService: 绑定隔离上下文的浏览器服务
+
+        Raises:
+            BrowserError: 浏览器驱动不支持多上下文或创建失败
+        """
+        return self._create_child_service('create_context_driver', "浏览器上下文")
+
+    def _create_child_service(self, factory_name: str, label: str) -> 'SimplifiedBrowserService':
+        """使用驱动工厂方法创建共享浏览器进程的子服务"""
+        if not self._browser_started:
+            try:
+                loop = asyncio.get_running_loop()
+                future = asyncio.run_coroutine_threadsafe(self.start_browser(), loop)
+                future.result()
+            except RuntimeError:
+                asyncio.run(self.start_browser())
+
+        if not self.browser_driver or not hasattr(self.browser_driver, factory_name):
+            raise BrowserError(f"当前浏览器驱动不支持创建{label}")
+
+        child_driver = getattr(self.browser_driver, factory_name)()
+        if not child_driver:
+            raise BrowserError(f"创建{label}失败")
+
+        child_service = self.__class__(self.config.to_dict())
+        child_service.browser_driver = child_driver
+        child_service._initialized = True
+        child_service._browser_started = True
+        self.logger.info(f"✅ {label}浏览器服务创建完成")
+        return child_service
 
     def get_event_loop(self):
         """
@@ -1100,7 +1259,7 @@ class SimplifiedBrowserService:
             Dict[str, Any]: 浏览器服务配置字典
         """
         import os
-        from .core.models.browser_config import BrowserConfig, BrowserType
+        from .core.models.browser_config import BrowserConfig, BrowserType, ResourceBlockingConfig
         from .core.config.config import BrowserServiceConfig
 
         logger = logging.getLogger(__name__)
@@ -1110,6 +1269,7 @@ class SimplifiedBrowserService:
             browser_type = os.environ.get('PREFERRED_BROWSER', 'edge').lower()
             debug_port = os.environ.get('BROWSER_DEBUG_PORT', '9222')
             headless = os.environ.get('BROWSER_HEADLESS', 'false').lower() == 'true'
+            block_resources = os.environ.get('BROWSER_BLOCK_RESOURCES', 'false').lower() == 'true'
 
             # 创建浏览器检测器
             detector = BrowserDetector()
@@ -1164,7 +1324,8 @@ class SimplifiedBrowserService:
                 browser_type=BrowserType.EDGE if browser_type == 'edge' else BrowserType.CHROME,
                 headless=headless,
                 debug_port=int(debug_port),
-                user_data_dir=user_data_dir
+                user_data_dir=user_data_dir,
+                resource_blocking=ResourceBlockingConfig(enabled=block_resources)
             )
 
             service_config = BrowserServiceConfig(
@@ -35,6 +35,7 @@ from .models.browser_config import (
     BrowserConfig,
     ViewportConfig,
     ProxyConfig,
+    ResourceBlockingConfig,
     SecurityConfig,
     PerformanceConfig,
     create_default_config
@@ -64,6 +65,7 @@ from .exceptions.browser_exceptions import (
     ValidationError,
     ScenarioExecutionError,
     PaginationError,
+    OperationCancelledError,
     create_browser_error,
     handle_browser_error
 )
@@ -93,6 +95,7 @@ __all__ = [
     'BrowserConfig',
     'ViewportConfig',
     'ProxyConfig',
+    'ResourceBlockingConfig',
     'SecurityConfig',
     'PerformanceConfig',
     'create_default_config',
@@ -117,6 +120,7 @@ __all__ = [
     'ValidationError',
     'ScenarioExecutionError',
     'PaginationError',
+    'OperationCancelledError',
     'create_browser_error',
     'handle_browser_error'
 ]
\ No newline at end of file
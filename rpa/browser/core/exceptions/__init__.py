@@ -18,6 +18,7 @@ from .browser_exceptions import (
     ValidationError,
     ScenarioExecutionError,
     PaginationError,
+    OperationCancelledError,
     create_browser_error,
     handle_browser_error
 )
@@ -36,6 +37,7 @@ __all__ = [
     'ValidationError',
     'ScenarioExecutionError',
     'PaginationError',
+    'OperationCancelledError',
     'create_browser_error',
     'handle_browser_error'
 ]
\ No newline at end of file
@@ -263,6 +263,16 @@ class PageAnalysisError(BrowserError):
         super().__init__(message, "PAGE_ANALYSIS_ERROR", details)
 
 
+class OperationCancelledError(BrowserError):
+    """浏览器操作已取消异常（所属操作超时后，其后续浏览器调用不再执行）"""
+
+    def __init__(self, message: str, operation: Optional[str] = None):
+        details = {}
+        if operation:
+            details['operation'] = operation
+        super().__init__(message, "OPERATION_CANCELLED", details)
+
+
 # 异常工厂函数
 def create_browser_error(error_type: str, message: str, **kwargs) -> BrowserError:
     """创建浏览器异常的工厂函数"""
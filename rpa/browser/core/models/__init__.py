@@ -8,6 +8,7 @@ from .browser_config import (
     BrowserConfig,
     ViewportConfig,
     ProxyConfig,
+    ResourceBlockingConfig,
     SecurityConfig,
     PerformanceConfig,
     create_default_config
@@ -22,11 +23,20 @@ from .page_element import (
     ElementType
 )
 
+from .action_script import (
+    ActionScript,
+    ActionScriptResult,
+    ActionStepResult,
+    ActionType,
+    BrowserAction
+)
+
 __all__ = [
     # 浏览器配置模型
     'BrowserConfig',
     'ViewportConfig',
     'ProxyConfig',
+    'ResourceBlockingConfig',
     'SecurityConfig',
     'PerformanceConfig',
     'create_default_config',
@@ -37,5 +47,12 @@ __all__ = [
     'ElementBounds',
     'ElementState',
     'ElementCollection',
-    'ElementType'
+    'ElementType',
+
+    # 动作脚本模型
+    'ActionScript',
+    'ActionScriptResult',
+    'ActionStepResult',
+    'ActionType',
+    'BrowserAction'
 ]
\ No newline at end of file
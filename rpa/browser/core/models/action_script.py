@@ -0,0 +1,139 @@
+"""
+浏览器动作脚本数据模型
+
+把"查找第一个匹配的选择器 → 点击 → 等待内容 → 返回片段 HTML"这类多步交互
+描述为一个声明式脚本，由驱动在事件循环上一次性执行（一次跨线程往返），
+并报告每一步实际命中的选择器。
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+
+class ActionType(Enum):
+    """动作类型枚举"""
+    FIND_FIRST = "find_first"    # 查找第一个存在的选择器
+    CLICK = "click"              # 点击第一个存在的选择器
+    WAIT_FOR = "wait_for"        # 等待任一选择器出现
+    EVALUATE = "evaluate"        # 执行页面脚本
+    GET_HTML = "get_html"        # 返回第一个匹配元素的 outerHTML（无选择器时返回整页）
+
+
+@dataclass
+class BrowserAction:
+    """单个动作"""
+    action: ActionType
+    selectors: List[str] = field(default_factory=list)
+    timeout_ms: int = 5000
+    state: str = 'attached'
+    script: Optional[str] = None
+    optional: bool = False
+    name: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """结果中的步骤名称"""
+        return self.name or self.action.value
+
+
+@dataclass
+class ActionStepResult:
+    """单个动作的执行结果"""
+    action: str
+    name: str
+    success: bool
+    selector: Optional[str] = None
+    value: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class ActionScriptResult:
+    """动作脚本的执行结果"""
+    success: bool
+    steps: List[ActionStepResult] = field(default_factory=list)
+    failed_step: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    def get(self, name: str) -> Optional[ActionStepResult]:
+        """按步骤名称获取结果（同名步骤取最后一个）"""
+        for step in reversed(self.steps):
+            if step.name == name:
+                return step
+        return None
+
+    def value(self, name: str) -> Any:
+        """步骤返回值，步骤未执行或失败时返回 None"""
+        step = self.get(name)
+        return step.value if step and step.success else None
+
+    def matched_selector(self, name: str) -> Optional[str]:
+        """步骤命中的选择器"""
+        step = self.get(name)
+        return step.selector if step and step.success else None
+
+    @property
+    def matched_selectors(self) -> Dict[str, Optional[str]]:
+        """各步骤命中的选择器（用于日志）"""
+        return {step.name: step.selector for step in self.steps if step.selector}
+
+
+class ActionScript:
+    """
+    声明式动作脚本
+
+    示例：
+        script = (ActionScript()
+                  .click(area_selectors, name='open')
+                  .wait_for(popup_selectors, timeout_ms=5000, optional=True)
+                  .get_html(popup_selectors, name='popup'))
+        result = browser_service.run_action_script_sync(script)
+
+    执行规则：
+    - 步骤按顺序执行，必需步骤失败时脚本终止，optional 步骤失败后继续
+    - XPath 选择器（以 "//" 开头）自动加上 "xpath=" 前缀
+    """
+
+    def __init__(self, actions: Optional[List[BrowserAction]] = None):
+        self.actions: List[BrowserAction] = list(actions or [])
+
+    def _add(self, action: ActionType, selectors=None, **kwargs) -> 'ActionScript':
+        if isinstance(selectors, str):
+            selectors = [selectors]
+        self.actions.append(BrowserAction(action=action, selectors=list(selectors or []), **kwargs))
+        return self
+
+    def find_first(self, selectors, timeout_ms: int = 1000, optional: bool = False,
+                   name: Optional[str] = None) -> 'ActionScript':
+        """查找第一个存在的选择器（不等待出现）"""
+        return self._add(ActionType.FIND_FIRST, selectors, timeout_ms=timeout_ms, optional=optional, name=name)
+
+    def click(self, selectors, timeout_ms: int = 5000, optional: bool = False,
+              name: Optional[str] = None) -> 'ActionScript':
+        """点击第一个存在的选择器"""
+        return self._add(ActionType.CLICK, selectors, timeout_ms=timeout_ms, optional=optional, name=name)
+
+    def wait_for(self, selectors, timeout_ms: int = 5000, state: str = 'attached', optional: bool = False,
+                 name: Optional[str] = None) -> 'ActionScript':
+        """等待任一选择器达到指定状态"""
+        return self._add(ActionType.WAIT_FOR, selectors, timeout_ms=timeout_ms, state=state,
+                         optional=optional, name=name)
+
+    def evaluate(self, script: str, timeout_ms: int = 5000, optional: bool = False,
+                 name: Optional[str] = None) -> 'ActionScript':
+        """执行页面脚本（返回 Promise 时等待其完成）"""
+        return self._add(ActionType.EVALUATE, timeout_ms=timeout_ms, script=script, optional=optional, name=name)
+
+    def get_html(self, selectors=None, optional: bool = False, name: Optional[str] = None) -> 'ActionScript':
+        """返回第一个匹配元素的 outerHTML；不指定选择器时返回整页 HTML"""
+        return self._add(ActionType.GET_HTML, selectors, optional=optional, name=name)
+
+    @property
+    def total_timeout_ms(self) -> int:
+        """各步骤超时之和（脚本整体等待上限的基础）"""
+        return sum(action.timeout_ms for action in self.actions)
+
+    def __len__(self) -> int:
+        return len(self.actions)
@@ -45,6 +45,31 @@ class ProxyConfig:
     bypass: Optional[List[str]] = None
 
 
+@dataclass
+class ResourceBlockingConfig:
+    """资源拦截配置"""
+    enabled: bool = False
+    # Playwright 资源类型：image、media、font、stylesheet、script 等（document 始终放行）
+    blocked_resource_types: List[str] = field(default_factory=lambda: ['image', 'media', 'font'])
+    # 统计/广告等域名，任意资源类型都拦截（包含子域名）
+    blocked_domains: List[str] = field(default_factory=lambda: [
+        'google-analytics.com',
+        'googletagmanager.com',
+        'doubleclick.net',
+        'mc.yandex.ru',
+        'mc.yandex.com',
+        'top-fwz1.mail.ru',
+        'criteo.com',
+        'hotjar.com',
+        'hm.baidu.com',
+        'cnzz.com',
+    ])
+    # 全局放行域名
+    allowed_domains: List[str] = field(default_factory=list)
+    # 按页面站点放行：{'ozon.ru': {'resource_types': ['image'], 'domains': ['cdn.example.com']}}
+    site_allowlists: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+
+
 @dataclass
 class ExtensionConfig:
     """扩展配置"""
@@ -78,6 +103,8 @@ class BrowserConfig:
     user_agent: Optional[str] = None
     extra_http_headers: Dict[str, str] = field(default_factory=dict)
     
+    resource_blocking: ResourceBlockingConfig = field(default_factory=ResourceBlockingConfig)
+    
     # 超时配置
     default_timeout: int = 30000  # 30秒
     navigation_timeout: int = 30000
@@ -132,7 +159,7 @@ class BrowserConfig:
                 result[key] = value.value
             elif isinstance(value, Path):
                 result[key] = str(value)
-            elif isinstance(value, (ViewportConfig, ProxyConfig)):
+            elif isinstance(value, (ViewportConfig, ProxyConfig, ResourceBlockingConfig)):
                 result[key] = value.__dict__
             elif isinstance(value, list) and value and isinstance(value[0], ExtensionConfig):
                 result[key] = [ext.__dict__ for ext in value]
@@ -153,6 +180,9 @@ class BrowserConfig:
             
         if 'proxy' in data and isinstance(data['proxy'], dict):
             data['proxy'] = ProxyConfig(**data['proxy'])
+
+        if 'resource_blocking' in data and isinstance(data['resource_blocking'], dict):
+            data['resource_blocking'] = ResourceBlockingConfig(**data['resource_blocking'])
             
         if 'extensions' in data and isinstance(data['extensions'], list):
             data['extensions'] = [
@@ -9,9 +9,12 @@
 - EnvironmentManager: 环境变量管理器实现
 - StructuredLogger: 结构化日志记录器实现
 - LoggerSystem: 日志系统管理器实现
+- QueuedLogPipeline: 非阻塞日志管线（后台批量写出、重复日志限流、环形缓冲区）
+- AdaptiveRateLimiter: 按域名的导航限流（令牌桶 + AIMD 并发控制）
+- PagePool: 页面回收池（健康检查、按导航次数/内存回收页面、后台预热）
 """
 
-from .playwright_browser_driver import PlaywrightBrowserDriver
+from .playwright_browser_driver import PlaywrightBrowserDriver, PlaywrightTabDriver, PlaywrightContextDriver
 
 
 from .dom_page_analyzer import DOMPageAnalyzer, DOMContentExtractor, DOMElementMatcher, DOMPageValidator
@@ -21,14 +24,34 @@ from .logger_system import (
     StructuredLogger,
     LoggerSystem,
     PerformanceLogger,
+    QueuedLogPipeline,
+    RateLimitFilter,
+    get_global_log_pipeline,
+    reset_global_log_pipeline,
     get_logger_system,
     get_logger,
     set_debug_mode
 )
+from .rate_limiter import (
+    AdaptiveRateLimiter,
+    configure_global_rate_limiter,
+    get_global_rate_limiter,
+    reset_global_rate_limiter
+)
+from .page_pool import (
+    PagePool,
+    PageRecyclePolicy,
+    configure_page_recycle_policy,
+    get_page_pool_stats,
+    get_page_recycle_policy,
+    reset_page_recycle_policy
+)
 
 __all__ = [
     # 浏览器驱动
     'PlaywrightBrowserDriver',
+    'PlaywrightTabDriver',
+    'PlaywrightContextDriver',
 
     # DOM分析器
     'DOMPageAnalyzer',
@@ -47,7 +70,25 @@ __all__ = [
     'StructuredLogger',
     'LoggerSystem',
     'PerformanceLogger',
+    'QueuedLogPipeline',
+    'RateLimitFilter',
+    'get_global_log_pipeline',
+    'reset_global_log_pipeline',
     'get_logger_system',
     'get_logger',
-    'set_debug_mode'
+    'set_debug_mode',
+
+    # 导航限流
+    'AdaptiveRateLimiter',
+    'configure_global_rate_limiter',
+    'get_global_rate_limiter',
+    'reset_global_rate_limiter',
+
+    # 页面回收
+    'PagePool',
+    'PageRecyclePolicy',
+    'configure_page_recycle_policy',
+    'get_page_pool_stats',
+    'get_page_recycle_policy',
+    'reset_page_recycle_policy'
 ]
\ No newline at end of file
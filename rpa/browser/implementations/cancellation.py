@@ -0,0 +1,199 @@
+"""
+浏览器操作取消范围
+
+业务层的一次带超时操作（导航、数据提取）对应一个 CancellationScope。操作期间驱动提交到
+专用事件循环的协程都登记在当前线程的取消范围中；操作超时时取消该范围：
+- 已提交、尚未完成的协程在事件循环中被取消（不再继续操作共享页面）
+- 该操作后续的浏览器调用直接抛出 OperationCancelledError，不会与下一个商品的导航竞争
+
+驱动等待协程结果超时时也会取消该协程（wait_for_future），避免超时后协程仍在事件循环中运行。
+
+在事件循环的桥接任务中（见 loop_bridge）调用时，协程直接作为事件循环上的任务执行并等待，
+不经过跨线程提交；取消范围使用 contextvars 保存，每个桥接任务互不影响。
+"""
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Coroutine, Iterator, List, Optional, Set, Union
+
+from ..core.exceptions.browser_exceptions import OperationCancelledError
+from .loop_bridge import await_on_loop, in_loop_bridge
+
+
+_current_scope: ContextVar[Optional['CancellationScope']] = ContextVar('browser_cancellation_scope', default=None)
+
+# 跨线程提交返回 concurrent.futures.Future，桥接任务中返回 asyncio.Task
+BrowserFuture = Union[Future, asyncio.Future]
+
+
+def _cancel_future(future: BrowserFuture) -> bool:
+    """取消协程（asyncio 任务通过其事件循环线程安全地取消）"""
+    if isinstance(future, asyncio.Future):
+        if future.done():
+            return False
+        future.get_loop().call_soon_threadsafe(future.cancel)
+        return True
+    return future.cancel()
+
+
+class CancellationScope:
+    """
+    可取消的操作范围
+
+    支持嵌套：子范围在父范围取消时一并取消。
+    """
+
+    def __init__(self, name: str = "operation", parent: Optional['CancellationScope'] = None):
+        self.name = name
+        self.parent = parent
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._futures: Set[BrowserFuture] = set()
+        self._children: List['CancellationScope'] = []
+        self.cancelled_coroutines = 0
+
+        if parent is not None:
+            parent._add_child(self)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def _add_child(self, child: 'CancellationScope') -> None:
+        with self._lock:
+            if not self._cancelled:
+                self._children.append(child)
+                return
+        child.cancel()
+
+    def _remove_child(self, child: 'CancellationScope') -> None:
+        with self._lock:
+            if child in self._children:
+                self._children.remove(child)
+
+    def register(self, future: BrowserFuture) -> None:
+        """
+        登记已提交到事件循环的协程
+
+        Raises:
+            OperationCancelledError: 范围已取消（协程同时被取消）
+        """
+        with self._lock:
+            if not self._cancelled:
+                self._futures.add(future)
+                future.add_done_callback(self._discard)
+                return
+        if _cancel_future(future):
+            self.cancelled_coroutines += 1
+        raise OperationCancelledError(f"{self.name}已取消", operation=self.name)
+
+    def _discard(self, future: BrowserFuture) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def check(self) -> None:
+        """范围已取消时抛出 OperationCancelledError"""
+        if self._cancelled:
+            raise OperationCancelledError(f"{self.name}已取消", operation=self.name)
+
+    def cancel(self) -> int:
+        """
+        取消范围内所有未完成的协程（包括子范围）
+
+        Returns:
+            int: 本次取消的协程数量
+        """
+        with self._lock:
+            self._cancelled = True
+            futures = list(self._futures)
+            self._futures.clear()
+            children = list(self._children)
+
+        cancelled = 0
+        for future in futures:
+            if _cancel_future(future):
+                cancelled += 1
+        self.cancelled_coroutines += cancelled
+
+        for child in children:
+            cancelled += child.cancel()
+        return cancelled
+
+    def close(self) -> None:
+        """操作结束后从父范围中移除"""
+        if self.parent is not None:
+            self.parent._remove_child(self)
+
+
+def current_scope() -> Optional[CancellationScope]:
+    """获取当前线程（或桥接任务）所在的取消范围"""
+    return _current_scope.get()
+
+
+@contextmanager
+def cancellation_scope(scope: CancellationScope) -> Iterator[CancellationScope]:
+    """在当前线程（或桥接任务）中进入取消范围"""
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        scope.close()
+
+
+def submit_coroutine(coro: Coroutine, loop: asyncio.AbstractEventLoop) -> BrowserFuture:
+    """
+    提交协程到驱动的专用事件循环，并登记到当前线程的取消范围
+
+    不在取消范围内调用时与 asyncio.run_coroutine_threadsafe 行为一致；
+    在该事件循环的桥接任务中调用时直接创建事件循环任务（不跨线程）。
+
+    Raises:
+        OperationCancelledError: 当前操作已被取消
+    """
+    scope = current_scope()
+    if scope is not None and scope.cancelled:
+        coro.close()
+        scope.check()
+
+    if in_loop_bridge(loop):
+        future = loop.create_task(coro)
+    else:
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+    if scope is not None:
+        scope.register(future)
+    return future
+
+
+def wait_for_future(future: BrowserFuture, timeout: Optional[float] = None):
+    """
+    等待事件循环中的协程结果，超时时取消协程
+
+    Raises:
+        TimeoutError: 等待超时（协程已被取消）
+        CancelledError: 协程被取消范围取消
+    """
+    if isinstance(future, asyncio.Future):
+        return _await_task(future, timeout)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+
+def _await_task(task: asyncio.Future, timeout: Optional[float]):
+    """在桥接任务中等待事件循环任务，异常与跨线程等待保持一致"""
+    try:
+        return await_on_loop(asyncio.wait_for(task, timeout))
+    except asyncio.TimeoutError:
+        raise FutureTimeoutError()
+    except asyncio.CancelledError:
+        scope = current_scope()
+        if scope is not None and scope.cancelled:
+            # 与跨线程等待一致：取消范围导致的取消以 concurrent.futures.CancelledError 抛出
+            raise CancelledError()
+        raise
@@ -5,14 +5,17 @@
 支持结构化日志、性能监控、多种输出格式和日志轮转
 """
 
+import copy
 import logging
 import logging.handlers
+import queue
 import sys
 import json
 import time
 import asyncio
 import os
 import threading
+from collections import deque
 from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
 from datetime import datetime
@@ -429,9 +432,9 @@ class StructuredLogger:
                             if k not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
                                        'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
                                        'thread', 'threadName', 'processName', 'process', 'message']}
-            self.logger.debug(message, extra={'data': filtered_extra})
+            self.logger.debug(message, extra={'data': filtered_extra}, stacklevel=2)
         else:
-            self.logger.debug(message)
+            self.logger.debug(message, stacklevel=2)
 
     def info(self, message: str, **kwargs):
         """输出INFO级别日志"""
@@ -455,9 +458,9 @@ class StructuredLogger:
                             if k not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
                                        'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
                                        'thread', 'threadName', 'processName', 'process', 'message']}
-            self.logger.info(message, extra={'data': filtered_extra})
+            self.logger.info(message, extra={'data': filtered_extra}, stacklevel=2)
         else:
-            self.logger.info(message)
+            self.logger.info(message, stacklevel=2)
 
     def warning(self, message: str, **kwargs):
         """输出WARNING级别日志"""
@@ -481,9 +484,9 @@ class StructuredLogger:
                             if k not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
                                        'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
                                        'thread', 'threadName', 'processName', 'process', 'message']}
-            self.logger.warning(message, extra={'data': filtered_extra})
+            self.logger.warning(message, extra={'data': filtered_extra}, stacklevel=2)
         else:
-            self.logger.warning(message)
+            self.logger.warning(message, stacklevel=2)
 
     def error(self, message: str, exception: Optional[Exception] = None, **kwargs):
         """输出ERROR级别日志"""
@@ -515,9 +518,9 @@ class StructuredLogger:
                             if k not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
                                        'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
                                        'thread', 'threadName', 'processName', 'process', 'message']}
-            self.logger.error(error_message, extra={'data': filtered_extra})
+            self.logger.error(error_message, extra={'data': filtered_extra}, stacklevel=2)
         else:
-            self.logger.error(error_message)
+            self.logger.error(error_message, stacklevel=2)
 
     def critical(self, message: str, exception: Optional[Exception] = None, **kwargs):
         """输出CRITICAL级别日志"""
@@ -550,13 +553,13 @@ class StructuredLogger:
                             if k not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
                                        'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
                                        'thread', 'threadName', 'processName', 'process', 'message']}
-            self.logger.critical(critical_message, extra={'data': filtered_extra})
+            self.logger.critical(critical_message, extra={'data': filtered_extra}, stacklevel=2)
         else:
-            self.logger.critical(critical_message)
+            self.logger.critical(critical_message, stacklevel=2)
 
     def exception(self, message: str, **kwargs):
         """输出异常日志"""
-        self.logger.exception(message)
+        self.logger.exception(message, stacklevel=2)
 
     def context(self, context_data: Dict[str, Any]):
         """上下文管理器"""
@@ -696,6 +699,270 @@ class StructuredFormatter(logging.Formatter):
         return base_msg
 
 
+class RateLimitFilter(logging.Filter):
+    """
+    重复日志限流过滤器
+
+    按调用位置（日志器 + 源文件 + 行号）统计，同一位置在每个时间窗口内最多放行 burst 条；
+    WARNING 及以上级别不限流。窗口结束后放行的第一条日志会附带被抑制的条数。
+    """
+
+    def __init__(self, burst: int = 20, interval: float = 10.0, passthrough_level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.passthrough_level = passthrough_level
+        self.suppressed_total = 0
+        self._windows: Dict[tuple, List[float]] = {}  # key -> [窗口开始时间, 已放行条数, 已抑制条数]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.passthrough_level or self.burst <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = int(window[2]) if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} （{self.interval:g}秒内已抑制{suppressed}条同类日志）"
+                    record.args = None
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            self.suppressed_total += 1
+            return False
+
+
+class _QueueingHandler(logging.handlers.QueueHandler):
+    """把日志记录放入管线队列的处理器（只做最少的工作，格式化在写入线程完成）"""
+
+    def __init__(self, pipeline: 'QueuedLogPipeline', target_handlers: tuple):
+        super().__init__(pipeline._queue)
+        self.pipeline = pipeline
+        self.target_handlers = target_handlers
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """合并消息参数并截断超长消息，避免在队列中持有可变参数"""
+        message = record.getMessage()
+        max_chars = self.pipeline.max_message_chars
+        if max_chars and len(message) > max_chars:
+            message = f"{message[:max_chars]}...（已截断，共{len(message)}字符）"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        self.pipeline._put((record, self.target_handlers))
+
+
+class QueuedLogPipeline:
+    """
+    非阻塞日志管线
+
+    挂接到日志器后，其原有处理器移到后台写入线程：调用线程只把记录放入有界队列，
+    格式化和文件写入在后台线程按批完成，每批只刷新一次流。
+    同时对重复日志限流，并在内存环形缓冲区中保留最近的日志记录。
+    队列满时丢弃 WARNING 以下的日志（计入 dropped），WARNING 及以上级别等待入队。
+    """
+
+    _STOP = object()
+
+    def __init__(self, queue_size: int = 10000, batch_size: int = 256, flush_interval: float = 0.5,
+                 ring_buffer_size: int = 2000, rate_limit_burst: int = 20, rate_limit_interval: float = 10.0,
+                 max_message_chars: int = 4000):
+        """
+        初始化日志管线
+
+        Args:
+            queue_size: 队列容量
+            batch_size: 每批最多写入的记录数
+            flush_interval: 队列空闲时的最长刷新间隔（秒）
+            ring_buffer_size: 内存中保留的最近日志条数
+            rate_limit_burst: 同一调用位置每个窗口最多输出的条数（0 表示不限流）
+            rate_limit_interval: 限流窗口（秒）
+            max_message_chars: 单条消息最大字符数，超出部分截断（0 表示不截断）
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_message_chars = max_message_chars
+        self.rate_limit_filter = RateLimitFilter(burst=rate_limit_burst, interval=rate_limit_interval)
+        self.ring_buffer: deque = deque(maxlen=ring_buffer_size)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._attached: Dict[str, tuple] = {}  # 日志器名称 -> (日志器, 队列处理器, 原处理器)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'errors': 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'QueuedLogPipeline':
+        """启动后台写入线程"""
+        with self._lock:
+            if not self.running:
+                self._thread = threading.Thread(target=self._writer_loop, name="LogWriter", daemon=True)
+                self._thread.start()
+        return self
+
+    def attach(self, logger: logging.Logger):
+        """把日志器的现有处理器移到后台写入线程"""
+        with self._lock:
+            if logger.name in self._attached:
+                return
+            target_handlers = tuple(logger.handlers)
+            queue_handler = _QueueingHandler(self, target_handlers)
+            queue_handler.addFilter(self.rate_limit_filter)
+            for handler in target_handlers:
+                logger.removeHandler(handler)
+            logger.addHandler(queue_handler)
+            self._attached[logger.name] = (logger, queue_handler, target_handlers)
+
+    def detach(self, logger: logging.Logger):
+        """恢复日志器的原处理器（之前入队的记录仍会写出）"""
+        with self._lock:
+            entry = self._attached.pop(logger.name, None)
+        if entry:
+            _, queue_handler, target_handlers = entry
+            logger.removeHandler(queue_handler)
+            for handler in target_handlers:
+                logger.addHandler(handler)
+
+    def _put(self, item: tuple):
+        """放入队列：队列满时低级别日志直接丢弃，不阻塞抓取线程"""
+        record = item[0]
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self._stats['dropped'] += 1
+                return
+            try:
+                self._queue.put(item, timeout=1.0)
+            except queue.Full:
+                self._stats['dropped'] += 1
+                return
+        self._stats['enqueued'] += 1
+
+    def _writer_loop(self):
+        """后台写入线程：按批取出记录写入，每批结束后统一刷新"""
+        stop = False
+        while not stop:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = self._write_batch(items)
+
+    def _write_batch(self, items: List[Any]) -> bool:
+        """写入一批记录，返回是否收到停止信号"""
+        stop = False
+        touched = {}
+        for item in items:
+            if item is self._STOP:
+                stop = True
+                continue
+            if isinstance(item, threading.Event):
+                # flush() 的同步标记：之前的记录写完并刷新后再通知
+                self._flush_handlers(touched)
+                touched = {}
+                item.set()
+                continue
+            record, target_handlers = item
+            self.ring_buffer.append(record)
+            for handler in target_handlers:
+                if record.levelno < handler.level:
+                    continue
+                try:
+                    if _emit_without_flush(handler, record):
+                        touched[id(handler)] = handler
+                except Exception:
+                    self._stats['errors'] += 1
+            self._stats['written'] += 1
+        self._flush_handlers(touched)
+        self._stats['batches'] += 1
+        return stop
+
+    def _flush_handlers(self, handlers: Dict[int, logging.Handler]):
+        for handler in handlers.values():
+            try:
+                handler.flush()
+            except Exception:
+                self._stats['errors'] += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """等待已入队的记录全部写出并刷新"""
+        if not self.running:
+            return False
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """写出剩余记录、停止写入线程并恢复所有日志器的原处理器"""
+        for logger, _, _ in list(self._attached.values()):
+            self.detach(logger)
+        if self.running:
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+        self._thread = None
+
+    def get_recent_records(self, limit: Optional[int] = None,
+                           min_level: int = logging.NOTSET) -> List[logging.LogRecord]:
+        """获取环形缓冲区中最近的日志记录（按时间顺序）"""
+        records = [record for record in list(self.ring_buffer) if record.levelno >= min_level]
+        return records[-limit:] if limit else records
+
+    def get_recent_lines(self, limit: Optional[int] = None, min_level: int = logging.NOTSET) -> List[str]:
+        """获取最近日志的文本（查看时才格式化）"""
+        formatter = StructuredFormatter(console=False)
+        return [formatter.format(record) for record in self.get_recent_records(limit, min_level)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取管线统计信息"""
+        stats = dict(self._stats)
+        stats['suppressed'] = self.rate_limit_filter.suppressed_total
+        stats['queue_depth'] = self._queue.qsize()
+        stats['attached_loggers'] = list(self._attached.keys())
+        return stats
+
+
+def _emit_without_flush(handler: logging.Handler, record: logging.LogRecord) -> bool:
+    """
+    写入记录但不刷新流（由管线在批次结束后统一刷新）
+
+    Returns:
+        bool: 是否写入了需要刷新的流
+    """
+    if not isinstance(handler, logging.StreamHandler) or not handler.filter(record):
+        handler.handle(record)
+        return False
+    with handler.lock:
+        if isinstance(handler, logging.handlers.BaseRotatingHandler) and handler.shouldRollover(record):
+            handler.doRollover()
+        if isinstance(handler, logging.FileHandler) and handler.stream is None:
+            handler.stream = handler._open()
+        handler.stream.write(handler.format(record) + handler.terminator)
+    return True
+
+
 class LoggerSystem:
     """日志系统管理器"""
     
@@ -715,6 +982,7 @@ class LoggerSystem:
         self.default_logger = None
         self.global_context = {}
         self.initialized = False
+        self.log_pipeline: Optional[QueuedLogPipeline] = None
 
         # 创建默认日志器
         self._create_default_logger()
@@ -781,6 +1049,8 @@ class LoggerSystem:
             logger_config.update(kwargs)
             
             self.loggers[name] = StructuredLogger(**logger_config)
+            if self.log_pipeline:
+                self.log_pipeline.attach(self.loggers[name].logger)
         
         return self.loggers[name]
 
@@ -807,9 +1077,29 @@ class LoggerSystem:
         
         logger = StructuredLogger(**logger_config)
         self.loggers[name] = logger
+        if self.log_pipeline:
+            self.log_pipeline.attach(logger.logger)
         
         return logger
 
+    def enable_queued_logging(self, pipeline: 'QueuedLogPipeline'):
+        """
+        所有日志器（包括之后创建的）改为经由日志管线异步写出
+
+        Args:
+            pipeline: 已启动的日志管线
+        """
+        self.log_pipeline = pipeline
+        for logger in self.loggers.values():
+            pipeline.attach(logger.logger)
+
+    def disable_queued_logging(self):
+        """恢复所有日志器的同步写出"""
+        if self.log_pipeline:
+            for logger in self.loggers.values():
+                self.log_pipeline.detach(logger.logger)
+            self.log_pipeline = None
+
     def set_debug_mode(self, enabled: bool):
         """
         设置调试模式
@@ -968,6 +1258,7 @@ class LoggerSystem:
 
     def shutdown(self):
         """关闭日志系统"""
+        self.disable_queued_logging()
         for logger in self.loggers.values():
             for handler in logger.logger.handlers:
                 handler.close()
@@ -993,9 +1284,47 @@ def get_logger_system(debug_mode: bool = False) -> LoggerSystem:
     global _global_logger_system
     if _global_logger_system is None:
         _global_logger_system = LoggerSystem(debug_mode)
+        if _global_log_pipeline is not None:
+            _global_logger_system.enable_queued_logging(_global_log_pipeline)
     return _global_logger_system
 
 
+# 全局日志管线实例
+_global_log_pipeline: Optional[QueuedLogPipeline] = None
+
+
+def get_global_log_pipeline(**settings) -> QueuedLogPipeline:
+    """
+    获取全局日志管线（首次调用时按 settings 创建并启动，进程退出前自动写出剩余日志）
+
+    全局日志系统的日志器（包括之后创建的）都经由该管线写出。
+
+    Args:
+        **settings: QueuedLogPipeline 构造参数
+
+    Returns:
+        QueuedLogPipeline: 已启动的日志管线
+    """
+    global _global_log_pipeline
+    if _global_log_pipeline is None:
+        _global_log_pipeline = QueuedLogPipeline(**settings).start()
+        atexit.register(_global_log_pipeline.stop)
+        if _global_logger_system is not None:
+            _global_logger_system.enable_queued_logging(_global_log_pipeline)
+    return _global_log_pipeline
+
+
+def reset_global_log_pipeline():
+    """停止全局日志管线并恢复各日志器的同步写出"""
+    global _global_log_pipeline
+    if _global_log_pipeline is not None:
+        if _global_logger_system is not None and _global_logger_system.log_pipeline is _global_log_pipeline:
+            _global_logger_system.disable_queued_logging()
+        _global_log_pipeline.stop()
+        atexit.unregister(_global_log_pipeline.stop)
+        _global_log_pipeline = None
+
+
 def get_logger(name: str = "default", debug_mode: bool = False) -> StructuredLogger:
     """
     获取日志器（兼容原有接口）
@@ -0,0 +1,90 @@
+"""
+同步代码与驱动事件循环之间的桥接
+
+驱动的 *_sync 方法默认把每个 Playwright 调用通过 run_coroutine_threadsafe 提交到专用事件循环线程，
+调用线程阻塞等待结果；一次商品抓取会产生几十次这样的跨线程往返。
+
+run_sync_on_loop 把一段同步代码（例如一次完整的 scraper.scrape 调用）放在 greenlet 中、
+直接运行在驱动事件循环上（与 Playwright 同步 API 的实现方式相同）：
+- 同步代码中的 *_sync 调用不再跨线程，而是切回事件循环直接 await 对应的协程
+- 多个桥接任务可以在同一事件循环上交替执行（例如不同标签页上的抓取）
+- cooperative_sleep 在桥接任务中让出事件循环，不阻塞其他任务
+
+注意：桥接任务中的纯 Python 计算（HTML 解析等）仍在事件循环线程上执行。
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from greenlet import greenlet, getcurrent
+
+
+class _BridgeGreenlet(greenlet):
+    """运行在驱动事件循环上的同步代码"""
+
+    def __init__(self, run: Callable[..., Any], loop: asyncio.AbstractEventLoop):
+        super().__init__(run)
+        self.loop = loop
+
+
+def in_loop_bridge(loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+    """
+    当前代码是否运行在事件循环的桥接任务中
+
+    Args:
+        loop: 指定事件循环，为空时只判断是否处于任意桥接任务中
+    """
+    current = getcurrent()
+    return isinstance(current, _BridgeGreenlet) and (loop is None or current.loop is loop)
+
+
+def await_on_loop(awaitable: Awaitable) -> Any:
+    """
+    在桥接任务中等待协程结果（切回事件循环 await，完成后恢复同步代码）
+
+    Raises:
+        RuntimeError: 不在桥接任务中调用
+    """
+    current = getcurrent()
+    if not isinstance(current, _BridgeGreenlet):
+        raise RuntimeError("await_on_loop 只能在 run_sync_on_loop 启动的同步代码中调用")
+    return current.parent.switch(awaitable)
+
+
+async def run_sync_on_loop(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    在当前事件循环上以协程方式运行同步函数
+
+    必须在驱动事件循环中 await；函数内的浏览器同步调用直接 await，不再跨线程。
+
+    Args:
+        func: 同步函数
+        *args, **kwargs: 函数参数
+
+    Returns:
+        Any: 函数返回值（函数抛出的异常原样抛出）
+    """
+    bridge = _BridgeGreenlet(lambda: func(*args, **kwargs), asyncio.get_running_loop())
+    value = bridge.switch()
+    while not bridge.dead:
+        try:
+            result = await value
+        except GeneratorExit:
+            # 事件循环关闭时回收未完成的协程
+            raise
+        except BaseException as e:
+            value = bridge.throw(e)
+        else:
+            value = bridge.switch(result)
+    return value
+
+
+def cooperative_sleep(seconds: float) -> None:
+    """等待指定秒数：桥接任务中让出事件循环，其他情况下阻塞当前线程"""
+    if seconds <= 0:
+        return
+    if in_loop_bridge():
+        await_on_loop(asyncio.sleep(seconds))
+    else:
+        time.sleep(seconds)
@@ -0,0 +1,295 @@
+"""
+页面回收池
+
+长时间运行时同一个页面会被导航成千上万次，Chromium 渲染进程的内存持续增长，页面越来越慢甚至崩溃。
+PagePool 管理驱动使用的页面，每次导航前借出页面时：
+- 用一次轻量的 evaluate 检查页面健康（同时读取 JS 堆大小），无响应或已关闭的页面直接替换
+- 页面导航次数、JS 堆或渲染进程 RSS 超过阈值时回收：换上新页面，旧页面在后台关闭
+- 接近阈值时在后台预先创建替换页面，回收时不需要等待新页面创建
+
+回收只替换页面，不替换浏览器上下文：持久化上下文（ERP插件）无法重建，
+同一上下文中的新页面使用新的渲染进程，Cookie 和插件状态不受影响。
+
+所有方法都在驱动的专用事件循环中执行。抓取流程中通过 configure_page_recycling() 启用，
+未启用时驱动直接使用原页面。
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .logger_system import get_logger
+
+# 健康检查脚本：返回 JS 堆已用字节数（非 Chromium 浏览器返回 0）
+HEALTH_CHECK_SCRIPT = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+# 达到阈值的该比例时开始预热替换页面
+PREWARM_RATIO = 0.8
+
+
+@dataclass
+class PageRecyclePolicy:
+    """页面回收策略（阈值为 0 表示不按该条件回收）"""
+    max_navigations: int = 200  # 单个页面最多导航次数
+    max_js_heap_mb: float = 512.0  # 单个页面 JS 堆上限（MB）
+    max_renderer_rss_mb: float = 4096.0  # 浏览器全部渲染进程 RSS 上限（MB，仅 Linux 可用）
+    memory_check_interval: int = 10  # 每隔多少次导航检查一次渲染进程 RSS
+    health_check_timeout: float = 5.0  # 健康检查超时（秒）
+
+
+def renderer_rss_mb() -> Optional[float]:
+    """
+    当前进程启动的浏览器渲染进程 RSS 总和（MB）
+
+    通过 /proc 查找当前进程的子孙进程中命令行包含 --type=renderer 的进程；
+    非 Linux 系统或通过 CDP 连接的外部浏览器无法获取，返回 None。
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+            # 进程名可能包含空格，ppid 位于最后一个 ')' 之后的第二个字段
+            parents[int(entry)] = int(stat[stat.rindex(b')') + 2:].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+
+    descendants = {os.getpid()}
+    changed = True
+    while changed:
+        changed = False
+        for pid, ppid in parents.items():
+            if ppid in descendants and pid not in descendants:
+                descendants.add(pid)
+                changed = True
+
+    total_kb = 0
+    renderers = 0
+    for pid in descendants - {os.getpid()}:
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                if b'--type=renderer' not in f.read():
+                    continue
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        renderers += 1
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024 if renderers else None
+
+
+class PooledPage:
+    """池中的页面及其运行统计"""
+
+    def __init__(self, page):
+        self.page = page
+        self.created_at = time.monotonic()
+        self.navigations = 0
+        self.js_heap_mb: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'age': round(time.monotonic() - self.created_at, 1),
+            'navigations': self.navigations,
+            'js_heap_mb': round(self.js_heap_mb, 1) if self.js_heap_mb is not None else None,
+        }
+
+
+class PagePool:
+    """
+    单个驱动的页面回收池
+
+    池中有一个正在使用的页面，以及接近回收条件时预热的一个备用页面。
+    """
+
+    def __init__(self, page, policy: PageRecyclePolicy, page_factory: Callable[[], Awaitable[Any]]):
+        """
+        Args:
+            page: 驱动当前使用的页面
+            policy: 回收策略
+            page_factory: 创建新页面的协程函数（在同一上下文中创建并注入反检测脚本）
+        """
+        self.policy = policy
+        self.page_factory = page_factory
+        self._logger = get_logger("PagePool")
+        self._active = PooledPage(page)
+        self._spare: Optional[PooledPage] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self._renderer_rss_mb: Optional[float] = None
+        self._navigations_since_rss_check = 0
+        self.stats = {'recycled': 0, 'health_check_failures': 0, 'recycled_by_reason': {}}
+        _all_pools.add(self)
+
+    async def checkout(self):
+        """
+        借出可用的页面（健康检查失败或达到回收条件时先替换页面）
+
+        Returns:
+            Page: 本次导航使用的页面
+        """
+        reason = await self._check_active()
+        if reason:
+            await self._recycle(reason)
+        elif self._near_threshold() and self._spare is None and self._prewarm_task is None:
+            self._prewarm_task = asyncio.get_running_loop().create_task(self._prewarm())
+        return self._active.page
+
+    @property
+    def active_page(self):
+        """当前使用的页面"""
+        return self._active.page
+
+    async def rebind(self, page):
+        """
+        驱动自行更换页面后（例如加载存储状态时重建上下文和页面）以新页面作为当前页面
+
+        旧页面由驱动关闭；备用页面可能属于旧上下文，一并关闭。
+        """
+        if self._prewarm_task is not None:
+            await self._prewarm_task
+        if self._spare is not None:
+            await self._close_page(self._spare.page)
+            self._spare = None
+        self._active = PooledPage(page)
+        self._renderer_rss_mb = None
+
+    def record_navigation(self):
+        """记录当前页面完成一次导航"""
+        self._active.navigations += 1
+        self._navigations_since_rss_check += 1
+
+    async def _check_active(self) -> Optional[str]:
+        """检查当前页面，返回需要回收的原因，可继续使用时返回 None"""
+        policy = self.policy
+        entry = self._active
+        if policy.max_navigations and entry.navigations >= policy.max_navigations:
+            return 'navigations'
+
+        try:
+            if entry.page.is_closed():
+                raise RuntimeError("page closed")
+            heap_bytes = await asyncio.wait_for(entry.page.evaluate(HEALTH_CHECK_SCRIPT), policy.health_check_timeout)
+            entry.js_heap_mb = (heap_bytes or 0) / 1024 / 1024 or None
+        except Exception as e:
+            self.stats['health_check_failures'] += 1
+            self._logger.warning(f"⚠️ 页面健康检查失败，替换页面: {e}")
+            return 'unhealthy'
+
+        if policy.max_js_heap_mb and entry.js_heap_mb and entry.js_heap_mb >= policy.max_js_heap_mb:
+            return 'js_heap'
+
+        if policy.max_renderer_rss_mb and self._navigations_since_rss_check >= policy.memory_check_interval:
+            self._navigations_since_rss_check = 0
+            self._renderer_rss_mb = await asyncio.get_running_loop().run_in_executor(None, renderer_rss_mb)
+            if self._renderer_rss_mb and self._renderer_rss_mb >= policy.max_renderer_rss_mb:
+                return 'renderer_rss'
+        return None
+
+    def _near_threshold(self) -> bool:
+        policy = self.policy
+        entry = self._active
+        return bool(
+            (policy.max_navigations and entry.navigations >= policy.max_navigations * PREWARM_RATIO)
+            or (policy.max_js_heap_mb and entry.js_heap_mb and entry.js_heap_mb >= policy.max_js_heap_mb * PREWARM_RATIO)
+            or (policy.max_renderer_rss_mb and self._renderer_rss_mb
+                and self._renderer_rss_mb >= policy.max_renderer_rss_mb * PREWARM_RATIO)
+        )
+
+    async def _prewarm(self):
+        try:
+            self._spare = PooledPage(await self.page_factory())
+        except Exception as e:
+            self._logger.warning(f"⚠️ 预热替换页面失败: {e}")
+        finally:
+            self._prewarm_task = None
+
+    async def _recycle(self, reason: str):
+        """换上备用页面（没有时立即创建），旧页面在后台关闭"""
+        if self._prewarm_task is not None:
+            await self._prewarm_task
+        spare, self._spare = self._spare, None
+        if spare is None or spare.page.is_closed():
+            spare = PooledPage(await self.page_factory())
+
+        old, self._active = self._active, spare
+        self._renderer_rss_mb = None
+        self.stats['recycled'] += 1
+        by_reason = self.stats['recycled_by_reason']
+        by_reason[reason] = by_reason.get(reason, 0) + 1
+        self._logger.info(
+            f"♻️ 回收页面（{reason}）: 已导航{old.navigations}次，使用{time.monotonic() - old.created_at:.0f}s，"
+            f"JS堆{old.js_heap_mb or 0:.0f}MB"
+        )
+        asyncio.get_running_loop().create_task(self._close_page(old.page))
+
+    async def _close_page(self, page):
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception as e:
+            self._logger.debug(f"关闭回收页面失败: {e}")
+
+    async def close(self):
+        """关闭备用页面（当前页面由驱动关闭）"""
+        if self._prewarm_task is not None:
+            await self._prewarm_task
+        if self._spare is not None:
+            await self._close_page(self._spare.page)
+            self._spare = None
+        _all_pools.discard(self)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取页面统计（当前页面与备用页面的使用时间、导航次数、JS堆）"""
+        pages = [dict(self._active.to_dict(), role='active')]
+        if self._spare is not None:
+            pages.append(dict(self._spare.to_dict(), role='spare'))
+        return {
+            'pages': pages,
+            'recycled': self.stats['recycled'],
+            'recycled_by_reason': dict(self.stats['recycled_by_reason']),
+            'health_check_failures': self.stats['health_check_failures'],
+            'renderer_rss_mb': round(self._renderer_rss_mb, 1) if self._renderer_rss_mb else None,
+        }
+
+
+# 全局回收策略（由抓取流程设置，驱动在导航时读取）
+_page_recycle_policy: Optional[PageRecyclePolicy] = None
+_all_pools: "weakref.WeakSet[PagePool]" = weakref.WeakSet()
+
+
+def configure_page_recycle_policy(**settings) -> PageRecyclePolicy:
+    """
+    设置全局页面回收策略（替换已有的策略，已有的池在下次导航时按新策略重建）
+
+    Args:
+        **settings: PageRecyclePolicy 字段
+    """
+    global _page_recycle_policy
+    _page_recycle_policy = PageRecyclePolicy(**settings)
+    return _page_recycle_policy
+
+
+def get_page_recycle_policy() -> Optional[PageRecyclePolicy]:
+    """获取全局页面回收策略，未启用时返回 None"""
+    return _page_recycle_policy
+
+
+def reset_page_recycle_policy():
+    """停用页面回收（已有的池不再使用，驱动继续使用当前页面）"""
+    global _page_recycle_policy
+    _page_recycle_policy = None
+
+
+def get_page_pool_stats() -> List[Dict[str, Any]]:
+    """获取所有页面回收池的统计"""
+    return [pool.get_stats() for pool in list(_all_pools)]
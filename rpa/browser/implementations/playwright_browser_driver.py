@@ -14,12 +14,17 @@ import os
 import platform
 import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
 
 from .logger_system import get_logger
+from .cancellation import CancellationScope, cancellation_scope, current_scope, submit_coroutine, wait_for_future
+from .loop_bridge import in_loop_bridge, run_sync_on_loop
+from .page_pool import PagePool, PageRecyclePolicy, get_page_recycle_policy
+from .resource_blocker import ResourceBlocker
 from ..core.interfaces.browser_driver import IBrowserDriver
 from ..core.exceptions.browser_exceptions import BrowserError, BrowserInitializationError
+from ..core.models.action_script import ActionScript, ActionScriptResult, ActionStepResult, ActionType, BrowserAction
 
 
 class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
@@ -53,6 +58,15 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
         self._initialized = False
         self._is_persistent_context = False
 
+        # 网络资源拦截（未启用时为 None）
+        self._resource_blocker: Optional[ResourceBlocker] = self._create_resource_blocker()
+
+        # 最近一次同步导航的结果（状态码、最终URL、是否超时）
+        self.last_navigation: Dict[str, Any] = {}
+
+        # 页面回收池（启用页面回收策略后在首次导航时创建）
+        self._page_pool: Optional[PagePool] = None
+
         # 🔧 关键修复：创建专用后台事件循环线程
         self._loop_thread: Optional[threading.Thread] = None
         self._event_loop: Optional[asyncio.AbstractEventLoop] = None
@@ -78,11 +92,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 self._logger.info(f"✅ 专用事件循环线程已启动: {self._event_loop}")
 
             # 在专用事件循环中初始化 Playwright
-            future = asyncio.run_coroutine_threadsafe(
+            future = submit_coroutine(
                 self._async_initialize(),
                 self._event_loop
             )
-            return future.result(timeout=30)
+            return wait_for_future(future, timeout=30)
 
         except Exception as e:
             self._logger.error(f"Failed to initialize browser driver: {e}")
@@ -109,6 +123,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             )
             
             if success and self.context:
+                await self._install_resource_blocking(self.context)
+
                 # 创建页面
                 self.page = await self.context.new_page()
                 
@@ -157,6 +173,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 self.context = await self.browser.new_context()
                 self._logger.info("Created new browser context")
 
+            await self._install_resource_blocking(self.context)
+
             # 获取或创建页面
             pages = self.context.pages
             if pages:
@@ -200,18 +218,20 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
 
         try:
             self._logger.info("Shutting down Playwright browser driver...")
+            self._log_resource_blocking_stats()
+            self._log_page_pool_stats()
 
             # 标记为未初始化
             self._initialized = False
 
             # 🔧 在专用事件循环中执行清理
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self._async_shutdown(),
                     self._event_loop
                 )
                 # 增加超时时间到30秒，因为浏览器关闭可能需要较长时间
-                future.result(timeout=30)
+                wait_for_future(future, timeout=30)
             else:
                 # 如果事件循环不可用，尝试直接清理
                 try:
@@ -257,7 +277,9 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
     async def _async_shutdown(self) -> None:
         """在专用事件循环中执行的异步关闭逻辑"""
         try:
-            # 关闭页面
+            # 关闭页面（包括回收池预热的备用页面）
+            if self._page_pool:
+                await self._page_pool.close()
             if self.page:
                 try:
                     await self.page.close()
@@ -326,11 +348,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
 
             # 使用事件循环同步执行页面导航
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
-                    self.page.goto(url, wait_until=wait_until, timeout=timeout),
-                    self._event_loop
-                )
-                future.result(timeout=timeout/1000 + 5)
+                future = submit_coroutine(self._goto(url, wait_until, timeout), self._event_loop)
+                wait_for_future(future, timeout=timeout/1000 + 5)
             else:
                 self._logger.error("Event loop is not running")
                 return False
@@ -368,14 +387,17 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             start_time = time.time()
 
 
+            self.last_navigation = {'url': url, 'status': None, 'final_url': None, 'timed_out': False}
+
             # 🔧 关键修复：直接调用 page.goto() 协程，而不是同步的 open_page() 方法
-            future = asyncio.run_coroutine_threadsafe(
-                self.page.goto(url, wait_until=wait_until, timeout=timeout),
-                self._event_loop
-            )
+            future = submit_coroutine(self._goto(url, wait_until, timeout), self._event_loop)
 
             # 等待导航完成
-            future.result(timeout=timeout/1000 + 5)
+            response = wait_for_future(future, timeout=timeout/1000 + 5)
+
+            # 记录主文档状态码和最终URL（限流器据此识别拦截页）
+            self.last_navigation['status'] = getattr(response, 'status', None)
+            self.last_navigation['final_url'] = self.page.url
 
             elapsed = time.time() - start_time
             self._logger.info(f"✅ Page navigation successful after {elapsed:.2f}s: {url}")
@@ -383,13 +405,44 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
 
         except TimeoutError:
             elapsed = time.time() - start_time if 'start_time' in locals() else 0
+            self.last_navigation['timed_out'] = True
             self._logger.error(f"⏱️ Timeout opening page after {elapsed:.2f}s (timeout: {timeout}ms): {url}")
             return False
         except Exception as e:
             elapsed = time.time() - start_time if 'start_time' in locals() else 0
+            # Playwright 的导航超时异常不是内置 TimeoutError
+            self.last_navigation['timed_out'] = 'timeout' in type(e).__name__.lower()
             self._logger.error(f"❌ Failed to open page after {elapsed:.2f}s: {url} - Error: {str(e)}")
             return False
 
+    def _goto(self, url: str, wait_until: str, timeout: int):
+        """页面导航协程（启用页面回收时经由回收池）"""
+        policy = get_page_recycle_policy()
+        if policy:
+            return self._pooled_goto(url, wait_until, timeout, policy)
+        return self.page.goto(url, wait_until=wait_until, timeout=timeout)
+
+    async def _pooled_goto(self, url: str, wait_until: str, timeout: int, policy: PageRecyclePolicy):
+        """从页面回收池借出页面（健康检查、必要时换新页面）后导航"""
+        if self._page_pool is None or self._page_pool.policy is not policy:
+            if self._page_pool is not None:
+                await self._page_pool.close()
+            self._page_pool = PagePool(self.page, policy, self._new_pooled_page)
+        elif self._page_pool.active_page is not self.page:
+            # 驱动在回收池之外更换了页面
+            await self._page_pool.rebind(self.page)
+        self.page = await self._page_pool.checkout()
+        try:
+            return await self.page.goto(url, wait_until=wait_until, timeout=timeout)
+        finally:
+            self._page_pool.record_navigation()
+
+    async def _new_pooled_page(self) -> Page:
+        """在当前上下文中创建替换页面"""
+        page = await self.context.new_page()
+        await self._inject_stealth_scripts(page)
+        return page
+
     def navigate_to_sync(self, url: str, wait_until: str = 'domcontentloaded', timeout: int = 45000) -> bool:
         """
         同步导航到指定URL - 与SimplifiedBrowserService接口保持一致
@@ -442,11 +495,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
         try:
             # 使用事件循环同步执行JavaScript
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.page.evaluate(script),
                     self._event_loop
                 )
-                return future.result(timeout=10)
+                return wait_for_future(future, timeout=10)
             else:
                 self._logger.error("Event loop is not running")
                 return None
@@ -472,8 +525,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def get_url():
                 return self.page.url
 
-            future = asyncio.run_coroutine_threadsafe(get_url(), self._event_loop)
-            return future.result(timeout=5)
+            future = submit_coroutine(get_url(), self._event_loop)
+            return wait_for_future(future, timeout=5)
 
         except Exception as e:
             self._logger.error(f"Failed to get page URL: {e}")
@@ -489,11 +542,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
         try:
             # 使用事件循环同步等待元素
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.page.wait_for_selector(selector, timeout=timeout),
                     self._event_loop
                 )
-                future.result(timeout=timeout/1000 + 5)
+                wait_for_future(future, timeout=timeout/1000 + 5)
                 return True
             else:
                 self._logger.error("Event loop is not running")
@@ -510,11 +563,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
         try:
             # 使用事件循环同步点击元素
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.page.click(selector),
                     self._event_loop
                 )
-                future.result(timeout=10)
+                wait_for_future(future, timeout=10)
                 return True
             else:
                 self._logger.error("Event loop is not running")
@@ -531,11 +584,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
         try:
             # 使用事件循环同步填充输入框
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.page.fill(selector, text),
                     self._event_loop
                 )
-                future.result(timeout=10)
+                wait_for_future(future, timeout=10)
                 return True
             else:
                 self._logger.error("Event loop is not running")
@@ -552,11 +605,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
         try:
             # 使用事件循环同步获取元素文本
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.page.text_content(selector),
                     self._event_loop
                 )
-                return future.result(timeout=10)
+                return wait_for_future(future, timeout=10)
             else:
                 self._logger.error("Event loop is not running")
                 return None
@@ -582,11 +635,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
 
             # 使用事件循环同步获取cookies
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.context.cookies(domain),
                     self._event_loop
                 )
-                cookies = future.result(timeout=10)
+                cookies = wait_for_future(future, timeout=10)
             else:
                 self._logger.error("Event loop is not running")
                 result['message'] = 'Event loop not available'
@@ -618,11 +671,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
 
             # 使用事件循环同步保存存储状态
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.context.storage_state(path=file_path),
                     self._event_loop
                 )
-                future.result(timeout=10)
+                wait_for_future(future, timeout=10)
             else:
                 self._logger.error("Event loop is not running")
                 return False
@@ -646,11 +699,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
 
             # 创建新上下文并加载存储状态
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.browser.new_context(storage_state=file_path),
                     self._event_loop
                 )
-                new_context = future.result(timeout=10)
+                new_context = wait_for_future(future, timeout=10)
             else:
                 self._logger.error("Event loop is not running")
                 return False
@@ -658,29 +711,32 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             # 关闭旧上下文
             if self.context:
                 if self._event_loop and self._event_loop.is_running():
-                    future = asyncio.run_coroutine_threadsafe(
+                    future = submit_coroutine(
                         self.context.close(),
                         self._event_loop
                     )
-                    future.result(timeout=10)
+                    wait_for_future(future, timeout=10)
 
             self.context = new_context
 
             # 重新创建页面
             if self.page:
                 if self._event_loop and self._event_loop.is_running():
-                    future = asyncio.run_coroutine_threadsafe(
+                    future = submit_coroutine(
                         self.page.close(),
                         self._event_loop
                     )
-                    future.result(timeout=10)
+                    wait_for_future(future, timeout=10)
 
             if self._event_loop and self._event_loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(
+                future = submit_coroutine(
                     self.context.new_page(),
                     self._event_loop
                 )
-                self.page = future.result(timeout=10)
+                self.page = wait_for_future(future, timeout=10)
+                if self._page_pool:
+                    # 回收池改用新页面（旧页面已随旧上下文关闭）
+                    wait_for_future(submit_coroutine(self._page_pool.rebind(self.page), self._event_loop), timeout=10)
             else:
                 self._logger.error("Event loop is not running")
                 return False
@@ -998,9 +1054,10 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
 
         return args
 
-    async def _inject_stealth_scripts(self) -> None:
-        """注入反检测脚本"""
-        if not self.page:
+    async def _inject_stealth_scripts(self, page: Optional[Page] = None) -> None:
+        """注入反检测脚本（默认注入到主页面）"""
+        page = page or self.page
+        if not page:
             return
         
         try:
@@ -1038,10 +1095,10 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             });
             """
             
-            await self.page.add_init_script(stealth_script)
+            await page.add_init_script(stealth_script)
             
             # 设置请求头
-            await self.page.set_extra_http_headers({
+            await page.set_extra_http_headers({
                 'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
                 'Accept-Encoding': 'gzip, deflate, br',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
@@ -1071,11 +1128,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 self._logger.error("Event loop is not running")
                 return None
 
-            future = asyncio.run_coroutine_threadsafe(
+            future = submit_coroutine(
                 self.screenshot_async(file_path),
                 self._event_loop
             )
-            return future.result(timeout=timeout/1000 + 5)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout taking screenshot: {file_path}")
@@ -1099,11 +1156,11 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 self._logger.error("Event loop is not running")
                 return None
 
-            future = asyncio.run_coroutine_threadsafe(
+            future = submit_coroutine(
                 self.get_page_title_async(),
                 self._event_loop
             )
-            return future.result(timeout=timeout/1000 + 5)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error("⏱️ Timeout getting page title")
@@ -1137,8 +1194,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def query():
                 return await self.page.query_selector(selector)
 
-            future = asyncio.run_coroutine_threadsafe(query(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(query(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout querying selector: {selector}")
@@ -1170,8 +1227,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def query_all():
                 return await self.page.query_selector_all(selector)
 
-            future = asyncio.run_coroutine_threadsafe(query_all(), self._event_loop)
-            result = future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(query_all(), self._event_loop)
+            result = wait_for_future(future, timeout=timeout/1000 + 5)
             return result if result else []
 
         except TimeoutError:
@@ -1206,8 +1263,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 await self.page.wait_for_selector(selector, state=state, timeout=timeout)
                 return True
 
-            future = asyncio.run_coroutine_threadsafe(wait(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(wait(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout waiting for selector: {selector}")
@@ -1242,8 +1299,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 await self.page.click(selector, timeout=timeout)
                 return True
 
-            future = asyncio.run_coroutine_threadsafe(click(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(click(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout clicking selector: {selector}")
@@ -1277,8 +1334,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 await self.page.fill(selector, value, timeout=timeout)
                 return True
 
-            future = asyncio.run_coroutine_threadsafe(fill(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(fill(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout filling selector: {selector}")
@@ -1316,8 +1373,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                     await self.page.type(selector, text, timeout=timeout)
                 return True
 
-            future = asyncio.run_coroutine_threadsafe(type_text(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(type_text(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout typing into selector: {selector}")
@@ -1351,8 +1408,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
                 await self.page.select_option(selector, value, timeout=timeout)
                 return True
 
-            future = asyncio.run_coroutine_threadsafe(select(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(select(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout selecting option in selector: {selector}")
@@ -1386,8 +1443,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def get_text():
                 return await self.page.inner_text(selector, timeout=timeout)
 
-            future = asyncio.run_coroutine_threadsafe(get_text(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(get_text(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout getting inner text of selector: {selector}")
@@ -1419,8 +1476,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def get_content():
                 return await self.page.text_content(selector, timeout=timeout)
 
-            future = asyncio.run_coroutine_threadsafe(get_content(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(get_content(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout getting text content of selector: {selector}")
@@ -1451,8 +1508,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def get_content():
                 return await self.page.content()
 
-            future = asyncio.run_coroutine_threadsafe(get_content(), self._event_loop)
-            return future.result(timeout=timeout)
+            future = submit_coroutine(get_content(), self._event_loop)
+            return wait_for_future(future, timeout=timeout)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout getting page content")
@@ -1485,8 +1542,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def get_attr():
                 return await self.page.get_attribute(selector, name, timeout=timeout)
 
-            future = asyncio.run_coroutine_threadsafe(get_attr(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(get_attr(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout getting attribute '{name}' of selector: {selector}")
@@ -1518,8 +1575,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def check_visible():
                 return await self.page.is_visible(selector, timeout=timeout)
 
-            future = asyncio.run_coroutine_threadsafe(check_visible(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(check_visible(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.debug(f"⏱️ Timeout checking visibility of selector: {selector}")
@@ -1553,8 +1610,8 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             async def evaluate():
                 return await self.page.evaluate(script)
 
-            future = asyncio.run_coroutine_threadsafe(evaluate(), self._event_loop)
-            return future.result(timeout=timeout/1000 + 5)
+            future = submit_coroutine(evaluate(), self._event_loop)
+            return wait_for_future(future, timeout=timeout/1000 + 5)
 
         except TimeoutError:
             self._logger.error(f"⏱️ Timeout evaluating script")
@@ -1563,6 +1620,333 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
             self._logger.error(f"Failed to evaluate script: {e}")
             return None
 
+    # ==================== 动作脚本 ====================
+
+    @staticmethod
+    def _normalize_selector(selector: str) -> str:
+        """XPath 选择器加上 Playwright 的 xpath= 前缀"""
+        return f"xpath={selector}" if selector.startswith('//') else selector
+
+    async def _find_first_element(self, selectors: List[str]):
+        """返回第一个存在的元素及其选择器（不等待出现）"""
+        for selector in selectors:
+            try:
+                element = await self.page.query_selector(self._normalize_selector(selector))
+            except Exception as e:
+                self._logger.debug(f"Invalid selector {selector}: {e}")
+                continue
+            if element:
+                return selector, element
+        return None, None
+
+    async def _wait_for_any(self, selectors: List[str], state: str, timeout: int) -> Optional[str]:
+        """并行等待多个选择器，返回第一个达到指定状态的选择器"""
+        tasks = {
+            asyncio.ensure_future(
+                self.page.wait_for_selector(self._normalize_selector(selector), state=state, timeout=timeout)
+            ): selector
+            for selector in selectors
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        return tasks[task]
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run_action(self, action: BrowserAction) -> ActionStepResult:
+        """执行单个动作"""
+        step = ActionStepResult(action=action.action.value, name=action.key, success=False)
+
+        if action.action in (ActionType.FIND_FIRST, ActionType.CLICK):
+            selector, element = await self._find_first_element(action.selectors)
+            if not element:
+                step.error = "no_match"
+                return step
+            if action.action == ActionType.CLICK:
+                await element.click(timeout=action.timeout_ms)
+            step.selector = selector
+            step.success = True
+
+        elif action.action == ActionType.WAIT_FOR:
+            step.selector = await self._wait_for_any(action.selectors, action.state, action.timeout_ms)
+            step.success = step.selector is not None
+            if not step.success:
+                step.error = "timeout"
+
+        elif action.action == ActionType.EVALUATE:
+            step.value = await asyncio.wait_for(self.page.evaluate(action.script), action.timeout_ms / 1000)
+            step.success = True
+
+        elif action.action == ActionType.GET_HTML:
+            if not action.selectors:
+                step.value = await self.page.content()
+                step.success = True
+            else:
+                selector, element = await self._find_first_element(action.selectors)
+                if element:
+                    step.value = await element.evaluate("el => el.outerHTML")
+                    step.selector = selector
+                    step.success = True
+                else:
+                    step.error = "no_match"
+
+        return step
+
+    async def run_action_script(self, script: ActionScript) -> ActionScriptResult:
+        """
+        在事件循环上顺序执行动作脚本
+
+        必需步骤失败时终止并记录 failed_step，optional 步骤失败后继续。
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = ActionScriptResult(success=True)
+        for action in script.actions:
+            step_start = loop.time()
+            try:
+                step = await self._run_action(action)
+            except asyncio.TimeoutError:
+                step = ActionStepResult(action=action.action.value, name=action.key, success=False, error="timeout")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                step = ActionStepResult(action=action.action.value, name=action.key, success=False,
+                                        error=f"{e.__class__.__name__}: {e}")
+            step.elapsed_ms = (loop.time() - step_start) * 1000
+            result.steps.append(step)
+            if not step.success and not action.optional:
+                result.success = False
+                result.failed_step = step.name
+                break
+        result.elapsed_ms = (loop.time() - start) * 1000
+        return result
+
+    def run_action_script_sync(self, script: ActionScript, timeout: Optional[float] = None) -> ActionScriptResult:
+        """
+        同步执行动作脚本：整个脚本只进行一次跨线程往返
+
+        Args:
+            script: 动作脚本
+            timeout: 等待上限（秒），默认为各步骤超时之和再加 5 秒
+
+        Returns:
+            ActionScriptResult: 各步骤结果及命中的选择器；页面不可用或整体超时时 success=False
+        """
+        try:
+            if not self.page:
+                self._logger.error("Page not available")
+                return ActionScriptResult(success=False, failed_step="page")
+
+            if not self._event_loop or not self._event_loop.is_running():
+                self._logger.error("Event loop is not running")
+                return ActionScriptResult(success=False, failed_step="event_loop")
+
+            if timeout is None:
+                timeout = script.total_timeout_ms / 1000 + 5
+
+            future = submit_coroutine(self.run_action_script(script), self._event_loop)
+            return wait_for_future(future, timeout=timeout)
+
+        except TimeoutError:
+            self._logger.error(f"⏱️ Timeout running action script ({len(script)} steps)")
+            return ActionScriptResult(success=False, failed_step="timeout")
+        except Exception as e:
+            self._logger.error(f"Failed to run action script: {e}")
+            return ActionScriptResult(success=False, failed_step="error")
+
+    # ==================== 事件循环桥接（异步执行模式） ====================
+
+    async def run_in_loop(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在驱动事件循环上以协程方式运行同步函数（必须在驱动事件循环中 await）
+
+        函数内通过本驱动（及共享事件循环的标签页驱动）发起的 *_sync 调用直接 await，不再跨线程。
+        """
+        return await run_sync_on_loop(func, *args, **kwargs)
+
+    def run_in_loop_sync(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        同步入口：把整段同步函数放到驱动事件循环上运行，只进行一次跨线程往返
+
+        Args:
+            func: 同步函数（例如 scraper.scrape）
+            timeout: 等待上限（秒），超时后取消事件循环上的任务
+            *args, **kwargs: 函数参数
+
+        Returns:
+            Any: 函数返回值（函数抛出的异常原样抛出）
+        """
+        if in_loop_bridge(self._event_loop) or not self._event_loop or not self._event_loop.is_running():
+            return func(*args, **kwargs)
+
+        # 调用方所在的取消范围延续到事件循环上的任务中（范围取消时任务内的浏览器调用失败，
+        # 与跨线程模式一致；任务本身不登记到范围中）
+        parent_scope = current_scope()
+        if parent_scope is not None:
+            parent_scope.check()
+
+        def run():
+            if parent_scope is None:
+                return func(*args, **kwargs)
+            with cancellation_scope(CancellationScope(parent_scope.name, parent=parent_scope)):
+                return func(*args, **kwargs)
+
+        future = asyncio.run_coroutine_threadsafe(run_sync_on_loop(run), self._event_loop)
+        return wait_for_future(future, timeout=timeout)
+
+    # ==================== 网络资源拦截 ====================
+
+    def _create_resource_blocker(self) -> Optional[ResourceBlocker]:
+        """根据配置创建资源拦截器，配置无效时不启用"""
+        try:
+            return ResourceBlocker.from_dict(self.config.get('resource_blocking'))
+        except Exception as e:
+            self._logger.warning(f"⚠️ 资源拦截配置无效，不启用拦截: {e}")
+            return None
+
+    async def _install_resource_blocking(self, context: BrowserContext) -> None:
+        """在浏览器上下文上注册资源拦截（新标签页自动继承）"""
+        if not self._resource_blocker:
+            return
+        try:
+            await self._resource_blocker.install(context)
+        except Exception as e:
+            self._logger.warning(f"⚠️ 注册资源拦截失败，按不拦截方式继续: {e}")
+
+    def get_resource_blocking_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        获取资源拦截统计
+
+        Returns:
+            Dict[str, Any]: 拦截请求数、估算节省字节数、按类型/域名的拦截次数；未启用拦截时返回 None
+        """
+        return self._resource_blocker.get_stats() if self._resource_blocker else None
+
+    def get_page_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        获取页面回收池统计
+
+        Returns:
+            Dict[str, Any]: 各页面的使用时间、导航次数、JS堆大小与回收次数；未启用页面回收时返回 None
+        """
+        return self._page_pool.get_stats() if self._page_pool else None
+
+    def _log_page_pool_stats(self) -> None:
+        stats = self.get_page_pool_stats()
+        if stats:
+            active = stats['pages'][0]
+            self._logger.info(
+                f"♻️ 页面回收统计: 回收{stats['recycled']}次（健康检查失败{stats['health_check_failures']}次），"
+                f"当前页面已导航{active['navigations']}次"
+            )
+
+    def _log_resource_blocking_stats(self) -> None:
+        stats = self.get_resource_blocking_stats()
+        if stats:
+            self._logger.info(
+                f"🛡️ 资源拦截统计: 拦截{stats['blocked_requests']}个请求"
+                f"（约{stats['blocked_bytes_estimated'] / 1024 / 1024:.1f}MB），放行{stats['allowed_requests']}个"
+            )
+
+    # ==================== 多标签页支持 ====================
+
+    def create_tab_driver(self, timeout: int = 30000) -> Optional['PlaywrightTabDriver']:
+        """
+        在当前浏览器上下文中打开新标签页，并返回绑定该标签页的驱动
+
+        新标签页与主页面共享浏览器进程、上下文（Cookie、ERP插件）和专用事件循环，
+        所有 *_sync 方法都作用于新标签页，可用于多标签页并发抓取。
+
+        Args:
+            timeout: 超时时间（毫秒）
+
+        Returns:
+            PlaywrightTabDriver: 标签页驱动，失败返回 None
+        """
+        try:
+            if not self._initialized or not self.context:
+                self._logger.error("Browser driver not initialized")
+                return None
+
+            if not self._event_loop or not self._event_loop.is_running():
+                self._logger.error("Event loop is not running")
+                return None
+
+            async def new_tab():
+                page = await self.context.new_page()
+                await self._inject_stealth_scripts(page)
+                return page
+
+            future = submit_coroutine(new_tab(), self._event_loop)
+            page = wait_for_future(future, timeout=timeout/1000 + 5)
+            self._logger.info(f"✅ 新标签页已创建（当前上下文共 {len(self.context.pages)} 个页面）")
+            return PlaywrightTabDriver(self, page)
+
+        except TimeoutError:
+            self._logger.error("⏱️ Timeout creating new tab")
+            return None
+        except Exception as e:
+            self._logger.error(f"Failed to create new tab: {e}")
+            return None
+
+    def create_context_driver(self, timeout: int = 30000) -> Optional['PlaywrightTabDriver']:
+        """
+        在同一浏览器进程中创建隔离的浏览器上下文，并返回绑定该上下文的驱动
+
+        🔧 设计说明：
+        - 非持久化上下文：通过 browser.new_context(storage_state=...) 创建新上下文，
+          复制当前上下文的 Cookie 和 localStorage
+        - 持久化上下文（launch_persistent_context，ERP插件只在该模式下加载）：
+          Chromium 不支持在同一用户目录下创建第二个上下文，回退为共享上下文的新标签页，
+          以保证 Cookie 与 ERP 插件状态可用
+
+        Args:
+            timeout: 超时时间（毫秒）
+
+        Returns:
+            PlaywrightTabDriver: 上下文驱动（或回退的标签页驱动），失败返回 None
+        """
+        if self._is_persistent_context or not self.browser:
+            self._logger.info("持久化上下文不支持隔离上下文，使用共享上下文的新标签页")
+            return self.create_tab_driver(timeout)
+
+        try:
+            if not self._initialized or not self.context:
+                self._logger.error("Browser driver not initialized")
+                return None
+
+            if not self._event_loop or not self._event_loop.is_running():
+                self._logger.error("Event loop is not running")
+                return None
+
+            async def new_context():
+                storage_state = await self.context.storage_state()
+                context = await self.browser.new_context(storage_state=storage_state)
+                await self._install_resource_blocking(context)
+                page = await context.new_page()
+                await self._inject_stealth_scripts(page)
+                return context, page
+
+            future = submit_coroutine(new_context(), self._event_loop)
+            context, page = wait_for_future(future, timeout=timeout/1000 + 5)
+            self._logger.info(f"✅ 新浏览器上下文已创建（当前共 {len(self.browser.contexts)} 个上下文）")
+            return PlaywrightContextDriver(self, context, page)
+
+        except TimeoutError:
+            self._logger.error("⏱️ Timeout creating browser context")
+            return None
+        except Exception as e:
+            self._logger.error(f"Failed to create browser context: {e}")
+            return None
+
     # ==================== 上下文管理器 ====================
 
     def __enter__(self):
@@ -1630,10 +2014,117 @@ class SimplifiedPlaywrightBrowserDriver(IBrowserDriver):
         await self.shutdown()
 
 
+class PlaywrightTabDriver(SimplifiedPlaywrightBrowserDriver):
+    """
+    标签页驱动
+
+    复用父驱动的 Playwright 实例、浏览器上下文和专用事件循环，只持有独立的 page 对象。
+    关闭时只关闭自身标签页，不会影响父驱动和浏览器进程。
+    """
+
+    def __init__(self, parent: SimplifiedPlaywrightBrowserDriver, page: Page):
+        """
+        初始化标签页驱动
+
+        Args:
+            parent: 拥有浏览器上下文的父驱动
+            page: 在父驱动上下文中创建的标签页
+        """
+        super().__init__(parent.config)
+        self._parent = parent
+
+        # 共享父驱动的核心实例
+        self.playwright = parent.playwright
+        self.browser = parent.browser
+        self.context = parent.context
+        self.page = page
+        self._is_persistent_context = parent._is_persistent_context
+        self._resource_blocker = parent._resource_blocker
+
+        # 共享父驱动的专用事件循环
+        self._event_loop = parent._event_loop
+        self._loop_thread = parent._loop_thread
+        self._loop_ready.set()
+
+        self._initialized = True
+
+    def initialize(self) -> bool:
+        """标签页驱动创建即可用，无需再次初始化"""
+        return self._initialized
+
+    def shutdown(self) -> bool:
+        """关闭标签页（不关闭浏览器上下文和事件循环）"""
+        if not self._initialized:
+            return True
+
+        self._initialized = False
+        self._log_page_pool_stats()
+        page, self.page = self.page, None
+        page_pool, self._page_pool = self._page_pool, None
+
+        try:
+            if self._event_loop and self._event_loop.is_running():
+                if page_pool:
+                    wait_for_future(submit_coroutine(page_pool.close(), self._event_loop), timeout=10)
+                if page:
+                    future = submit_coroutine(page.close(), self._event_loop)
+                    wait_for_future(future, timeout=10)
+            self._logger.info("Tab closed")
+            return True
+        except Exception as e:
+            self._logger.warning(f"Failed to close tab: {e}")
+            return False
+
+
+class PlaywrightContextDriver(PlaywrightTabDriver):
+    """
+    隔离上下文驱动
+
+    复用父驱动的浏览器进程和专用事件循环，持有独立的浏览器上下文。
+    关闭时关闭自身上下文（包括其中所有标签页）。
+    """
+
+    def __init__(self, parent: SimplifiedPlaywrightBrowserDriver, context: BrowserContext, page: Page):
+        """
+        初始化上下文驱动
+
+        Args:
+            parent: 拥有浏览器进程的父驱动
+            context: 在父驱动浏览器中创建的上下文
+            page: 在该上下文中创建的页面
+        """
+        super().__init__(parent, page)
+        self.context = context
+        self._is_persistent_context = False
+
+    def shutdown(self) -> bool:
+        """关闭浏览器上下文（不关闭浏览器进程和事件循环）"""
+        if not self._initialized:
+            return True
+
+        self._initialized = False
+        self._log_page_pool_stats()
+        context, self.context = self.context, None
+        self.page = None
+        self._page_pool = None
+
+        try:
+            if context and self._event_loop and self._event_loop.is_running():
+                future = submit_coroutine(context.close(), self._event_loop)
+                wait_for_future(future, timeout=10)
+            self._logger.info("Browser context closed")
+            return True
+        except Exception as e:
+            self._logger.warning(f"Failed to close browser context: {e}")
+            return False
+
+
 # 向后兼容别名
 PlaywrightBrowserDriver = SimplifiedPlaywrightBrowserDriver
 
 __all__ = [
     'SimplifiedPlaywrightBrowserDriver',
+    'PlaywrightTabDriver',
+    'PlaywrightContextDriver',
     'PlaywrightBrowserDriver'
 ]
\ No newline at end of file
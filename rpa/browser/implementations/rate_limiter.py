@@ -0,0 +1,307 @@
+"""
+按域名的自适应限流器
+
+每个域名独立维护一个令牌桶（限制导航速率）和一个并发上限（同时进行的页面加载数），
+互不影响：Ozon 被限流退避时，Seerfar 和 ERP 插件相关域名照常抓取。
+
+并发上限和令牌速率按 AIMD（加性增、乘性减）调整：
+- 导航成功、耗时不超过目标延迟且近期错误率正常时，并发上限每轮（约 limit 次成功）加 1，速率同步小幅上调
+- 导航超时或返回拦截页（403/429/503、验证页面）时，并发上限和速率按系数减半，清空令牌并暂停该域名一段时间；
+  同一拥塞窗口内的多次失败只减一次，避免并发中的请求同时失败时把上限压到最低
+
+等待令牌和并发名额时，在驱动事件循环的桥接任务中让出事件循环，其他情况下阻塞当前线程。
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from .logger_system import get_logger
+from .loop_bridge import cooperative_sleep, in_loop_bridge
+
+# 导航结果
+OUTCOME_OK = 'ok'
+OUTCOME_ERROR = 'error'
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_BLOCKED = 'blocked'
+
+# 视为限流/拦截的HTTP状态码
+BLOCK_STATUS_CODES = frozenset({403, 429, 503})
+
+# 拦截页（验证页面）URL特征
+BLOCK_URL_MARKERS = ('/abt/', 'captcha', 'challenge', '/blocked')
+
+# 桥接任务中轮询等待的间隔（秒）
+_BRIDGE_POLL_INTERVAL = 0.05
+
+
+def domain_of(url: str) -> str:
+    """限流使用的域名（去掉 www. 前缀），无法解析时返回空字符串"""
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def classify_navigation(success: bool, status: Optional[int] = None, final_url: Optional[str] = None,
+                        timed_out: bool = False) -> str:
+    """
+    根据导航结果判断对限流器的反馈
+
+    Args:
+        success: 导航是否成功
+        status: 主文档的HTTP状态码
+        final_url: 导航结束后的页面URL（被重定向到验证页面时用于识别）
+        timed_out: 是否超时
+
+    Returns:
+        str: OUTCOME_OK / OUTCOME_ERROR / OUTCOME_TIMEOUT / OUTCOME_BLOCKED
+    """
+    if timed_out:
+        return OUTCOME_TIMEOUT
+    if status in BLOCK_STATUS_CODES:
+        return OUTCOME_BLOCKED
+    if final_url and any(marker in final_url.lower() for marker in BLOCK_URL_MARKERS):
+        return OUTCOME_BLOCKED
+    return OUTCOME_OK if success else OUTCOME_ERROR
+
+
+class _DomainState:
+    """单个域名的令牌桶、并发上限与统计"""
+
+    def __init__(self, rate: float, burst: int, concurrency: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.concurrency_limit = concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.avg_latency = 0.0
+        self.error_rate = 0.0
+        self.stats = {
+            'requests': 0, 'successes': 0, 'errors': 0, 'timeouts': 0, 'blocked': 0,
+            'decreases': 0, 'wait_time': 0.0,
+        }
+
+    def refill(self, now: float):
+        if now < self.paused_until:
+            self.last_refill = now
+            return
+        self.tokens = min(float(self.burst), self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def wait_time(self, now: float) -> Optional[float]:
+        """获取名额还需等待的时间，可以立即获取时返回 None"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens < 1.0:
+            return (1.0 - self.tokens) / self.rate
+        if self.in_flight >= int(self.concurrency_limit):
+            return _BRIDGE_POLL_INTERVAL
+        return None
+
+
+class NavigationPermit:
+    """一次导航占用的名额，导航结束后通过 release() 反馈结果"""
+
+    def __init__(self, limiter: 'AdaptiveRateLimiter', domain: str):
+        self.limiter = limiter
+        self.domain = domain
+        self.start_time = time.monotonic()
+        self.outcome: Optional[str] = None
+
+    def release(self, outcome: str = OUTCOME_OK):
+        """释放名额并记录结果（重复调用只记录第一次）"""
+        if self.outcome is None:
+            self.outcome = outcome
+            self.limiter._release(self, outcome, time.monotonic() - self.start_time)
+
+
+class AdaptiveRateLimiter:
+    """
+    按域名的令牌桶 + AIMD 并发控制
+
+    线程安全；多个标签页、多个浏览器上下文共享同一实例，按目标域名合并计算。
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 4,
+                 initial_concurrency: int = 2, min_concurrency: int = 1, max_concurrency: int = 8,
+                 min_rate: float = 0.1, max_rate: Optional[float] = None,
+                 latency_target: float = 8.0, error_rate_threshold: float = 0.3,
+                 decrease_factor: float = 0.5, block_pause: float = 10.0):
+        """
+        初始化限流器
+
+        Args:
+            rate: 每个域名的初始导航速率（次/秒）
+            burst: 令牌桶容量（允许的突发导航数）
+            initial_concurrency: 每个域名的初始并发上限
+            min_concurrency: 并发上限下限
+            max_concurrency: 并发上限上限
+            min_rate: 速率下限
+            max_rate: 速率上限，默认为初始速率的 4 倍
+            latency_target: 健康导航的最大耗时（秒），超过时不再增加并发
+            error_rate_threshold: 近期错误率（指数滑动平均）超过该值时不再增加并发
+            decrease_factor: 超时或拦截时的乘性减小系数
+            block_pause: 返回拦截页后该域名暂停导航的时间（秒）
+        """
+        self.initial_rate = rate
+        self.burst = max(1, burst)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.initial_concurrency = min(max(initial_concurrency, self.min_concurrency), self.max_concurrency)
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.latency_target = latency_target
+        self.error_rate_threshold = error_rate_threshold
+        self.decrease_factor = decrease_factor
+        self.block_pause = block_pause
+
+        self._logger = get_logger("AdaptiveRateLimiter")
+        self._condition = threading.Condition()
+        self._domains: Dict[str, _DomainState] = {}
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = _DomainState(self.initial_rate, self.burst, self.initial_concurrency)
+        return state
+
+    def acquire(self, url: str) -> NavigationPermit:
+        """
+        获取目标域名的导航名额（令牌不足或并发已满时等待）
+
+        Args:
+            url: 导航目标URL
+
+        Returns:
+            NavigationPermit: 导航结束后需调用 release()
+        """
+        domain = domain_of(url)
+        start_time = time.monotonic()
+        with self._condition:
+            state = self._state(domain)
+            state.stats['requests'] += 1
+            while True:
+                now = time.monotonic()
+                state.refill(now)
+                delay = state.wait_time(now)
+                if delay is None:
+                    state.tokens -= 1.0
+                    state.in_flight += 1
+                    state.stats['wait_time'] += now - start_time
+                    return NavigationPermit(self, domain)
+                if in_loop_bridge():
+                    # 事件循环上不能阻塞（其他标签页的导航和名额释放都需要事件循环）
+                    self._condition.release()
+                    try:
+                        cooperative_sleep(min(delay, _BRIDGE_POLL_INTERVAL))
+                    finally:
+                        self._condition.acquire()
+                else:
+                    self._condition.wait(delay)
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[NavigationPermit]:
+        """
+        在导航名额内执行导航
+
+        代码块正常结束时按成功记录（可提前调用 permit.release() 记录其他结果），
+        抛出超时异常时按超时记录，其他异常按错误记录。
+        """
+        permit = self.acquire(url)
+        try:
+            yield permit
+        except Exception as e:
+            permit.release(OUTCOME_TIMEOUT if 'timeout' in type(e).__name__.lower() else OUTCOME_ERROR)
+            raise
+        finally:
+            permit.release(OUTCOME_OK)
+
+    def _release(self, permit: NavigationPermit, outcome: str, latency: float):
+        with self._condition:
+            state = self._state(permit.domain)
+            state.in_flight = max(0, state.in_flight - 1)
+            now = time.monotonic()
+            failed = outcome != OUTCOME_OK
+            state.error_rate = state.error_rate * 0.8 + (0.2 if failed else 0.0)
+
+            if outcome in (OUTCOME_TIMEOUT, OUTCOME_BLOCKED):
+                state.stats['timeouts' if outcome == OUTCOME_TIMEOUT else 'blocked'] += 1
+                self._decrease(state, permit, now, outcome)
+            elif failed:
+                state.stats['errors'] += 1
+            else:
+                state.stats['successes'] += 1
+                state.avg_latency = latency if state.stats['successes'] == 1 else state.avg_latency * 0.8 + latency * 0.2
+                if latency <= self.latency_target and state.error_rate < self.error_rate_threshold:
+                    # 加性增：每轮（约 limit 次成功）并发上限加 1
+                    state.concurrency_limit = min(float(self.max_concurrency),
+                                                  state.concurrency_limit + 1.0 / state.concurrency_limit)
+                    state.rate = min(self.max_rate, state.rate + self.initial_rate / (4 * state.concurrency_limit))
+            self._condition.notify_all()
+
+    def _decrease(self, state: _DomainState, permit: NavigationPermit, now: float, outcome: str):
+        """乘性减（同一拥塞窗口内只减一次：名额在上次减小之前发出的请求不再重复减小）"""
+        if outcome == OUTCOME_BLOCKED:
+            state.paused_until = max(state.paused_until, now + self.block_pause)
+        if permit.start_time < state.last_decrease:
+            return
+        state.last_decrease = now
+        state.stats['decreases'] += 1
+        state.concurrency_limit = max(float(self.min_concurrency), state.concurrency_limit * self.decrease_factor)
+        state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+        state.tokens = min(state.tokens, 0.0)
+        self._logger.warning(
+            f"🚦 {permit.domain} 导航{'被拦截' if outcome == OUTCOME_BLOCKED else '超时'}，"
+            f"并发上限降至{int(state.concurrency_limit)}，速率降至{state.rate:.2f}次/秒"
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各域名的当前状态与统计"""
+        with self._condition:
+            now = time.monotonic()
+            stats = {}
+            for domain, state in self._domains.items():
+                state.refill(now)
+                stats[domain] = {
+                    'rate': round(state.rate, 3),
+                    'concurrency_limit': int(state.concurrency_limit),
+                    'in_flight': state.in_flight,
+                    'tokens': round(state.tokens, 2),
+                    'paused_for': round(max(0.0, state.paused_until - now), 1),
+                    'avg_latency': round(state.avg_latency, 3),
+                    'error_rate': round(state.error_rate, 3),
+                    **{key: round(value, 3) if isinstance(value, float) else value
+                       for key, value in state.stats.items()},
+                }
+            return stats
+
+
+# 全局限流器（抓取流程中启用，浏览器服务的导航经由该限流器）
+_global_rate_limiter: Optional[AdaptiveRateLimiter] = None
+
+
+def configure_global_rate_limiter(**settings) -> AdaptiveRateLimiter:
+    """
+    创建全局限流器（替换已有的实例）
+
+    Args:
+        **settings: AdaptiveRateLimiter 构造参数
+    """
+    global _global_rate_limiter
+    _global_rate_limiter = AdaptiveRateLimiter(**settings)
+    return _global_rate_limiter
+
+
+def get_global_rate_limiter() -> Optional[AdaptiveRateLimiter]:
+    """获取全局限流器，未启用时返回 None"""
+    return _global_rate_limiter
+
+
+def reset_global_rate_limiter():
+    """停用全局限流器"""
+    global _global_rate_limiter
+    _global_rate_limiter = None
@@ -0,0 +1,132 @@
+"""
+日志读取器测试
+
+验证倒序按块读取、旁路索引的增量更新与重建，以及 LogManager 的最近日志、级别过滤和时间范围查询
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from cli.log_manager import LogManager
+from cli.log_reader import LEVEL_BITS, LogIndex, read_lines_reverse
+
+BASE_TIME = datetime(2025, 11, 6, 8, 0, 0)
+
+
+def _log_lines(count, start=0):
+    """生成日志行：每 50 条一条 ERROR，其余 INFO，每条间隔 1 秒"""
+    lines = []
+    for i in range(start, start + count):
+        timestamp = (BASE_TIME + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S')
+        level = 'ERROR' if i % 50 == 0 else 'INFO'
+        lines.append(f"{timestamp} - xuanping - {level} - 处理店铺 {i} 完成\n")
+    return lines
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """写有 2000 条日志的日志文件"""
+    path = tmp_path / "xuanping.log"
+    path.write_text(''.join(_log_lines(2000)), encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def manager(log_file):
+    """只读取临时日志文件的 LogManager"""
+    files = [{'name': log_file.name, 'path': str(log_file)}]
+    with patch('cli.log_manager.xuanping_logger.list_log_files', return_value=files):
+        yield LogManager()
+
+
+class TestReadLinesReverse:
+    """倒序读取测试"""
+
+    def test_reverse_lines_across_blocks(self, log_file):
+        """测试跨块边界的倒序读取与顺序读取一致"""
+        expected = log_file.read_bytes().split(b'\n')
+        assert list(read_lines_reverse(log_file, block_size=100)) == expected[::-1]
+
+    def test_reads_only_the_tail(self, log_file):
+        """测试只取前几行时只读取文件尾部"""
+        lines = read_lines_reverse(log_file, block_size=4096)
+        assert next(lines) == b''
+        assert next(lines).endswith("处理店铺 1999 完成".encode('utf-8'))
+
+
+class TestLogIndex:
+    """旁路索引测试"""
+
+    def test_select_blocks_by_level_and_time(self, log_file):
+        """测试按级别和时间范围只选出可能命中的块"""
+        index = LogIndex(log_file, block_size=1024)
+        index.update()
+        assert index.index_path.exists()
+        assert len(index.blocks) > 50
+
+        since = BASE_TIME + timedelta(seconds=1000)
+        until = BASE_TIME + timedelta(seconds=1100)
+        blocks = index.select_blocks(since=since, until=until)
+        assert 0 < len(blocks) <= 8
+        assert sum(block.end - block.offset for block in blocks) < log_file.stat().st_size / 10
+
+        error_blocks = index.select_blocks(level='error')
+        assert len(error_blocks) < len(index.blocks)
+
+    def test_incremental_update_and_rebuild(self, log_file):
+        """测试日志追加后增量更新、文件被重写后重建"""
+        index = LogIndex(log_file, block_size=1024)
+        index.update()
+        first_blocks = list(index.blocks)
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.writelines(_log_lines(10, start=2000))
+        reloaded = LogIndex(log_file, block_size=1024)
+        assert reloaded.update()
+        assert reloaded.blocks[:len(first_blocks) - 1] == first_blocks[:-1]
+        assert reloaded.indexed_size == log_file.stat().st_size
+
+        log_file.write_text(''.join(_log_lines(5, start=5000)), encoding='utf-8')
+        assert reloaded.update()
+        assert len(reloaded.blocks) == 1
+        assert reloaded.blocks[0].level_mask == LEVEL_BITS['INFO'] | LEVEL_BITS['ERROR']
+
+    def test_unindexed_tail_included(self, log_file):
+        """测试未以换行结尾的尾部作为未索引块返回"""
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write("2025-11-06 09:00:00 - xuanping - ERROR - 写入中")
+        index = LogIndex(log_file)
+        blocks = index.select_blocks(level='error')
+        assert blocks[-1].offset == index.indexed_size
+        assert blocks[-1].end == log_file.stat().st_size
+
+
+class TestLogManagerQueries:
+    """LogManager 查询测试"""
+
+    def test_recent_logs(self, manager):
+        """测试最近 N 条日志按时间倒序返回"""
+        logs = manager.get_recent_logs(limit=3)
+        assert [log.message for log in logs] == ["处理店铺 1999 完成", "处理店铺 1998 完成", "处理店铺 1997 完成"]
+
+    def test_level_filter_matches_full_scan(self, manager):
+        """测试使用索引的级别过滤与全量扫描结果一致"""
+        indexed = manager.get_recent_logs(limit=100, level_filter='error')
+        full_scan = LogManager(use_index=False).get_recent_logs(limit=100, level_filter='error')
+
+        assert len(indexed) == 40
+        assert [log.message for log in indexed] == [log.message for log in full_scan]
+        assert all(log.level.value == 'error' for log in indexed)
+
+    def test_time_range_export(self, manager, tmp_path):
+        """测试按时间范围导出"""
+        since = BASE_TIME + timedelta(seconds=500)
+        until = BASE_TIME + timedelta(seconds=509)
+        logs = manager.get_recent_logs(limit=10000, since=since, until=until)
+        assert [log.timestamp for log in logs] == [until - timedelta(seconds=i) for i in range(10)]
+
+        output = tmp_path / "export.csv"
+        assert manager.export_logs_csv(str(output), since=since, until=until)
+        assert len(output.read_text(encoding='utf-8').splitlines()) == 11
@@ -0,0 +1,148 @@
+"""
+批量利润计算引擎单元测试
+
+测试向量化计算与标量计算逐位一致、校验掩码与错误信息、标量广播
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from common.business.batch_profit_engine import calculate_pricing_batch, evaluate_profit_batch
+from common.business.excel_calculator import ExcelCalculatorError, ExcelProfitCalculator, create_sample_excel_file
+from common.business.pricing_calculator import PricingCalculator
+from common.business.profit_evaluator import ProfitEvaluator
+from common.config.base_config import GoodStoreSelectorConfig
+from common.models import ProductInfo
+
+
+@pytest.fixture
+def calculator():
+    """创建计算器fixture"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        excel_path = Path(temp_dir) / "test.xlsx"
+        create_sample_excel_file(excel_path)
+        calc = ExcelProfitCalculator(excel_path)
+        yield calc
+        calc.close()
+
+
+def _random_columns(size=500, seed=7):
+    """生成包含非法值的随机输入列"""
+    rng = np.random.default_rng(seed)
+    columns = {
+        'black_price': rng.uniform(-10, 5000, size).round(2),
+        'green_price': rng.uniform(-10, 5000, size).round(2),
+        'list_price': rng.uniform(1, 5000, size),
+        'purchase_price': rng.uniform(-1, 3000, size),
+        'commission_rate': rng.uniform(-5, 110, size).round(1),
+        'weight': rng.uniform(-50, 5000, size),
+        'length': rng.uniform(1, 100, size),
+        'width': rng.uniform(1, 100, size),
+        'height': rng.uniform(-1, 100, size),
+    }
+    return columns
+
+
+class TestEvaluateProfitBatch:
+    """批量利润计算测试"""
+
+    def test_matches_scalar_calculation(self, calculator):
+        """测试每一行与 calculate_profit 的结果和校验错误完全一致"""
+        columns = _random_columns()
+        batch = calculator.calculate_profit_batch(**columns)
+
+        assert 0 < batch.valid_count < len(batch)
+        for i in range(len(batch)):
+            row = batch.row(i)
+            kwargs = {name: float(values[i]) for name, values in columns.items()}
+            try:
+                scalar = calculator.calculate_profit(**kwargs)
+            except ExcelCalculatorError as e:
+                assert not row['valid']
+                assert row['error'] == str(e)
+                continue
+            assert row['valid']
+            assert row['profit_amount'] == scalar.profit_amount
+            assert row['profit_rate'] == scalar.profit_rate
+            assert row['is_loss'] == scalar.is_loss
+
+    def test_scalar_arguments_broadcast(self):
+        """测试标量参数广播到所有行"""
+        result = evaluate_profit_batch(
+            black_price=[100.0, 200.0], green_price=[120.0, 150.0], list_price=95.0, purchase_price=50.0,
+            commission_rate=10.0, weight=500.0, length=10.0, width=10.0, height=10.0
+        )
+
+        np.testing.assert_array_equal(result.profit_amount, [10.0, -70.0])
+        np.testing.assert_array_equal(result.is_loss, [False, True])
+        assert result.invalid_masks['commission_rate'].shape == (2,)
+
+    def test_invalid_rows_reported_by_mask(self):
+        """测试不合法行不抛出异常，通过掩码和错误信息返回"""
+        result = evaluate_profit_batch(
+            black_price=[100.0, None], green_price=[120.0, 80.0], list_price=95.0, purchase_price=50.0,
+            commission_rate=[12.0, 120.0], weight=500.0, length=10.0, width=10.0, height=10.0
+        )
+
+        assert result.valid.tolist() == [True, False]
+        assert result.invalid_masks['black_price'].tolist() == [False, True]
+        assert result.invalid_masks['commission_rate'].tolist() == [False, True]
+        assert result.row(1)['error'] == "黑标价格必须为正数"
+        assert result.row(1)['profit_amount'] is None
+        assert np.isnan(result.profit_amount[1])
+
+
+class TestPricingBatch:
+    """批量定价计算测试"""
+
+    def test_matches_scalar_pricing(self):
+        """测试覆盖各价格区间（含缺失价格）时与 calculate_complete_pricing 逐位一致"""
+        config = GoodStoreSelectorConfig()
+        pricing_calculator = PricingCalculator(config)
+        rng = np.random.default_rng(11)
+        green = [None, 0, 500.0, 900.0, 1200.0, 3000.0] + list(rng.uniform(1, 3000, 200).round(2))
+        black = [800.0, None, None, 1000.0, 1000.0, 2500.0] + list(rng.uniform(1, 3000, 200).round(2))
+
+        batch_results = pricing_calculator.calculate_complete_pricing_batch(green, black)
+
+        for green_rub, black_rub, batch_result in zip(green, black, batch_results):
+            scalar = pricing_calculator.calculate_complete_pricing(green_rub, black_rub)
+            assert batch_result == scalar
+
+        raw = calculate_pricing_batch(green, black, config.price_calculation)
+        assert len(raw) == len(green)
+
+    def test_matches_scalar_pricing_with_negative_prices(self):
+        """测试负价格与标量实现一致：只有黑标价格时不截断，绿标参与计算时截断为 0"""
+        config = GoodStoreSelectorConfig()
+        pricing_calculator = PricingCalculator(config)
+        rng = np.random.default_rng(23)
+        green = [None, 0, -500.0, 100.0, 3000.0] + list(rng.choice([0.0, -1.0, 1.0], 300) * rng.uniform(1, 3000, 300))
+        black = [-800.0, -1.5, -200.0, -900.0, -100.0] + list(rng.uniform(-3000, 3000, 300))
+
+        batch_results = pricing_calculator.calculate_complete_pricing_batch(green, black)
+
+        for green_rub, black_rub, batch_result in zip(green, black, batch_results):
+            scalar = pricing_calculator.calculate_complete_pricing(green_rub, black_rub)
+            assert batch_result == scalar
+        assert batch_results[0].real_selling_price < 0
+
+    def test_batch_evaluate_products_matches_single(self):
+        """测试批量评估与逐个评估结果一致（包括上架时间拒绝）"""
+        config = GoodStoreSelectorConfig()
+        evaluator = ProfitEvaluator("/tmp/calc.xlsx", config)
+        products = [
+            ProductInfo(product_id="1", green_price=900.0, black_price=1000.0),
+            ProductInfo(product_id="2", green_price=None, black_price=300.0),
+            ProductInfo(product_id="3", green_price=2000.0, black_price=1500.0, shelf_days=1000),
+            ProductInfo(product_id="4", green_price=None, black_price=None),
+        ]
+
+        batch = evaluator.batch_evaluate_products(products, {"1": 50.0})
+        single = [evaluator.evaluate_product_profit(product, {"1": 50.0}.get(product.product_id))
+                  for product in products]
+
+        assert batch == single
+        assert batch[2]['calculation_source'] == 'shelf_time_rejected'
@@ -0,0 +1,164 @@
+"""
+Excel公式模型单元测试
+
+测试公式编译结果与 Excel 缓存值一致、批量求值与单行求值一致、按修改时间重新编译，
+以及利润计算器按工作簿公式计算
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from openpyxl import load_workbook
+
+from common.business.excel_calculator import ExcelCalculatorError, ExcelProfitCalculator, create_sample_excel_file
+from common.business.formula_model import (
+    FormulaModel, FormulaModelError, clear_formula_model_cache, load_formula_model
+)
+
+PROFIT_WORKBOOK = Path(__file__).resolve().parents[2] / "resources" / "利润表V4版本.xlsx"
+
+
+@pytest.fixture
+def workbook_copy():
+    """复制利润表到临时目录（可修改）"""
+    clear_formula_model_cache()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "利润表.xlsx"
+        shutil.copy(PROFIT_WORKBOOK, path)
+        yield path
+    clear_formula_model_cache()
+
+
+def _model_from_cells(cells):
+    """由 {地址: 值} 构建只有一个工作表的模型"""
+    constants = {('S', key): value for key, value in cells.items() if not str(value).startswith('=')}
+    formulas = {('S', key): value[1:] for key, value in cells.items() if str(value).startswith('=')}
+    return FormulaModel("memory.xlsx", constants, formulas)
+
+
+class TestFormulaEvaluation:
+    """公式求值测试"""
+
+    def test_operators_and_functions(self):
+        """测试运算符优先级、百分号、文本连接和常用函数"""
+        model = _model_from_cells({
+            'A1': 2, 'A2': 3, 'A3': '自提点',
+            'B1': '=-A1^2+A2*4%', 'B2': '=IF(A3="自提点",SUM(A1:A2,10),"")', 'B3': '=A3&A1',
+            'B4': '=MAX(A1:A3)', 'B5': '=IF(AND(A1<A2,OR(A1>5,ISBLANK(C9))),1,0)', 'B6': '=A1/0',
+            'B7': '=ISERROR(B6)',
+        })
+        result = model.evaluate({}, ['B1', 'B2', 'B3', 'B4', 'B5', 'B6', 'B7'], default_sheet='S')
+
+        assert result['B1'] == pytest.approx(4 + 0.12)
+        assert result['B2'] == 15.0
+        assert result['B3'] == '自提点2'
+        assert result['B4'] == 3.0
+        assert result['B5'] == 1.0
+        assert np.isnan(result['B6'])
+        assert result['B7'] is True
+
+    def test_unsupported_function_reported_on_use(self):
+        """测试不支持的函数只在被求值时报错"""
+        model = _model_from_cells({'A1': 1, 'B1': '=DISPIMG("ID",1)', 'B2': '=A1+1'})
+
+        assert model.evaluate({}, ['B2'], default_sheet='S')['B2'] == 2.0
+        with pytest.raises(FormulaModelError, match="DISPIMG"):
+            model.evaluate({}, ['B1'], default_sheet='S')
+
+    def test_circular_reference(self):
+        """测试循环引用报错"""
+        model = _model_from_cells({'A1': '=B1+1', 'B1': '=A1'})
+        with pytest.raises(FormulaModelError, match="循环引用"):
+            model.evaluate({}, ['A1'], default_sheet='S')
+
+
+class TestProfitWorkbookModel:
+    """利润表公式模型测试"""
+
+    def test_matches_excel_cached_values(self, workbook_copy):
+        """测试所有可编译公式的结果与 Excel 保存的计算结果一致"""
+        model = load_formula_model(workbook_copy)
+        cached = load_workbook(workbook_copy, data_only=True)
+
+        checked = 0
+        for sheet, cell in model.formulas:
+            if (sheet, cell) in model.unsupported:
+                continue
+            address = f"{sheet}!{cell}"
+            value = model.evaluate({}, [address])[address]
+            expected = cached[sheet][cell].value
+            if expected is None:
+                assert value in ('', None)
+            elif isinstance(expected, str):
+                assert value == expected
+            else:
+                assert value == pytest.approx(expected)
+            checked += 1
+        assert checked > 40
+
+    def test_batch_matches_single_rows(self, workbook_copy):
+        """测试整批求值与逐行求值一致（覆盖不同物流渠道）"""
+        model = load_formula_model(workbook_copy)
+        inputs = {
+            '利润计算表!A4': [100.0, 450.0, 1500.0, 3000.0, 6000.0],
+            '利润计算表!A11': [80.0, 180.0, 700.0, 1200.0, 900.0],
+            '利润计算表!B11': [28.0, 40.0, 300.0, 500.0, 0.0],
+        }
+        outputs = ['利润计算表!G11', '利润计算表!H11', '利润计算表!B8']
+        batch = model.evaluate_batch(inputs, outputs)
+
+        for i in range(5):
+            single = model.evaluate({address: values[i] for address, values in inputs.items()}, outputs)
+            for address in outputs:
+                if isinstance(single[address], float) and np.isnan(single[address]):
+                    assert np.isnan(batch[address][i])
+                else:
+                    assert batch[address][i] == single[address]
+        assert len(set(batch['利润计算表!B8'])) > 1
+
+    def test_recompiles_when_file_changes(self, workbook_copy):
+        """测试缓存按修改时间失效：工作簿被编辑后重新编译"""
+        model = load_formula_model(workbook_copy)
+        assert load_formula_model(workbook_copy) is model
+
+        workbook = load_workbook(workbook_copy)
+        workbook['利润计算表']['D11'] = 10
+        workbook.save(workbook_copy)
+        os.utime(workbook_copy, ns=(model.mtime_ns + 10 ** 9, model.mtime_ns + 10 ** 9))
+
+        reloaded = load_formula_model(workbook_copy)
+        assert reloaded is not model
+        before = model.evaluate({}, ['利润计算表!G11'])['利润计算表!G11']
+        after = reloaded.evaluate({}, ['利润计算表!G11'])['利润计算表!G11']
+        assert after == pytest.approx(before - 7)
+
+
+class TestCalculatorWorkbookFormulas:
+    """利润计算器按工作簿公式计算"""
+
+    def test_calculate_profit_uses_sheet(self, workbook_copy):
+        """测试单个计算与批量计算都按工作簿公式求值且结果一致"""
+        calculator = ExcelProfitCalculator(workbook_copy, use_workbook_formulas=True)
+        params = dict(black_price=331.0, green_price=322.0, list_price=180.0, purchase_price=28.0,
+                      commission_rate=12.0, weight=450.0, length=30.0, width=30.0, height=30.0)
+
+        result = calculator.calculate_profit(**params)
+        model = load_formula_model(workbook_copy)
+        expected = model.evaluate({}, ['利润计算表!G11'])['利润计算表!G11']
+        assert result.profit_amount == pytest.approx(expected)
+        assert result.log_info['calculation_source'] == 'workbook_formulas'
+
+        batch = calculator.calculate_profit_batch(**{**params, 'list_price': [180.0, 80.0], 'purchase_price': 28.0})
+        assert batch.profit_amount[0] == result.profit_amount
+        assert batch.profit_rate[0] == result.profit_rate
+        assert batch.profit_amount[1] != batch.profit_amount[0]
+
+    def test_workbook_without_formulas_rejected(self):
+        """测试工作簿缺少利润公式单元格时报错"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = create_sample_excel_file(Path(temp_dir) / "sample.xlsx")
+            with pytest.raises(ExcelCalculatorError, match="缺少利润公式单元格"):
+                ExcelProfitCalculator(path, use_workbook_formulas=True)
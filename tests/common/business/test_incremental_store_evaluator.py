@@ -0,0 +1,113 @@
+"""
+增量店铺评估器单元测试
+
+测试提前确定的判定始终与处理全部商品后的判定一致，以及商品循环在判定确定后停止抓取
+"""
+import random
+from unittest.mock import Mock, patch
+
+import pytest
+
+from common.business.store_evaluator import IncrementalStoreEvaluator, StoreEvaluator
+from common.config.base_config import GoodStoreSelectorConfig
+from common.models import GoodStoreFlag, PriceCalculationResult, ProductInfo, StoreInfo
+from common.models.scraping_result import ScrapingResult
+
+
+@pytest.fixture
+def config():
+    """好店阈值为 20% 的配置"""
+    config = GoodStoreSelectorConfig()
+    config.selector_filter.good_store_ratio_threshold = 20.0
+    return config
+
+
+def _evaluation(product_id: str, profit_rate: float):
+    return {
+        'product_id': product_id,
+        'pricing_calculation': PriceCalculationResult(
+            real_selling_price=100.0, product_pricing=95.0, profit_amount=profit_rate,
+            profit_rate=profit_rate, is_profitable=profit_rate >= 20.0,
+            calculation_details={'green_price_cny': 100.0, 'black_price_cny': 120.0}
+        ),
+        'profit_rate': profit_rate,
+    }
+
+
+def test_converts_pricing_result_objects(config):
+    """测试定价计算结果为对象时商品计入店铺评估"""
+    result = StoreEvaluator(config).evaluate_store(
+        StoreInfo(store_id="S1"), [_evaluation("1", 30.0), _evaluation("2", 5.0)]
+    )
+
+    assert result.total_products == 2
+    assert result.profitable_products == 1
+    assert result.products[0].product_info.green_price == 100.0
+    assert result.store_info.is_good_store == GoodStoreFlag.YES
+
+
+def test_decides_good_and_not_good_early(config):
+    """测试剩余商品无法改变结果时判定提前确定"""
+    good = IncrementalStoreEvaluator(10, config)
+    assert good.add(_evaluation("1", 30.0)) is None
+    assert good.add(_evaluation("2", 30.0)) == GoodStoreFlag.YES
+    assert good.get_stats()['skipped'] == 8
+
+    # 8 个无利润后剩余 2 个全部有利润仍可达到 20%，9 个无利润后不可能达标
+    not_good = IncrementalStoreEvaluator(10, config)
+    for i in range(8):
+        not_good.add(_evaluation(str(i), 5.0))
+    assert not_good.decided is None
+    assert not_good.add(_evaluation("8", 5.0)) == GoodStoreFlag.NO
+
+    # 失败的商品不计入分母
+    undecided = IncrementalStoreEvaluator(3, config)
+    undecided.add(None)
+    undecided.add(None)
+    assert undecided.decided is None
+    assert undecided.add(None) == GoodStoreFlag.NO
+
+
+def test_early_verdict_matches_full_evaluation(config):
+    """测试随机商品序列中提前确定的判定与全部商品评估后的判定一致"""
+    rng = random.Random(3)
+    evaluator = StoreEvaluator(config)
+    for _ in range(300):
+        evaluations = [
+            None if rng.random() < 0.2 else _evaluation(str(i), rng.choice([5.0, 30.0]) if rng.random() < 0.5 else 5.0)
+            for i in range(rng.randint(1, 15))
+        ]
+        incremental = IncrementalStoreEvaluator(len(evaluations), config, evaluator)
+        early_verdict = None
+        for evaluation in evaluations:
+            early_verdict = incremental.add(evaluation)
+            if early_verdict is not None:
+                break
+
+        final = evaluator.evaluate_store(StoreInfo(store_id="S"), [e for e in evaluations if e])
+        assert early_verdict == final.store_info.is_good_store
+
+
+def test_product_loop_stops_after_verdict(config):
+    """测试商品循环在判定确定后不再抓取剩余商品"""
+    from good_store_selector import GoodStoreSelector
+
+    config.performance.product_memo = False
+    with patch('good_store_selector.ExcelStoreProcessor'), \
+         patch('good_store_selector.ProfitEvaluator'), \
+         patch('good_store_selector.get_global_scraping_orchestrator'):
+        selector = GoodStoreSelector("/tmp/test.xlsx", "/tmp/calc.xlsx", config)
+
+    selector.scraping_orchestrator = Mock()
+    selector.scraping_orchestrator.scrape_with_orchestration.return_value = ScrapingResult.create_success(data={})
+    products = [ProductInfo(product_id=str(i), product_url=f"https://www.ozon.ru/product/{i}/") for i in range(10)]
+
+    with patch.object(selector, '_evaluate_scraped_product',
+                      side_effect=lambda product, result: _evaluation(product.product_id, 30.0)):
+        store_evaluation = IncrementalStoreEvaluator(len(products), config, selector.store_evaluator)
+        evaluations = selector._process_products(products, store_evaluation)
+        assert len(evaluations) == 2
+        assert selector.scraping_orchestrator.scrape_with_orchestration.call_count == 2
+
+        # 审计运行不传增量评估器时处理全部商品
+        assert len(selector._process_products(products)) == 10
@@ -0,0 +1,155 @@
+"""
+PagePrefetcher 与 Seerfar 流式分页单元测试
+
+测试：
+- 后台标签页始终只领先调用方一页，关闭后停止翻页并关闭标签页
+- Seerfar 商品行按页产出，max_products 按前置过滤后的商品计数，达到后停止翻页
+"""
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from common.scrapers.seerfar_scraper import SeerfarScraper
+from common.services.page_prefetcher import PagePrefetcher
+
+
+class FakeTabService:
+    """模拟后台标签页：记录每次翻页"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.current = None
+        self.flips = []
+        self.closed = False
+        self._changed = threading.Condition()
+
+    def navigate_to_sync(self, url):
+        return True
+
+    def wait_for_selector_sync(self, selector, timeout=30000):
+        return True
+
+    def iterate_pages_sync(self, root_selector, config=None, max_pages=None):
+        for number in range(1, min(len(self.pages), max_pages or len(self.pages)) + 1):
+            with self._changed:
+                self.current = number
+                self.flips.append(number)
+                self._changed.notify_all()
+            yield number
+
+    def wait_for_flip(self, number, timeout=2.0):
+        with self._changed:
+            return self._changed.wait_for(lambda: number in self.flips, timeout)
+
+    def close_sync(self):
+        self.closed = True
+
+
+def _make_browser_service(tab_service):
+    browser_service = Mock()
+    browser_service.create_tab_service.return_value = tab_service
+    return browser_service
+
+
+class TestPagePrefetcher(unittest.TestCase):
+    """后台分页预取测试"""
+
+    def setUp(self):
+        self.tab = FakeTabService([[f"p{page}-{row}" for row in range(3)] for page in range(1, 7)])
+        self.prefetcher = PagePrefetcher(
+            _make_browser_service(self.tab), "https://seerfar.cn/store", ".pagination",
+            lambda tab_service: list(tab_service.pages[tab_service.current - 1])
+        )
+
+    def test_stays_one_page_ahead(self):
+        """测试调用方取走一页后才翻到下一页"""
+        self.prefetcher.start()
+        self.assertTrue(self.tab.wait_for_flip(2))
+        time.sleep(0.1)
+        self.assertEqual(self.tab.flips, [1, 2])
+
+        self.assertEqual(self.prefetcher.next_page(), (2, ["p2-0", "p2-1", "p2-2"]))
+        self.assertTrue(self.tab.wait_for_flip(3))
+        time.sleep(0.1)
+        self.assertEqual(self.tab.flips, [1, 2, 3])
+
+        self.prefetcher.close()
+        self.assertTrue(self.tab.closed)
+        self.assertEqual(self.tab.flips, [1, 2, 3])
+
+    def test_returns_none_after_last_page(self):
+        """测试翻到最后一页后返回 None"""
+        self.prefetcher.max_pages = 3
+        pages = []
+        while True:
+            page = self.prefetcher.next_page()
+            if page is None:
+                break
+            pages.append(page[0])
+        self.prefetcher.close()
+
+        self.assertEqual(pages, [2, 3])
+        self.assertIsNone(self.prefetcher.next_page())
+        self.assertEqual(self.prefetcher.get_stats()['pages_fetched'], 2)
+
+
+class TestSeerfarProductStream(unittest.TestCase):
+    """Seerfar 商品列表流式分页测试"""
+
+    def setUp(self):
+        # 每页 10 行，销量为偶数的商品通过前置过滤
+        self.pages = [
+            [{'ozonUrl': f"https://www.ozon.ru/product/{page}-{row}", 'salesVolume': row} for row in range(10)]
+            for page in range(1, 7)
+        ]
+        self.tab = FakeTabService(self.pages)
+        self.scraper = SeerfarScraper(browser_service=_make_browser_service(self.tab))
+
+        def extract_rows(selector, browser_service=None):
+            if browser_service is self.tab:
+                return self.pages[self.tab.current - 1]
+            return self.pages[0]
+
+        patcher = patch.object(self.scraper, '_extract_all_products_data_js', side_effect=extract_rows)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _even_sales(product):
+        return product['product_sales_volume'] % 2 == 0
+
+    def test_first_page_only_when_enough_products(self):
+        """测试首页通过过滤的商品足够时不打开后台标签页"""
+        batches = list(self.scraper.iter_product_batches(5, self._even_sales, url="https://seerfar.cn/store"))
+
+        self.assertEqual([len(batch) for batch in batches], [5])
+        self.scraper.browser_service.create_tab_service.assert_not_called()
+
+    def test_stops_paging_after_max_products(self):
+        """测试按过滤后的商品计数，达到上限后停止翻页"""
+        stats = {}
+        batches = list(self.scraper.iter_product_batches(12, self._even_sales,
+                                                         url="https://seerfar.cn/store", stats=stats))
+
+        self.assertEqual([len(batch) for batch in batches], [5, 5, 2])
+        self.assertEqual(batches[1][0]['ozon_url'], "https://www.ozon.ru/product/2-0")
+        self.assertEqual(stats['pages'], 3)
+        self.assertEqual(stats['filtered'], 11)
+        self.assertTrue(self.tab.closed)
+        self.assertLessEqual(max(self.tab.flips), 4)
+
+    def test_extract_products_list_fetches_ozon_details(self):
+        """测试逐批抓取 OZON 详情并合并到商品数据"""
+        with patch.object(self.scraper, '_fetch_ozon_details',
+                          side_effect=lambda url: {'green_price': 100.0, 'source_url': url}):
+            products = self.scraper._extract_products_list(7, self._even_sales, url="https://seerfar.cn/store")
+
+        self.assertEqual(len(products), 7)
+        self.assertEqual(products[6]['source_url'], "https://www.ozon.ru/product/2-2")
+        self.assertNotIn('ozon_url', products[0])
+        self.assertTrue(all(product['green_price'] == 100.0 for product in products))
+
+
+if __name__ == '__main__':
+    unittest.main()
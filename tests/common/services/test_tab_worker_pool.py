@@ -0,0 +1,109 @@
+"""
+TabWorkerPool 单元测试
+
+测试多标签页工作池的结果顺序、统计信息与停止控制
+"""
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from common.services.tab_worker_pool import TabWorkerPool
+
+
+class TestTabWorkerPool(unittest.TestCase):
+    """TabWorkerPool 功能测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.browser_service = Mock()
+        self.browser_service.create_tab_service.side_effect = lambda: Mock()
+        self.pool = TabWorkerPool(
+            3,
+            browser_service=self.browser_service,
+            orchestrator_factory=lambda tab_service: Mock(tab_service=tab_service)
+        )
+
+    def tearDown(self):
+        """测试后清理"""
+        self.pool.close()
+
+    def test_start_creates_tabs(self):
+        """测试启动时为每个标签页创建服务"""
+        self.pool.start()
+
+        self.assertEqual(self.browser_service.create_tab_service.call_count, 3)
+        self.assertEqual(len(self.pool.get_tab_stats()), 3)
+
+    def test_map_preserves_order(self):
+        """测试结果按输入顺序返回"""
+        def task(worker, item):
+            time.sleep(0.01 * (5 - item))
+            return item * 10
+
+        results = self.pool.map(task, list(range(6)))
+
+        self.assertEqual(results, [0, 10, 20, 30, 40, 50])
+
+    def test_each_tab_runs_one_task_at_a_time(self):
+        """测试同一标签页不会被并发使用"""
+        active = set()
+        lock = threading.Lock()
+        conflicts = []
+
+        def task(worker, item):
+            with lock:
+                if id(worker) in active:
+                    conflicts.append(item)
+                active.add(id(worker))
+            time.sleep(0.01)
+            with lock:
+                active.discard(id(worker))
+            return item
+
+        self.pool.map(task, list(range(12)))
+
+        self.assertEqual(conflicts, [])
+
+    def test_failed_task_returns_none_and_is_counted(self):
+        """测试失败任务返回None并计入统计"""
+        def task(worker, item):
+            if item == 1:
+                raise RuntimeError("boom")
+            return item
+
+        results = self.pool.map(task, [0, 1, 2])
+        stats = self.pool.get_tab_stats()
+
+        self.assertEqual(results, [0, None, 2])
+        self.assertEqual(sum(s['tasks'] for s in stats), 3)
+        self.assertEqual(sum(s['failures'] for s in stats), 1)
+
+    def test_should_continue_stops_dispatch(self):
+        """测试任务控制返回False后停止派发"""
+        pool = TabWorkerPool(
+            1,
+            browser_service=self.browser_service,
+            orchestrator_factory=lambda tab_service: Mock()
+        )
+        try:
+            results = pool.map(lambda worker, item: item, [0, 1, 2, 3],
+                               should_continue=lambda index, item: index < 2)
+        finally:
+            pool.close()
+
+        self.assertEqual(results, [0, 1, None, None])
+
+    def test_close_closes_tabs(self):
+        """测试关闭时释放所有标签页"""
+        self.pool.start()
+        tab_services = list(self.pool._tab_services)
+
+        self.pool.close()
+
+        for tab_service in tab_services:
+            tab_service.close_sync.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+IncrementalExcelWriter 单元测试
+
+测试增量写回的触发条件、原子替换、格式保留与失败重试
+"""
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from common.config.base_config import GoodStoreSelectorConfig
+from common.excel_processor import IncrementalExcelWriter
+from common.models.enums import GoodStoreFlag, StoreStatus
+from common.models.excel_models import ExcelStoreData
+
+
+def _make_store(store_id: str, row_index: int) -> ExcelStoreData:
+    return ExcelStoreData(
+        row_index=row_index,
+        store_id=store_id,
+        is_good_store=GoodStoreFlag.EMPTY,
+        status=StoreStatus.EMPTY
+    )
+
+
+class TestIncrementalExcelWriter(unittest.TestCase):
+    """IncrementalExcelWriter 功能测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.excel_path = Path(self.temp_dir) / "stores.xlsx"
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "店铺"
+        sheet.append(["店铺ID", "是否好店", "状态", "备注"])
+        for i in range(10):
+            sheet.append([f"{1000 + i}", None, None, f"note-{i}"])
+        workbook.create_sheet("说明").append(["保留的其他工作表"])
+        workbook.save(self.excel_path)
+
+        self.stores = [_make_store(f"{1000 + i}", i + 2) for i in range(10)]
+        self.config = GoodStoreSelectorConfig()
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _rows(self):
+        workbook = load_workbook(self.excel_path)
+        try:
+            return list(workbook["店铺"].iter_rows(min_row=2, values_only=True))
+        finally:
+            workbook.close()
+
+    def test_flushes_every_n_stores(self):
+        """测试每完成N个店铺写回一次"""
+        writer = IncrementalExcelWriter(self.excel_path, self.config, flush_every=3, flush_interval=3600)
+
+        writer.add(self.stores[0], GoodStoreFlag.YES, StoreStatus.PROCESSED)
+        writer.add(self.stores[1], GoodStoreFlag.NO, StoreStatus.PROCESSED)
+        self.assertEqual(writer.flush_count, 0)
+        self.assertEqual(self._rows()[0], ("1000", None, None, "note-0"))
+
+        writer.add(self.stores[2], GoodStoreFlag.NO, StoreStatus.FAILED)
+
+        self.assertEqual(writer.flush_count, 1)
+        self.assertEqual(writer.pending_count, 0)
+        rows = self._rows()
+        self.assertEqual(rows[0], ("1000", "是", "已处理", "note-0"))
+        self.assertEqual(rows[2], ("1002", "否", "抓取异常", "note-2"))
+        self.assertEqual(rows[3], ("1003", None, None, "note-3"))
+
+    def test_flushes_after_interval(self):
+        """测试距上次写回超过间隔时写回"""
+        writer = IncrementalExcelWriter(self.excel_path, self.config, flush_every=100, flush_interval=60)
+
+        with patch('common.excel_processor.time.time', return_value=writer._last_flush + 61):
+            writer.add(self.stores[0], GoodStoreFlag.YES, StoreStatus.PROCESSED)
+
+        self.assertEqual(writer.flush_count, 1)
+
+    def test_close_writes_remaining_and_keeps_other_sheets(self):
+        """测试关闭时写回剩余结果，其他工作表内容保留"""
+        writer = IncrementalExcelWriter(self.excel_path, self.config, flush_every=100, flush_interval=3600)
+        writer.add_many([(store, GoodStoreFlag.NO, StoreStatus.PROCESSED) for store in self.stores])
+
+        self.assertTrue(writer.close())
+
+        self.assertTrue(all(row[1:3] == ("否", "已处理") for row in self._rows()))
+        workbook = load_workbook(self.excel_path)
+        self.assertEqual(workbook.sheetnames, ["店铺", "说明"])
+        self.assertEqual(workbook["说明"]["A1"].value, "保留的其他工作表")
+        workbook.close()
+        # 不残留临时文件
+        self.assertEqual([p.name for p in Path(self.temp_dir).iterdir()], ["stores.xlsx"])
+
+    def test_keeps_formatting_by_default(self):
+        """测试默认写回保留样式、列宽、合并单元格和冻结窗格"""
+        workbook = load_workbook(self.excel_path)
+        sheet = workbook["店铺"]
+        sheet["A1"].font = Font(bold=True)
+        sheet.column_dimensions["D"].width = 42
+        sheet.merge_cells("E1:F1")
+        sheet.freeze_panes = "A2"
+        workbook.save(self.excel_path)
+        workbook.close()
+
+        writer = IncrementalExcelWriter(self.excel_path, self.config, flush_every=1, flush_interval=3600)
+        writer.add(self.stores[0], GoodStoreFlag.YES, StoreStatus.PROCESSED)
+
+        self.assertEqual(self._rows()[0][:4], ("1000", "是", "已处理", "note-0"))
+        workbook = load_workbook(self.excel_path)
+        sheet = workbook["店铺"]
+        self.assertTrue(sheet["A1"].font.bold)
+        self.assertEqual(sheet.column_dimensions["D"].width, 42)
+        self.assertIn("E1:F1", [str(r) for r in sheet.merged_cells.ranges])
+        self.assertEqual(sheet.freeze_panes, "A2")
+        workbook.close()
+
+    def test_workbook_loaded_once_across_flushes(self):
+        """测试默认模式只在第一次写回时加载工作簿，之后的写回复用常驻工作簿"""
+        writer = IncrementalExcelWriter(self.excel_path, self.config, flush_every=1, flush_interval=3600)
+
+        with patch('common.excel_processor.load_workbook', wraps=load_workbook) as loader:
+            for store in self.stores[:3]:
+                writer.add(store, GoodStoreFlag.YES, StoreStatus.PROCESSED)
+            self.assertTrue(writer.close())
+
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(writer.flush_count, 3)
+        self.assertTrue(all(row[1:3] == ("是", "已处理") for row in self._rows()[:3]))
+        self.assertEqual(self._rows()[3], ("1003", None, None, "note-3"))
+
+    def test_streaming_rewrite_is_opt_in(self):
+        """测试启用流式重写时结果同样写回（只保留单元格值）"""
+        self.config.performance.excel_streaming_rewrite = True
+        writer = IncrementalExcelWriter(self.excel_path, self.config, flush_every=100, flush_interval=3600)
+        writer.add_many([(self.stores[1], GoodStoreFlag.NO, StoreStatus.PROCESSED)])
+
+        self.assertTrue(writer.close())
+
+        rows = self._rows()
+        self.assertEqual(rows[1], ("1001", "否", "已处理", "note-1"))
+        self.assertEqual(rows[0], ("1000", None, None, "note-0"))
+
+    def test_failed_write_keeps_original_and_retries(self):
+        """测试写入失败时原文件不变，待写结果保留到下次重试"""
+        writer = IncrementalExcelWriter(self.excel_path, self.config, flush_every=100, flush_interval=3600)
+        writer.add(self.stores[0], GoodStoreFlag.YES, StoreStatus.PROCESSED)
+
+        with patch('common.excel_processor.os.replace', side_effect=PermissionError("file is open")):
+            self.assertFalse(writer.flush())
+
+        self.assertEqual(writer.pending_count, 1)
+        self.assertEqual(self._rows()[0], ("1000", None, None, "note-0"))
+
+        self.assertTrue(writer.flush())
+        self.assertEqual(self._rows()[0], ("1000", "是", "已处理", "note-0"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+动作脚本单元测试
+
+使用真实的驱动事件循环线程和模拟的异步 page 对象，测试：
+- 查找/点击/等待/取片段 HTML 在一次驱动调用中完成并报告命中的选择器
+- 必需步骤失败时脚本终止，optional 步骤失败后继续
+- XPath 选择器自动加上 xpath= 前缀
+"""
+import asyncio
+import unittest
+
+from rpa.browser.core.models.action_script import ActionScript, ActionScriptResult
+from rpa.browser.implementations.playwright_browser_driver import SimplifiedPlaywrightBrowserDriver
+
+
+class FakeElement:
+    """模拟 Playwright 异步元素"""
+
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def click(self, timeout=None):
+        self.page.clicked.append(self.selector)
+        self.page.present.update(self.page.reveals.get(self.selector, []))
+
+    async def evaluate(self, script):
+        return f"<div>{self.selector}</div>"
+
+
+class FakePage:
+    """模拟 Playwright 异步 page：present 中的选择器存在，点击后出现 reveals 中的选择器"""
+
+    def __init__(self, present, reveals=None):
+        self.present = set(present)
+        self.reveals = reveals or {}
+        self.clicked = []
+        self.queried = []
+
+    async def query_selector(self, selector):
+        self.queried.append(selector)
+        return FakeElement(self, selector) if selector in self.present else None
+
+    async def wait_for_selector(self, selector, state='visible', timeout=30000):
+        for _ in range(int(timeout / 10)):
+            if selector in self.present:
+                return FakeElement(self, selector)
+            await asyncio.sleep(0.01)
+        raise TimeoutError(f"Timeout {timeout}ms waiting for {selector}")
+
+    async def evaluate(self, script):
+        return {'ready': True}
+
+    async def content(self):
+        return "<html></html>"
+
+
+class TestActionScript(unittest.TestCase):
+    """动作脚本执行测试"""
+
+    def setUp(self):
+        """启动驱动的专用事件循环线程（不启动浏览器）"""
+        self.driver = SimplifiedPlaywrightBrowserDriver()
+        self.driver._start_event_loop_thread()
+        self.driver._loop_ready.wait(5)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.driver._event_loop).result(timeout=5)
+
+    def tearDown(self):
+        """停止事件循环（先让已取消的等待任务处理完取消）"""
+        loop = self.driver._event_loop
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        self.driver._loop_thread.join(timeout=5)
+
+    def test_click_wait_and_get_html(self):
+        """测试点击第一个存在的选择器、等待弹窗并返回片段 HTML"""
+        self.driver.page = FakePage(present={'.area'}, reveals={'.area': ['#popup']})
+        script = (ActionScript()
+                  .click(['.missing', '.area'], name='open')
+                  .wait_for(['.other', '#popup'], timeout_ms=1000, name='loaded')
+                  .evaluate("probe()", name='ready')
+                  .get_html(['#popup'], name='popup'))
+
+        result = self.driver.run_action_script_sync(script, timeout=5)
+
+        self.assertIsInstance(result, ActionScriptResult)
+        self.assertTrue(result.success)
+        self.assertEqual(self.driver.page.clicked, ['.area'])
+        self.assertEqual(result.matched_selectors, {'open': '.area', 'loaded': '#popup', 'popup': '#popup'})
+        self.assertEqual(result.value('ready'), {'ready': True})
+        self.assertEqual(result.value('popup'), "<div>#popup</div>")
+
+    def test_required_step_failure_stops_script(self):
+        """测试必需步骤失败时终止，后续步骤不执行"""
+        self.driver.page = FakePage(present=set())
+        script = ActionScript().click(['.area'], name='open').get_html(name='page')
+
+        result = self.driver.run_action_script_sync(script, timeout=5)
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.failed_step, 'open')
+        self.assertEqual(result.get('open').error, 'no_match')
+        self.assertIsNone(result.get('page'))
+
+    def test_optional_steps_continue(self):
+        """测试 optional 步骤失败后继续执行"""
+        self.driver.page = FakePage(present={'#popup'})
+        script = (ActionScript()
+                  .click(['.expand'], optional=True, name='expand')
+                  .wait_for(['.never'], timeout_ms=50, optional=True, name='loaded')
+                  .get_html(name='page'))
+
+        result = self.driver.run_action_script_sync(script, timeout=5)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.get('loaded').error, 'timeout')
+        self.assertEqual(result.value('page'), "<html></html>")
+
+    def test_xpath_selectors_normalized(self):
+        """测试 XPath 选择器加上 xpath= 前缀，结果中报告原始选择器"""
+        self.driver.page = FakePage(present={"xpath=//div[@id='a']"})
+        result = self.driver.run_action_script_sync(ActionScript().find_first(["//div[@id='a']"]), timeout=5)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.matched_selector('find_first'), "//div[@id='a']")
+        self.assertEqual(self.driver.page.queried, ["xpath=//div[@id='a']"])
+
+
+if __name__ == '__main__':
+    unittest.main()
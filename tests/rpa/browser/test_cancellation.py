@@ -0,0 +1,83 @@
+"""
+浏览器操作取消范围单元测试
+
+测试取消范围取消事件循环中的协程、取消后拒绝新的提交以及嵌套范围级联取消
+"""
+import asyncio
+import threading
+import unittest
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeoutError
+
+from rpa.browser.core.exceptions.browser_exceptions import OperationCancelledError
+from rpa.browser.implementations.cancellation import (
+    CancellationScope, cancellation_scope, current_scope, submit_coroutine, wait_for_future
+)
+
+
+class TestCancellationScope(unittest.TestCase):
+    """CancellationScope 测试"""
+
+    def setUp(self):
+        """启动专用事件循环线程（与驱动相同的运行方式）"""
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+
+    def tearDown(self):
+        """停止事件循环（先让已取消的协程处理完取消）"""
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=5)
+        self.loop.close()
+
+    def test_cancel_stops_pending_coroutine(self):
+        """测试取消范围时事件循环中未完成的协程被取消"""
+        scope = CancellationScope("导航")
+        with cancellation_scope(scope):
+            future = submit_coroutine(asyncio.sleep(30), self.loop)
+
+        self.assertEqual(scope.cancel(), 1)
+        with self.assertRaises(CancelledError):
+            future.result(timeout=5)
+
+    def test_submit_after_cancel_raises(self):
+        """测试范围取消后该操作的后续浏览器调用直接失败"""
+        scope = CancellationScope("数据提取")
+        scope.cancel()
+
+        coro = asyncio.sleep(0)
+        with cancellation_scope(scope):
+            with self.assertRaises(OperationCancelledError):
+                submit_coroutine(coro, self.loop)
+        self.assertIsNone(coro.cr_frame)
+
+    def test_parent_cancel_cascades_to_child(self):
+        """测试父范围取消时子范围一并取消"""
+        parent = CancellationScope("外层")
+        with cancellation_scope(parent):
+            child = CancellationScope("内层", parent=current_scope())
+            with cancellation_scope(child):
+                future = submit_coroutine(asyncio.sleep(30), self.loop)
+                self.assertEqual(parent.cancel(), 1)
+                self.assertTrue(child.cancelled)
+
+        self.assertTrue(future.cancelled())
+        late_child = CancellationScope("延迟", parent=parent)
+        self.assertTrue(late_child.cancelled)
+
+    def test_submit_without_scope(self):
+        """测试不在取消范围内时与 run_coroutine_threadsafe 行为一致"""
+        self.assertIsNone(current_scope())
+        future = submit_coroutine(asyncio.sleep(0, result=42), self.loop)
+        self.assertEqual(wait_for_future(future, timeout=5), 42)
+
+    def test_wait_for_future_cancels_on_timeout(self):
+        """测试等待超时后协程被取消"""
+        future = submit_coroutine(asyncio.sleep(30), self.loop)
+        with self.assertRaises(FutureTimeoutError):
+            wait_for_future(future, timeout=0.05)
+        self.assertTrue(future.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+非阻塞日志管线单元测试
+
+测试：
+- 日志器的处理器移到后台线程，flush 后文件内容完整，stop 后恢复原处理器
+- 同一调用位置的重复日志限流，WARNING 不限流，窗口结束后报告抑制条数
+- StructuredLogger 输出的日志按调用方的位置限流
+- 环形缓冲区有界，队列满时低级别日志直接丢弃
+"""
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+from common.config.system_config import PerformanceConfig
+from common.logging_config import configure_queued_logging
+from rpa.browser.implementations.logger_system import (
+    QueuedLogPipeline, RateLimitFilter, StructuredLogger, get_global_log_pipeline, reset_global_log_pipeline
+)
+
+
+class TestQueuedLogPipeline(unittest.TestCase):
+    """日志管线测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.temp_dir.name) / "pipeline.log"
+        self.logger = logging.getLogger(f"test.pipeline.{self._testMethodName}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        self.file_handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.logger.addHandler(self.file_handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.file_handler)
+        self.file_handler.close()
+        self.temp_dir.cleanup()
+
+    def _log_repeated(self, count):
+        """同一调用位置输出 count 条日志"""
+        for i in range(count):
+            self.logger.info("商品 %d 处理完成", i)
+
+    def test_writes_in_background_and_restores_handlers(self):
+        """测试后台写出、flush 同步和停止后恢复处理器"""
+        pipeline = QueuedLogPipeline(rate_limit_burst=0).start()
+        pipeline.attach(self.logger)
+        self.assertNotIn(self.file_handler, self.logger.handlers)
+
+        self._log_repeated(50)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("提取失败")
+        self.assertTrue(pipeline.flush())
+
+        lines = self.log_file.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(lines[0], "INFO 商品 0 处理完成")
+        self.assertEqual(lines[49], "INFO 商品 49 处理完成")
+        self.assertEqual(lines[50], "ERROR 提取失败")
+        self.assertIn("ValueError: boom", lines[-1])
+        self.assertEqual(pipeline.get_stats()['written'], 51)
+
+        pipeline.stop()
+        self.assertEqual(self.logger.handlers, [self.file_handler])
+        self.assertFalse(pipeline.running)
+
+    def test_repeated_messages_rate_limited(self):
+        """测试同一调用位置超过 burst 的日志被抑制，WARNING 不受影响"""
+        pipeline = QueuedLogPipeline(rate_limit_burst=5, rate_limit_interval=60).start()
+        pipeline.attach(self.logger)
+
+        self._log_repeated(100)
+        for _ in range(10):
+            self.logger.warning("页面加载较慢")
+        pipeline.flush()
+        pipeline.stop()
+
+        lines = self.log_file.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(sum(line.startswith("INFO") for line in lines), 5)
+        self.assertEqual(sum(line.startswith("WARNING") for line in lines), 10)
+        self.assertEqual(pipeline.get_stats()['suppressed'], 95)
+
+    def test_structured_logger_limited_per_caller_site(self):
+        """测试 StructuredLogger 不同调用位置的日志互不限流，同一位置的重复日志仍被限流"""
+        structured = StructuredLogger(self.logger.name, level="DEBUG", console_output=False)
+        pipeline = QueuedLogPipeline(rate_limit_burst=2, rate_limit_interval=60).start()
+        pipeline.attach(self.logger)
+
+        structured.info("site A")
+        structured.info("site B")
+        structured.info("site C")
+        structured.debug("site D")
+        for i in range(5):
+            structured.info(f"repeated {i}")
+        pipeline.flush()
+        pipeline.stop()
+
+        lines = self.log_file.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(lines, [
+            "INFO site A", "INFO site B", "INFO site C", "DEBUG site D", "INFO repeated 0", "INFO repeated 1"
+        ])
+        self.assertEqual(pipeline.get_stats()['suppressed'], 3)
+
+    def test_suppressed_count_reported_in_next_window(self):
+        """测试新窗口放行的第一条日志附带上个窗口抑制的条数"""
+        rate_filter = RateLimitFilter(burst=1, interval=10)
+        records = [logging.LogRecord("x", logging.INFO, "a.py", 1, "第%d条", (i,), None) for i in range(3)]
+        for record, created in zip(records, (0.0, 1.0, 2.0)):
+            record.created = created
+        self.assertEqual([rate_filter.filter(record) for record in records], [True, False, False])
+
+        later = logging.LogRecord("x", logging.INFO, "a.py", 1, "第%d条", (3,), None)
+        later.created = 11.0
+        self.assertTrue(rate_filter.filter(later))
+        self.assertEqual(later.getMessage(), "第3条 （10秒内已抑制2条同类日志）")
+
+    def test_ring_buffer_bounded_and_long_messages_truncated(self):
+        """测试环形缓冲区只保留最近的记录，超长消息被截断"""
+        pipeline = QueuedLogPipeline(ring_buffer_size=10, rate_limit_burst=0, max_message_chars=20).start()
+        pipeline.attach(self.logger)
+
+        self._log_repeated(30)
+        self.logger.debug("x" * 100)
+        pipeline.flush()
+        pipeline.stop()
+
+        records = pipeline.get_recent_records()
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records[0].getMessage(), "商品 21 处理完成")
+        self.assertTrue(records[-1].getMessage().startswith("x" * 20 + "...（已截断，共100字符）"))
+        self.assertEqual(len(pipeline.get_recent_records(limit=3, min_level=logging.INFO)), 3)
+        self.assertIn("商品 29 处理完成", pipeline.get_recent_lines(limit=2)[0])
+
+    def test_full_queue_drops_low_level_records(self):
+        """测试队列满时 INFO 日志直接丢弃，不阻塞调用线程"""
+        pipeline = QueuedLogPipeline(queue_size=5, rate_limit_burst=0)
+        pipeline.attach(self.logger)
+
+        self._log_repeated(20)
+        self.assertEqual(pipeline.get_stats()['dropped'], 15)
+
+        pipeline.start()
+        pipeline.flush()
+        pipeline.stop()
+        self.assertEqual(len(self.log_file.read_text(encoding='utf-8').splitlines()), 5)
+
+
+class TestConfigureQueuedLogging(unittest.TestCase):
+    """按性能配置启用日志管线"""
+
+    def tearDown(self):
+        reset_global_log_pipeline()
+
+    def test_configure_from_performance_config(self):
+        """测试启用时根日志器挂接到全局管线，关闭时恢复"""
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+
+        pipeline = configure_queued_logging(PerformanceConfig(queued_logging=True, log_rate_limit_burst=3))
+        self.assertIs(pipeline, get_global_log_pipeline())
+        self.assertEqual(pipeline.rate_limit_filter.burst, 3)
+        self.assertIn(root.name, pipeline.get_stats()['attached_loggers'])
+
+        self.assertIsNone(configure_queued_logging(PerformanceConfig()))
+        self.assertEqual(root.handlers, handlers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+事件循环桥接（异步执行模式）单元测试
+
+使用真实的驱动事件循环线程和模拟的异步 page 对象，测试：
+- run_in_loop_sync 中的 *_sync 调用直接在事件循环上 await（不跨线程）
+- 多个桥接任务在同一事件循环上并发交替执行
+- 超时与取消范围在桥接任务中的行为与跨线程模式一致
+"""
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from rpa.browser.implementations.cancellation import CancellationScope, cancellation_scope, current_scope
+from rpa.browser.implementations.loop_bridge import cooperative_sleep, in_loop_bridge, run_sync_on_loop
+from rpa.browser.implementations.playwright_browser_driver import SimplifiedPlaywrightBrowserDriver
+
+
+class FakePage:
+    """模拟 Playwright 异步 page，记录调用所在线程"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.threads = []
+
+    async def evaluate(self, script):
+        self.threads.append(threading.current_thread().name)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return script
+
+
+class TestLoopBridge(unittest.TestCase):
+    """驱动事件循环桥接测试"""
+
+    def setUp(self):
+        """启动驱动的专用事件循环线程（不启动浏览器）"""
+        self.driver = SimplifiedPlaywrightBrowserDriver()
+        self.driver._start_event_loop_thread()
+        self.driver._loop_ready.wait(5)
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.driver._event_loop).result(timeout=5)
+        self.driver.page = FakePage()
+
+    def tearDown(self):
+        """停止事件循环"""
+        loop = self.driver._event_loop
+        loop.call_soon_threadsafe(loop.stop)
+        self.driver._loop_thread.join(timeout=5)
+
+    def test_sync_calls_run_directly_on_loop(self):
+        """测试桥接任务中的同步调用在事件循环线程上执行且结果一致"""
+        def scrape():
+            self.assertTrue(in_loop_bridge(self.driver._event_loop))
+            return [self.driver.evaluate_sync(f"script-{i}") for i in range(3)], threading.current_thread().name
+
+        results, thread_name = self.driver.run_in_loop_sync(scrape, timeout=5)
+
+        self.assertEqual(results, ['script-0', 'script-1', 'script-2'])
+        self.assertEqual(thread_name, "PlaywrightEventLoop")
+        self.assertEqual(set(self.driver.page.threads), {"PlaywrightEventLoop"})
+        # 同步入口保持兼容
+        self.assertEqual(self.driver.evaluate_sync("direct"), "direct")
+        self.assertFalse(in_loop_bridge())
+
+    def test_bridged_tasks_interleave_on_one_loop(self):
+        """测试多个桥接任务在同一事件循环上并发执行"""
+        self.driver.page = FakePage(delay=0.2)
+
+        async def run_all():
+            return await asyncio.gather(*[
+                self.driver.run_in_loop(self.driver.evaluate_sync, f"tab-{i}") for i in range(5)
+            ])
+
+        start = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(run_all(), self.driver._event_loop)
+        results = future.result(timeout=5)
+
+        self.assertEqual(results, [f"tab-{i}" for i in range(5)])
+        self.assertLess(time.monotonic() - start, 0.8)
+
+    def test_cooperative_sleep_yields_loop(self):
+        """测试桥接任务中的等待不阻塞其他任务"""
+        async def run_all():
+            return await asyncio.gather(
+                run_sync_on_loop(cooperative_sleep, 0.3),
+                run_sync_on_loop(cooperative_sleep, 0.3),
+            )
+
+        start = time.monotonic()
+        asyncio.run_coroutine_threadsafe(run_all(), self.driver._event_loop).result(timeout=5)
+        self.assertLess(time.monotonic() - start, 0.55)
+
+    def test_timeout_and_exceptions_propagate(self):
+        """测试函数异常原样抛出，整体超时后取消事件循环上的任务"""
+        def fail():
+            raise ValueError("提取失败")
+
+        with self.assertRaises(ValueError):
+            self.driver.run_in_loop_sync(fail, timeout=5)
+
+        self.driver.page = FakePage(delay=5)
+        with self.assertRaises(FutureTimeoutError):
+            self.driver.run_in_loop_sync(self.driver.evaluate_sync, "slow", timeout=0.2)
+
+    def test_cancelled_scope_inside_bridge(self):
+        """测试调用方的取消范围延续到桥接任务中：取消后驱动调用返回失败"""
+        self.driver.page = FakePage(delay=5)
+        scope = CancellationScope("商品抓取")
+
+        def scrape():
+            self.assertIsNotNone(current_scope())
+            return self.driver.evaluate_sync("slow")
+
+        result = {}
+
+        def run():
+            with cancellation_scope(scope):
+                result['value'] = self.driver.run_in_loop_sync(scrape, timeout=5)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        time.sleep(0.2)
+        scope.cancel()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(result['value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+PagePool 单元测试
+
+测试按导航次数回收并使用预热页面、健康检查失败时替换页面、JS堆超限回收、统计内容与驱动导航接入
+"""
+import asyncio
+import threading
+import unittest
+from unittest.mock import Mock
+
+from rpa.browser.implementations.page_pool import (
+    PagePool, PageRecyclePolicy, configure_page_recycle_policy, reset_page_recycle_policy
+)
+from rpa.browser.implementations.playwright_browser_driver import PlaywrightBrowserDriver
+
+
+class FakePage:
+    """模拟 Playwright 页面：evaluate 返回 JS 堆字节数"""
+
+    def __init__(self, heap_mb: float = 50.0, hang: bool = False):
+        self.heap_mb = heap_mb
+        self.hang = hang
+        self.closed = False
+        self.visited = []
+        self.url = "about:blank"
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        if self.hang:
+            await asyncio.sleep(10)
+        return self.heap_mb * 1024 * 1024
+
+    async def goto(self, url, **kwargs):
+        self.visited.append(url)
+        self.url = url
+        return Mock(status=200)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestPagePool(unittest.TestCase):
+    """页面回收池测试"""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.created = []
+
+    def tearDown(self):
+        self.loop.close()
+
+    async def _factory(self):
+        page = FakePage()
+        self.created.append(page)
+        return page
+
+    def _navigate(self, pool, times):
+        async def run():
+            pages = []
+            for _ in range(times):
+                pages.append(await pool.checkout())
+                pool.record_navigation()
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            return pages
+        return self.loop.run_until_complete(run())
+
+    def test_recycle_after_navigations_uses_prewarmed_page(self):
+        """测试达到导航次数后换上预热的页面，旧页面被关闭"""
+        first = FakePage()
+        pool = PagePool(first, PageRecyclePolicy(max_navigations=5, max_renderer_rss_mb=0), self._factory)
+        pages = self._navigate(pool, 6)
+
+        self.assertEqual(pages[:5], [first] * 5)
+        self.assertEqual(len(self.created), 1)
+        self.assertIs(pages[5], self.created[0])
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.get_stats()['recycled_by_reason'], {'navigations': 1})
+
+    def test_unhealthy_page_replaced(self):
+        """测试健康检查超时或页面已关闭时换新页面"""
+        hung = FakePage(hang=True)
+        policy = PageRecyclePolicy(max_navigations=0, max_renderer_rss_mb=0, health_check_timeout=0.05)
+        pool = PagePool(hung, policy, self._factory)
+        page = self._navigate(pool, 1)[0]
+        self.assertIs(page, self.created[0])
+
+        page.closed = True
+        self.assertIs(self._navigate(pool, 1)[0], self.created[1])
+        stats = pool.get_stats()
+        self.assertEqual((stats['recycled'], stats['health_check_failures']), (2, 2))
+
+    def test_js_heap_threshold_and_stats(self):
+        """测试JS堆超限时回收，统计包含页面导航次数与内存"""
+        first = FakePage(heap_mb=100.0)
+        pool = PagePool(first, PageRecyclePolicy(max_navigations=0, max_js_heap_mb=200, max_renderer_rss_mb=0),
+                        self._factory)
+        self._navigate(pool, 2)
+        stats = pool.get_stats()
+        self.assertEqual(stats['pages'][0]['navigations'], 2)
+        self.assertEqual(stats['pages'][0]['js_heap_mb'], 100.0)
+        self.assertEqual(stats['recycled'], 0)
+
+        first.heap_mb = 250.0
+        self.assertIs(self._navigate(pool, 1)[0], self.created[0])
+        self.assertEqual(pool.get_stats()['recycled_by_reason'], {'js_heap': 1})
+
+
+class TestDriverPageRecycling(unittest.TestCase):
+    """驱动导航经由页面回收池"""
+
+    def setUp(self):
+        """启动专用事件循环线程（与驱动相同的运行方式）"""
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+
+    def tearDown(self):
+        reset_page_recycle_policy()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=5)
+        self.loop.close()
+
+    def test_open_page_sync_switches_to_new_page(self):
+        """测试超过导航次数后驱动切换到上下文中新建的页面并注入反检测脚本"""
+        first, replacement = FakePage(), FakePage()
+        driver = PlaywrightBrowserDriver()
+        driver._initialized = True
+        self.addCleanup(setattr, driver, '_initialized', False)
+        driver._event_loop = self.loop
+        driver.page = first
+        driver.context = Mock()
+
+        async def new_page():
+            return replacement
+        driver.context.new_page = new_page
+        injected = []
+
+        async def inject(page=None):
+            injected.append(page)
+        driver._inject_stealth_scripts = inject
+
+        configure_page_recycle_policy(max_navigations=2, max_renderer_rss_mb=0)
+        for i in range(3):
+            self.assertTrue(driver.open_page_sync(f"https://www.ozon.ru/product/{i}/"))
+
+        self.assertIs(driver.page, replacement)
+        self.assertEqual(len(first.visited), 2)
+        self.assertEqual(replacement.visited, ["https://www.ozon.ru/product/2/"])
+        self.assertEqual(injected, [replacement])
+        self.assertEqual(driver.get_page_pool_stats()['pages'][0]['navigations'], 1)
+
+    def _driver(self, page, new_pages):
+        driver = PlaywrightBrowserDriver()
+        driver._initialized = True
+        self.addCleanup(setattr, driver, '_initialized', False)
+        driver._event_loop = self.loop
+        driver.page = page
+        driver.context = Mock()
+
+        async def new_page():
+            return new_pages.pop(0)
+        driver.context.new_page = new_page
+
+        async def inject(page=None):
+            pass
+        driver._inject_stealth_scripts = inject
+        return driver
+
+    def test_open_page_counts_navigations_in_pool(self):
+        """测试 open_page 同样经由回收池（计数并按导航次数回收）"""
+        first, replacement = FakePage(), FakePage()
+        driver = self._driver(first, [replacement])
+
+        configure_page_recycle_policy(max_navigations=2, max_renderer_rss_mb=0)
+        for i in range(3):
+            self.assertTrue(driver.open_page(f"https://www.ozon.ru/product/{i}/"))
+
+        self.assertIs(driver.page, replacement)
+        self.assertEqual(len(first.visited), 2)
+        self.assertEqual(driver.get_page_pool_stats()['recycled_by_reason'], {'navigations': 1})
+
+    def test_swapped_page_rebound_to_pool(self):
+        """测试驱动更换页面后回收池改用新页面，不再另建页面"""
+        first, swapped = FakePage(), FakePage()
+        driver = self._driver(first, [])
+
+        configure_page_recycle_policy(max_navigations=10, max_renderer_rss_mb=0)
+        self.assertTrue(driver.open_page_sync("https://www.ozon.ru/product/1/"))
+
+        # 模拟 load_storage_state：关闭旧页面并换上新上下文中的页面
+        first.closed = True
+        driver.page = swapped
+        self.assertTrue(driver.open_page_sync("https://www.ozon.ru/product/2/"))
+
+        self.assertIs(driver.page, swapped)
+        self.assertEqual(swapped.visited, ["https://www.ozon.ru/product/2/"])
+        stats = driver.get_page_pool_stats()
+        self.assertEqual((stats['recycled'], stats['pages'][0]['navigations']), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+AdaptiveRateLimiter 单元测试
+
+测试导航结果分类、按域名隔离、AIMD 并发调整、并发上限与浏览器服务导航的限流反馈
+"""
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from rpa.browser.browser_service import SimplifiedBrowserService
+from rpa.browser.implementations.rate_limiter import (
+    OUTCOME_BLOCKED, OUTCOME_ERROR, OUTCOME_OK, OUTCOME_TIMEOUT,
+    AdaptiveRateLimiter, classify_navigation, configure_global_rate_limiter, domain_of, reset_global_rate_limiter
+)
+
+
+OZON_PAGE = "https://www.ozon.ru/product/test-123/"
+SEERFAR_PAGE = "https://seerfar.cn/admin/store-detail.html?storeId=1"
+
+
+class TestNavigationOutcome(unittest.TestCase):
+    """导航结果分类测试"""
+
+    def test_classify(self):
+        """测试超时、拦截状态码、验证页面重定向与普通失败"""
+        self.assertEqual(domain_of(OZON_PAGE), "ozon.ru")
+        self.assertEqual(classify_navigation(True, 200, OZON_PAGE), OUTCOME_OK)
+        self.assertEqual(classify_navigation(True, 429, OZON_PAGE), OUTCOME_BLOCKED)
+        self.assertEqual(classify_navigation(True, 200, "https://www.ozon.ru/abt/result?x=1"), OUTCOME_BLOCKED)
+        self.assertEqual(classify_navigation(False, timed_out=True), OUTCOME_TIMEOUT)
+        self.assertEqual(classify_navigation(False), OUTCOME_ERROR)
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """限流与AIMD调整测试"""
+
+    def test_additive_increase_and_multiplicative_decrease(self):
+        """测试健康导航逐步增加并发上限，超时后减半且同一窗口内只减一次"""
+        limiter = AdaptiveRateLimiter(rate=1000, burst=100, initial_concurrency=2, max_concurrency=8)
+        for _ in range(10):
+            limiter.acquire(OZON_PAGE).release(OUTCOME_OK)
+        grown = limiter.get_stats()['ozon.ru']['concurrency_limit']
+        self.assertGreater(grown, 2)
+
+        in_flight = [limiter.acquire(OZON_PAGE) for _ in range(3)]
+        for permit in in_flight:
+            permit.release(OUTCOME_TIMEOUT)
+        stats = limiter.get_stats()['ozon.ru']
+        self.assertEqual(stats['decreases'], 1)
+        self.assertEqual(stats['timeouts'], 3)
+        self.assertEqual(stats['concurrency_limit'], max(1, grown // 2))
+
+        # 请求失败率高时不再增加并发
+        for _ in range(3):
+            limiter.acquire(OZON_PAGE).release(OUTCOME_ERROR)
+        limit = limiter.get_stats()['ozon.ru']['concurrency_limit']
+        limiter.acquire(OZON_PAGE).release(OUTCOME_OK)
+        self.assertEqual(limiter.get_stats()['ozon.ru']['concurrency_limit'], limit)
+
+    def test_block_pauses_only_that_domain(self):
+        """测试拦截页暂停该域名，其他域名照常导航"""
+        limiter = AdaptiveRateLimiter(rate=1000, burst=10, block_pause=0.3)
+        limiter.acquire(OZON_PAGE).release(OUTCOME_BLOCKED)
+
+        start = time.monotonic()
+        limiter.acquire(SEERFAR_PAGE).release(OUTCOME_OK)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+        limiter.acquire(OZON_PAGE).release(OUTCOME_OK)
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+        stats = limiter.get_stats()
+        self.assertEqual(stats['ozon.ru']['blocked'], 1)
+        self.assertEqual(stats['seerfar.cn']['blocked'], 0)
+
+    def test_concurrency_limit_enforced(self):
+        """测试同一域名同时进行的导航不超过并发上限"""
+        limiter = AdaptiveRateLimiter(rate=1000, burst=100, initial_concurrency=2, max_concurrency=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def navigate():
+            with limiter.limit(OZON_PAGE):
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.05)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=navigate) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(limiter.get_stats()['ozon.ru']['successes'], 6)
+
+    def test_token_bucket_rate(self):
+        """测试令牌用尽后按速率发放"""
+        limiter = AdaptiveRateLimiter(rate=20, burst=2, max_rate=20)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire(OZON_PAGE).release(OUTCOME_OK)
+        # 2 个突发令牌之后每 0.05s 发放一个
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+
+class TestServiceNavigationFeedback(unittest.TestCase):
+    """浏览器服务导航经由全局限流器"""
+
+    def tearDown(self):
+        reset_global_rate_limiter()
+
+    def test_navigate_to_sync_reports_block_status(self):
+        """测试驱动返回 429 时按拦截记录"""
+        limiter = configure_global_rate_limiter(rate=1000, burst=10, block_pause=0)
+        service = SimplifiedBrowserService.__new__(SimplifiedBrowserService)
+        service.logger = Mock()
+        service._browser_started = True
+        service.browser_driver = Mock()
+        service.browser_driver.open_page_sync.return_value = True
+        service.browser_driver.last_navigation = {'status': 429, 'final_url': OZON_PAGE, 'timed_out': False}
+
+        self.assertTrue(service.navigate_to_sync(OZON_PAGE))
+        service.browser_driver.last_navigation = {'status': 200, 'final_url': OZON_PAGE, 'timed_out': False}
+        service.navigate_to_sync(OZON_PAGE)
+
+        stats = limiter.get_stats()['ozon.ru']
+        self.assertEqual((stats['requests'], stats['blocked'], stats['successes']), (2, 1, 1))
+        self.assertEqual(stats['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+ResourceBlocker 单元测试
+
+测试资源拦截规则、站点放行名单、route 处理与拦截统计
+"""
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+from rpa.browser.core.models.browser_config import BrowserConfig, ResourceBlockingConfig
+from rpa.browser.implementations.resource_blocker import ResourceBlocker
+
+
+OZON_PAGE = "https://www.ozon.ru/product/test-123/"
+
+
+class TestResourceBlocker(unittest.TestCase):
+    """ResourceBlocker 规则测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.blocker = ResourceBlocker(ResourceBlockingConfig(
+            enabled=True,
+            site_allowlists={'seerfar.cn': {'resource_types': ['image'], 'domains': ['at.alicdn.com']}}
+        ))
+
+    def test_blocks_heavy_resource_types(self):
+        """测试默认拦截图片、视频和字体"""
+        self.assertTrue(self.blocker.should_block("https://cdn1.ozone.ru/a.jpg", 'image', OZON_PAGE))
+        self.assertTrue(self.blocker.should_block("https://cdn1.ozone.ru/v.mp4", 'media', OZON_PAGE))
+        self.assertTrue(self.blocker.should_block("https://cdn1.ozone.ru/f.woff2", 'font', OZON_PAGE))
+
+    def test_keeps_requests_needed_by_erp_and_popup(self):
+        """测试页面导航、接口请求、脚本和样式表不被拦截"""
+        self.assertFalse(self.blocker.should_block(OZON_PAGE, 'document'))
+        self.assertFalse(self.blocker.should_block("https://www.ozon.ru/api/composer", 'fetch', OZON_PAGE))
+        self.assertFalse(self.blocker.should_block("https://www.ozon.ru/app.js", 'script', OZON_PAGE))
+        self.assertFalse(self.blocker.should_block("https://www.ozon.ru/app.css", 'stylesheet', OZON_PAGE))
+        # 插件资源不经过 http(s)
+        self.assertFalse(self.blocker.should_block("chrome-extension://abc/icon.png", 'image', OZON_PAGE))
+
+    def test_blocks_analytics_domains_for_any_type(self):
+        """测试统计域名（含子域名）任意类型都拦截"""
+        self.assertTrue(self.blocker.should_block("https://mc.yandex.ru/watch/1", 'script', OZON_PAGE))
+        self.assertTrue(self.blocker.should_block("https://www.googletagmanager.com/gtm.js", 'script', OZON_PAGE))
+
+    def test_site_allowlist_applies_only_on_that_site(self):
+        """测试站点放行名单只对对应站点页面生效"""
+        seerfar_page = "https://seerfar.cn/admin/store-detail.html?storeId=1"
+
+        self.assertFalse(self.blocker.should_block("https://img.seerfar.cn/a.png", 'image', seerfar_page))
+        self.assertFalse(self.blocker.should_block("https://at.alicdn.com/font.woff", 'font', seerfar_page))
+        self.assertTrue(self.blocker.should_block("https://at.alicdn.com/font.woff", 'font', OZON_PAGE))
+
+    def test_from_dict_respects_enabled_flag(self):
+        """测试未启用时不创建拦截器"""
+        self.assertIsNone(ResourceBlocker.from_dict(None))
+        self.assertIsNone(ResourceBlocker.from_dict({'enabled': False}))
+        self.assertIsInstance(ResourceBlocker.from_dict({'enabled': True}), ResourceBlocker)
+
+    def test_browser_config_roundtrip(self):
+        """测试拦截配置随浏览器配置字典传递"""
+        config = BrowserConfig(resource_blocking=ResourceBlockingConfig(enabled=True, allowed_domains=['a.com']))
+
+        restored = BrowserConfig.from_dict(config.to_dict())
+
+        self.assertTrue(restored.resource_blocking.enabled)
+        self.assertEqual(restored.resource_blocking.allowed_domains, ['a.com'])
+
+
+class TestResourceBlockerRoute(unittest.TestCase):
+    """ResourceBlocker route 处理测试"""
+
+    def _route(self, url: str, resource_type: str) -> Mock:
+        route = Mock()
+        route.request.url = url
+        route.request.resource_type = resource_type
+        route.request.frame.url = OZON_PAGE
+        route.abort = AsyncMock()
+        route.fallback = AsyncMock()
+        return route
+
+    def test_handle_route_aborts_or_falls_back_and_counts(self):
+        """测试拦截请求被中止、其余请求继续，并记录统计"""
+        blocker = ResourceBlocker(ResourceBlockingConfig(enabled=True))
+        image = self._route("https://cdn1.ozone.ru/a.jpg", 'image')
+        api = self._route("https://www.ozon.ru/api/composer", 'xhr')
+
+        async def run():
+            await blocker.handle_route(image)
+            await blocker.handle_route(api)
+
+        asyncio.run(run())
+
+        image.abort.assert_awaited_once_with('blockedbyclient')
+        api.fallback.assert_awaited_once()
+        stats = blocker.get_stats()
+        self.assertEqual(stats['blocked_requests'], 1)
+        self.assertEqual(stats['allowed_requests'], 1)
+        self.assertEqual(stats['blocked_by_type'], {'image': 1})
+        self.assertEqual(stats['blocked_by_domain'], {'cdn1.ozone.ru': 1})
+        self.assertGreater(stats['blocked_bytes_estimated'], 0)
+        self.assertEqual(stats['blocked_ratio'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
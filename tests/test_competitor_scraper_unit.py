@@ -12,6 +12,7 @@ from bs4 import BeautifulSoup
 from common.scrapers.competitor_scraper import CompetitorScraper
 from common.models.scraping_result import ScrapingResult
 from common.config.ozon_selectors_config import OzonSelectorsConfig
+from rpa.browser.core.models.action_script import ActionScriptResult, ActionStepResult
 
 
 class TestCompetitorScraper:
@@ -415,6 +416,43 @@ class TestCompetitorScraper:
         # Assert
         assert result["success"] is False
 
+    def test_present_competitor_popup_action_script(self):
+        """测试以一个动作脚本完成弹窗流程并解析命中的弹窗片段"""
+        # Arrange
+        script_result = ActionScriptResult(success=True, steps=[
+            ActionStepResult(action='click', name='open', success=True, selector='.pdp_bi8'),
+            ActionStepResult(action='wait_for', name='popup_loaded', success=True, selector='div.pdp_bk3'),
+            ActionStepResult(action='get_html', name='popup', success=True, selector='div.pdp_bk3',
+                             value='<div class="pdp_bk3"><span class="store-name">店铺A</span></div>'),
+        ])
+        self.mock_browser_service.run_action_script_sync.return_value = script_result
+
+        # Act
+        result = self.scraper._present_competitor_popup(expand=True)
+
+        # Assert
+        assert result["success"] is True
+        assert result["popup_container"].select_one('.store-name').get_text() == "店铺A"
+        self.mock_browser_service.run_action_script_sync.assert_called_once()
+        self.mock_browser_service.click_sync.assert_not_called()
+        script = self.mock_browser_service.run_action_script_sync.call_args[0][0]
+        assert [action.key for action in script.actions][:3] == ['open', 'popup_loaded', 'expand']
+
+    def test_present_competitor_popup_action_script_no_match(self):
+        """测试动作脚本未找到竞品容器时返回无跟卖"""
+        # Arrange
+        self.mock_browser_service.run_action_script_sync.return_value = ActionScriptResult(
+            success=False, failed_step='open',
+            steps=[ActionStepResult(action='click', name='open', success=False, error='no_match')]
+        )
+
+        # Act
+        result = self.scraper._present_competitor_popup(expand=False)
+
+        # Assert
+        assert result["success"] is False
+        assert result["error"] == "no_competitors"
+
     # ========== _expand_competitor_list 方法测试 ==========
 
     def test_expand_competitor_list_success(self):
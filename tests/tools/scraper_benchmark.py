@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+抓取解析离线基准测试工具
+功能：回放 tests/resources 中保存的页面，测量各提取函数的耗时和内存分配，并与保存的基线对比
+
+用法：
+    python tests/tools/scraper_benchmark.py                    # 运行全部用例并输出报告
+    python tests/tools/scraper_benchmark.py --filter erp       # 只运行名称包含 erp 的用例
+    python tests/tools/scraper_benchmark.py --save-baseline    # 保存当前结果为基线
+    python tests/tools/scraper_benchmark.py --threshold 0.3    # 与基线对比，耗时增加超过30%视为退化
+
+也可以通过 pytest-benchmark 运行（tests/tools/test_scraper_benchmark.py）。
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import Mock, patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+RESOURCES_DIR = PROJECT_ROOT / "tests" / "resources"
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+OZON_PRODUCT_PAGE = "debug-click-test.html"
+COMPETITOR_FIXTURES = ("debug-144042159.html", "debug-2369901364.html")
+ERP_FIXTURES = ("debug_erp_plugin_1702055870.html", "debug_erp_plugin_1711104434.html")
+SEERFAR_TABLE = "debug_seefar_table.html"
+SEERFAR_STORE_INFO = "debug-seefar_store_info.html"
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str) -> str:
+    """读取保存的页面"""
+    return (RESOURCES_DIR / name).read_text(encoding='utf-8')
+
+
+@dataclass
+class BenchmarkCase:
+    """基准测试用例：setup 只执行一次（如解析HTML），func 为被测函数"""
+    name: str
+    func: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+
+    def prepare(self) -> Callable[[], Any]:
+        """执行准备步骤，返回可重复调用的被测函数"""
+        arg = self.setup()
+        return lambda: self.func(arg)
+
+
+@dataclass
+class BenchmarkResult:
+    """单个用例的测量结果"""
+    name: str
+    iterations: int
+    mean_ms: float
+    median_ms: float
+    min_ms: float
+    p95_ms: float
+    peak_kb: float
+    retained_kb: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'iterations': self.iterations,
+            'mean_ms': round(self.mean_ms, 4),
+            'median_ms': round(self.median_ms, 4),
+            'min_ms': round(self.min_ms, 4),
+            'p95_ms': round(self.p95_ms, 4),
+            'peak_kb': round(self.peak_kb, 2),
+            'retained_kb': round(self.retained_kb, 2),
+        }
+
+
+class FixtureBrowserService:
+    """
+    回放保存页面的浏览器服务替身
+
+    只实现提取函数用到的同步读取接口，所有内容来自保存的HTML，不启动浏览器。
+    """
+
+    def __init__(self, html: str):
+        from common.utils.html_parser import parse_html
+        self.html = html
+        self.soup = parse_html(html)
+
+    def evaluate_sync(self, script: str, timeout: int = 30000):
+        if 'outerHTML' in script:
+            return self.html
+        return None
+
+    def text_content_sync(self, selector: str, timeout: int = 30000) -> Optional[str]:
+        element = self.soup.select_one(selector)
+        return element.get_text() if element else None
+
+    def navigate_to_sync(self, url: str, **kwargs) -> bool:
+        return True
+
+    def get_page_url_sync(self) -> str:
+        return ''
+
+
+def _create_scraper(scraper_class):
+    """使用回放浏览器服务创建抓取器（不初始化全局浏览器）"""
+    with patch('rpa.browser.browser_service.SimplifiedBrowserService.get_global_instance', return_value=Mock()):
+        return scraper_class(browser_service=Mock())
+
+
+def _parsed(name: str, parser: Optional[str] = None) -> Callable[[], Any]:
+    def setup():
+        from common.utils.html_parser import parse_html
+        return parse_html(load_fixture(name), parser)
+    return setup
+
+
+def _short(name: str) -> str:
+    return name.replace('.html', '').replace('debug_', '').replace('debug-', '')
+
+
+def build_cases() -> List[BenchmarkCase]:
+    """构建全部基准测试用例"""
+    from common.utils.html_parser import PARSER_HTML, PARSER_LXML, _lxml_available, parse_html
+    from common.utils.scraping_utils import ScrapingUtils
+    from common.utils.sales_data_utils import extract_sales_data_generic
+    from common.config.seerfar_selectors import SEERFAR_SELECTORS, get_seerfar_selector
+    from common.scrapers.competitor_scraper import CompetitorScraper
+    from common.scrapers.erp_plugin_scraper import ErpPluginScraper
+    from common.scrapers.ozon_scraper import OzonScraper
+
+    logger = logging.getLogger("benchmark")
+    utils = ScrapingUtils(logger)
+    cases: List[BenchmarkCase] = []
+
+    # ---------- HTML解析 ----------
+    parsers = [PARSER_LXML, PARSER_HTML] if _lxml_available() else [PARSER_HTML]
+    for fixture in (OZON_PRODUCT_PAGE, ERP_FIXTURES[0], SEERFAR_TABLE):
+        for parser in parsers:
+            cases.append(BenchmarkCase(
+                name=f"parse.{_short(fixture)}.{parser}",
+                setup=lambda fixture=fixture: load_fixture(fixture),
+                func=lambda html, parser=parser: parse_html(html, parser)
+            ))
+
+    # ---------- ScrapingUtils（OZON商品页） ----------
+    for price_type in ("green", "black"):
+        cases.append(BenchmarkCase(
+            name=f"scraping_utils.extract_price_from_soup.{price_type}",
+            setup=_parsed(OZON_PRODUCT_PAGE),
+            func=lambda soup, price_type=price_type: utils.extract_price_from_soup(soup, price_type)
+        ))
+    cases.append(BenchmarkCase(
+        name="scraping_utils.get_competitor_area",
+        setup=_parsed(OZON_PRODUCT_PAGE),
+        func=utils.get_competitor_area
+    ))
+    cases.append(BenchmarkCase(
+        name="scraping_utils.extract_product_image",
+        setup=_parsed(OZON_PRODUCT_PAGE),
+        func=lambda soup: utils.extract_product_image(
+            soup, utils.selectors_config.image_selectors, OzonScraper.PRODUCT_IMAGE_CONFIG
+        )
+    ))
+
+    # ---------- ERP插件 ----------
+    erp_scraper = _create_scraper(ErpPluginScraper)
+
+    def extract_erp(soup):
+        content = []
+        for selector in erp_scraper.selectors_config.erp_container_selectors:
+            content.extend(soup.select(selector))
+            if content:
+                break
+        return erp_scraper._extract_erp_data_from_content(content)
+
+    for fixture in ERP_FIXTURES:
+        cases.append(BenchmarkCase(
+            name=f"erp._extract_erp_data_from_content.{_short(fixture)}",
+            setup=_parsed(fixture),
+            func=extract_erp
+        ))
+
+    # ---------- 跟卖店铺列表 ----------
+    competitor_scraper = _create_scraper(CompetitorScraper)
+    for fixture in COMPETITOR_FIXTURES:
+        cases.append(BenchmarkCase(
+            name=f"competitor.extract_competitors_from_content.{_short(fixture)}",
+            setup=_parsed(fixture),
+            func=lambda soup: competitor_scraper.extract_competitors_from_content(soup, max_competitors=50)
+        ))
+
+    # ---------- Seerfar ----------
+    # Seerfar 商品行在页面内由JS提取，这里测量行定位；店铺销售数据通过回放浏览器服务走真实提取函数
+    rows_selector = get_seerfar_selector('product_list', 'product_rows')
+    cases.append(BenchmarkCase(
+        name="seerfar.product_rows",
+        setup=_parsed(SEERFAR_TABLE),
+        func=lambda soup: [row.get_text(" ", strip=True) for row in soup.select(rows_selector)]
+    ))
+
+    store_sales_fields = [
+        ('sales_amount', 'sold_30days', False),
+        ('sales_volume', 'sold_count_30days', True),
+        ('daily_avg_sales', 'daily_avg_sold', True),
+    ]
+
+    def extract_store_sales(browser):
+        data = {}
+        for selector_key, result_key, is_int in store_sales_fields:
+            data.update(extract_sales_data_generic(
+                browser, None, get_seerfar_selector, 'store_sales_data', selector_key, selector_key,
+                result_key, SEERFAR_SELECTORS.store_sales_data[selector_key], is_int=is_int, logger=logger
+            ) or {})
+        return data
+
+    cases.append(BenchmarkCase(
+        name="seerfar.extract_sales_data_generic",
+        setup=lambda: FixtureBrowserService(load_fixture(SEERFAR_STORE_INFO)),
+        func=extract_store_sales
+    ))
+
+    return cases
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(percent * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_case(case: BenchmarkCase, iterations: int = 20, warmup: int = 2) -> BenchmarkResult:
+    """
+    运行单个用例
+
+    Args:
+        case: 用例
+        iterations: 计时次数
+        warmup: 预热次数（不计时）
+
+    Returns:
+        BenchmarkResult: 测量结果（内存分配在计时之外单独测量一次）
+    """
+    call = case.prepare()
+    for _ in range(warmup):
+        call()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = call()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    timings.sort()
+    return BenchmarkResult(
+        name=case.name,
+        iterations=iterations,
+        mean_ms=statistics.fmean(timings),
+        median_ms=statistics.median(timings),
+        min_ms=timings[0],
+        p95_ms=_percentile(timings, 0.95),
+        peak_kb=(peak - before) / 1024,
+        retained_kb=(after - before) / 1024
+    )
+
+
+def run_benchmarks(cases: List[BenchmarkCase], iterations: int = 20, warmup: int = 2,
+                   name_filter: Optional[str] = None) -> List[BenchmarkResult]:
+    """运行用例列表"""
+    results = []
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        results.append(run_case(case, iterations=iterations, warmup=warmup))
+    return results
+
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict[str, Any],
+                        threshold: float = 0.2, memory_threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    与基线对比，找出退化的用例
+
+    Args:
+        results: 本次结果
+        baseline: 基线数据（save_baseline 保存的格式）
+        threshold: 中位耗时增加比例阈值
+        memory_threshold: 峰值内存增加比例阈值
+
+    Returns:
+        List[Dict[str, Any]]: 退化项列表
+    """
+    regressions = []
+    baseline_cases = baseline.get('cases', {})
+    for result in results:
+        reference = baseline_cases.get(result.name)
+        if not reference:
+            continue
+
+        checks = [
+            ('median_ms', result.median_ms, reference.get('median_ms'), threshold),
+            ('peak_kb', result.peak_kb, reference.get('peak_kb'), memory_threshold),
+        ]
+        for metric, current, previous, limit in checks:
+            if not previous:
+                continue
+            change = (current - previous) / previous
+            if change > limit:
+                regressions.append({
+                    'name': result.name,
+                    'metric': metric,
+                    'baseline': previous,
+                    'current': round(current, 4),
+                    'change': round(change, 4)
+                })
+    return regressions
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """读取基线文件，不存在时返回 None"""
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[BenchmarkResult], path: Path) -> None:
+    """保存基线（合并到已有基线，保留本次未运行的用例）"""
+    baseline = load_baseline(path) or {'cases': {}}
+    baseline['created_at'] = datetime.now().isoformat(timespec='seconds')
+    baseline['python'] = platform.python_version()
+    baseline['machine'] = platform.machine()
+    baseline['cases'].update({result.name: result.to_dict() for result in results})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def format_report(results: List[BenchmarkResult], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """生成文本报告"""
+    baseline_cases = (baseline or {}).get('cases', {})
+    name_width = max([len(result.name) for result in results] + [10])
+    header = f"{'用例'.ljust(name_width)}  {'中位(ms)':>10}  {'P95(ms)':>10}  {'峰值(KB)':>10}  {'较基线':>8}"
+    lines = [header, '-' * len(header)]
+
+    for result in results:
+        reference = baseline_cases.get(result.name, {}).get('median_ms')
+        change = f"{(result.median_ms - reference) / reference:+.0%}" if reference else '-'
+        lines.append(
+            f"{result.name.ljust(name_width)}  {result.median_ms:>10.3f}  {result.p95_ms:>10.3f}  "
+            f"{result.peak_kb:>10.1f}  {change:>8}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='抓取解析离线基准测试工具')
+    parser.add_argument('--iterations', type=int, default=20, help='每个用例的计时次数')
+    parser.add_argument('--warmup', type=int, default=2, help='每个用例的预热次数')
+    parser.add_argument('--filter', dest='name_filter', help='只运行名称包含该字符串的用例')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE_PATH, help='基线文件路径')
+    parser.add_argument('--save-baseline', action='store_true', help='将本次结果保存为基线')
+    parser.add_argument('--threshold', type=float, default=0.2, help='中位耗时退化阈值（比例）')
+    parser.add_argument('--memory-threshold', type=float, default=0.2, help='峰值内存退化阈值（比例）')
+    parser.add_argument('--json', type=Path, help='将结果输出为JSON文件')
+    parser.add_argument('--verbose', action='store_true', help='保留提取函数的日志输出')
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # 提取函数的日志输出会影响计时
+        logging.disable(logging.CRITICAL)
+
+    results = run_benchmarks(build_cases(), iterations=args.iterations, warmup=args.warmup,
+                             name_filter=args.name_filter)
+    if not results:
+        print("未匹配到任何用例")
+        return 1
+
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({result.name: result.to_dict() for result in results}, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n基线已保存: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\n未找到基线文件 {args.baseline}，使用 --save-baseline 生成")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold, args.memory_threshold)
+    if regressions:
+        print(f"\n⚠️ 发现 {len(regressions)} 项性能退化:")
+        for item in regressions:
+            print(f"  {item['name']} {item['metric']}: {item['baseline']} -> {item['current']} ({item['change']:+.0%})")
+        return 1
+
+    print("\n✅ 未发现性能退化")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+抓取解析离线基准测试
+
+- TestBenchmarkHarness: 基准工具本身的单元测试（基线对比、保存与用例可运行）
+- test_extraction_benchmark: 安装 pytest-benchmark 时，对每个用例生成基准测试
+  （pytest tests/tools/test_scraper_benchmark.py --benchmark-only）
+"""
+import importlib.util
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from tools.scraper_benchmark import (
+    BenchmarkCase, BenchmarkResult, build_cases, compare_to_baseline, run_case, save_baseline
+)
+
+
+HAS_PYTEST_BENCHMARK = importlib.util.find_spec("pytest_benchmark") is not None
+
+
+def _result(name: str, median_ms: float, peak_kb: float = 10.0) -> BenchmarkResult:
+    return BenchmarkResult(name=name, iterations=5, mean_ms=median_ms, median_ms=median_ms,
+                           min_ms=median_ms, p95_ms=median_ms, peak_kb=peak_kb, retained_kb=0.0)
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """基准工具测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.baseline_path = Path(self.temp_dir) / "baseline.json"
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_compare_reports_time_and_memory_regressions(self):
+        """测试超过阈值的耗时和内存增长被报告为退化"""
+        baseline = {'cases': {
+            'a': {'median_ms': 10.0, 'peak_kb': 100.0},
+            'b': {'median_ms': 10.0, 'peak_kb': 100.0},
+        }}
+        results = [_result('a', 11.0, 150.0), _result('b', 13.0, 100.0), _result('new', 99.0)]
+
+        regressions = compare_to_baseline(results, baseline, threshold=0.2, memory_threshold=0.2)
+
+        self.assertEqual(
+            sorted((item['name'], item['metric']) for item in regressions),
+            [('a', 'peak_kb'), ('b', 'median_ms')]
+        )
+
+    def test_save_baseline_merges_existing_cases(self):
+        """测试保存基线时保留本次未运行的用例"""
+        save_baseline([_result('a', 1.0)], self.baseline_path)
+        save_baseline([_result('b', 2.0)], self.baseline_path)
+
+        with open(self.baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        self.assertEqual(sorted(baseline['cases']), ['a', 'b'])
+        self.assertEqual(baseline['cases']['b']['median_ms'], 2.0)
+
+    def test_run_case_measures_time_and_allocations(self):
+        """测试运行用例得到耗时和内存分配"""
+        case = BenchmarkCase(name='alloc', setup=lambda: 1000, func=lambda n: [str(i) for i in range(n)])
+
+        result = run_case(case, iterations=3, warmup=0)
+
+        self.assertEqual(result.iterations, 3)
+        self.assertGreater(result.median_ms, 0)
+        self.assertGreater(result.peak_kb, 0)
+
+    def test_cases_cover_all_extractors(self):
+        """测试用例覆盖各类提取函数且都能在保存的页面上运行"""
+        cases = build_cases()
+        prefixes = {case.name.split('.')[0] for case in cases}
+        self.assertTrue({'parse', 'scraping_utils', 'erp', 'competitor', 'seerfar'} <= prefixes)
+
+        logging.disable(logging.CRITICAL)
+        try:
+            sales = next(case for case in cases if case.name == 'seerfar.extract_sales_data_generic')
+            self.assertEqual(sales.prepare()(), {
+                'sold_30days': 274083.0, 'sold_count_30days': 423, 'daily_avg_sold': 14
+            })
+        finally:
+            logging.disable(logging.NOTSET)
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not HAS_PYTEST_BENCHMARK, reason="pytest-benchmark 未安装")
+@pytest.mark.parametrize("case", build_cases(), ids=lambda case: case.name)
+def test_extraction_benchmark(benchmark, case):
+    """使用 pytest-benchmark 测量提取函数"""
+    benchmark(case.prepare())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+GoodStoreSelector 店铺并发单元测试
+
+测试多浏览器上下文并发处理店铺的调度、顺序与任务控制
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+from good_store_selector import GoodStoreSelector
+from common.config.base_config import GoodStoreSelectorConfig
+from common.models.enums import GoodStoreFlag, StoreStatus
+from common.models.excel_models import ExcelStoreData
+from common.services.tab_worker_pool import ContextWorkerPool
+
+
+def _make_store(store_id: str, row_index: int) -> ExcelStoreData:
+    return ExcelStoreData(
+        row_index=row_index,
+        store_id=store_id,
+        is_good_store=GoodStoreFlag.EMPTY,
+        status=StoreStatus.EMPTY
+    )
+
+
+class TestGoodStoreSelectorConcurrency(unittest.TestCase):
+    """GoodStoreSelector 店铺并发测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.config = GoodStoreSelectorConfig()
+        self.config.performance.max_concurrent_stores = 2
+        self.selector = GoodStoreSelector(
+            excel_file_path="/tmp/test.xlsx",
+            profit_calculator_path="/tmp/calc.xlsx",
+            config=self.config
+        )
+        self.stores = [_make_store(str(1000 + i), i + 2) for i in range(5)]
+
+        browser_service = Mock()
+        browser_service.create_context_service.side_effect = lambda: Mock()
+        self.pool = ContextWorkerPool(
+            2,
+            browser_service=browser_service,
+            orchestrator_factory=lambda service: Mock(name="context_orchestrator")
+        )
+
+    def _result_for(self, store_data):
+        result = Mock()
+        result.store_info.status = StoreStatus.PROCESSED
+        result.store_info.is_good_store = GoodStoreFlag.YES
+        result.total_products = 1
+        result.profitable_products = 1
+        result.store_id = store_data.store_id
+        return result
+
+    def test_results_keep_excel_order(self):
+        """测试并发处理结果按Excel顺序返回"""
+        used_orchestrators = []
+
+        def process(store_data):
+            used_orchestrators.append(self.selector.scraping_orchestrator)
+            return self._result_for(store_data)
+
+        with patch('good_store_selector.ContextWorkerPool', return_value=self.pool), \
+             patch.object(self.selector, '_process_single_store', side_effect=process):
+            handled, results = self.selector._process_stores_concurrently(self.stores)
+
+        self.assertEqual([s.store_id for s in handled], [s.store_id for s in self.stores])
+        self.assertEqual([r.store_id for r in results], [s.store_id for s in self.stores])
+        self.assertEqual(self.selector.processing_stats['processed_stores'], 5)
+        self.assertEqual(self.selector.processing_stats['good_stores'], 5)
+        self.assertEqual(len(self.selector.processing_stats['context_stats']), 2)
+        # 工作线程使用各自上下文绑定的协调器
+        self.assertTrue(all(o is not None for o in used_orchestrators))
+        self.assertIsNone(self.selector.scraping_orchestrator)
+
+    def test_task_control_stops_dispatch(self):
+        """测试任务控制停止后不再派发新店铺"""
+        calls = []
+
+        def check(task_point):
+            calls.append(task_point)
+            return len(calls) <= 2
+
+        with patch('good_store_selector.ContextWorkerPool', return_value=self.pool), \
+             patch.object(self.selector, '_check_task_control', side_effect=check), \
+             patch.object(self.selector, '_process_single_store', side_effect=self._result_for):
+            handled, results = self.selector._process_stores_concurrently(self.stores)
+
+        self.assertLessEqual(len(handled), 2)
+        self.assertEqual(len(handled), len(results))
+
+    def test_fallback_to_sequential_when_pool_fails(self):
+        """测试上下文工作池创建失败时回退到顺序处理"""
+        failing_pool = Mock()
+        failing_pool.start.side_effect = RuntimeError("no browser")
+
+        with patch('good_store_selector.ContextWorkerPool', return_value=failing_pool), \
+             patch.object(self.selector, '_process_single_store', side_effect=self._result_for):
+            handled, results = self.selector._process_stores_concurrently(self.stores)
+
+        self.assertEqual(len(handled), 5)
+        self.assertIsNone(self.selector.context_pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
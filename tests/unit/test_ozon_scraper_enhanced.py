@@ -10,6 +10,7 @@ import pytest
 from common.scrapers.ozon_scraper import OzonScraper
 from common.config.base_config import GoodStoreSelectorConfig
 from common.models.scraping_result import ScrapingResult
+from common.models.scraping_models import PageSnapshot
 
 
 class TestOzonScraperEnhanced(unittest.TestCase):
@@ -144,6 +145,138 @@ class TestOzonScraperEnhanced(unittest.TestCase):
             self.assertFalse(result['is_competitor'])
             self.assertEqual(result['analysis_type'], 'filtered_out')
 
+    def test_scrape_reuses_snapshot_without_navigation(self):
+        """测试提供同一页面快照时不再导航"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        snapshot = PageSnapshot(url=test_url + "?from=seerfar", html="<html></html>")
+
+        with patch.object(self.scraper, 'navigate_to', return_value=True) as mock_navigate, \
+             patch.object(self.scraper, '_scrape_with_competitor_analysis',
+                          return_value={'analysis_type': 'filtered_out'}) as mock_analysis:
+
+            result = self.scraper.scrape(test_url, include_competitor=True, snapshot=snapshot)
+
+            self.assertTrue(result.success)
+            mock_navigate.assert_not_called()
+            self.assertIs(mock_analysis.call_args.kwargs['snapshot'], snapshot)
+            self.assertIs(result.metadata['page_snapshot'], snapshot)
+
+    def test_extract_basic_product_info_uses_snapshot_once(self):
+        """测试同一快照上的基础信息和ERP数据只提取一次"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        snapshot = PageSnapshot(url=test_url, html="<html><body></body></html>")
+        self.scraper.erp_scraper = Mock()
+        self.scraper.erp_scraper.scrape.return_value = ScrapingResult(success=True, data={'competitor_cnt': 3})
+
+        with patch.object(self.scraper, 'capture_snapshot') as mock_capture, \
+             patch.object(self.scraper, '_extract_competitor_price', return_value=None):
+            context = {'competitor_cnt': None}
+            first = self.scraper._extract_basic_product_info(test_url, context, snapshot=snapshot)
+            second = self.scraper._extract_basic_product_info(test_url, context, snapshot=snapshot)
+
+            mock_capture.assert_not_called()
+            self.scraper.erp_scraper.scrape.assert_called_once()
+            self.assertIs(self.scraper.erp_scraper.scrape.call_args.kwargs['soup'], snapshot.soup)
+            self.assertEqual(first, second)
+            self.assertEqual(context['competitor_cnt'], 3)
+
+    def test_scrape_served_from_page_cache_without_navigation(self):
+        """测试页面缓存命中时不打开页面"""
+        test_url = "https://www.ozon.ru/product/test-123/?from=seerfar"
+        page_cache = Mock()
+        page_cache.get_data.return_value = {'green_price': 100.0, 'erp_data': {'competitor_cnt': 0}}
+
+        with patch('common.scrapers.base_scraper.get_page_cache', return_value=page_cache), \
+             patch.object(self.scraper, 'navigate_to', return_value=True) as mock_navigate, \
+             patch.object(self.scraper, 'capture_snapshot') as mock_capture:
+
+            result = self.scraper.scrape(test_url, include_competitor=False)
+
+            self.assertTrue(result.success)
+            self.assertEqual(result.data['green_price'], 100.0)
+            mock_navigate.assert_not_called()
+            mock_capture.assert_not_called()
+            # 判断是否命中时读取的结果直接用于返回，不再重复查询
+            page_cache.get_data.assert_called_once_with("https://www.ozon.ru/product/test-123", 'ozon', 'basic_info')
+
+    def test_competitor_analysis_served_from_page_cache_reads_each_entry_once(self):
+        """测试跟卖分析命中页面缓存时，基础数据和跟卖数据各只读取一次"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        entries = {
+            'basic_info': {'green_price': 100.0, 'erp_data': {'competitor_cnt': 2}},
+            'competitors': {'first_competitor_product_id': '456', 'competitors': [{'product_id': '456'}]},
+        }
+        page_cache = Mock()
+        page_cache.get_data.side_effect = lambda url, source, kind: entries.get(kind)
+
+        with patch('common.scrapers.base_scraper.get_page_cache', return_value=page_cache), \
+             patch.object(self.scraper, '_should_analyze_competitor', return_value=True), \
+             patch.object(self.scraper, 'navigate_to', return_value=True) as mock_navigate:
+
+            result = self.scraper.scrape(test_url, include_competitor=True)
+
+            self.assertTrue(result.success)
+            self.assertEqual(result.data['first_competitor_product_id'], '456')
+            mock_navigate.assert_not_called()
+            self.assertEqual([c.args[2] for c in page_cache.get_data.call_args_list], ['basic_info', 'competitors'])
+
+    def test_extract_basic_product_info_with_js_bundle(self):
+        """测试页面内一次性提取：不抓取整页HTML，结果记录在快照中供后续步骤复用"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        self.mock_browser_service.evaluate_sync.return_value = {
+            'url': test_url,
+            'price_texts': {'green': ['', '1 299 ₽'], 'black': ['1 499 ₽']},
+            'image_srcs': ['https://ir.ozone.ru/s3/multimedia-1/wc50/6000.jpg'],
+            'erp_html': '<div class="mz-widget-product"><span>类目： </span></div>',
+            'competitor_html': ''
+        }
+        self.scraper.erp_scraper.scrape = Mock(return_value=ScrapingResult(success=True, data={'competitor_cnt': 2}))
+
+        with patch.object(self.scraper, 'capture_snapshot') as mock_capture, \
+             patch.object(self.scraper, '_extract_competitor_price', return_value=None):
+            context = {'competitor_cnt': None}
+            data = self.scraper._extract_basic_product_info(test_url, context, skip_competitors=True)
+            again = self.scraper._extract_basic_product_info(test_url, context, skip_competitors=True,
+                                                             snapshot=self.scraper._last_snapshot)
+
+        mock_capture.assert_not_called()
+        self.mock_browser_service.evaluate_sync.assert_called_once()
+        self.scraper.erp_scraper.scrape.assert_called_once()
+        erp_soup = self.scraper.erp_scraper.scrape.call_args.kwargs['soup']
+        self.assertIsNotNone(erp_soup.select_one('.mz-widget-product'))
+        self.assertEqual(data['green_price'], 1299.0)
+        self.assertEqual(data['black_price'], 1499.0)
+        self.assertEqual(data['product_image'], 'https://ir.ozone.ru/s3/multimedia-1/wc1000/6000.jpg')
+        self.assertEqual(data, again)
+        self.assertEqual(context['competitor_cnt'], 2)
+
+    def test_extract_basic_product_info_falls_back_to_full_html(self):
+        """测试页面内提取失败时回退到整页HTML解析"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        self.mock_browser_service.evaluate_sync.side_effect = RuntimeError("Execution context was destroyed")
+        self.scraper.erp_scraper.scrape = Mock(return_value=ScrapingResult(success=True, data={}))
+        snapshot = PageSnapshot(url=test_url, html="<html><body></body></html>")
+
+        with patch.object(self.scraper, 'capture_snapshot', return_value=snapshot) as mock_capture:
+            data = self.scraper._extract_basic_product_info(test_url, {}, skip_competitors=True)
+
+        mock_capture.assert_called_once_with(test_url)
+        self.assertIs(self.scraper.erp_scraper.scrape.call_args.kwargs['soup'], snapshot.soup)
+        self.assertEqual(data, {})
+
+    def test_js_bundle_disabled_by_config(self):
+        """测试关闭 ozon_js_extraction 时直接使用整页HTML"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        self.config.performance.ozon_js_extraction = False
+        self.scraper.erp_scraper.scrape = Mock(return_value=ScrapingResult(success=True, data={}))
+
+        with patch.object(self.scraper, 'capture_snapshot',
+                          return_value=PageSnapshot(url=test_url, html="<html></html>")) as mock_capture:
+            self.scraper._extract_basic_product_info(test_url, {}, skip_competitors=True)
+
+        mock_capture.assert_called_once()
+        self.mock_browser_service.evaluate_sync.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -7,7 +7,10 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import pytest
 
-from common.services.scraping_orchestrator import ScrapingOrchestrator, ScrapingMode
+from common.services.scraping_orchestrator import (
+    OrchestrationConfig, ScrapingOrchestrator, ScrapingMode, configure_async_scraping
+)
+from common.config.system_config import PerformanceConfig
 from common.models.scraping_result import ScrapingResult
 
 
@@ -112,6 +115,27 @@ class TestScrapingOrchestratorEnhanced(unittest.TestCase):
             # 验证调用次数
             self.assertEqual(mock_scrape.call_count, 3)
     
+    def test_orchestrate_product_full_analysis_reuses_snapshot(self):
+        """测试跟卖检测复用原商品抓取生成的页面快照"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        snapshot = object()
+
+        primary_result = ScrapingResult.create_success({'product_id': '123', 'green_price': 100.0})
+        primary_result.metadata['page_snapshot'] = snapshot
+        competitor_result = ScrapingResult.create_success({
+            'first_competitor_product_id': None,
+            'competitors': []
+        })
+
+        with patch.object(self.orchestrator.ozon_scraper, 'scrape') as mock_scrape:
+            mock_scrape.side_effect = [primary_result, competitor_result]
+
+            result = self.orchestrator._orchestrate_product_full_analysis(test_url)
+
+            self.assertTrue(result.success)
+            self.assertEqual(mock_scrape.call_count, 2)
+            self.assertIs(mock_scrape.call_args_list[1].kwargs['snapshot'], snapshot)
+    
     def test_convert_to_product_info(self):
         """测试 _convert_to_product_info 数据转换方法"""
         # 测试原商品数据转换
@@ -249,5 +273,38 @@ class TestScrapingOrchestratorEnhanced(unittest.TestCase):
             self.assertNotIn('selection_reason', result.data)
 
 
+class TestScrapingOrchestratorAsyncMode(unittest.TestCase):
+    """异步执行模式测试"""
+
+    def test_async_scraping_runs_on_browser_loop(self):
+        """测试异步执行模式下整次抓取通过一次 run_in_loop_sync 在浏览器事件循环上执行"""
+        test_url = "https://www.ozon.ru/product/test-123/"
+        browser_service = Mock()
+        browser_service.run_in_loop_sync.side_effect = lambda func, *args, timeout=None, **kwargs: func(*args, **kwargs)
+        orchestrator = ScrapingOrchestrator(browser_service=browser_service,
+                                            config=OrchestrationConfig(async_scraping=True))
+        expected = ScrapingResult.create_success({'product_id': '123'})
+
+        with patch.object(orchestrator.ozon_scraper, 'scrape', return_value=expected) as mock_scrape:
+            result = orchestrator.scrape_with_orchestration(ScrapingMode.PRODUCT_INFO, test_url, include_competitor=False)
+
+        self.assertIs(result, expected)
+        browser_service.run_in_loop_sync.assert_called_once()
+        self.assertEqual(browser_service.run_in_loop_sync.call_args.kwargs['timeout'], orchestrator.config.timeout_seconds)
+        mock_scrape.assert_called_once_with(test_url, include_competitor=False)
+
+    def test_async_scraping_follows_global_setting(self):
+        """测试未单独配置时使用全局异步执行模式设置"""
+        orchestrator = ScrapingOrchestrator(browser_service=Mock())
+        self.assertFalse(orchestrator._use_async_scraping())
+        try:
+            configure_async_scraping(PerformanceConfig(async_scraping=True))
+            self.assertTrue(orchestrator._use_async_scraping())
+            orchestrator.config.async_scraping = False
+            self.assertFalse(orchestrator._use_async_scraping())
+        finally:
+            configure_async_scraping(PerformanceConfig())
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
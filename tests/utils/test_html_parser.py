@@ -0,0 +1,142 @@
+"""
+HTML解析后端单元测试
+
+测试后端选择与回退，并基于 tests/resources 中保存的真实页面验证
+lxml 与 html.parser 两种后端下各提取逻辑的结果一致
+"""
+import logging
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from common.utils import html_parser
+from common.utils.html_parser import parse_html, resolve_parser, set_html_parser
+
+
+RESOURCES_DIR = Path(__file__).resolve().parents[1] / "resources"
+LXML_AVAILABLE = html_parser._lxml_available()
+
+
+def _load(name: str) -> str:
+    return (RESOURCES_DIR / name).read_text(encoding='utf-8')
+
+
+class TestHtmlParserSelection(unittest.TestCase):
+    """解析后端选择测试"""
+
+    def tearDown(self):
+        """恢复默认配置"""
+        set_html_parser(None)
+
+    def test_explicit_html_parser(self):
+        """测试显式指定 html.parser"""
+        self.assertEqual(resolve_parser('html.parser'), 'html.parser')
+
+    def test_auto_prefers_lxml_when_available(self):
+        """测试 auto 在安装了 lxml 时使用 lxml"""
+        with patch.object(html_parser, '_lxml_available', return_value=True):
+            self.assertEqual(resolve_parser('auto'), 'lxml')
+
+    def test_falls_back_without_lxml(self):
+        """测试未安装 lxml 时回退到 html.parser"""
+        with patch.object(html_parser, '_lxml_available', return_value=False):
+            self.assertEqual(resolve_parser('auto'), 'html.parser')
+            self.assertEqual(resolve_parser('lxml'), 'html.parser')
+
+    def test_set_html_parser_applies_globally(self):
+        """测试全局配置生效，且优先于环境变量"""
+        with patch.dict('os.environ', {'HTML_PARSER': 'lxml'}):
+            self.assertEqual(set_html_parser('html.parser'), 'html.parser')
+            self.assertEqual(resolve_parser(), 'html.parser')
+
+    def test_set_html_parser_rejects_unknown_backend(self):
+        """测试不支持的后端抛出 ValueError"""
+        with self.assertRaises(ValueError):
+            set_html_parser('selectolax')
+
+    def test_parse_empty_content(self):
+        """测试空内容返回空文档"""
+        self.assertEqual(parse_html(None, 'html.parser').get_text(), '')
+
+
+@unittest.skipUnless(LXML_AVAILABLE, "lxml 未安装")
+class TestHtmlParserEquivalence(unittest.TestCase):
+    """lxml 与 html.parser 提取结果一致性测试"""
+
+    PARSERS = ('lxml', 'html.parser')
+
+    def _for_each_parser(self, name: str, extract):
+        html = _load(name)
+        return [extract(parse_html(html, parser)) for parser in self.PARSERS]
+
+    def assertSameAcrossParsers(self, name: str, extract):
+        lxml_result, builtin_result = self._for_each_parser(name, extract)
+        self.assertEqual(lxml_result, builtin_result, f"{name} 在两种解析后端下结果不一致")
+        return lxml_result
+
+    def test_price_extraction(self):
+        """测试商品页价格提取结果一致"""
+        from common.utils.scraping_utils import ScrapingUtils
+        utils = ScrapingUtils(logging.getLogger(__name__))
+
+        for price_type in ("green", "black"):
+            self.assertSameAcrossParsers(
+                "debug-click-test.html",
+                lambda soup: utils.extract_price_from_soup(soup, price_type)
+            )
+
+    def test_competitor_area(self):
+        """测试跟卖区域定位结果一致"""
+        from common.utils.scraping_utils import ScrapingUtils
+        utils = ScrapingUtils(logging.getLogger(__name__))
+
+        def area_text(soup):
+            area = utils.get_competitor_area(soup)
+            return area.get_text(" ", strip=True) if area else None
+
+        for name in ("debug-click-test.html", "debug-144042159.html", "debug-2369901364.html"):
+            self.assertSameAcrossParsers(name, area_text)
+
+    def test_competitor_list_extraction(self):
+        """测试跟卖店铺列表提取结果一致"""
+        from common.scrapers.competitor_scraper import CompetitorScraper
+
+        with patch('rpa.browser.browser_service.SimplifiedBrowserService.get_global_instance',
+                   return_value=Mock()):
+            scraper = CompetitorScraper(browser_service=Mock())
+
+        for name in ("debug-144042159.html", "debug-2369901364.html"):
+            competitors = self.assertSameAcrossParsers(
+                name, lambda soup: scraper.extract_competitors_from_content(soup, max_competitors=50)
+            )
+            self.assertTrue(competitors, f"{name} 未提取到跟卖店铺")
+
+    def test_erp_plugin_extraction(self):
+        """测试ERP插件数据提取结果一致"""
+        from common.scrapers.erp_plugin_scraper import ErpPluginScraper
+
+        with patch('rpa.browser.browser_service.SimplifiedBrowserService.get_global_instance',
+                   return_value=Mock()):
+            scraper = ErpPluginScraper(browser_service=Mock())
+
+        def erp_data(soup):
+            content = []
+            for selector in scraper.selectors_config.erp_container_selectors:
+                content.extend(soup.select(selector))
+            return scraper._extract_erp_data_from_content(content)
+
+        for name in ("debug_erp_plugin_1702055870.html", "debug_erp_plugin_1711104434.html"):
+            data = self.assertSameAcrossParsers(name, erp_data)
+            self.assertTrue(data, f"{name} 未提取到ERP数据")
+
+    def test_seerfar_tables(self):
+        """测试Seerfar页面表格文本一致"""
+        def table_text(soup):
+            return [cell.get_text(" ", strip=True) for cell in soup.select("table td")]
+
+        for name in ("debug_seefar_table.html", "debug-seefar_store_info.html"):
+            self.assertSameAcrossParsers(name, table_text)
+
+
+if __name__ == '__main__':
+    unittest.main()
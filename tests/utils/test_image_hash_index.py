@@ -0,0 +1,171 @@
+"""
+商品图片感知哈希索引单元测试
+
+测试：
+- 汉明半径查询结果与暴力扫描一致，索引重新打开后数据仍在
+- 哈希预过滤：pHash 距离过大的图片对直接判为不相似
+- find_similar 只对索引筛选出的候选评分，后台索引器跳过已索引的同一图片
+"""
+
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import imagehash
+import numpy as np
+from PIL import Image
+
+from common.config.system_config import PerformanceConfig
+from utils.image_hash_index import (
+    ImageHashIndex, ImageHashIndexer, configure_image_hash_index, get_image_hash_index,
+    hamming_distance, hash_to_int, reset_image_hash_index
+)
+from utils.image_similarity import ProductImageSimilarity
+
+
+def _noise_image(seed: int, size: int = 64) -> Image.Image:
+    """生成随机纹理图片（不同种子的图片感知哈希差异很大）"""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    return Image.fromarray(pixels).resize((size, size), Image.BILINEAR)
+
+
+class TestImageHashIndex(unittest.TestCase):
+    """哈希索引查询测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "hashes.db"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_query_matches_brute_force(self):
+        """测试各查询半径下的结果与暴力扫描一致"""
+        rng = random.Random(7)
+        base = [rng.getrandbits(64) for _ in range(20)]
+        hashes = {}
+        for i in range(2000):
+            # 一部分哈希是基准哈希的少量比特翻转，保证各半径都有命中
+            value = base[i % len(base)]
+            for _ in range(rng.randint(0, 12)):
+                value ^= 1 << rng.randrange(64)
+            hashes[f"item-{i}"] = value
+
+        index = ImageHashIndex()
+        for item_id, value in hashes.items():
+            index.add(item_id, value, value)
+
+        for radius in (0, 4, 10, 17):
+            for query in base[:5]:
+                expected = sorted(item_id for item_id, value in hashes.items()
+                                  if hamming_distance(query, value) <= radius)
+                matches = index.query(query, max_distance=radius)
+                self.assertEqual(sorted(match.item_id for match in matches), expected)
+                distances = [match.phash_distance for match in matches]
+                self.assertEqual(distances, sorted(distances))
+        index.close()
+
+    def test_persisted_and_updated(self):
+        """测试重新打开后数据仍在，更新和删除生效（含最高位为1的哈希）"""
+        index = ImageHashIndex(self.db_path)
+        index.add("a", 0xFFFF000000000001, 0x8000000000000000, {'image_url': 'https://x/a.jpg'})
+        index.add("b", 0x0F0F0F0F0F0F0F0F, 0x1)
+        index.add("b", 0x0F0F0F0F0F0F0F0E, 0x1)
+        index.add("c", 0x1234, 0x1234)
+        self.assertTrue(index.remove("c"))
+        index.close()
+
+        reopened = ImageHashIndex(self.db_path)
+        self.assertEqual(len(reopened), 2)
+        self.assertNotIn("c", reopened)
+        self.assertEqual(reopened.get("a").metadata, {'image_url': 'https://x/a.jpg'})
+        self.assertEqual([m.item_id for m in reopened.query(0xFFFF000000000000, 0x8000000000000000, 2)], ["a"])
+        self.assertEqual([m.item_id for m in reopened.query(0x0F0F0F0F0F0F0F0E, max_distance=0)], ["b"])
+        self.assertEqual(reopened.query(0xFFFF000000000000, 0x7FFFFFFFFFFFFFFF, 2), [])
+        reopened.close()
+
+    def test_configure_from_performance_config(self):
+        """测试按性能配置打开和关闭全局索引"""
+        try:
+            index = configure_image_hash_index(PerformanceConfig(image_hash_index_path=str(self.db_path)))
+            self.assertIs(index, get_image_hash_index())
+            self.assertIsNone(configure_image_hash_index(PerformanceConfig()))
+            self.assertIsNone(get_image_hash_index())
+        finally:
+            reset_image_hash_index()
+
+
+class TestHashPrefilter(unittest.TestCase):
+    """相似度计算中的哈希预过滤测试"""
+
+    def setUp(self):
+        self.image = _noise_image(1)
+        self.near_duplicate = self.image.point(lambda value: min(255, value + 8))
+        self.different = _noise_image(2)
+
+    def test_hash_values(self):
+        """测试哈希值与 imagehash 的结果一致"""
+        tool = ProductImageSimilarity(use_clip=False)
+        phash, dhash = tool.get_hash_values(self.image)
+        self.assertEqual(phash, hash_to_int(imagehash.phash(self.image)))
+        self.assertEqual(dhash, hash_to_int(imagehash.dhash(self.image)))
+
+    def test_distant_pairs_skip_full_scoring(self):
+        """测试 pHash 距离过大的图片对分数为 0，近似重复的图片正常评分"""
+        tool = ProductImageSimilarity(use_clip=False, hash_prefilter_distance=10)
+        baseline = ProductImageSimilarity(use_clip=False)
+
+        self.assertEqual(tool.calculate_similarity(self.image, self.different, method='fast'), 0.0)
+        self.assertAlmostEqual(tool.calculate_similarity(self.image, self.near_duplicate, method='fast'),
+                               baseline.calculate_similarity(self.image, self.near_duplicate, method='fast'))
+
+        scores = tool.compare_many(self.image, [self.near_duplicate, self.different], method='fast')
+        self.assertEqual(scores[1], 0.0)
+        self.assertGreater(scores[0], 0.5)
+        different_key = tool.get_features(self.different).key
+        self.assertFalse(tool.image_cache.has_feature(different_key, 'ssim512'))
+
+
+class TestFindSimilar(unittest.TestCase):
+    """索引查找与后台索引器测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.paths = {}
+        images = {'query': _noise_image(1), 'different': _noise_image(2), 'other': _noise_image(3)}
+        images['duplicate'] = images['query'].point(lambda value: min(255, value + 8))
+        for name, image in images.items():
+            path = Path(self.temp_dir.name) / f"{name}.png"
+            image.save(path)
+            self.paths[name] = str(path)
+        self.tool = ProductImageSimilarity(use_clip=False)
+        self.index = ImageHashIndex()
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_indexer_and_find_similar(self):
+        """测试后台索引器建立索引后只返回近似重复的商品"""
+        indexer = ImageHashIndexer(self.index, self.tool, max_workers=2)
+        for name in ('duplicate', 'different', 'other'):
+            indexer.submit(name, self.paths[name], {'product_url': f"https://www.ozon.ru/product/{name}"})
+        indexer.close()
+        self.assertEqual(indexer.get_stats()['indexed'], 3)
+
+        again = ImageHashIndexer(self.index, self.tool)
+        again.submit('duplicate', self.paths['duplicate'])
+        again.close()
+        self.assertEqual(again.get_stats()['skipped'], 1)
+
+        results = self.tool.find_similar(self.paths['query'], self.index, max_distance=10, method='fast')
+        self.assertEqual([match.item_id for match, _ in results], ['duplicate'])
+        match, score = results[0]
+        self.assertEqual(match.metadata['image_url'], self.paths['duplicate'])
+        self.assertGreater(score, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
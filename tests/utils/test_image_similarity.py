@@ -30,6 +30,7 @@ if not DEPENDENCIES_AVAILABLE:
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from utils.image_similarity import (
+    CLIPSimilarityCalculator,
     ProductImageSimilarity,
     load_image_from_source,
     calculate_hash_similarity,
@@ -103,7 +104,7 @@ class TestImageSimilarity(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             load_image_from_source('nonexistent_file.jpg')
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_load_image_from_url(self, mock_get):
         """测试从URL加载图片"""
         # 模拟HTTP响应
@@ -213,6 +214,90 @@ class TestImageSimilarity(unittest.TestCase):
         # 对于没有CLIP的情况，这应该不会出错
 
 
+class FakeCLIPCalculator:
+    """模拟CLIP计算器：记录每次前向计算的图片数，嵌入由图片平均颜色决定"""
+
+    feature_name = "clip-fake"
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_images(self, images):
+        self.batches.append(len(images))
+        vectors = np.array([np.asarray(img, dtype=np.float64).mean(axis=(0, 1)) + 1.0 for img in images])
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    similarity_from_embeddings = staticmethod(CLIPSimilarityCalculator.similarity_from_embeddings)
+
+
+class TestImageCacheAndCompareMany(unittest.TestCase):
+    """图片/特征缓存与批量比较测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        colors = ['red', 'red', 'blue', 'green', 'yellow']
+        self.paths = []
+        for i, color in enumerate(colors):
+            img = Image.new('RGB', (120, 90), color=color)
+            ImageDraw.Draw(img).rectangle([10 + i * 5, 10, 40 + i * 5, 50], fill='white')
+            path = os.path.join(self.temp_dir.name, f'img{i}.png')
+            img.save(path)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _mock_response(self, path):
+        response = Mock()
+        with open(path, 'rb') as f:
+            response.content = f.read()
+        response.raise_for_status.return_value = None
+        return response
+
+    def test_compare_many_matches_pairwise(self):
+        """测试批量比较与逐对比较结果一致，加载失败的候选为 None"""
+        tool = ProductImageSimilarity(use_clip=False)
+        candidates = self.paths[1:] + [os.path.join(self.temp_dir.name, 'missing.png')]
+
+        scores = tool.compare_many(self.paths[0], candidates, method='fast')
+
+        expected = [ProductImageSimilarity(use_clip=False).calculate_similarity(self.paths[0], path, method='fast')
+                    for path in self.paths[1:]]
+        self.assertEqual(scores[:-1], expected)
+        self.assertIsNone(scores[-1])
+
+    def test_urls_downloaded_once_and_features_persisted(self):
+        """测试同一URL只下载一次，磁盘缓存在新实例中复用图片和特征"""
+        urls = [f'http://example.com/{i}.png' for i in range(len(self.paths))]
+        responses = dict(zip(urls, (self._mock_response(path) for path in self.paths)))
+        cache_dir = os.path.join(self.temp_dir.name, 'cache')
+
+        with patch('requests.Session.get', side_effect=lambda url, timeout: responses[url]) as mock_get:
+            tool = ProductImageSimilarity(use_clip=False, cache_dir=cache_dir)
+            first = tool.compare_many(urls[0], urls[1:])
+            tool.calculate_fast_similarity(urls[0], urls[1])
+            self.assertEqual(mock_get.call_count, len(urls))
+
+            reloaded = ProductImageSimilarity(use_clip=False, cache_dir=cache_dir)
+            self.assertEqual(reloaded.compare_many(urls[0], urls[1:]), first)
+            self.assertEqual(mock_get.call_count, len(urls))
+            self.assertEqual(reloaded.image_cache.get_stats()['feature_misses'], 0)
+
+    def test_clip_embeddings_batched(self):
+        """测试需要CLIP的候选在一次批量前向计算中完成，评分规则与逐对计算一致"""
+        tool = ProductImageSimilarity(use_clip=False)
+        tool.use_clip = True
+        tool.clip_calculator = FakeCLIPCalculator()
+
+        scores = tool.compare_many(self.paths[0], self.paths[1:])
+
+        self.assertEqual(len(tool.clip_calculator.batches), 1)
+        self.assertLessEqual(tool.clip_calculator.batches[0], len(self.paths))
+        for path, score in zip(self.paths[1:], scores):
+            self.assertEqual(tool.calculate_semantic_similarity(self.paths[0], path), score)
+        self.assertEqual(len(tool.clip_calculator.batches), 1)
+
+
 class TestCLIPSimilarity(unittest.TestCase):
     """CLIP相似度测试（需要可选依赖）"""
     
@@ -0,0 +1,153 @@
+"""
+PageCache 单元测试
+
+测试页面缓存的读写、过期、LRU淘汰与强制刷新
+"""
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from common.config.system_config import PerformanceConfig
+from common.utils.page_cache import (
+    PageCache,
+    configure_page_cache,
+    get_page_cache,
+    normalize_cache_url,
+    reset_page_cache
+)
+
+
+class TestPageCache(unittest.TestCase):
+    """PageCache 功能测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = PageCache(self.cache_dir, ttl_by_source={'ozon': 60, 'seerfar': 3600})
+
+    def tearDown(self):
+        """测试后清理"""
+        self.cache.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_put_and_get_roundtrip(self):
+        """测试HTML与提取结果的写入和读取"""
+        url = "https://www.ozon.ru/product/test-123/"
+        html = "<html><body>" + "商品" * 1000 + "</body></html>"
+
+        self.assertTrue(self.cache.put(url, 'ozon', 'basic_info', html=html, data={'green_price': 100.0}))
+        entry = self.cache.get(url.rstrip('/'), 'ozon', 'basic_info')
+
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.html, html)
+        self.assertEqual(entry.data, {'green_price': 100.0})
+        # HTML 压缩保存
+        self.assertLess(self.cache.get_stats()['size_bytes'], len(html.encode('utf-8')))
+
+    def test_query_params_are_part_of_key(self):
+        """测试查询参数参与缓存键（顺序无关）"""
+        base = "https://seerfar.cn/admin/store-detail.html"
+        self.cache.put(f"{base}?storeId=1&platform=OZON", 'seerfar', 'sales_data', data={'sold_30days': 1})
+
+        self.assertEqual(
+            self.cache.get_data(f"{base}?platform=OZON&storeId=1", 'seerfar', 'sales_data'),
+            {'sold_30days': 1}
+        )
+        self.assertIsNone(self.cache.get_data(f"{base}?storeId=2&platform=OZON", 'seerfar', 'sales_data'))
+        self.assertEqual(normalize_cache_url("HTTPS://Ozon.RU/a/?b=2&a=1"), "https://ozon.ru/a?a=1&b=2")
+
+    def test_entry_expires_by_source_ttl(self):
+        """测试按来源TTL过期"""
+        url = "https://www.ozon.ru/product/test-123/"
+        with patch('common.utils.page_cache.time.time', return_value=1000.0):
+            self.cache.put(url, 'ozon', 'basic_info', data={'a': 1})
+            self.cache.put(url, 'seerfar', 'other', data={'b': 1})
+
+        with patch('common.utils.page_cache.time.time', return_value=1100.0):
+            self.assertIsNone(self.cache.get_data(url, 'ozon', 'basic_info'))
+            self.assertEqual(self.cache.get_data(url, 'seerfar', 'other'), {'b': 1})
+
+        self.assertEqual(self.cache.get_stats()['expired'], 1)
+
+    def test_lru_eviction_respects_size_cap(self):
+        """测试超过大小上限时淘汰最近最少使用的条目"""
+        cache = PageCache(tempfile.mkdtemp(dir=self.cache_dir), max_size_bytes=250)
+        try:
+            payload = {'text': 'x' * 100}
+            with patch('common.utils.page_cache.time.time', side_effect=[1.0, 2.0, 3.0, 4.0, 5.0, 6.0]):
+                cache.put("https://a.com/1", 'ozon', data=payload)
+                cache.put("https://a.com/2", 'ozon', data=payload)
+                cache.get("https://a.com/1", 'ozon')  # 访问1，使2成为最久未使用
+                cache.put("https://a.com/3", 'ozon', data=payload)
+
+            with patch('common.utils.page_cache.time.time', return_value=7.0):
+                self.assertIsNotNone(cache.get("https://a.com/1", 'ozon'))
+                self.assertIsNone(cache.get("https://a.com/2", 'ozon'))
+                self.assertIsNotNone(cache.get("https://a.com/3", 'ozon'))
+            self.assertEqual(cache.get_stats()['evictions'], 1)
+        finally:
+            cache.close()
+
+    def test_force_refresh_bypasses_reads(self):
+        """测试强制刷新时不读取缓存但仍写入"""
+        url = "https://www.ozon.ru/product/test-123/"
+        self.cache.put(url, 'ozon', 'basic_info', data={'a': 1})
+        self.cache.force_refresh = True
+
+        self.assertIsNone(self.cache.get(url, 'ozon', 'basic_info'))
+        self.assertTrue(self.cache.put(url, 'ozon', 'basic_info', data={'a': 2}))
+
+        self.cache.force_refresh = False
+        self.assertEqual(self.cache.get_data(url, 'ozon', 'basic_info'), {'a': 2})
+        self.assertEqual(self.cache.get_stats()['bypassed'], 1)
+
+
+class TestGlobalPageCache(unittest.TestCase):
+    """全局页面缓存启用与关闭测试"""
+
+    def tearDown(self):
+        """测试后清理"""
+        reset_page_cache()
+
+    def test_disabled_by_default(self):
+        """测试未配置时不启用缓存"""
+        self.assertIsNone(get_page_cache())
+
+    def test_configure_from_performance_config(self):
+        """测试根据性能配置启用缓存"""
+        cache_dir = tempfile.mkdtemp()
+        try:
+            config = PerformanceConfig(page_cache_dir=cache_dir, force_refresh=True)
+            cache = configure_page_cache(config, dryrun=True)
+
+            self.assertIs(get_page_cache(), cache)
+            self.assertTrue(cache.force_refresh)
+            self.assertEqual(cache.get_ttl('seerfar'), 24 * 3600)
+
+            config.enable_cache = False
+            self.assertIsNone(configure_page_cache(config, dryrun=True))
+            self.assertIsNone(get_page_cache())
+        finally:
+            reset_page_cache()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def test_production_runs_opt_in(self):
+        """测试正式运行默认不启用缓存，开启 page_cache_always 后启用"""
+        cache_dir = tempfile.mkdtemp()
+        try:
+            config = PerformanceConfig(page_cache_dir=cache_dir)
+            self.assertIsNone(configure_page_cache(config))
+            self.assertIsNone(get_page_cache())
+
+            config.page_cache_always = True
+            cache = configure_page_cache(config)
+            self.assertIsNotNone(cache)
+            self.assertIs(get_page_cache(), cache)
+        finally:
+            reset_page_cache()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+ProductMemo 单元测试
+
+测试：
+- 商品ID标准化（商品ID与URL两种来源）
+- 结果的读写、持久化、过期与命中统计
+- 并发请求同一商品时只计算一次（线程和事件循环桥接任务两种方式）
+- 协调器完整分析：同一商品和已抓取过的跟卖商品不再打开页面
+"""
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from common.config.system_config import PerformanceConfig
+from common.models.scraping_result import ScrapingResult
+from common.services.scraping_orchestrator import ScrapingOrchestrator
+from rpa.browser.implementations.loop_bridge import cooperative_sleep, run_sync_on_loop
+from common.utils.product_memo import (
+    ProductMemo,
+    configure_product_memo,
+    get_product_memo,
+    normalize_product_id,
+    reset_product_memo
+)
+
+
+class TestNormalizeProductId(unittest.TestCase):
+    """商品ID标准化测试"""
+
+    def test_normalize(self):
+        """测试纯数字ID、带名称的URL和纯ID URL"""
+        self.assertEqual(normalize_product_id(" 0123 "), "123")
+        self.assertEqual(normalize_product_id(url="https://www.ozon.ru/product/haval-disk-2964205200/?at=1"),
+                         "2964205200")
+        self.assertEqual(normalize_product_id("abc", "https://www.ozon.ru/product/123456789/"), "123456789")
+        self.assertIsNone(normalize_product_id("abc", "https://www.ozon.ru/seller/123/"))
+
+
+class TestProductMemo(unittest.TestCase):
+    """ProductMemo 功能测试"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "memo.db"
+
+    def tearDown(self):
+        reset_product_memo()
+        self.temp_dir.cleanup()
+
+    def test_persisted_and_expired(self):
+        """测试可序列化结果写入磁盘，不可序列化结果只在内存中，过期结果不再返回"""
+        memo = ProductMemo(self.db_path, ttl=60)
+        memo.put('product', '1', {'green_price': 100.0})
+        memo.put('evaluation', '1', {'pricing': object()})
+        self.assertIsNotNone(memo.get('evaluation', '1'))
+        memo.close()
+
+        reopened = ProductMemo(self.db_path, ttl=60)
+        self.assertEqual(reopened.get('product', '1'), {'green_price': 100.0})
+        self.assertIsNone(reopened.get('evaluation', '1'))
+        stats = reopened.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['by_kind']['evaluation']['misses'], 1)
+        reopened.close()
+
+        with patch('common.utils.product_memo.time.time', return_value=time.time() + 120):
+            expired = ProductMemo(self.db_path, ttl=60)
+            self.assertIsNone(expired.get('product', '1'))
+            expired.close()
+
+    def test_key_lock_single_flight(self):
+        """测试多个线程同时请求同一商品时只计算一次"""
+        memo = ProductMemo()
+        computed = []
+
+        def worker():
+            with memo.key_lock('full_chain', '42'):
+                if memo.get('full_chain', '42') is None:
+                    time.sleep(0.05)
+                    computed.append(1)
+                    memo.put('full_chain', '42', {'ok': True})
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(computed), 1)
+        self.assertEqual(memo.get_stats()['hits'], 3)
+
+    def test_key_lock_bridged_tasks_do_not_block_loop(self):
+        """测试同一事件循环上的两个桥接任务请求同一商品时不会阻塞事件循环"""
+        memo = ProductMemo()
+        computed = []
+
+        def worker():
+            with memo.key_lock('full_chain', '123'):
+                if memo.get('full_chain', '123') is None:
+                    cooperative_sleep(0.1)
+                    computed.append(1)
+                    memo.put('full_chain', '123', {'ok': True})
+            return memo.get('full_chain', '123')
+
+        async def run_all():
+            return await asyncio.gather(run_sync_on_loop(worker), run_sync_on_loop(worker))
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            results = asyncio.run_coroutine_threadsafe(run_all(), loop).result(timeout=5)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+        self.assertEqual(results, [{'ok': True}, {'ok': True}])
+        self.assertEqual(len(computed), 1)
+
+    def test_configure_from_performance_config(self):
+        """测试按性能配置启用和关闭全局备忘"""
+        memo = configure_product_memo(PerformanceConfig(product_memo_path=str(self.db_path)))
+        self.assertIs(memo, get_product_memo())
+        self.assertEqual(memo.db_path, self.db_path)
+        self.assertIsNone(configure_product_memo(PerformanceConfig(product_memo=False)))
+        self.assertIsNone(get_product_memo())
+
+
+class TestOrchestratorMemo(unittest.TestCase):
+    """协调器完整分析的备忘测试"""
+
+    def setUp(self):
+        configure_product_memo(PerformanceConfig())
+        self.orchestrator = ScrapingOrchestrator.__new__(ScrapingOrchestrator)
+        self.orchestrator.logger = logging.getLogger(__name__)
+        self.orchestrator.ozon_scraper = Mock()
+        self.orchestrator.ozon_scraper.scrape.side_effect = self._scrape
+        self.pages = []
+
+    def tearDown(self):
+        reset_product_memo()
+
+    def _scrape(self, url, include_competitor=False, skip_competitors=False, **kwargs):
+        self.pages.append(url)
+        product_id = normalize_product_id(url=url)
+        if include_competitor:
+            return ScrapingResult.create_success(data={
+                'first_competitor_product_id': '900',
+                'competitors': [{'store_id': 's1', 'price': 90.0}],
+            })
+        return ScrapingResult.create_success(data={
+            'product_id': product_id, 'product_url': url, 'green_price': float(product_id),
+        })
+
+    def test_same_product_analyzed_once(self):
+        """测试同一商品第二次直接复用结果，跟卖商品只抓取一次"""
+        first = self.orchestrator._orchestrate_product_full_analysis("https://www.ozon.ru/product/a-100/")
+        self.assertTrue(first.success)
+        self.assertEqual(first.data['competitor_product'].green_price, 900.0)
+        scraped = len(self.pages)
+
+        second = self.orchestrator._orchestrate_product_full_analysis("https://www.ozon.ru/product/100/?from=x")
+        self.assertEqual(len(self.pages), scraped)
+        self.assertTrue(second.metadata['memo_hit'])
+        self.assertEqual(second.data['primary_product'], first.data['primary_product'])
+        self.assertIsNot(second.data['competitors_list'], first.data['competitors_list'])
+
+        # 另一个商品的跟卖商品已抓取过，只打开该商品本身
+        self.orchestrator._orchestrate_product_full_analysis("https://www.ozon.ru/product/b-200/")
+        self.assertEqual(len(self.pages), scraped + 2)
+        self.assertNotIn('900', self.pages[scraped:][-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+StoreJournal 单元测试
+
+测试店铺处理断点日志的追加、读取、续跑拆分与结果回放
+"""
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from openpyxl import Workbook, load_workbook
+
+from common.config.base_config import GoodStoreSelectorConfig
+from common.excel_processor import IncrementalExcelWriter
+from common.models.business_models import StoreAnalysisResult, StoreInfo
+from common.models.enums import GoodStoreFlag, StoreStatus
+from common.models.excel_models import ExcelStoreData
+from common.utils.store_journal import StoreJournal, default_journal_path
+from good_store_selector import GoodStoreSelector
+
+
+def _make_store(store_id: str, row_index: int) -> ExcelStoreData:
+    return ExcelStoreData(
+        row_index=row_index,
+        store_id=store_id,
+        is_good_store=GoodStoreFlag.EMPTY,
+        status=StoreStatus.EMPTY
+    )
+
+
+def _make_result(store_id: str, is_good: bool = True,
+                 status: StoreStatus = StoreStatus.PROCESSED) -> StoreAnalysisResult:
+    store_info = StoreInfo(store_id=store_id, sold_30days=1500000.0)
+    result = StoreAnalysisResult(store_info=store_info, products=[])
+    store_info.is_good_store = GoodStoreFlag.YES if is_good else GoodStoreFlag.NO
+    store_info.status = status
+    result.total_products = 10
+    result.profitable_products = 4 if is_good else 0
+    return result
+
+
+class TestStoreJournal(unittest.TestCase):
+    """StoreJournal 功能测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_path = Path(self.temp_dir) / "stores.xlsx.journal.jsonl"
+        self.journal = StoreJournal(self.journal_path)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.journal.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_default_path_next_to_excel(self):
+        """测试默认日志路径位于Excel文件旁"""
+        self.assertEqual(
+            default_journal_path("/data/stores.xlsx"),
+            Path("/data/stores.xlsx.journal.jsonl")
+        )
+
+    def test_append_and_load_roundtrip(self):
+        """测试追加记录后可完整读取并还原结果"""
+        self.journal.open()
+        self.journal.append(2, _make_result("1001"))
+        self.journal.append(3, _make_result("1002", is_good=False))
+        self.journal.close()
+
+        records = StoreJournal(self.journal_path).load()
+        self.assertEqual(len(records), 2)
+
+        result = records[StoreJournal.make_key("1001", 2)].to_result()
+        self.assertEqual(result.store_info.is_good_store, GoodStoreFlag.YES)
+        self.assertEqual(result.store_info.status, StoreStatus.PROCESSED)
+        self.assertEqual(result.store_info.sold_30days, 1500000.0)
+        self.assertEqual(result.total_products, 10)
+        self.assertEqual(result.profitable_products, 4)
+
+    def test_truncated_last_line_is_ignored(self):
+        """测试崩溃时写了一半的末行被忽略"""
+        self.journal.open()
+        self.journal.append(2, _make_result("1001"))
+        self.journal.close()
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"store_id": "1002", "row_in')
+
+        records = StoreJournal(self.journal_path).load()
+
+        self.assertEqual(list(records), [StoreJournal.make_key("1001", 2)])
+
+    def test_split_pending_retries_failed_stores(self):
+        """测试续跑时跳过已完成店铺，失败店铺重新处理"""
+        self.journal.open()
+        self.journal.append(2, _make_result("1001"))
+        self.journal.append(3, _make_result("1002", status=StoreStatus.FAILED))
+        self.journal.close()
+
+        stores = [_make_store("1001", 2), _make_store("1002", 3), _make_store("1003", 4)]
+        remaining, done, done_records = self.journal.split_pending(stores, self.journal.load())
+
+        self.assertEqual([s.store_id for s in remaining], ["1002", "1003"])
+        self.assertEqual([s.store_id for s in done], ["1001"])
+        self.assertEqual(done_records[0].store_id, "1001")
+
+    def test_open_without_resume_backs_up_old_journal(self):
+        """测试非续跑模式打开时备份旧日志"""
+        self.journal.open()
+        self.journal.append(2, _make_result("1001"))
+        self.journal.close()
+
+        self.journal.open(resume=False)
+
+        self.assertEqual(self.journal.load(), {})
+        self.assertTrue(self.journal_path.with_name(f"{self.journal_path.name}.bak").exists())
+
+
+class TestGoodStoreSelectorResume(unittest.TestCase):
+    """GoodStoreSelector 续跑测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.excel_path = Path(self.temp_dir) / "stores.xlsx"
+        self.stores = [_make_store(str(1000 + i), i + 2) for i in range(4)]
+
+        workbook = Workbook()
+        workbook.active.append(["店铺ID", "是否好店", "状态"])
+        for store in self.stores:
+            workbook.active.append([store.store_id, None, None])
+        workbook.save(self.excel_path)
+
+        # 模拟上次运行在处理完前两个店铺后崩溃
+        journal = StoreJournal(default_journal_path(self.excel_path)).open()
+        journal.append(2, _make_result("1000"))
+        journal.append(3, _make_result("1001", is_good=False))
+        journal.close()
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, resume: bool, dryrun: bool = False):
+        config = GoodStoreSelectorConfig()
+        config.resume = resume
+        config.dryrun = dryrun
+        selector = GoodStoreSelector(
+            excel_file_path=str(self.excel_path),
+            profit_calculator_path="/tmp/calc.xlsx",
+            config=config
+        )
+        selector.excel_processor = Mock()
+        processed = []
+
+        def process(store_data):
+            processed.append(store_data.store_id)
+            return _make_result(store_data.store_id)
+
+        with patch.object(selector, '_initialize_components'), \
+             patch.object(selector, '_load_pending_stores', return_value=list(self.stores)), \
+             patch.object(selector, '_process_single_store', side_effect=process), \
+             patch('good_store_selector.configure_page_cache', return_value=None):
+            result = selector.process_stores()
+        return selector, processed, result
+
+    def test_resume_skips_journaled_stores_and_replays_results(self):
+        """测试续跑跳过已完成店铺，并把日志结果回放到Excel更新"""
+        selector, processed, result = self._run(resume=True)
+
+        self.assertEqual(processed, ["1002", "1003"])
+        rows = list(load_workbook(self.excel_path).active.iter_rows(min_row=2, values_only=True))
+        self.assertEqual(rows, [
+            ("1000", "是", "已处理"),
+            ("1001", "否", "已处理"),
+            ("1002", "是", "已处理"),
+            ("1003", "是", "已处理"),
+        ])
+        self.assertEqual(result.processed_stores, 4)
+        self.assertEqual(selector.processing_stats['resumed_stores'], 2)
+        # Excel保存成功后删除日志
+        self.assertFalse(default_journal_path(self.excel_path).exists())
+
+    def test_resume_writes_only_replayed_results_at_end(self):
+        """测试结束时只补写日志回放的店铺，本次处理的店铺不重复写回"""
+        add_many = IncrementalExcelWriter.add_many
+        with patch.object(IncrementalExcelWriter, 'add_many', autospec=True, side_effect=add_many) as spy:
+            self._run(resume=True)
+
+        spy.assert_called_once()
+        replayed = [store_data.store_id for store_data, _, _ in spy.call_args.args[1]]
+        self.assertEqual(replayed, ["1000", "1001"])
+
+    def test_without_resume_processes_all_stores(self):
+        """测试未开启续跑时重新处理所有店铺"""
+        selector, processed, result = self._run(resume=False)
+
+        self.assertEqual(processed, ["1000", "1001", "1002", "1003"])
+        self.assertEqual(result.processed_stores, 4)
+
+    def test_dryrun_does_not_touch_journal(self):
+        """测试试运行不读写日志，正式运行的断点保持不变"""
+        journal_path = default_journal_path(self.excel_path)
+        original = journal_path.read_bytes()
+
+        selector, processed, _ = self._run(resume=False, dryrun=True)
+
+        self.assertEqual(processed, ["1000", "1001", "1002", "1003"])
+        self.assertIsNone(selector.journal)
+        self.assertEqual(journal_path.read_bytes(), original)
+        self.assertEqual([p.name for p in Path(self.temp_dir).iterdir() if p.suffix == '.bak'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+TimeoutExecutor 单元测试
+
+测试共享线程池的超时、取消、异常传递、嵌套调用与统计
+"""
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+
+from common.config.system_config import PerformanceConfig
+from common.utils.timeout_executor import (
+    TimeoutExecutor, configure_timeout_executor, get_global_timeout_executor, reset_global_timeout_executor
+)
+from rpa.browser.core.exceptions.browser_exceptions import OperationCancelledError
+from rpa.browser.implementations.cancellation import submit_coroutine
+
+
+class TestTimeoutExecutor(unittest.TestCase):
+    """TimeoutExecutor 测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.executor = TimeoutExecutor(max_workers=2)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.executor.shutdown()
+
+    def test_returns_result(self):
+        """测试正常返回结果"""
+        self.assertEqual(self.executor.run(lambda: 42, timeout=5, operation_name="提取"), 42)
+        stats = self.executor.get_stats()
+        self.assertEqual(stats['completed'], 1)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_operation_exception_propagates(self):
+        """测试操作自身的异常（包括 TimeoutError）原样抛出，不计为超时"""
+        def fail():
+            raise TimeoutError("页面元素等待超时")
+
+        with self.assertRaisesRegex(TimeoutError, "页面元素等待超时"):
+            self.executor.run(fail, timeout=5)
+        stats = self.executor.get_stats()
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['timed_out'], 0)
+
+    def test_timeout_cancels_browser_coroutines(self):
+        """测试超时后取消操作提交的协程，操作后续的浏览器调用失败"""
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, daemon=True)
+        loop_thread.start()
+        outcome = {}
+        finished = threading.Event()
+
+        def operation():
+            future = submit_coroutine(asyncio.sleep(30), loop)
+            try:
+                future.result()
+            except CancelledError:
+                outcome['first'] = 'cancelled'
+            try:
+                submit_coroutine(asyncio.sleep(0), loop)
+            except OperationCancelledError:
+                outcome['second'] = 'rejected'
+            finished.set()
+
+        try:
+            with self.assertRaisesRegex(TimeoutError, "导航超时"):
+                self.executor.run(operation, timeout=0.1, operation_name="导航")
+            self.assertTrue(finished.wait(5))
+        finally:
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), loop).result(timeout=5)
+            loop.call_soon_threadsafe(loop.stop)
+            loop_thread.join(timeout=5)
+            loop.close()
+
+        self.assertEqual(outcome, {'first': 'cancelled', 'second': 'rejected'})
+        stats = self.executor.get_stats()
+        self.assertEqual(stats['timed_out'], 1)
+        self.assertEqual(stats['cancelled_coroutines'], 1)
+
+    def test_queued_operation_cancelled_before_start(self):
+        """测试线程池占满时排队超时的操作不会再执行"""
+        release = threading.Event()
+        started = []
+        blockers = [threading.Thread(target=self.executor.run, args=(release.wait, 5)) for _ in range(2)]
+        for thread in blockers:
+            thread.start()
+        time.sleep(0.1)
+
+        try:
+            with self.assertRaises(TimeoutError):
+                self.executor.run(lambda: started.append(True), timeout=0.1)
+        finally:
+            release.set()
+            for thread in blockers:
+                thread.join(timeout=5)
+
+        time.sleep(0.05)
+        self.assertEqual(started, [])
+        self.assertEqual(self.executor.get_stats()['cancelled_before_start'], 1)
+
+    def test_nested_call_runs_inline_with_deadline(self):
+        """测试嵌套调用在当前线程执行且有截止时间，不占用额外线程"""
+        def inner():
+            return threading.current_thread().name
+
+        def outer():
+            return threading.current_thread().name, self.executor.run(inner, timeout=5)
+
+        outer_thread, inner_thread = self.executor.run(outer, timeout=5)
+        self.assertEqual(outer_thread, inner_thread)
+
+        def slow_nested():
+            return self.executor.run(lambda: time.sleep(0.3), timeout=0.05, operation_name="内层")
+
+        with self.assertRaisesRegex(TimeoutError, "内层超时"):
+            self.executor.run(slow_nested, timeout=5)
+
+    def test_thread_count_bounded(self):
+        """测试大量调用不会增加线程数"""
+        for _ in range(50):
+            self.executor.run(lambda: None, timeout=5)
+        workers = [t for t in threading.enumerate() if t.name.startswith("scraper-op")]
+        self.assertLessEqual(len(workers), 2)
+
+
+class TestGlobalTimeoutExecutor(unittest.TestCase):
+    """全局执行器测试"""
+
+    def tearDown(self):
+        """测试后清理"""
+        reset_global_timeout_executor()
+
+    def test_configure_resizes_pool(self):
+        """测试按配置设置线程池大小，大小不变时复用实例"""
+        config = PerformanceConfig(timeout_executor_workers=4)
+        executor = configure_timeout_executor(config)
+        self.assertEqual(executor.max_workers, 4)
+        self.assertIs(configure_timeout_executor(config), executor)
+        self.assertIs(get_global_timeout_executor(), executor)
+
+        config.timeout_executor_workers = 8
+        self.assertEqual(configure_timeout_executor(config).max_workers, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,8 +14,11 @@ from common.utils.wait_utils import (
     select_with_soup,
     _wait_for_content_with_browser_native,
     wait_for_content_smart,
-    create_content_validator
+    create_content_validator,
+    wait_for_page_ready,
+    configure_readiness_probe
 )
+from common.config.system_config import PerformanceConfig
 
 
 class TestWaitUtilsContentSelection(unittest.TestCase):
@@ -255,5 +258,62 @@ class TestWaitUtilsSmartContentWaiting(unittest.TestCase):
         self.mock_browser_service.wait_for_selector_sync.assert_called()
 
 
+class TestWaitForPageReady(unittest.TestCase):
+    """页面就绪探测测试"""
+
+    def setUp(self):
+        """测试初始化"""
+        self.mock_browser_service = Mock()
+
+    def tearDown(self):
+        """恢复默认配置"""
+        configure_readiness_probe(PerformanceConfig())
+
+    def test_returns_as_soon_as_probe_reports_ready(self):
+        """测试探测就绪时不再固定等待"""
+        self.mock_browser_service.evaluate_sync.return_value = {'ready': True, 'reason': 'stable', 'elapsed_ms': 320}
+
+        with patch('common.utils.wait_utils.time.sleep') as mock_sleep:
+            ready = WaitUtils(self.mock_browser_service).wait_for_page_ready(['.store-total-revenue'], max_wait=5.0)
+
+        self.assertTrue(ready)
+        mock_sleep.assert_not_called()
+        script = self.mock_browser_service.evaluate_sync.call_args.args[0]
+        self.assertIn('MutationObserver', script)
+        self.assertIn('"selectors": [".store-total-revenue"]', script)
+        self.assertIn('"timeoutMs": 5000', script)
+
+    def test_falls_back_to_fixed_wait_when_probe_unavailable(self):
+        """测试探测失败（如执行上下文被导航销毁）时等待剩余的固定时间"""
+        self.mock_browser_service.evaluate_sync.return_value = None
+
+        with patch('common.utils.wait_utils.time.sleep') as mock_sleep:
+            ready = wait_for_page_ready(self.mock_browser_service, None, 1.0)
+
+        self.assertFalse(ready)
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 1.0, places=1)
+
+    def test_disabled_by_config(self):
+        """测试关闭就绪探测时使用固定等待"""
+        configure_readiness_probe(PerformanceConfig(readiness_probe=False))
+
+        with patch('common.utils.wait_utils.time.sleep') as mock_sleep:
+            ready = wait_for_page_ready(self.mock_browser_service, ['.a'], 0.5)
+
+        self.assertFalse(ready)
+        self.mock_browser_service.evaluate_sync.assert_not_called()
+        mock_sleep.assert_called_once()
+
+    def test_not_ready_within_upper_bound(self):
+        """测试探测超时时不额外等待"""
+        self.mock_browser_service.evaluate_sync.return_value = {'ready': False, 'reason': 'selector_missing'}
+
+        with patch('common.utils.wait_utils.time.sleep') as mock_sleep:
+            ready = wait_for_page_ready(self.mock_browser_service, ['.a'], 2.0)
+
+        self.assertFalse(ready)
+        mock_sleep.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
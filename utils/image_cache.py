@@ -0,0 +1,282 @@
+"""
+图片与特征缓存
+
+以图片内容的 SHA-256 为键缓存下载的图片和计算出的特征（感知哈希、SSIM灰度图、ORB描述符、CLIP嵌入）：
+- 同一张图片只下载一次，URL 到内容键的映射也会持久化，下次运行不再请求
+- 特征按 (内容键, 特征名) 缓存在内存（LRU）中，指定缓存目录时同时保存为 .npy 文件
+- 下载使用按线程复用的 requests.Session（连接池），并发下载时各线程互不干扰
+
+未指定缓存目录时只使用内存缓存。
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_CACHE_DIR = Path.home() / ".xuanping" / "cache" / "images"
+
+_thread_local = threading.local()
+
+
+def get_http_session(pool_size: int = 16) -> requests.Session:
+    """
+    获取当前线程的 HTTP 会话（复用连接，避免每次下载重新建立 TCP/TLS 连接）
+
+    Args:
+        pool_size: 每个主机的连接池大小
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _thread_local.session = session
+    return session
+
+
+def download_image_bytes(url: str, timeout: float = 10) -> bytes:
+    """下载图片内容"""
+    response = get_http_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def decode_image(data: bytes, source: str) -> Image.Image:
+    """把图片内容解码为 RGB 图片"""
+    try:
+        return Image.open(BytesIO(data)).convert('RGB')
+    except Exception as e:
+        raise ValueError(f"无法从URL加载图片 {source}: {e}")
+
+
+def content_key(data: bytes) -> str:
+    """图片内容的键"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def image_pixel_key(img: Image.Image) -> str:
+    """PIL 图片对象的键（按像素内容计算，不依赖对象ID）"""
+    digest = hashlib.sha256(f"{img.mode}:{img.size}".encode('ascii'))
+    digest.update(img.tobytes())
+    return digest.hexdigest()
+
+
+class ImageCache:
+    """
+    内容寻址的图片与特征缓存
+
+    线程安全，可在并发下载/计算特征时共享同一实例。
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_memory_items: int = 4096):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 磁盘缓存目录，None 表示只使用内存缓存
+            max_memory_items: 内存中最多保留的条目数（图片内容和特征分别计数）
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_memory_items = max_memory_items
+        self._url_keys: Dict[str, str] = {}
+        self._file_keys: Dict[Tuple[str, int, int], str] = {}
+        self._memory: 'OrderedDict[Tuple[str, str], Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'downloads': 0, 'download_hits': 0, 'feature_hits': 0, 'feature_misses': 0}
+
+        if self.cache_dir:
+            for sub_dir in ('images', 'urls', 'features'):
+                (self.cache_dir / sub_dir).mkdir(parents=True, exist_ok=True)
+
+    # ---------- 内存 LRU ----------
+
+    def _memory_get(self, key: Tuple[str, str]):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return True, self._memory[key]
+        return False, None
+
+    def _memory_put(self, key: Tuple[str, str], value: Any):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    # ---------- 图片来源 ----------
+
+    def _path(self, kind: str, key: str, suffix: str = '') -> Path:
+        return self.cache_dir / kind / key[:2] / f"{key}{suffix}"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def _cached_url_key(self, url: str) -> Optional[str]:
+        """已缓存的 URL 对应的内容键（图片内容仍可读取时才返回）"""
+        key = self._url_keys.get(url)
+        if key is None and self.cache_dir:
+            url_file = self._path('urls', content_key(url.encode('utf-8')))
+            if url_file.exists():
+                key = url_file.read_text(encoding='ascii').strip()
+        if key is None:
+            return None
+        if self._memory_get((key, 'bytes'))[0] or (self.cache_dir and self._path('images', key).exists()):
+            self._url_keys[url] = key
+            return key
+        return None
+
+    def _read_bytes(self, key: str, source: str) -> bytes:
+        found, data = self._memory_get((key, 'bytes'))
+        if found:
+            return data
+        if self.cache_dir and self._path('images', key).exists():
+            return self._path('images', key).read_bytes()
+        # 内存中的图片内容已被淘汰且没有磁盘缓存：重新下载
+        return self._download(source)[1]
+
+    def _download(self, url: str) -> Tuple[str, bytes]:
+        try:
+            data = download_image_bytes(url)
+        except Exception as e:
+            raise ValueError(f"无法从URL加载图片 {url}: {e}")
+        key = content_key(data)
+        with self._lock:
+            self.stats['downloads'] += 1
+        self._url_keys[url] = key
+        self._memory_put((key, 'bytes'), data)
+        if self.cache_dir:
+            self._write_atomic(self._path('images', key), data)
+            self._write_atomic(self._path('urls', content_key(url.encode('utf-8'))), key.encode('ascii'))
+        return key, data
+
+    def resolve(self, source: Union[str, Image.Image]) -> Tuple[str, Callable[[], Image.Image]]:
+        """
+        解析图片来源
+
+        Args:
+            source: 本地文件路径、HTTP/HTTPS URL 或 PIL Image 对象
+
+        Returns:
+            Tuple[str, Callable]: (内容键, 按需加载 RGB 图片的函数)
+        """
+        if isinstance(source, Image.Image):
+            return image_pixel_key(source), lambda: source.convert('RGB')
+
+        if not isinstance(source, str):
+            raise ValueError(f"不支持的图片来源类型: {type(source)}")
+
+        if source.startswith(('http://', 'https://')):
+            key = self._cached_url_key(source)
+            if key is not None:
+                with self._lock:
+                    self.stats['download_hits'] += 1
+                return key, lambda: decode_image(self._read_bytes(key, source), source)
+            key, data = self._download(source)
+            return key, lambda: decode_image(data, source)
+
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"图片文件不存在: {source}")
+        stat = os.stat(source)
+        file_id = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size)
+        key = self._file_keys.get(file_id)
+        if key is None:
+            with open(source, 'rb') as f:
+                key = self._file_keys[file_id] = content_key(f.read())
+
+        def load_local() -> Image.Image:
+            try:
+                return Image.open(source).convert('RGB')
+            except Exception as e:
+                raise ValueError(f"无法加载本地图片 {source}: {e}")
+
+        return key, load_local
+
+    # ---------- 特征 ----------
+
+    def get_feature(self, key: str, name: str, compute: Callable[[], Optional[np.ndarray]]) -> Optional[np.ndarray]:
+        """
+        获取图片特征（先查内存，再查磁盘，都没有时计算并保存）
+
+        Args:
+            key: 图片内容键
+            name: 特征名（不同参数的同一特征应使用不同名称）
+            compute: 计算特征的函数，返回 numpy 数组或 None
+        """
+        found, value = self._memory_get((key, name))
+        if not found and self.cache_dir:
+            feature_path = self._path('features', key, f".{name}.npy")
+            if feature_path.exists():
+                try:
+                    value = self._from_stored(np.load(feature_path, allow_pickle=False))
+                    found = True
+                    self._memory_put((key, name), value)
+                except (OSError, ValueError):
+                    found = False
+        if found:
+            with self._lock:
+                self.stats['feature_hits'] += 1
+            return value
+
+        with self._lock:
+            self.stats['feature_misses'] += 1
+        value = compute()
+        self.put_feature(key, name, value)
+        return value
+
+    def has_feature(self, key: str, name: str) -> bool:
+        """特征是否已缓存"""
+        if self._memory_get((key, name))[0]:
+            return True
+        return bool(self.cache_dir) and self._path('features', key, f".{name}.npy").exists()
+
+    def put_feature(self, key: str, name: str, value: Optional[np.ndarray]):
+        """保存图片特征"""
+        self._memory_put((key, name), value)
+        if self.cache_dir:
+            buffer = BytesIO()
+            np.save(buffer, self._to_stored(value), allow_pickle=False)
+            try:
+                self._write_atomic(self._path('features', key, f".{name}.npy"), buffer.getvalue())
+            except OSError as e:
+                logger.warning(f"保存图片特征缓存失败: {e}")
+
+    @staticmethod
+    def _to_stored(value: Optional[np.ndarray]) -> np.ndarray:
+        # None（例如没有ORB特征点）保存为空的对象标记数组
+        return np.zeros((0,), dtype=np.int8) if value is None else np.asarray(value)
+
+    @staticmethod
+    def _from_stored(value: np.ndarray) -> Optional[np.ndarray]:
+        return None if value.dtype == np.int8 and value.shape == (0,) else value
+
+    def clear_memory(self):
+        """清空内存缓存（磁盘缓存保留）"""
+        with self._lock:
+            self._memory.clear()
+            self._url_keys.clear()
+            self._file_keys.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_items'] = len(self._memory)
+        return stats
@@ -0,0 +1,320 @@
+"""
+商品图片感知哈希索引
+
+持久化保存商品图片的 64 位 pHash 和 dHash，用多索引哈希（multi-index hashing）做汉明半径查询：
+64 位哈希切分为 4 段 16 位，汉明距离不超过 r 的两个哈希至少有一段的距离不超过 r // 4，
+因此只需在各段的倒排表中枚举少量相邻值即可找到全部候选，查询时间与命中数量相关而不是与索引大小成正比。
+
+索引作为图片相似度的前置过滤：先按哈希距离找出候选商品，再只对候选做 SSIM/ORB/CLIP 评分。
+
+抓取流程中通过 configure_image_hash_index() 启用，未启用时 get_image_hash_index() 返回 None。
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import imagehash
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+SEGMENT_COUNT = 4
+SEGMENT_BITS = HASH_BITS // SEGMENT_COUNT
+SEGMENT_MASK = (1 << SEGMENT_BITS) - 1
+
+# 每段枚举的最大汉明距离（超过时改为线性扫描，对应查询半径 >= 16）
+MAX_SEGMENT_RADIUS = 3
+
+
+def hash_to_int(image_hash: imagehash.ImageHash) -> int:
+    """把 8x8 的 ImageHash 转换为 64 位无符号整数"""
+    value = 0
+    for bit in image_hash.hash.flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个哈希的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+def _to_signed(value: int) -> int:
+    """SQLite 只支持有符号 64 位整数"""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+def _segments(value: int) -> List[int]:
+    return [(value >> (i * SEGMENT_BITS)) & SEGMENT_MASK for i in range(SEGMENT_COUNT)]
+
+
+def _neighbors(segment: int, radius: int) -> List[int]:
+    """与 segment 汉明距离不超过 radius 的所有 16 位值"""
+    values = [segment]
+    for distance in range(1, radius + 1):
+        for bits in combinations(range(SEGMENT_BITS), distance):
+            flipped = segment
+            for bit in bits:
+                flipped ^= 1 << bit
+            values.append(flipped)
+    return values
+
+
+@dataclass
+class HashMatch:
+    """哈希查询结果"""
+    item_id: str
+    phash_distance: int
+    dhash_distance: Optional[int] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ImageHashIndex:
+    """
+    图片感知哈希索引
+
+    数据保存在 SQLite 中，打开时把哈希载入内存并建立分段倒排表。线程安全。
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        """
+        初始化索引
+
+        Args:
+            db_path: SQLite 数据库路径，None 表示只在内存中保存
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self._lock = threading.RLock()
+        self._items: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+        self._segment_tables: List[Dict[int, set]] = [{} for _ in range(SEGMENT_COUNT)]
+
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path) if self.db_path else ':memory:', check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS image_hashes ("
+            "item_id TEXT PRIMARY KEY, phash INTEGER NOT NULL, dhash INTEGER NOT NULL, "
+            "metadata TEXT, updated_at REAL)"
+        )
+        self._conn.commit()
+        self._load()
+
+    def _load(self):
+        for item_id, phash, dhash, metadata in self._conn.execute(
+                "SELECT item_id, phash, dhash, metadata FROM image_hashes"):
+            self._insert(item_id, _to_unsigned(phash), _to_unsigned(dhash), json.loads(metadata or '{}'))
+
+    def _insert(self, item_id: str, phash: int, dhash: int, metadata: Dict[str, Any]):
+        self._remove_from_tables(item_id)
+        self._items[item_id] = (phash, dhash, metadata)
+        for table, segment in zip(self._segment_tables, _segments(phash)):
+            table.setdefault(segment, set()).add(item_id)
+
+    def _remove_from_tables(self, item_id: str):
+        existing = self._items.pop(item_id, None)
+        if existing:
+            for table, segment in zip(self._segment_tables, _segments(existing[0])):
+                bucket = table.get(segment)
+                if bucket:
+                    bucket.discard(item_id)
+                    if not bucket:
+                        del table[segment]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._items
+
+    def add(self, item_id: str, phash: int, dhash: int, metadata: Optional[Dict[str, Any]] = None):
+        """
+        添加或更新一条记录
+
+        Args:
+            item_id: 商品标识
+            phash: 64 位 pHash
+            dhash: 64 位 dHash
+            metadata: 附加信息（如图片URL、商品URL），需可序列化为JSON
+        """
+        metadata = dict(metadata or {})
+        with self._lock:
+            self._insert(item_id, phash, dhash, metadata)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO image_hashes (item_id, phash, dhash, metadata, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (item_id, _to_signed(phash), _to_signed(dhash), json.dumps(metadata, ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def remove(self, item_id: str) -> bool:
+        """删除一条记录"""
+        with self._lock:
+            if item_id not in self._items:
+                return False
+            self._remove_from_tables(item_id)
+            self._conn.execute("DELETE FROM image_hashes WHERE item_id = ?", (item_id,))
+            self._conn.commit()
+            return True
+
+    def get(self, item_id: str) -> Optional[HashMatch]:
+        """按标识获取记录（距离为 0）"""
+        entry = self._items.get(item_id)
+        if entry is None:
+            return None
+        return HashMatch(item_id, 0, 0, dict(entry[2]))
+
+    def query(self, phash: int, dhash: Optional[int] = None, max_distance: int = 10,
+              dhash_max_distance: Optional[int] = None, limit: Optional[int] = None) -> List[HashMatch]:
+        """
+        汉明半径查询
+
+        Args:
+            phash: 查询图片的 pHash
+            dhash: 查询图片的 dHash（提供时同时按 dHash 距离过滤）
+            max_distance: pHash 最大汉明距离
+            dhash_max_distance: dHash 最大汉明距离，默认与 max_distance 相同
+            limit: 最多返回的条数
+
+        Returns:
+            List[HashMatch]: 按 pHash 距离（其次 dHash 距离）升序排列的结果
+        """
+        if dhash_max_distance is None:
+            dhash_max_distance = max_distance
+        segment_radius = max_distance // SEGMENT_COUNT
+
+        with self._lock:
+            if segment_radius > MAX_SEGMENT_RADIUS:
+                candidates = set(self._items)
+            else:
+                candidates = set()
+                for table, segment in zip(self._segment_tables, _segments(phash)):
+                    for neighbor in _neighbors(segment, segment_radius):
+                        bucket = table.get(neighbor)
+                        if bucket:
+                            candidates.update(bucket)
+
+            matches = []
+            for item_id in candidates:
+                item_phash, item_dhash, metadata = self._items[item_id]
+                phash_distance = hamming_distance(phash, item_phash)
+                if phash_distance > max_distance:
+                    continue
+                dhash_distance = None
+                if dhash is not None:
+                    dhash_distance = hamming_distance(dhash, item_dhash)
+                    if dhash_distance > dhash_max_distance:
+                        continue
+                matches.append(HashMatch(item_id, phash_distance, dhash_distance, dict(metadata)))
+
+        matches.sort(key=lambda match: (match.phash_distance, match.dhash_distance or 0, match.item_id))
+        return matches[:limit] if limit else matches
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class ImageHashIndexer:
+    """
+    后台图片哈希索引器
+
+    抓取线程只提交 (商品标识, 图片URL, 附加信息)，图片下载和哈希计算在后台线程池完成，
+    不增加单个商品的处理时间。
+    """
+
+    def __init__(self, index: ImageHashIndex, similarity_tool=None, max_workers: int = 4):
+        """
+        Args:
+            index: 图片哈希索引
+            similarity_tool: ProductImageSimilarity 实例（复用其图片/特征缓存），默认创建不使用CLIP的实例
+            max_workers: 后台线程数
+        """
+        if similarity_tool is None:
+            from utils.image_similarity import ProductImageSimilarity
+            similarity_tool = ProductImageSimilarity(use_clip=False)
+        self.index = index
+        self.similarity_tool = similarity_tool
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ImageHashIndexer")
+        self.stats = {'submitted': 0, 'indexed': 0, 'skipped': 0, 'failed': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def submit(self, item_id: str, image_source: Optional[str], metadata: Optional[Dict[str, Any]] = None):
+        """提交一张商品图片（已索引的同一图片不会重复计算）"""
+        if not item_id or not image_source:
+            return
+        existing = self.index.get(item_id)
+        if existing and existing.metadata.get('image_url') == image_source:
+            self._count('skipped')
+            return
+        self._count('submitted')
+        self._executor.submit(self._index_image, item_id, image_source, dict(metadata or {}))
+
+    def _index_image(self, item_id: str, image_source: str, metadata: Dict[str, Any]):
+        try:
+            phash, dhash = self.similarity_tool.get_hash_values(image_source)
+            metadata.setdefault('image_url', image_source)
+            self.index.add(item_id, phash, dhash, metadata)
+            self._count('indexed')
+        except Exception as e:
+            self._count('failed')
+            logger.debug(f"商品图片索引失败 {item_id}: {e}")
+
+    def close(self, wait: bool = True):
+        """等待已提交的图片处理完成并关闭线程池"""
+        self._executor.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+# 全局索引（由 configure_image_hash_index 根据性能配置创建）
+_image_hash_index: Optional[ImageHashIndex] = None
+
+
+def configure_image_hash_index(performance_config) -> Optional[ImageHashIndex]:
+    """
+    根据性能配置打开商品图片哈希索引
+
+    Args:
+        performance_config: PerformanceConfig 实例
+
+    Returns:
+        Optional[ImageHashIndex]: 配置了索引路径时返回索引，否则返回 None
+    """
+    global _image_hash_index
+    reset_image_hash_index()
+    index_path = getattr(performance_config, 'image_hash_index_path', '')
+    if index_path:
+        _image_hash_index = ImageHashIndex(Path(index_path).expanduser())
+    return _image_hash_index
+
+
+def get_image_hash_index() -> Optional[ImageHashIndex]:
+    """获取全局图片哈希索引（未启用时返回 None）"""
+    return _image_hash_index
+
+
+def reset_image_hash_index():
+    """关闭全局图片哈希索引"""
+    global _image_hash_index
+    if _image_hash_index is not None:
+        _image_hash_index.close()
+        _image_hash_index = None
@@ -2,6 +2,10 @@
 图片相似度评分工具
 支持基于哈希、SSIM、ORB特征匹配和CLIP语义相似度的多层次图片相似度评分
 适用于商品图片相似度检测，支持CPU/GPU加速
+
+单张图片的特征（哈希、SSIM灰度图、ORB描述符、CLIP嵌入）按图片内容缓存（见 image_cache），
+compare_many 批量计算 CLIP 嵌入，一张图片与多个候选比较时每张图片只下载和计算一次。
+在大量已有商品中查找相似商品时，先用感知哈希索引（见 image_hash_index）按汉明距离筛选候选。
 """
 
 import os
@@ -10,11 +14,13 @@ from PIL import Image, ImageOps
 import imagehash
 from skimage.metrics import structural_similarity as ssim
 import cv2
-import requests
-from io import BytesIO
-from typing import Union, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Tuple, Optional, List
 import logging
 
+from utils.image_cache import ImageCache, decode_image, download_image_bytes, image_pixel_key
+from utils.image_hash_index import HashMatch, ImageHashIndex, hash_to_int
+
 # 可选依赖
 try:
     import torch
@@ -50,12 +56,10 @@ def load_image_from_source(source: Union[str, Image.Image]) -> Image.Image:
         # 判断是URL还是本地路径
         if source.startswith(('http://', 'https://')):
             try:
-                response = requests.get(source, timeout=10)
-                response.raise_for_status()
-                img = Image.open(BytesIO(response.content))
-                return img.convert('RGB')
+                data = download_image_bytes(source)
             except Exception as e:
                 raise ValueError(f"无法从URL加载图片 {source}: {e}")
+            return decode_image(data, source)
         else:
             # 本地文件路径
             if not os.path.exists(source):
@@ -80,26 +84,19 @@ def preprocess_for_ssim(img_a: Image.Image, img_b: Image.Image, size: int = 512)
     Returns:
         处理后的灰度图片数组
     """
-    # 转换为灰度图
-    gray_a = img_a.convert('L')
-    gray_b = img_b.convert('L')
+    return crop_to_common_size(ssim_gray_array(img_a, size), ssim_gray_array(img_b, size))
+
 
-    # 统一尺寸，保持宽高比
-    gray_a = ImageOps.contain(gray_a, (size, size))
-    gray_b = ImageOps.contain(gray_b, (size, size))
+def ssim_gray_array(img: Image.Image, size: int = 512) -> np.ndarray:
+    """单张图片的SSIM灰度数组（转为灰度图并保持宽高比缩放到 size 以内）"""
+    return np.array(ImageOps.contain(img.convert('L'), (size, size)))
 
-    # 转换为numpy数组
-    arr_a = np.array(gray_a)
-    arr_b = np.array(gray_b)
 
-    # 裁剪到相同尺寸
+def crop_to_common_size(arr_a: np.ndarray, arr_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """裁剪到相同尺寸"""
     min_h = min(arr_a.shape[0], arr_b.shape[0])
     min_w = min(arr_a.shape[1], arr_b.shape[1])
-
-    arr_a = arr_a[:min_h, :min_w]
-    arr_b = arr_b[:min_h, :min_w]
-
-    return arr_a, arr_b
+    return arr_a[:min_h, :min_w], arr_b[:min_h, :min_w]
 
 
 def calculate_hash_similarity(img_a: Image.Image, img_b: Image.Image, hash_type: str = 'phash') -> float:
@@ -125,9 +122,11 @@ def calculate_hash_similarity(img_a: Image.Image, img_b: Image.Image, hash_type:
 
     hash_func = hash_funcs[hash_type]
 
-    hash_a = hash_func(img_a)
-    hash_b = hash_func(img_b)
+    return hash_similarity_from_hashes(hash_func(img_a), hash_func(img_b))
 
+
+def hash_similarity_from_hashes(hash_a: imagehash.ImageHash, hash_b: imagehash.ImageHash) -> float:
+    """由两张图片的感知哈希计算相似度 (0-1)"""
     # 计算汉明距离
     hamming_distance = abs(hash_a - hash_b)
 
@@ -149,6 +148,12 @@ def calculate_ssim_similarity(img_a: Image.Image, img_b: Image.Image) -> float:
         SSIM相似度分数 (0-1)
     """
     arr_a, arr_b = preprocess_for_ssim(img_a, img_b)
+    return ssim_similarity_from_arrays(arr_a, arr_b)
+
+
+def ssim_similarity_from_arrays(arr_a: np.ndarray, arr_b: np.ndarray) -> float:
+    """由两张图片的SSIM灰度数组计算结构相似度 (0-1)"""
+    arr_a, arr_b = crop_to_common_size(arr_a, arr_b)
 
     # 计算SSIM
     similarity = ssim(arr_a, arr_b, data_range=255)
@@ -168,17 +173,21 @@ def calculate_orb_similarity(img_a: Image.Image, img_b: Image.Image, max_feature
     Returns:
         ORB相似度分数 (0-1)
     """
-    # 转换为OpenCV格式
-    arr_a = cv2.cvtColor(np.array(img_a), cv2.COLOR_RGB2GRAY)
-    arr_b = cv2.cvtColor(np.array(img_b), cv2.COLOR_RGB2GRAY)
+    return orb_similarity_from_descriptors(orb_descriptors(img_a, max_features), orb_descriptors(img_b, max_features))
 
-    # 创建ORB检测器
-    orb = cv2.ORB_create(max_features)
+
+def orb_descriptors(img: Image.Image, max_features: int = 1000) -> Optional[np.ndarray]:
+    """检测单张图片的ORB描述符（没有特征点时返回 None）"""
+    # 转换为OpenCV格式
+    gray = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2GRAY)
 
     # 检测关键点和描述符
-    kp_a, desc_a = orb.detectAndCompute(arr_a, None)
-    kp_b, desc_b = orb.detectAndCompute(arr_b, None)
+    _, descriptors = cv2.ORB_create(max_features).detectAndCompute(gray, None)
+    return descriptors
 
+
+def orb_similarity_from_descriptors(desc_a: Optional[np.ndarray], desc_b: Optional[np.ndarray]) -> float:
+    """由两张图片的ORB描述符计算特征匹配相似度 (0-1)"""
     if desc_a is None or desc_b is None:
         return 0.0
 
@@ -230,29 +239,66 @@ class CLIPSimilarityCalculator:
                 logger.error(f"CLIP模型加载失败: {e}")
                 raise
 
-    def _get_image_embedding(self, img: Image.Image) -> np.ndarray:
-        """获取图片的CLIP嵌入向量"""
-        self._load_model()
+    @property
+    def batch_size(self) -> int:
+        """每次前向计算的图片数"""
+        return 64 if self.device == "cuda" else 16
 
-        # 简单缓存机制（基于图片对象ID）
-        img_id = id(img)
-        if img_id in self.cache:
-            return self.cache[img_id]
+    @property
+    def feature_name(self) -> str:
+        """嵌入在特征缓存中的名称（区分模型）"""
+        return "clip-" + self.model_name.replace('/', '_')
 
-        # 预处理图片
-        inputs = self.processor(images=img, return_tensors="pt").to(self.device)
+    def embed_images(self, images: List[Image.Image]) -> np.ndarray:
+        """
+        批量计算图片的CLIP嵌入向量（不使用缓存）
 
-        # 获取图片特征
-        with torch.no_grad():
-            image_features = self.model.get_image_features(**inputs)
-            # L2归一化
-            image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+        Args:
+            images: 图片列表
 
-        # 转换为numpy数组并缓存
-        embedding = image_features.cpu().numpy()[0]
-        self.cache[img_id] = embedding
+        Returns:
+            形状为 (图片数, 维度) 的L2归一化嵌入矩阵
+        """
+        self._load_model()
 
-        return embedding
+        batches = []
+        for start in range(0, len(images), self.batch_size):
+            # 预处理图片
+            inputs = self.processor(images=images[start:start + self.batch_size], return_tensors="pt").to(self.device)
+
+            # 获取图片特征
+            with torch.no_grad():
+                image_features = self.model.get_image_features(**inputs)
+                # L2归一化
+                image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+            batches.append(image_features.cpu().numpy())
+
+        return np.concatenate(batches, axis=0)
+
+    def get_image_embeddings(self, images: List[Image.Image]) -> List[np.ndarray]:
+        """批量获取图片的CLIP嵌入向量（按像素内容缓存，只对未缓存的图片做前向计算）"""
+        keys = [image_pixel_key(img) for img in images]
+        missing = {}
+        for key, img in zip(keys, images):
+            if key not in self.cache and key not in missing:
+                missing[key] = img
+        if missing:
+            for key, embedding in zip(missing, self.embed_images(list(missing.values()))):
+                self.cache[key] = embedding
+        return [self.cache[key] for key in keys]
+
+    def _get_image_embedding(self, img: Image.Image) -> np.ndarray:
+        """获取图片的CLIP嵌入向量"""
+        return self.get_image_embeddings([img])[0]
+
+    @staticmethod
+    def similarity_from_embeddings(embedding_a: np.ndarray, embedding_b: np.ndarray) -> float:
+        """由两个嵌入向量计算语义相似度 (0-1)"""
+        # 计算余弦相似度
+        cosine_sim = float(np.dot(embedding_a, embedding_b))
+
+        # 将余弦相似度从[-1,1]映射到[0,1]
+        return (cosine_sim + 1.0) / 2.0
 
     def calculate_similarity(self, img_a: Image.Image, img_b: Image.Image) -> float:
         """
@@ -264,29 +310,64 @@ class CLIPSimilarityCalculator:
         Returns:
             语义相似度分数 (0-1)
         """
-        embedding_a = self._get_image_embedding(img_a)
-        embedding_b = self._get_image_embedding(img_b)
-
-        # 计算余弦相似度
-        cosine_sim = float(np.dot(embedding_a, embedding_b))
-
-        # 将余弦相似度从[-1,1]映射到[0,1]
-        similarity = (cosine_sim + 1.0) / 2.0
-
-        return similarity
+        embedding_a, embedding_b = self.get_image_embeddings([img_a, img_b])
+        return self.similarity_from_embeddings(embedding_a, embedding_b)
 
     def clear_cache(self):
         """清空缓存"""
         self.cache.clear()
 
 
+class ImageFeatures:
+    """单张图片的特征（按需计算，经由 ImageCache 按图片内容缓存）"""
+
+    def __init__(self, key: str, loader, cache: ImageCache):
+        self.key = key
+        self._loader = loader
+        self._cache = cache
+        self._image: Optional[Image.Image] = None
+
+    @property
+    def image(self) -> Image.Image:
+        """RGB 图片（首次访问时加载）"""
+        if self._image is None:
+            self._image = self._loader()
+        return self._image
+
+    @property
+    def phash(self) -> imagehash.ImageHash:
+        bits = self._cache.get_feature(self.key, 'phash', lambda: imagehash.phash(self.image).hash)
+        return imagehash.ImageHash(bits)
+
+    @property
+    def dhash(self) -> imagehash.ImageHash:
+        bits = self._cache.get_feature(self.key, 'dhash', lambda: imagehash.dhash(self.image).hash)
+        return imagehash.ImageHash(bits)
+
+    @property
+    def ssim_array(self) -> np.ndarray:
+        return self._cache.get_feature(self.key, 'ssim512', lambda: ssim_gray_array(self.image))
+
+    @property
+    def orb_descriptors(self) -> Optional[np.ndarray]:
+        return self._cache.get_feature(self.key, 'orb1000', lambda: orb_descriptors(self.image))
+
+    def clip_embedding(self, calculator: CLIPSimilarityCalculator) -> np.ndarray:
+        return self._cache.get_feature(
+            self.key, calculator.feature_name, lambda: calculator.embed_images([self.image])[0]
+        )
+
+
 class ProductImageSimilarity:
     """商品图片相似度评分工具"""
 
     def __init__(self,
                  use_clip: bool = True,
                  clip_model: str = "openai/clip-vit-base-patch32",
-                 device: Optional[str] = None):
+                 device: Optional[str] = None,
+                 cache_dir: Optional[str] = None,
+                 image_cache: Optional[ImageCache] = None,
+                 hash_prefilter_distance: Optional[int] = None):
         """
         初始化图片相似度工具
         
@@ -294,9 +375,15 @@ class ProductImageSimilarity:
             use_clip: 是否使用CLIP语义相似度
             clip_model: CLIP模型名称
             device: 计算设备 ('cpu', 'cuda', None为自动选择)
+            cache_dir: 图片与特征的磁盘缓存目录（None 只使用内存缓存）
+            image_cache: 共享的图片缓存实例（优先于 cache_dir）
+            hash_prefilter_distance: pHash 汉明距离超过该值的图片对直接判为不相似（分数为 0），
+                                     不再计算 SSIM/ORB/CLIP；None 表示不预过滤
         """
         self.use_clip = use_clip and CLIP_AVAILABLE
         self.clip_calculator = None
+        self.image_cache = image_cache or ImageCache(cache_dir)
+        self.hash_prefilter_distance = hash_prefilter_distance
 
         if self.use_clip:
             try:
@@ -309,6 +396,78 @@ class ProductImageSimilarity:
         if not self.use_clip:
             logger.info("使用传统图片相似度方法（哈希+SSIM+ORB）")
 
+    def get_features(self, source: Union[str, Image.Image]) -> ImageFeatures:
+        """
+        获取图片特征（URL 只下载一次，特征按图片内容缓存）
+
+        Args:
+            source: 图片来源（URL、本地路径或PIL Image对象）
+        """
+        key, loader = self.image_cache.resolve(source)
+        return ImageFeatures(key, loader, self.image_cache)
+
+    def _as_features(self, source: Union[str, Image.Image, ImageFeatures]) -> ImageFeatures:
+        return source if isinstance(source, ImageFeatures) else self.get_features(source)
+
+    def get_hash_values(self, source: Union[str, Image.Image]) -> Tuple[int, int]:
+        """获取图片的 64 位 pHash 和 dHash（用于图片哈希索引）"""
+        features = self._as_features(source)
+        return hash_to_int(features.phash), hash_to_int(features.dhash)
+
+    def _prefilter_rejects(self, features_a: ImageFeatures, features_b: ImageFeatures) -> bool:
+        """pHash 距离超过预过滤阈值时返回 True"""
+        if self.hash_prefilter_distance is None:
+            return False
+        return abs(features_a.phash - features_b.phash) > self.hash_prefilter_distance
+
+    @staticmethod
+    def _fast_score(features_a: ImageFeatures, features_b: ImageFeatures) -> float:
+        """快速相似度：哈希和SSIM的加权组合 (经验权重)"""
+        hash_sim = hash_similarity_from_hashes(features_a.phash, features_b.phash)
+        ssim_sim = ssim_similarity_from_arrays(features_a.ssim_array, features_b.ssim_array)
+        return float(0.6 * hash_sim + 0.4 * ssim_sim)
+
+    def _clip_score(self, features_a: ImageFeatures, features_b: ImageFeatures) -> float:
+        return self.clip_calculator.similarity_from_embeddings(
+            features_a.clip_embedding(self.clip_calculator), features_b.clip_embedding(self.clip_calculator)
+        )
+
+    def _semantic_score(self, features_a: ImageFeatures, features_b: ImageFeatures,
+                        fast_score: Optional[float] = None) -> float:
+        """语义相似度：快速分数较低时结合CLIP，两者分歧较大时再结合ORB"""
+        if fast_score is None:
+            fast_score = self._fast_score(features_a, features_b)
+
+        # 如果快速相似度很高，直接返回
+        if fast_score >= 0.9 or not self.use_clip:
+            return fast_score
+
+        # 计算CLIP语义相似度
+        clip_score = self._clip_score(features_a, features_b)
+
+        # 如果快速方法和CLIP分歧较大，使用ORB作为补充
+        orb_score = 0.0
+        if abs(fast_score - clip_score) > 0.25:
+            orb_score = orb_similarity_from_descriptors(features_a.orb_descriptors, features_b.orb_descriptors)
+
+        # 综合评分
+        if orb_score > 0:
+            # 三种方法加权组合
+            combined_score = 0.4 * fast_score + 0.4 * clip_score + 0.2 * orb_score
+        else:
+            # 两种方法加权组合
+            combined_score = 0.5 * fast_score + 0.5 * clip_score
+
+        return float(combined_score)
+
+    def _resolve_method(self, method: str) -> str:
+        if method == 'auto':
+            # 自动选择：有CLIP用语义，否则用快速
+            return 'semantic' if self.use_clip else 'fast'
+        if method not in ('fast', 'semantic'):
+            raise ValueError(f"不支持的计算方法: {method}")
+        return method
+
     def calculate_fast_similarity(self,
                                   source_a: Union[str, Image.Image],
                                   source_b: Union[str, Image.Image]) -> float:
@@ -321,19 +480,7 @@ class ProductImageSimilarity:
         Returns:
             快速相似度分数 (0-1)
         """
-        img_a = load_image_from_source(source_a)
-        img_b = load_image_from_source(source_b)
-
-        # 计算哈希相似度
-        hash_sim = calculate_hash_similarity(img_a, img_b, 'phash')
-
-        # 计算SSIM相似度
-        ssim_sim = calculate_ssim_similarity(img_a, img_b)
-
-        # 加权组合 (经验权重)
-        combined_score = 0.6 * hash_sim + 0.4 * ssim_sim
-
-        return float(combined_score)
+        return self._fast_score(self._as_features(source_a), self._as_features(source_b))
 
     def calculate_semantic_similarity(self,
                                       source_a: Union[str, Image.Image],
@@ -347,33 +494,7 @@ class ProductImageSimilarity:
         Returns:
             语义相似度分数 (0-1)
         """
-        img_a = load_image_from_source(source_a)
-        img_b = load_image_from_source(source_b)
-
-        # 先计算快速相似度
-        fast_score = self.calculate_fast_similarity(img_a, img_b)
-
-        # 如果快速相似度很高，直接返回
-        if fast_score >= 0.9 or not self.use_clip:
-            return fast_score
-
-        # 计算CLIP语义相似度
-        clip_score = self.clip_calculator.calculate_similarity(img_a, img_b)
-
-        # 如果快速方法和CLIP分歧较大，使用ORB作为补充
-        orb_score = 0.0
-        if abs(fast_score - clip_score) > 0.25:
-            orb_score = calculate_orb_similarity(img_a, img_b)
-
-        # 综合评分
-        if orb_score > 0:
-            # 三种方法加权组合
-            combined_score = 0.4 * fast_score + 0.4 * clip_score + 0.2 * orb_score
-        else:
-            # 两种方法加权组合
-            combined_score = 0.5 * fast_score + 0.5 * clip_score
-
-        return float(combined_score)
+        return self._semantic_score(self._as_features(source_a), self._as_features(source_b))
 
     def calculate_similarity(self,
                              source_a: Union[str, Image.Image],
@@ -389,18 +510,122 @@ class ProductImageSimilarity:
         Returns:
             相似度分数 (0-1)
         """
+        method = self._resolve_method(method)
+        features_a, features_b = self._as_features(source_a), self._as_features(source_b)
+        if self._prefilter_rejects(features_a, features_b):
+            return 0.0
         if method == 'fast':
-            return self.calculate_fast_similarity(source_a, source_b)
-        elif method == 'semantic':
-            return self.calculate_semantic_similarity(source_a, source_b)
-        elif method == 'auto':
-            # 自动选择：有CLIP用语义，否则用快速
+            return self.calculate_fast_similarity(features_a, features_b)
+        return self.calculate_semantic_similarity(features_a, features_b)
+
+    def compare_many(self,
+                     query: Union[str, Image.Image],
+                     candidates: List[Union[str, Image.Image]],
+                     method: str = 'auto',
+                     max_workers: int = 8) -> List[Optional[float]]:
+        """
+        计算一张图片与多个候选图片的相似度
+
+        候选图片并发下载并计算特征，需要CLIP的图片按批做前向计算；
+        每张图片的特征只计算一次，所有比较复用。评分规则与 calculate_similarity 相同。
+
+        Args:
+            query: 待匹配的图片来源
+            candidates: 候选图片来源列表
+            method: 计算方法 ('fast', 'semantic', 'auto')
+            max_workers: 并发下载/计算特征的线程数
+
+        Returns:
+            与 candidates 对齐的相似度分数列表，加载失败的候选为 None，被哈希预过滤排除的候选为 0
+        """
+        method = self._resolve_method(method)
+        query_features = self.get_features(query)
+        self._prepare_fast_features(query_features)
+
+        def prepare(source) -> Optional[ImageFeatures]:
+            try:
+                features = self.get_features(source)
+                if self._prefilter_rejects(query_features, features):
+                    return features
+                return self._prepare_fast_features(features)
+            except (ValueError, FileNotFoundError) as e:
+                logger.warning(f"候选图片加载失败，跳过: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(candidates) or 1))) as executor:
+            candidate_features = list(executor.map(prepare, candidates))
+
+        rejected = [features is not None and self._prefilter_rejects(query_features, features)
+                    for features in candidate_features]
+        fast_scores = [self._fast_score(query_features, features) if features and not skip else None
+                       for features, skip in zip(candidate_features, rejected)]
+
+        if method == 'semantic':
             if self.use_clip:
-                return self.calculate_semantic_similarity(source_a, source_b)
-            else:
-                return self.calculate_fast_similarity(source_a, source_b)
-        else:
-            raise ValueError(f"不支持的计算方法: {method}")
+                needs_clip = [features for features, score in zip(candidate_features, fast_scores)
+                              if score is not None and score < 0.9]
+                if needs_clip:
+                    self._embed_features([query_features] + needs_clip)
+            fast_scores = [self._semantic_score(query_features, features, score) if score is not None else None
+                           for features, score in zip(candidate_features, fast_scores)]
+
+        return [0.0 if skip else score for score, skip in zip(fast_scores, rejected)]
+
+    def find_similar(self,
+                     source: Union[str, Image.Image],
+                     index: ImageHashIndex,
+                     max_distance: int = 10,
+                     method: str = 'auto',
+                     min_score: float = 0.0,
+                     limit: Optional[int] = None) -> List[Tuple[HashMatch, float]]:
+        """
+        在图片哈希索引中查找相似商品
+
+        先按 pHash/dHash 汉明距离从索引中取出候选，再只对候选做完整评分（compare_many），
+        不需要与索引中的每个商品逐一比较。
+
+        Args:
+            source: 待匹配的图片来源
+            index: 图片哈希索引（记录的 metadata 中需有 image_url）
+            max_distance: 哈希最大汉明距离
+            method: 计算方法 ('fast', 'semantic', 'auto')
+            min_score: 最低相似度
+            limit: 最多返回的条数
+
+        Returns:
+            List[Tuple[HashMatch, float]]: 按相似度降序排列的 (索引记录, 相似度)
+        """
+        phash, dhash = self.get_hash_values(source)
+        matches = [match for match in index.query(phash, dhash, max_distance=max_distance)
+                   if match.metadata.get('image_url')]
+        if not matches:
+            return []
+
+        scores = self.compare_many(source, [match.metadata['image_url'] for match in matches], method=method)
+        results = [(match, score) for match, score in zip(matches, scores)
+                   if score is not None and score >= min_score]
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results[:limit] if limit else results
+
+    @staticmethod
+    def _prepare_fast_features(features: ImageFeatures) -> ImageFeatures:
+        """预先计算（或从缓存读取）快速比较所需的哈希和SSIM特征"""
+        features.phash
+        features.ssim_array
+        return features
+
+    def _embed_features(self, features_list: List[ImageFeatures]):
+        """对尚未缓存CLIP嵌入的图片按批做前向计算"""
+        name = self.clip_calculator.feature_name
+        pending = {}
+        for features in features_list:
+            if features.key not in pending and not self.image_cache.has_feature(features.key, name):
+                pending[features.key] = features
+        if not pending:
+            return
+        embeddings = self.clip_calculator.embed_images([features.image for features in pending.values()])
+        for key, embedding in zip(pending, embeddings):
+            self.image_cache.put_feature(key, name, embedding)
 
     def get_detailed_scores(self,
                             source_a: Union[str, Image.Image],
@@ -414,13 +639,13 @@ class ProductImageSimilarity:
         Returns:
             包含各项分数的字典
         """
-        img_a = load_image_from_source(source_a)
-        img_b = load_image_from_source(source_b)
+        features_a = self.get_features(source_a)
+        features_b = self.get_features(source_b)
 
         scores = {
-            'hash_similarity': calculate_hash_similarity(img_a, img_b, 'phash'),
-            'ssim_similarity': calculate_ssim_similarity(img_a, img_b),
-            'orb_similarity': calculate_orb_similarity(img_a, img_b),
+            'hash_similarity': hash_similarity_from_hashes(features_a.phash, features_b.phash),
+            'ssim_similarity': ssim_similarity_from_arrays(features_a.ssim_array, features_b.ssim_array),
+            'orb_similarity': orb_similarity_from_descriptors(features_a.orb_descriptors, features_b.orb_descriptors),
         }
 
         # 快速组合分数
@@ -428,7 +653,8 @@ class ProductImageSimilarity:
 
         # CLIP语义分数（如果可用）
         if self.use_clip:
-            scores['clip_similarity'] = self.clip_calculator.calculate_similarity(img_a, img_b)
+            self._embed_features([features_a, features_b])
+            scores['clip_similarity'] = self._clip_score(features_a, features_b)
 
             # 语义组合分数
             if abs(scores['fast_combined'] - scores['clip_similarity']) > 0.25:
@@ -445,9 +671,10 @@ class ProductImageSimilarity:
         return scores
 
     def clear_cache(self):
-        """清空CLIP缓存"""
+        """清空CLIP缓存和内存中的图片特征缓存（磁盘缓存保留）"""
         if self.clip_calculator:
             self.clip_calculator.clear_cache()
+        self.image_cache.clear_memory()
 
 
 # 便捷函数